@@ -22852,6 +22852,12 @@ export interface operations {
                  * @description Legacy name for the `dataset_details` parameter.
                  */
                 details?: string | null;
+                /** @description Only return contents after this `hid`, in ascending or descending `hid` order. Pass the `hid` of the last item of the previous page to get the next page without an `offset`. */
+                after_hid?: number | null;
+                /** @description The `history_content_type` of the last item of the previous page. Several contents can share a `hid`, set this and `after_id` to continue with the contents sharing `after_hid`. */
+                after_type?: components["schemas"]["HistoryContentType"] | null;
+                /** @description The encoded ID of the last item of the previous page, see `after_type`. */
+                after_id?: string | null;
                 /**
                  * @deprecated
                  * @description A comma-separated list of encoded `HDA/HDCA` IDs. If this list is provided, only information about the specific datasets will be returned. Also, setting this value will return `all` details of the content item.
@@ -24078,6 +24084,12 @@ export interface operations {
                  * @description Legacy name for the `dataset_details` parameter.
                  */
                 details?: string | null;
+                /** @description Only return contents after this `hid`, in ascending or descending `hid` order. Pass the `hid` of the last item of the previous page to get the next page without an `offset`. */
+                after_hid?: number | null;
+                /** @description The `history_content_type` of the last item of the previous page. Several contents can share a `hid`, set this and `after_id` to continue with the contents sharing `after_hid`. */
+                after_type?: components["schemas"]["HistoryContentType"] | null;
+                /** @description The encoded ID of the last item of the previous page, see `after_type`. */
+                after_id?: string | null;
                 /**
                  * @deprecated
                  * @description A comma-separated list of encoded `HDA/HDCA` IDs. If this list is provided, only information about the specific datasets will be returned. Also, setting this value will return `all` details of the content item.
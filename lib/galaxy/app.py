@@ -388,7 +388,12 @@ class MinimalGalaxyApplication(BasicSharedApp, HaltableContainer, SentryClientMi
         index_help = getattr(self.config, "index_tool_help", True)
         self.toolbox_search = self._register_singleton(
             ToolBoxSearch,
-            ToolBoxSearch(self.toolbox, index_dir=self.config.tool_search_index_dir, index_help=index_help),
+            ToolBoxSearch(
+                self.toolbox,
+                index_dir=self.config.tool_search_index_dir,
+                index_help=index_help,
+                cache_size=self.config.tool_search_cache_size,
+            ),
         )
 
     @property
@@ -766,7 +771,9 @@ class UniverseApplication(StructuredApp, GalaxyManagerApplication):
         )
 
         # Setup a Tool Cache
-        self.tool_cache = self._register_singleton(ToolCache)
+        self.tool_cache = self._register_singleton(
+            ToolCache, ToolCache(max_materialized_tools=self.config.max_materialized_tools)
+        )
         self.tool_shed_repository_cache = self._register_singleton(ToolShedRepositoryCache)
         # Watch various config files for immediate reload
         self.watchers = self._register_singleton(ConfigWatchers)
@@ -240,6 +240,8 @@ class MockAppConfig(GalaxyDataTestConfig, CommonConfigurationMixin):
 
         self.umask = 0o77
         self.flush_per_n_datasets = 0
+        self.bulk_insert_discovered_datasets = False
+        self.model_store_import_copy_threads = 4
 
         # Compliance related config
         self.redact_email_in_job_name = False
@@ -276,6 +278,7 @@ class MockAppConfig(GalaxyDataTestConfig, CommonConfigurationMixin):
         self.drmaa_external_runjob_script = None
         self.tool_secret = None
         self.track_jobs_in_database = False
+        self.job_handler_wakeup = None
         self.amqp_internal_connection = None
         self.tool_configs = []
         self.manage_dependency_relationships = False
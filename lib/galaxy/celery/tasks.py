@@ -154,7 +154,7 @@ def change_datatype(
         return
     if datatype == "auto":
         path = dataset_instance.dataset.get_file_name()
-        datatype = sniff.guess_ext(path, datatypes_registry.sniff_order)
+        datatype = sniff.guess_ext(path, datatypes_registry.sniffer_index)
     datatypes_registry.change_datatype(dataset_instance, datatype)
     with transaction(sa_session):
         sa_session.commit()
@@ -419,13 +419,19 @@ def write_history_content_to(
     model_store_manager.write_history_content_to(request)
 
 
-@galaxy_task(action="import objects from a target model store")
+@galaxy_task(bind=True, action="import objects from a target model store")
 def import_model_store(
+    self,
     model_store_manager: ModelStoreManager,
     request: ImportModelStoreTaskRequest,
     task_user_id: Optional[int] = None,
 ):
-    model_store_manager.import_model_store(request)
+    def progress(completed: int, total: int) -> None:
+        # The task keeps its state, the number of imported dataset files is reported in the task's meta
+        if not self.request.called_directly:
+            self.update_state(state="STARTED", meta={"completed": completed, "total": total})
+
+    model_store_manager.import_model_store(request, progress=progress)
 
 
 @galaxy_task(action="compute dataset hash and store in database")
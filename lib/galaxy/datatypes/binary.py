@@ -295,6 +295,7 @@ class Meryldb(CompressedArchive):
     """MerylDB is a tar.gz archive, with 128 files. 64 data files and 64 index files."""
 
     file_ext = "meryldb"
+    sniff_requires_tar = True
 
     def sniff(self, filename: str) -> bool:
         """
@@ -325,6 +326,7 @@ class Visium(CompressedArchive):
     """Visium is a tar.gz archive with at least a 'Spatial' subfolder, a filtered h5 file and a raw h5 file."""
 
     file_ext = "visium.tar.gz"
+    sniff_requires_tar = True
 
     def sniff(self, filename: str) -> bool:
         """
@@ -3506,6 +3508,7 @@ class PostgresqlArchive(CompressedArchive):
         visible=True,
     )
     file_ext = "postgresql"
+    sniff_requires_tar = True
 
     def set_meta(self, dataset: DatasetProtocol, overwrite: bool = True, **kwd) -> None:
         super().set_meta(dataset, overwrite=overwrite, **kwd)
@@ -3562,6 +3565,7 @@ class MongoDBArchive(CompressedArchive):
         visible=True,
     )
     file_ext = "mongodb"
+    sniff_requires_tar = True
 
     def set_meta(self, dataset: DatasetProtocol, overwrite: bool = True, **kwd) -> None:
         super().set_meta(dataset, overwrite=overwrite, **kwd)
@@ -3638,6 +3642,7 @@ class Fast5Archive(CompressedArchive):
         name="fast5_count", default="0", param=MetadataParameter, desc="Read Count", readonly=True, visible=True
     )
     file_ext = "fast5.tar"
+    sniff_requires_tar = True
 
     def set_meta(self, dataset: DatasetProtocol, overwrite: bool = True, **kwd) -> None:
         super().set_meta(dataset, overwrite=overwrite, **kwd)
@@ -4120,6 +4125,7 @@ class BafTar(CompressedArchive):
     edam_data = "data_2536"  # mass spectrometry data
     edam_format = "format_3712"  # TODO: add more raw formats to EDAM?
     file_ext = "brukerbaf.d.tar"
+    sniff_requires_tar = True
 
     def get_signature_file(self) -> str:
         return "analysis.baf"
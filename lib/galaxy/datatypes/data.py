@@ -177,6 +177,15 @@ def _get_max_peek_size(data):
     return max_peek_size
 
 
+def _dataset_exists(data):
+    # Check the object store instead of the file, to not pull the dataset into the cache of a caching object store
+    dataset = getattr(data, "dataset", None)
+    object_store = getattr(dataset, "object_store", None)
+    if object_store is None or dataset.external_filename or dataset.purged:
+        return os.path.exists(data.get_file_name())
+    return object_store.exists(dataset)
+
+
 def _get_file_size(data):
     file_size = int(data.dataset.file_size or 0)
     if file_size == 0:
@@ -228,6 +237,8 @@ class Data(metaclass=DataMeta):
     # The dataset contains binary data --> do not space_to_tab or convert newlines, etc.
     # Allow binary file uploads of this type when True.
     is_binary: Union[bool, Literal["maybe"]] = True
+    # The sniffer only ever matches tar archives --> skip it for other files when sniffing.
+    sniff_requires_tar = False
     # Composite datatypes
     composite_type: Optional[str] = None
     composite_files: Dict[str, Any] = {}
@@ -484,7 +495,7 @@ class Data(metaclass=DataMeta):
 
     def _serve_binary_file_contents_as_text(self, trans, data, headers, file_size, max_peek_size):
         headers["content-type"] = "text/html"
-        with open(data.get_file_name(), "rb") as fh:
+        with p_dataproviders.dataset.open_dataset_bytes(data, decompress=False) as fh:
             return (
                 trans.fill_template_mako(
                     "/dataset/binary_file.mako",
@@ -503,7 +514,7 @@ class Data(metaclass=DataMeta):
         if not preview or isinstance(data.datatype, images.Image) or file_size < max_peek_size:
             return self._yield_user_file_content(trans, data, data.get_file_name(), headers), headers
 
-        with compression_utils.get_fileobj(data.get_file_name(), "rb") as fh:
+        with p_dataproviders.dataset.open_dataset_bytes(data) as fh:
             # preview large text file
             headers["content-type"] = "text/html"
             return (
@@ -585,8 +596,8 @@ class Data(metaclass=DataMeta):
         downloading = to_ext is not None
         file_size = _get_file_size(dataset)
 
-        if not os.path.exists(dataset.get_file_name()):
-            raise ObjectNotFound(f"File Not Found ({dataset.get_file_name()}).")
+        if not _dataset_exists(dataset):
+            raise ObjectNotFound(f"File Not Found ({dataset.get_file_name(sync_cache=False)}).")
 
         if downloading:
             trans.log_event(f"Download dataset id: {str(dataset.id)}")
@@ -6,7 +6,9 @@ Dataproviders that use either:
         (e.g. parsing genomic regions from their source)
 """
 
+import io
 import logging
+import os
 import sys
 
 from bx import (
@@ -14,7 +16,12 @@ from bx import (
     wiggle as bx_wig,
 )
 
-from galaxy.util import sqlite
+from galaxy.util import (
+    bz2_magic,
+    gzip_magic,
+    sqlite,
+    xz_magic,
+)
 from galaxy.util.compression_utils import get_fileobj
 from . import (
     base,
@@ -33,6 +40,84 @@ change SamtoolsDataProvider to use pysam
 log = logging.getLogger(__name__)
 
 
+COMPRESSED_MAGICS = (gzip_magic, bz2_magic, xz_magic, b"PK\x03\x04")
+
+
+# ----------------------------------------------------------------------------- reading datasets as bytes
+class DatasetBytesReader(io.RawIOBase):
+    """
+    Seekable, read-only file object reading the bytes of a dataset through its
+    object store.
+
+    Reading part of a dataset that is not in the cache of a caching object
+    store uses ranged requests instead of pulling the whole file into the cache.
+    """
+
+    def __init__(self, object_store, dataset):
+        """
+        :param object_store: the object store the dataset is stored in
+        :param dataset: the Galaxy dataset to read
+        :type dataset: model.Dataset
+        """
+        super().__init__()
+        self.object_store = object_store
+        self.dataset = dataset
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.object_store.size(self.dataset)
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self.position = offset
+        return self.position
+
+    def read(self, size=-1):
+        if size is None:
+            size = -1
+        data = self.object_store.get_bytes(self.dataset, start=self.position, count=size)
+        self.position += len(data)
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+
+def open_dataset_bytes(dataset, decompress=True):
+    """
+    Open the file of a dataset (instance) for reading bytes.
+
+    Files in an object store are read with a `DatasetBytesReader`. External
+    files, and compressed files if `decompress` is set, are opened as before,
+    the latter with `get_fileobj` to read them decompressed.
+    """
+    model_dataset = getattr(dataset, "dataset", dataset)
+    object_store = getattr(model_dataset, "object_store", None)
+    if object_store is None or getattr(model_dataset, "external_filename", None):
+        file_name = dataset.get_file_name()
+        return get_fileobj(file_name, "rb") if decompress else open(file_name, "rb")
+    reader = DatasetBytesReader(object_store, model_dataset)
+    if decompress:
+        if reader.read(max(len(magic) for magic in COMPRESSED_MAGICS)).startswith(COMPRESSED_MAGICS):
+            reader.close()
+            return get_fileobj(dataset.get_file_name(), "rb")
+        reader.seek(0)
+    return reader
+
+
 # ----------------------------------------------------------------------------- base for using a Glx dataset
 class DatasetDataProvider(base.DataProvider):
     """
@@ -53,9 +138,11 @@ class DatasetDataProvider(base.DataProvider):
         # precondition: dataset is a galaxy.model.DatasetInstance
         self.dataset = dataset
         # this dataset file is obviously the source
-        # TODO: this might be a good place to interface with the object_store...
-        mode = "rb" if dataset.datatype.is_binary else "r"
-        super().__init__(get_fileobj(dataset.get_file_name(), mode))
+        # binary files are read through the object store, text files still need decoding
+        if dataset.datatype.is_binary:
+            super().__init__(open_dataset_bytes(dataset))
+        else:
+            super().__init__(get_fileobj(dataset.get_file_name(), "r"))
 
     # TODO: this is a bit of a mess
     @classmethod
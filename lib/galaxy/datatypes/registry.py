@@ -40,6 +40,7 @@ from . import (
     xml,
 )
 from .display_applications.application import DisplayApplication
+from .sniff import SnifferIndex
 
 if TYPE_CHECKING:
     from galaxy.datatypes.data import Data
@@ -76,6 +77,8 @@ class Registry:
         self.available_tracks = []
         self.set_external_metadata_tool = None
         self.sniff_order = []
+        # Dispatch index over sniff_order, rebuilt whenever datatypes are loaded
+        self.sniffer_index = SnifferIndex(self.sniff_order)
         self.upload_file_formats = []
         # Datatype elements defined in local datatypes_conf.xml that contain display applications.
         self.display_app_containers = []
@@ -165,6 +168,8 @@ class Registry:
                         )
                         self.display_applications_path = self.display_path_attr
 
+            upload_file_formats = set(self.upload_file_formats)
+            display_app_containers = set(self.display_app_containers)
             for elem in registration.findall("datatype"):
                 # Keep a status of the process steps to enable stopping the process of handling the datatype if necessary.
                 ok = True
@@ -212,13 +217,13 @@ class Registry:
                             if datatype_class is None:
                                 try:
                                     # The datatype class name must be contained in one of the datatype modules in the Galaxy distribution.
-                                    fields = datatype_module.split(".")[1:]
-                                    module = __import__(datatype_module)
-                                    for mod in fields:
-                                        module = getattr(module, mod)
+                                    module = importlib.import_module(datatype_module)
                                     datatype_class = getattr(module, datatype_class_name)
                                     self.log.debug(
-                                        f"Retrieved datatype module {str(datatype_module)}:{datatype_class_name} from the datatype registry for extension {extension}."
+                                        "Retrieved datatype module %s:%s from the datatype registry for extension %s.",
+                                        datatype_module,
+                                        datatype_class_name,
+                                        extension,
                                     )
                                 except Exception:
                                     self.log.exception("Error importing datatype module %s", str(datatype_module))
@@ -227,7 +232,10 @@ class Registry:
                         try:
                             datatype_class = self.datatypes_by_extension[type_extension].__class__
                             self.log.debug(
-                                f"Retrieved datatype module {str(datatype_class.__name__)} from type_extension {type_extension} for extension {extension}."
+                                "Retrieved datatype module %s from type_extension %s for extension %s.",
+                                datatype_class.__name__,
+                                type_extension,
+                                extension,
                             )
                         except Exception:
                             self.log.exception(
@@ -271,7 +279,8 @@ class Registry:
                         self.mimetypes_by_extension[extension] = mimetype
                         if datatype_class.track_type:
                             self.available_tracks.append(extension)
-                        if display_in_upload and extension not in self.upload_file_formats:
+                        if display_in_upload and extension not in upload_file_formats:
+                            upload_file_formats.add(extension)
                             self.upload_file_formats.append(extension)
                         # Max file size cut off for setting optional metadata.
                         self.datatypes_by_extension[extension].max_optional_metadata_filesize = elem.get(
@@ -308,9 +317,9 @@ class Registry:
                             self.datatypes_by_extension[extension].add_composite_file(
                                 name, optional=optional, mimetype=mimetype
                             )
-                        for _display_app in elem.findall("display"):
-                            if elem not in self.display_app_containers:
-                                self.display_app_containers.append(elem)
+                        if elem.find("display") is not None and elem not in display_app_containers:
+                            display_app_containers.add(elem)
+                            self.display_app_containers.append(elem)
                         datatype_info_dict = {
                             "display_in_upload": display_in_upload,
                             "extension": extension,
@@ -359,7 +368,8 @@ class Registry:
                                 self.datatypes_by_suffix_inferences[f"{suffix}.{auto_compressed_type}"] = (
                                     compressed_datatype_instance
                                 )
-                            if display_in_upload and compressed_extension not in self.upload_file_formats:
+                            if display_in_upload and compressed_extension not in upload_file_formats:
+                                upload_file_formats.add(compressed_extension)
                                 self.upload_file_formats.append(compressed_extension)
                             self.datatype_info_dicts.append(
                                 {
@@ -427,6 +437,7 @@ class Registry:
                     self.sniff_order.append(datatype)
 
         append_to_sniff_order()
+        self.sniffer_index = SnifferIndex(self.sniff_order)
 
     def _load_build_sites(self, root):
         def load_build_site(build_site_config):
@@ -487,7 +498,8 @@ class Registry:
         Process the sniffers element from a parsed a datatypes XML file located at root_dir/config (if processing the Galaxy
         distributed config) or contained within an installed Tool Shed repository.
         """
-        sniffer_elem_classes = [e.attrib["type"] for e in self.sniffer_elems]
+        sniffer_elem_classes = {e.attrib["type"] for e in self.sniffer_elems}
+        sniff_order_classes = {sniffer.__class__ for sniffer in self.sniff_order}
         if (sniffers := root.find("sniffers")) is not None:
             for elem in sniffers.findall("sniffer"):
                 # Keep a status of the process steps to enable stopping the process of handling the sniffer if necessary.
@@ -506,9 +518,7 @@ class Registry:
                         if module is None:
                             try:
                                 # The datatype class name must be contained in one of the datatype modules in the Galaxy distribution.
-                                module = __import__(datatype_module)
-                                for comp in datatype_module.split(".")[1:]:
-                                    module = getattr(module, comp)
+                                module = importlib.import_module(datatype_module)
                             except Exception:
                                 self.log.exception("Error importing datatype class for '%s'", str(dtype))
                                 ok = False
@@ -523,20 +533,23 @@ class Registry:
                             if ok:
                                 # We are loading new sniffer, so see if we have a conflicting sniffer already loaded.
                                 conflict = False
-                                for conflict_loc, sniffer_class in enumerate(self.sniff_order):
-                                    if sniffer_class.__class__ == aclass.__class__:
-                                        # We have a conflicting sniffer, so replace the one previously loaded.
-                                        conflict = True
-                                        if override:
-                                            del self.sniff_order[conflict_loc]
-                                            self.log.debug(f"Removed conflicting sniffer for datatype '{dtype}'")
-                                        break
+                                if aclass.__class__ in sniff_order_classes:
+                                    for conflict_loc, sniffer_class in enumerate(self.sniff_order):
+                                        if sniffer_class.__class__ == aclass.__class__:
+                                            # We have a conflicting sniffer, so replace the one previously loaded.
+                                            conflict = True
+                                            if override:
+                                                del self.sniff_order[conflict_loc]
+                                                self.log.debug("Removed conflicting sniffer for datatype '%s'", dtype)
+                                            break
                                 if not conflict or override:
                                     if compressed_sniffers and aclass.__class__ in compressed_sniffers:
                                         for compressed_sniffer in compressed_sniffers[aclass.__class__]:
                                             self.sniff_order.append(compressed_sniffer)
+                                            sniff_order_classes.add(compressed_sniffer.__class__)
                                     self.sniff_order.append(aclass)
-                                    self.log.debug(f"Loaded sniffer for datatype '{dtype}'")
+                                    sniff_order_classes.add(aclass.__class__)
+                                    self.log.debug("Loaded sniffer for datatype '%s'", dtype)
                                 # Processing the new sniffer elem is now complete, so make sure the element defining it is loaded if necessary.
                                 sniffer_class = elem.get("type", None)
                                 if sniffer_class is not None:
@@ -10,6 +10,7 @@ import os
 import re
 import shutil
 import struct
+import tarfile
 import tempfile
 import zipfile
 from functools import partial
@@ -17,8 +18,12 @@ from typing import (
     Callable,
     Dict,
     IO,
+    Iterable,
+    Iterator,
+    List,
     NamedTuple,
     Optional,
+    Tuple,
     Union,
 )
 
@@ -35,6 +40,10 @@ from galaxy.util.checkers import (
     COMPRESSION_CHECK_FUNCTIONS,
     is_tar,
 )
+from galaxy.util.hash_util import (
+    HASH_NAME_MAP,
+    HashFunctionNameEnum,
+)
 from galaxy.util.path import StrPath
 
 import pylibmagic  # noqa: F401  # isort:skip
@@ -44,7 +53,16 @@ import magic  # isort:skip
 log = logging.getLogger(__name__)
 
 SNIFF_PREFIX_BYTES = int(os.environ.get("GALAXY_SNIFF_PREFIX_BYTES", None) or 2**20)
+NEWLINE_BYTE = 10
 BINARY_MIMETYPES = {"application/pdf", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"}
+# Detects mime type and encoding with a single libmagic call
+MIME_MAGIC = magic.Magic(mime=True, mime_encoding=True)
+
+
+def _detect_mime(detected: str) -> Tuple[str, str]:
+    """Split libmagic's ``mime/type; charset=encoding`` output."""
+    mime_type, _, encoding = detected.partition("; ")
+    return mime_type, encoding.replace("charset=", "")
 
 
 def get_test_fname(fname):
@@ -86,66 +104,129 @@ class ConvertResult(NamedTuple):
     converted_path: Optional[str]
     converted_newlines: bool
     converted_regex: bool
+    # Digests of the converted content, if requested
+    hashes: Optional[Dict[str, str]] = None
 
 
 class ConvertFunction(Protocol):
     def __call__(
-        self, fname: str, in_place: bool = True, tmp_dir: Optional[str] = None, tmp_prefix: Optional[str] = "gxupload"
+        self,
+        fname: str,
+        in_place: bool = True,
+        tmp_dir: Optional[str] = None,
+        tmp_prefix: Optional[str] = "gxupload",
+        hash_functions: Optional[List[HashFunctionNameEnum]] = None,
     ) -> ConvertResult: ...
 
 
-def convert_newlines(
-    fname: str,
-    in_place: bool = True,
-    tmp_dir: Optional[str] = None,
-    tmp_prefix: Optional[str] = "gxupload",
-    block_size: int = 128 * 1024,
+# Runs of whitespace replaced by convert_newlines_sep2tabs and convert_sep2tabs
+NEWLINES_SEP2TABS_REGEXP = re.compile(rb"[^\S\n]+")
+SEP2TABS_REGEXP = re.compile(rb"[^\S\r\n]+")
+
+
+def convert_stream(
+    fi: IO[bytes],
+    fp: IO[bytes],
+    posix_lines: bool = True,
     regexp=None,
+    block_size: int = 128 * 1024,
+    hash_functions: Optional[List[HashFunctionNameEnum]] = None,
 ) -> ConvertResult:
     """
-    Converts in place a file from universal line endings
-    to Posix line endings.
+    Copy ``fi`` to ``fp`` block by block, converting universal line endings to
+    Posix line endings (if ``posix_lines`` is set) and replacing runs of
+    whitespace matched by ``regexp`` with tabs.
+
+    Lines are counted and digests for ``hash_functions`` are calculated while
+    the converted content is written, so neither requires another pass over
+    the output. A trailing carriage return or whitespace run is held back until
+    the next block is read, so the result does not depend on the block size.
+
+    >>> from io import BytesIO
+    >>> fp = BytesIO()
+    >>> convert_stream(BytesIO(b"a  b\\r\\nc \\td\\r"), fp, regexp=NEWLINES_SEP2TABS_REGEXP, block_size=3, hash_functions=["MD5"])
+    ConvertResult(line_count=2, converted_path=None, converted_newlines=True, converted_regex=True, hashes={'MD5': '5b97c39643e3052265d88cfee159aa5a'})
+    >>> fp.getvalue()
+    b'a\\tb\\nc\\td\\n'
     """
-    i = 0
+    line_count = 0
     converted_newlines = False
     converted_regex = False
-    NEWLINE_BYTE = 10
-    CR_BYTE = 13
-    with tempfile.NamedTemporaryFile(mode="wb", prefix=tmp_prefix, dir=tmp_dir, delete=False) as fp, open(
-        fname, mode="rb"
-    ) as fi:
-        last_char = None
-        block = fi.read(block_size)
-        last_block = b""
-        while block:
-            if last_char == CR_BYTE and block.startswith(b"\n"):
-                # Last block ended with CR, new block startswith newline.
-                # Since we replace CR with newline in the previous iteration we skip the first byte
-                block = block[1:]
-            if block:
-                last_char = block[-1]
+    hashers = {hash_function: HASH_NAME_MAP[hash_function]() for hash_function in hash_functions or []}
+    last_byte = None
+    carry = b""
+    while True:
+        read_block = fi.read(block_size)
+        block = carry + read_block
+        carry = b""
+        if read_block:
+            if regexp:
+                stripped_block = block.rstrip()
+                carry = block[len(stripped_block) :]
+                block = stripped_block
+            elif posix_lines and block.endswith(b"\r"):
+                carry = b"\r"
+                block = block[:-1]
+        if block:
+            if posix_lines:
                 if b"\r" in block:
                     block = block.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
                     converted_newlines = True
-                if regexp:
-                    split_block = regexp.split(block)
-                    if len(split_block) > 1:
-                        converted_regex = True
+            if regexp:
+                split_block = regexp.split(block)
+                if len(split_block) > 1:
+                    converted_regex = True
                     block = b"\t".join(split_block)
-                fp.write(block)
-                i += block.count(b"\n")
-                last_block = block
-                block = fi.read(block_size)
-        if last_block and last_block[-1] != NEWLINE_BYTE:
-            converted_newlines = True
-            i += 1
-            fp.write(b"\n")
+            if posix_lines:
+                line_count += block.count(b"\n")
+            else:
+                line_count += block.count(b"\n") or block.count(b"\r")
+            fp.write(block)
+            for hasher in hashers.values():
+                hasher.update(block)
+            last_byte = block[-1]
+        if not read_block:
+            break
+    if posix_lines and last_byte is not None and last_byte != NEWLINE_BYTE:
+        converted_newlines = True
+        line_count += 1
+        fp.write(b"\n")
+        for hasher in hashers.values():
+            hasher.update(b"\n")
+    hashes = {hash_function: hasher.hexdigest() for hash_function, hasher in hashers.items()} if hashers else None
+    return ConvertResult(line_count, None, converted_newlines, converted_regex, hashes)
+
+
+def _convert_file(
+    fname: str, in_place: bool, tmp_dir: Optional[str], tmp_prefix: Optional[str], **kwd
+) -> ConvertResult:
+    with tempfile.NamedTemporaryFile(mode="wb", prefix=tmp_prefix, dir=tmp_dir, delete=False) as fp, open(
+        fname, mode="rb"
+    ) as fi:
+        convert_result = convert_stream(fi, fp, **kwd)
     if in_place:
         shutil.move(fp.name, fname)
-        # Return number of lines in file.
-        return ConvertResult(i, None, converted_newlines, converted_regex)
+        return convert_result
     else:
-        return ConvertResult(i, fp.name, converted_newlines, converted_regex)
+        return convert_result._replace(converted_path=fp.name)
+
+
+def convert_newlines(
+    fname: str,
+    in_place: bool = True,
+    tmp_dir: Optional[str] = None,
+    tmp_prefix: Optional[str] = "gxupload",
+    block_size: int = 128 * 1024,
+    regexp=None,
+    hash_functions: Optional[List[HashFunctionNameEnum]] = None,
+) -> ConvertResult:
+    """
+    Converts in place a file from universal line endings
+    to Posix line endings.
+    """
+    return _convert_file(
+        fname, in_place, tmp_dir, tmp_prefix, regexp=regexp, block_size=block_size, hash_functions=hash_functions
+    )
 
 
 def convert_sep2tabs(
@@ -154,53 +235,50 @@ def convert_sep2tabs(
     tmp_dir: Optional[str] = None,
     tmp_prefix: Optional[str] = "gxupload",
     block_size: int = 128 * 1024,
-):
+    hash_functions: Optional[List[HashFunctionNameEnum]] = None,
+) -> ConvertResult:
     """
     Transforms in place a 'sep' separated file to a tab separated one
     """
-    patt: bytes = rb"[^\S\r\n]+"
-    regexp = re.compile(patt)
-    i = 0
-    converted_newlines = False
-    converted_regex = False
-    with tempfile.NamedTemporaryFile(mode="wb", prefix=tmp_prefix, dir=tmp_dir, delete=False) as fp, open(
-        fname, mode="rb"
-    ) as fi:
-        block = fi.read(block_size)
-        while block:
-            if block:
-                split_block = regexp.split(block)
-                if len(split_block) > 1:
-                    converted_regex = True
-                block = b"\t".join(split_block)
-                fp.write(block)
-                i += block.count(b"\n") or block.count(b"\r")
-                block = fi.read(block_size)
-    if in_place:
-        shutil.move(fp.name, fname)
-        # Return number of lines in file.
-        return ConvertResult(i, None, converted_newlines, converted_regex)
-    else:
-        return ConvertResult(i, fp.name, converted_newlines, converted_regex)
+    return _convert_file(
+        fname,
+        in_place,
+        tmp_dir,
+        tmp_prefix,
+        posix_lines=False,
+        regexp=SEP2TABS_REGEXP,
+        block_size=block_size,
+        hash_functions=hash_functions,
+    )
 
 
 def convert_newlines_sep2tabs(
-    fname: str, in_place: bool = True, tmp_dir: Optional[str] = None, tmp_prefix: Optional[str] = "gxupload"
+    fname: str,
+    in_place: bool = True,
+    tmp_dir: Optional[str] = None,
+    tmp_prefix: Optional[str] = "gxupload",
+    hash_functions: Optional[List[HashFunctionNameEnum]] = None,
 ) -> ConvertResult:
     """
     Converts newlines in a file to posix newlines and replaces spaces with tabs.
     """
-    patt: bytes = rb"[^\S\n]+"
-    regexp = re.compile(patt)
-    return convert_newlines(fname, in_place, tmp_dir, tmp_prefix, regexp=regexp)
+    return convert_newlines(
+        fname, in_place, tmp_dir, tmp_prefix, regexp=NEWLINES_SEP2TABS_REGEXP, hash_functions=hash_functions
+    )
 
 
 def iter_headers(fname_or_file_prefix, sep, count=60, comment_designator=None):
     idx = 0
     if isinstance(fname_or_file_prefix, FilePrefix):
-        file_iterator = fname_or_file_prefix.line_iterator()
-    else:
-        file_iterator = compression_utils.get_fileobj(fname_or_file_prefix)
+        for line, row in fname_or_file_prefix.rows(sep):
+            if comment_designator is not None and comment_designator != "" and line.startswith(comment_designator):
+                continue
+            yield list(row)
+            idx += 1
+            if idx == count:
+                break
+        return
+    file_iterator = compression_utils.get_fileobj(fname_or_file_prefix)
     for line in file_iterator:
         line = line.rstrip("\n\r")
         if comment_designator is not None and comment_designator != "" and line.startswith(comment_designator):
@@ -570,47 +648,85 @@ def guess_ext_from_file_name(fname, registry, requested_ext="auto"):
 
 
 class FilePrefix:
+    """The first ``SNIFF_PREFIX_BYTES`` of a (decompressed) file, shared by all sniffers.
+
+    Decoding the prefix, detecting its type with libmagic and splitting it into
+    lines and rows is only done when a sniffer first asks for it and the result
+    is kept, so running hundreds of sniffers on the same file does not repeat
+    the work.
+    """
+
     def __init__(self, filename, auto_decompress=True):
-        non_utf8_error = None
-        compressed_format = None
-        contents_header_bytes = None
-        contents_header = None  # First MAX_BYTES of the file.
-        truncated = False
-        # A future direction to optimize sniffing even more for sniffers at the top of the list
-        # is to lazy load contents_header based on what interface is requested. For instance instead
-        # of returning a StringIO directly in string_io() return an object that reads the contents and
-        # populates contents_header while providing a StringIO-like interface until the file is read
-        # but then would fallback to native string_io()
+        compressed_format, f = compression_utils.get_fileobj_raw(filename, "rb")
         try:
-            compressed_format, f = compression_utils.get_fileobj_raw(filename, "rb")
-            try:
-                contents_header_bytes = f.read(SNIFF_PREFIX_BYTES)
-                truncated = len(contents_header_bytes) == SNIFF_PREFIX_BYTES
-                contents_header = contents_header_bytes.decode("utf-8")
-            finally:
-                f.close()
-        except UnicodeDecodeError as e:
-            non_utf8_error = e
+            contents_header_bytes = f.read(SNIFF_PREFIX_BYTES)
+            truncated = len(contents_header_bytes) == SNIFF_PREFIX_BYTES
+        finally:
+            f.close()
 
         self.auto_decompress = auto_decompress
         self.truncated = truncated
         self.filename = filename
-        self.non_utf8_error = non_utf8_error
-        file_magic = magic.detect_from_content(contents_header_bytes)
-        self.encoding = file_magic.encoding
-        self.mime_type = file_magic.mime_type
-        self.compressed_mime_type = None
-        self.compressed_encoding = None
-        if compressed_format:
-            compressed_magic = magic.detect_from_filename(filename)
-            self.compressed_mime_type = compressed_magic.mime_type
-            self.compressed_encoding = compressed_magic.encoding
         self.compressed_format = compressed_format
-        self.contents_header = contents_header
         self.contents_header_bytes = contents_header_bytes
+        self._decoded = False
+        self._contents_header: Optional[str] = None  # First MAX_BYTES of the file.
+        self._non_utf8_error: Optional[UnicodeDecodeError] = None
+        self._magic: Optional[Tuple[str, str]] = None
+        self._compressed_magic: Optional[Tuple[Optional[str], Optional[str]]] = None
+        self._lines: Optional[List[str]] = None
+        self._rows: Dict[Optional[str], List[Tuple[str, Tuple[str, ...]]]] = {}
         self._is_binary = None
+        self._is_tar = None
         self._file_size = None
 
+    def _decode(self) -> None:
+        if not self._decoded:
+            try:
+                self._contents_header = self.contents_header_bytes.decode("utf-8")
+            except UnicodeDecodeError as e:
+                self._non_utf8_error = e
+            self._decoded = True
+
+    @property
+    def contents_header(self) -> Optional[str]:
+        self._decode()
+        return self._contents_header
+
+    @property
+    def non_utf8_error(self) -> Optional[UnicodeDecodeError]:
+        self._decode()
+        return self._non_utf8_error
+
+    def _get_magic(self) -> Tuple[str, str]:
+        if self._magic is None:
+            self._magic = _detect_mime(MIME_MAGIC.from_buffer(self.contents_header_bytes))
+        return self._magic
+
+    def _get_compressed_magic(self) -> Tuple[Optional[str], Optional[str]]:
+        if self._compressed_magic is None:
+            if self.compressed_format:
+                self._compressed_magic = _detect_mime(MIME_MAGIC.from_file(self.filename))
+            else:
+                self._compressed_magic = (None, None)
+        return self._compressed_magic
+
+    @property
+    def mime_type(self) -> str:
+        return self._get_magic()[0]
+
+    @property
+    def encoding(self) -> str:
+        return self._get_magic()[1]
+
+    @property
+    def compressed_mime_type(self) -> Optional[str]:
+        return self._get_compressed_magic()[0]
+
+    @property
+    def compressed_encoding(self) -> Optional[str]:
+        return self._get_compressed_magic()[1]
+
     @property
     def binary(self):
         if self._is_binary is None:
@@ -629,33 +745,64 @@ class FilePrefix:
                 self._is_binary = True
         return self._is_binary
 
+    @property
+    def tar(self) -> bool:
+        """Whether the (possibly compressed) file is a tar archive."""
+        if self._is_tar is None:
+            try:
+                self._is_tar = tarfile.is_tarfile(self.filename)
+            except Exception:
+                self._is_tar = False
+        return self._is_tar
+
     @property
     def file_size(self):
         if self._file_size is None:
             self._file_size = os.path.getsize(self.filename)
         return self._file_size
 
-    def string_io(self) -> io.StringIO:
-        if self.non_utf8_error is not None:
+    def _text(self) -> str:
+        contents_header = self.contents_header
+        if contents_header is None:
+            assert self.non_utf8_error
             raise self.non_utf8_error
-        rval = io.StringIO(self.contents_header)
-        return rval
+        return contents_header
+
+    def string_io(self) -> io.StringIO:
+        return io.StringIO(self._text())
 
     def text_io(self, *args, **kwargs) -> io.TextIOWrapper:
         return io.TextIOWrapper(io.BytesIO(self.contents_header_bytes), *args, **kwargs)
 
     def startswith(self, prefix):
-        return self.string_io().read(len(prefix)) == prefix
-
-    def line_iterator(self):
-        s = self.string_io()
-        s_len = len(s.getvalue())
-        for line in iter(s.readline, ""):
-            if line.endswith("\n") or line.endswith("\r"):
-                yield line
-            elif s.tell() == s_len and not self.truncated:
+        return self._text().startswith(prefix)
+
+    def _get_lines(self) -> List[str]:
+        if self._lines is None:
+            # Split like string_io().readline() would
+            lines = self._text().split("\n")
+            last_line = lines.pop()
+            self._lines = [f"{line}\n" for line in lines]
+            if last_line and (last_line.endswith("\r") or not self.truncated):
                 # At the end, return the last line if it wasn't truncated when reading it in.
-                yield line
+                self._lines.append(last_line)
+        return self._lines
+
+    def line_iterator(self) -> Iterator[str]:
+        yield from self._get_lines()
+
+    def rows(self, sep: Optional[str] = None) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        """Iterate over lines without line endings and the lines split by ``sep``.
+
+        Rows are split only once, ``sep=None`` splits on whitespace.
+        """
+        lines = self._get_lines()
+        rows = self._rows.setdefault(sep, [])
+        for i, line in enumerate(lines):
+            if i == len(rows):
+                line = line.rstrip("\n\r")
+                rows.append((line, tuple(line.split(sep))))
+            yield rows[i]
 
     # Convenience wrappers around contents_header, shielding contents_header means we can
     # potentially do a better job lazy loading this data later on.
@@ -685,11 +832,77 @@ def _get_file_prefix(filename_or_file_prefix: Union[str, FilePrefix], auto_decom
     return filename_or_file_prefix
 
 
+def _sniffer_applies(datatype, compressed_format: Optional[str], binary: bool) -> bool:
+    """Whether ``datatype`` can match a file with this compression format and binary-ness at all."""
+    datatype_compressed = getattr(datatype, "compressed", False)
+    if datatype_compressed and not compressed_format and not datatype.file_ext.endswith(".tar"):
+        # we don't auto-detect tar as compressed
+        return False
+    if not datatype_compressed and compressed_format:
+        return False
+    if binary != datatype.is_binary and not datatype.is_binary == "maybe":
+        # Binary detection doesn't match datatype ...
+        compressed_data_for_compressed_text_datatype = (
+            binary and compressed_format and datatype_compressed and not datatype.is_binary
+        )
+        if not compressed_data_for_compressed_text_datatype:
+            # ... and mismatch is not due to compressed text data for a compressed text datatype
+            return False
+    if hasattr(datatype, "sniff_prefix") and compressed_format and getattr(datatype, "compressed_format", None):
+        # Compare the compressed format detected
+        # to the expected.
+        if compressed_format != datatype.compressed_format:
+            return False
+    return True
+
+
+class SnifferIndex:
+    """Precomputed dispatch of the datatypes of a sniff order to the files they can match.
+
+    Whether a datatype's sniffer can match a file at all only depends on the
+    file's compression format and on whether it is binary, so the candidate
+    sniffers for each such combination are computed once, in sniff order.
+    Sniffers of datatypes setting ``sniff_requires_tar`` only run for tar
+    archives, which is checked once per file instead of once per sniffer.
+    Sniffing with the index gives the same results as sniffing with the
+    complete sniff order, iterating over the index yields the sniff order.
+    """
+
+    def __init__(self, sniff_order: Iterable):
+        self.sniff_order = list(sniff_order)
+        self._candidates: Dict[Tuple[Optional[str], bool], List] = {}
+
+    def __iter__(self) -> Iterator:
+        return iter(self.sniff_order)
+
+    def __len__(self) -> int:
+        return len(self.sniff_order)
+
+    def candidates(self, file_prefix: "FilePrefix") -> List:
+        key = (file_prefix.compressed_format, file_prefix.binary)
+        candidates = self._candidates.get(key)
+        if candidates is None:
+            candidates = [datatype for datatype in self.sniff_order if _sniffer_applies(datatype, *key)]
+            self._candidates[key] = candidates
+        return candidates
+
+
 def run_sniffers_raw(file_prefix: FilePrefix, sniff_order):
-    """Run through sniffers specified by sniff_order, return None of None match."""
+    """Run through sniffers specified by sniff_order, return None of None match.
+
+    ``sniff_order`` may be a :class:`SnifferIndex` to only run the sniffers that can match the file.
+    """
     fname = file_prefix.filename
     file_ext = None
-    for datatype in sniff_order:
+    if isinstance(sniff_order, SnifferIndex):
+        candidates = sniff_order.candidates(file_prefix)
+    else:
+        candidates = (
+            datatype
+            for datatype in sniff_order
+            if _sniffer_applies(datatype, file_prefix.compressed_format, file_prefix.binary)
+        )
+    for datatype in candidates:
         """
         Some classes may not have a sniff function, which is ok.  In fact,
         Binary, Data, Tabular and Text are examples of classes that should never
@@ -698,27 +911,10 @@ def run_sniffers_raw(file_prefix: FilePrefix, sniff_order):
         from this function after all other datatypes in sniff_order have not been
         successfully discovered.
         """
-        datatype_compressed = getattr(datatype, "compressed", False)
-        if datatype_compressed and not file_prefix.compressed_format and not datatype.file_ext.endswith(".tar"):
-            # we don't auto-detect tar as compressed
-            continue
-        if not datatype_compressed and file_prefix.compressed_format:
+        if getattr(datatype, "sniff_requires_tar", False) and not file_prefix.tar:
             continue
-        if file_prefix.binary != datatype.is_binary and not datatype.is_binary == "maybe":
-            # Binary detection doesn't match datatype ...
-            compressed_data_for_compressed_text_datatype = (
-                file_prefix.binary and file_prefix.compressed_format and datatype_compressed and not datatype.is_binary
-            )
-            if not compressed_data_for_compressed_text_datatype:
-                # ... and mismatch is not due to compressed text data for a compressed text datatype
-                continue
         try:
             if hasattr(datatype, "sniff_prefix"):
-                if file_prefix.compressed_format and getattr(datatype, "compressed_format", None):
-                    # Compare the compressed format detected
-                    # to the expected.
-                    if file_prefix.compressed_format != datatype.compressed_format:
-                        continue
                 if datatype.sniff_prefix(file_prefix):
                     file_ext = datatype.file_ext
                     break
@@ -774,6 +970,8 @@ class HandleCompressedFileResponse(NamedTuple):
     uncompressed_path: str
     compressed_type: Optional[str]
     is_compressed: Optional[bool]
+    # Set if line endings and/or spaces were converted while uncompressing
+    convert_result: Optional[ConvertResult] = None
 
 
 def handle_compressed_file(
@@ -784,6 +982,8 @@ def handle_compressed_file(
     tmp_dir: Optional[str] = None,
     in_place: bool = False,
     check_content: bool = True,
+    convert_to_posix_lines: Optional[bool] = None,
+    convert_spaces_to_tabs: Optional[bool] = None,
 ) -> HandleCompressedFileResponse:
     """
     Check uploaded files for compression, check compressed file contents, and uncompress if necessary.
@@ -799,12 +999,16 @@ def handle_compressed_file(
     ``is_valid`` as returned will only be set if the file is compressed and contains invalid contents (or the first file
     in the case of a zip file), this is so lengthy decompression can be bypassed if there is invalid content in the
     first 32KB. Otherwise the caller should be checking content.
+
+    If ``convert_to_posix_lines`` or ``convert_spaces_to_tabs`` is set, uncompressed text content is converted
+    while it is written and ``convert_result`` is set, so the uncompressed file need not be converted again.
     """
     CHUNK_SIZE = 2**20  # 1Mb
     is_compressed = False
     compressed_type = None
     keep_compressed = False
     is_valid = False
+    convert_result = None
     filename = file_prefix.filename
     uncompressed_path = filename
     tmp_dir = tmp_dir or os.path.dirname(filename)
@@ -828,12 +1032,19 @@ def handle_compressed_file(
         assert compressed_type  # Tell type checker is_compressed will only be true if compressed_type is also set.
         with tempfile.NamedTemporaryFile(prefix=tmp_prefix, dir=tmp_dir, delete=False) as uncompressed:
             with DECOMPRESSION_FUNCTIONS[compressed_type](filename) as compressed_file:
-                # TODO: it'd be ideal to convert to posix newlines and space-to-tab here as well
                 try:
-                    for chunk in file_reader(compressed_file, CHUNK_SIZE):
-                        if not chunk:
-                            break
-                        uncompressed.write(chunk)
+                    if (convert_to_posix_lines or convert_spaces_to_tabs) and not file_prefix.binary:
+                        convert_result = convert_stream(
+                            compressed_file,
+                            uncompressed,
+                            block_size=CHUNK_SIZE,
+                            **_convert_stream_options(convert_to_posix_lines, convert_spaces_to_tabs),
+                        )
+                    else:
+                        for chunk in file_reader(compressed_file, CHUNK_SIZE):
+                            if not chunk:
+                                break
+                            uncompressed.write(chunk)
                 except OSError as e:
                     os.remove(uncompressed.name)
                     raise OSError(
@@ -848,7 +1059,9 @@ def handle_compressed_file(
             uncompressed_path = filename
     elif not is_compressed or not check_content:
         is_valid = True
-    return HandleCompressedFileResponse(is_valid, ext, uncompressed_path, compressed_type, is_compressed)
+    return HandleCompressedFileResponse(
+        is_valid, ext, uncompressed_path, compressed_type, is_compressed, convert_result
+    )
 
 
 def handle_uploaded_dataset_file(filename, *args, **kwds) -> str:
@@ -865,6 +1078,17 @@ class HandleUploadedDatasetFileInternalResponse(NamedTuple):
     converted_spaces: bool
 
 
+def _convert_stream_options(convert_to_posix_lines, convert_spaces_to_tabs) -> Dict:
+    """Keyword arguments for ``convert_stream`` matching the ``convert_function`` for these options."""
+    assert convert_to_posix_lines or convert_spaces_to_tabs
+    if convert_spaces_to_tabs and convert_to_posix_lines:
+        return {"regexp": NEWLINES_SEP2TABS_REGEXP}
+    elif convert_to_posix_lines:
+        return {}
+    else:
+        return {"posix_lines": False, "regexp": SEP2TABS_REGEXP}
+
+
 def convert_function(convert_to_posix_lines, convert_spaces_to_tabs) -> ConvertFunction:
     assert convert_to_posix_lines or convert_spaces_to_tabs
     if convert_spaces_to_tabs and convert_to_posix_lines:
@@ -889,7 +1113,7 @@ def handle_uploaded_dataset_file_internal(
     convert_to_posix_lines: Optional[bool] = None,
     convert_spaces_to_tabs: Optional[bool] = None,
 ) -> HandleUploadedDatasetFileInternalResponse:
-    is_valid, ext, converted_path, compressed_type, is_compressed = handle_compressed_file(
+    is_valid, ext, converted_path, compressed_type, is_compressed, convert_result = handle_compressed_file(
         file_prefix,
         datatypes_registry,
         ext=ext,
@@ -897,6 +1121,8 @@ def handle_uploaded_dataset_file_internal(
         tmp_dir=tmp_dir,
         in_place=in_place,
         check_content=check_content,
+        convert_to_posix_lines=convert_to_posix_lines,
+        convert_spaces_to_tabs=convert_spaces_to_tabs,
     )
     converted_newlines = False
     converted_spaces = False
@@ -907,30 +1133,32 @@ def handle_uploaded_dataset_file_internal(
             raise InappropriateDatasetContentError("The uploaded compressed file contains invalid content")
 
         is_binary = file_prefix.binary
-        guessed_ext = ext
-        if ext in AUTO_DETECT_EXTENSIONS:
-            # TODO: skip this if we haven't actually converted the dataset
-            guessed_ext = guess_ext(
-                converted_path,
-                sniff_order=datatypes_registry.sniff_order,
-                auto_decompress=file_prefix.auto_decompress,
-            )
-
-        if not is_binary and not is_compressed and (convert_to_posix_lines or convert_spaces_to_tabs):
+        if convert_result is not None:
+            # Already converted while uncompressing
+            converted_newlines, converted_spaces = convert_result.converted_newlines, convert_result.converted_regex
+        if (
+            convert_result is None
+            and not is_binary
+            and not is_compressed
+            and (convert_to_posix_lines or convert_spaces_to_tabs)
+        ):
             # Convert universal line endings to Posix line endings, spaces to tabs (if desired)
             convert_fxn = convert_function(convert_to_posix_lines, convert_spaces_to_tabs)
-            line_count, _converted_path, converted_newlines, converted_spaces = convert_fxn(
-                converted_path, in_place=in_place, tmp_dir=tmp_dir, tmp_prefix=tmp_prefix
-            )
+            convert_result = convert_fxn(converted_path, in_place=in_place, tmp_dir=tmp_dir, tmp_prefix=tmp_prefix)
+            converted_newlines, converted_spaces = convert_result.converted_newlines, convert_result.converted_regex
             if not in_place:
                 if converted_path and file_prefix.filename != converted_path:
                     os.unlink(converted_path)
-                assert _converted_path
-                converted_path = _converted_path
+                assert convert_result.converted_path
+                converted_path = convert_result.converted_path
             if ext in AUTO_DETECT_EXTENSIONS:
-                ext = guess_ext(converted_path, sniff_order=datatypes_registry.sniff_order)
-        else:
-            ext = guessed_ext
+                ext = guess_ext(converted_path, sniff_order=datatypes_registry.sniffer_index)
+        elif ext in AUTO_DETECT_EXTENSIONS:
+            ext = guess_ext(
+                converted_path,
+                sniff_order=datatypes_registry.sniffer_index,
+                auto_decompress=file_prefix.auto_decompress,
+            )
 
         if not is_binary and check_content and check_html(converted_path):
             raise InappropriateDatasetContentError("The uploaded file contains invalid HTML content")
@@ -14,6 +14,7 @@ from typing import (
     Union,
 )
 
+from sqlalchemy import insert
 from sqlalchemy.orm.scoping import ScopedSession
 
 from galaxy.model import (
@@ -94,6 +95,10 @@ class PermissionProvider(AbstractPermissionProvider):
         if (permissions := self.permissions) is not UNSET:
             self._security_agent.set_all_dataset_permissions(primary_data.dataset, permissions, new=True, flush=False)
 
+    def set_new_hdas_default_permissions(self, datasets):
+        if (permissions := self.permissions) is not UNSET:
+            self._security_agent.set_new_datasets_permissions([hda.dataset for hda in datasets], permissions)
+
     def copy_dataset_permissions(self, init_from, primary_data):
         self._security_agent.copy_dataset_permissions(init_from.dataset, primary_data.dataset, flush=False)
 
@@ -229,6 +234,7 @@ class JobContext(BaseJobContext):
         final_job_state,
         max_discovered_files: Optional[int],
         flush_per_n_datasets=None,
+        bulk_insert=False,
     ):
         self.tool = tool
         self._metadata_source_provider = metadata_source_provider
@@ -242,6 +248,7 @@ class JobContext(BaseJobContext):
         self._object_store = object_store
         self.final_job_state = final_job_state
         self._flush_per_n_datasets = flush_per_n_datasets
+        self._bulk_insert = bulk_insert
         self.max_discovered_files = float("inf") if max_discovered_files is None else max_discovered_files
         self.discovered_file_count = 0
         self._tag_handler = None
@@ -286,6 +293,10 @@ class JobContext(BaseJobContext):
     def input_dbkey(self) -> str:
         return self._input_dbkey
 
+    @property
+    def bulk_insert(self) -> bool:
+        return self._bulk_insert
+
     @property
     def object_store(self) -> ObjectStore:
         return self._object_store
@@ -335,6 +346,18 @@ class JobContext(BaseJobContext):
         assoc.job = self.job
         self.sa_session.add(assoc)
 
+    def add_output_dataset_associations(self, associations):
+        if not self.bulk_insert:
+            return super().add_output_dataset_associations(associations)
+        if not associations:
+            return
+        job_id = self.job.id
+        self.sa_session.execute(
+            insert(JobToOutputDatasetAssociation.table),
+            [{"job_id": job_id, "dataset_id": dataset.id, "name": name} for name, dataset in associations],
+        )
+        self.sa_session.expire(self.job, ["output_datasets"])
+
     def add_library_dataset_to_folder(self, library_folder, ld):
         trans = self.work_context
         ldda = ld.library_dataset_dataset_association
@@ -56,6 +56,10 @@ from galaxy.jobs.mapper import (
     JobMappingException,
     JobRunnerMapper,
 )
+from galaxy.jobs.readiness import (
+    READY_CHECK_METHODS,
+    READY_CHECK_QUERY,
+)
 from galaxy.jobs.runners import (
     BaseJobRunner,
     JobState,
@@ -334,6 +338,7 @@ class JobConfiguration(ConfiguresHandlers):
         self.handler_assignment_methods_configured = False
         self.handler_max_grab = None
         self.handler_ready_window_size = None
+        self.handler_ready_check = READY_CHECK_QUERY
         self.destinations = {}
         self.default_destination_id = None
         self.tools = {}
@@ -446,6 +451,12 @@ class JobConfiguration(ConfiguresHandlers):
         self.handler_ready_window_size = int(
             handling_config_dict.get("ready_window_size", JobConfiguration.DEFAULT_HANDLER_READY_WINDOW_SIZE)
         )
+        self.handler_ready_check = handling_config_dict.get("ready_check", READY_CHECK_QUERY).lower()
+        assert (
+            self.handler_ready_check in READY_CHECK_METHODS
+        ), "Invalid job handler ready check '{}', must be one of: {}".format(
+            self.handler_ready_check, ", ".join(READY_CHECK_METHODS)
+        )
 
         # Parse environments
         job_metrics = self.app.job_metrics
@@ -1454,6 +1465,7 @@ class MinimalJobWrapper(HasResourceParameters):
             job.set_final_state(
                 job.states.ERROR, supports_skip_locked=self.app.application_stack.supports_skip_locked()
             )
+            self.app.job_manager.notify_dependent_jobs(job)
             job.command_line = self.command_line
             job.info = message
             # TODO: Put setting the stdout, stderr, and exit code in one place
@@ -2060,6 +2072,8 @@ class MinimalJobWrapper(HasResourceParameters):
         if not job.tasks:
             # If job was composed of tasks, don't attempt to recollect statistics
             self._collect_metrics(job, job_metrics_directory)
+        # Let handlers dispatch (or fail) jobs waiting on these outputs right away (if a wakeup transport is configured)
+        self.app.job_manager.notify_dependent_jobs(job)
         with transaction(self.sa_session):
             self.sa_session.commit()
         if job.state == job.states.ERROR:
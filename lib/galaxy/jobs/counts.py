@@ -0,0 +1,153 @@
+"""
+Incrementally maintained active job counts for enforcing job concurrency limits.
+
+Checking user and destination concurrency limits needs the number of ``queued``,
+``running`` and ``resubmitted`` jobs per user and destination. Instead of
+counting over the whole job table on every handler iteration (or, without
+``cache_user_job_count``, once per waiting job), :class:`JobCounts` keeps the
+counts in memory and only applies the changes since the last iteration.
+
+Every call to :meth:`galaxy.model.Job.set_state` appends a row to the
+``job_state_history`` table, by any Galaxy process. Reading the rows added since
+the last iteration gives the jobs that changed, whose current state and
+destination are then read from the job table, so applying a change is
+idempotent. Because ids are allocated before a transaction commits, the last
+``HISTORY_LOOKBACK`` rows are read again on each iteration to pick up
+transactions that committed out of order. Changes that bypass ``set_state``
+are picked up by the periodic full reconciliation
+(``job_counts_reconcile_interval``).
+"""
+
+import logging
+import time
+from typing import (
+    Dict,
+    Optional,
+    Tuple,
+)
+
+from sqlalchemy import (
+    func,
+    select,
+)
+
+from galaxy import model
+
+log = logging.getLogger(__name__)
+
+# States counted against the overall per-user limit
+ACTIVE_STATES = (model.Job.states.QUEUED, model.Job.states.RUNNING, model.Job.states.RESUBMITTED)
+# States counted against the per-destination limits
+DISPATCHED_STATES = (model.Job.states.QUEUED, model.Job.states.RUNNING)
+# Number of already seen job state history rows that are read again on each update
+HISTORY_LOOKBACK = 500
+
+# user id, destination id, state
+JobCountKey = Tuple[Optional[int], Optional[str], str]
+
+
+class JobCounts:
+    """Active job counts per user, per user and destination and per destination.
+
+    Only used from the job handler queue's monitor thread.
+    """
+
+    def __init__(self, reconcile_interval: float):
+        self.reconcile_interval = reconcile_interval
+        # job id -> (user id, destination id, state) of every active job
+        self._jobs: Dict[int, JobCountKey] = {}
+        self.user_job_count: Dict[int, int] = {}
+        self.user_job_count_per_destination: Dict[int, Dict[str, int]] = {}
+        self.total_job_count_per_destination: Dict[str, int] = {}
+        self._last_history_id: Optional[int] = None
+        self._last_reconcile = 0.0
+
+    def update(self, sa_session) -> None:
+        """Bring the counts up to date, reconciling with the job table if due."""
+        if self._last_history_id is None or time.monotonic() - self._last_reconcile >= self.reconcile_interval:
+            self.reconcile(sa_session)
+        else:
+            self._apply_history(sa_session)
+
+    def reset(self) -> None:
+        """Drop the counts, the next update recomputes them from the job table."""
+        self._jobs = {}
+        self.user_job_count = {}
+        self.user_job_count_per_destination = {}
+        self.total_job_count_per_destination = {}
+        self._last_history_id = None
+
+    def reconcile(self, sa_session) -> None:
+        """Recompute all counts from the job table."""
+        history_table = model.JobStateHistory.table
+        job_table = model.Job.table
+        # Read the history watermark first, changes committed in between are applied again on the next update
+        last_history_id = sa_session.scalar(select(func.max(history_table.c.id))) or 0
+        rows = sa_session.execute(
+            select(job_table.c.id, job_table.c.user_id, job_table.c.destination_id, job_table.c.state).where(
+                job_table.c.state.in_(ACTIVE_STATES)
+            )
+        )
+        self._jobs = {}
+        self.user_job_count = {}
+        self.user_job_count_per_destination = {}
+        self.total_job_count_per_destination = {}
+        for job_id, user_id, destination_id, state in rows:
+            self._set(job_id, user_id, destination_id, state)
+        self._last_history_id = last_history_id
+        self._last_reconcile = time.monotonic()
+        log.debug("Reconciled active job counts, %d active jobs", len(self._jobs))
+
+    def _apply_history(self, sa_session) -> None:
+        history_table = model.JobStateHistory.table
+        job_table = model.Job.table
+        assert self._last_history_id is not None
+        rows = sa_session.execute(
+            select(
+                history_table.c.id,
+                job_table.c.id,
+                job_table.c.user_id,
+                job_table.c.destination_id,
+                job_table.c.state,
+            )
+            .join(job_table, history_table.c.job_id == job_table.c.id)
+            .where(history_table.c.id > self._last_history_id - HISTORY_LOOKBACK)
+        )
+        for history_id, job_id, user_id, destination_id, state in rows:
+            self._set(job_id, user_id, destination_id, state)
+            self._last_history_id = max(self._last_history_id, history_id)
+
+    def _set(self, job_id: int, user_id: Optional[int], destination_id: Optional[str], state: str) -> None:
+        old = self._jobs.pop(job_id, None)
+        if old is not None:
+            self._count(*old, delta=-1)
+        if state in ACTIVE_STATES:
+            self._jobs[job_id] = (user_id, destination_id, state)
+            self._count(user_id, destination_id, state, delta=1)
+
+    def _count(self, user_id: Optional[int], destination_id: Optional[str], state: str, delta: int) -> None:
+        if user_id is not None:
+            _add(self.user_job_count, user_id, delta)
+        if state in DISPATCHED_STATES:
+            if user_id is not None:
+                per_destination = self.user_job_count_per_destination.setdefault(user_id, {})
+                _add(per_destination, destination_id, delta)
+                if not per_destination:
+                    del self.user_job_count_per_destination[user_id]
+            _add(self.total_job_count_per_destination, destination_id, delta)
+
+    def snapshot(self):
+        """Return copies of the counts that the caller may increase for jobs it dispatches."""
+        return (
+            dict(self.user_job_count),
+            {user_id: dict(counts) for user_id, counts in self.user_job_count_per_destination.items()},
+            dict(self.total_job_count_per_destination),
+        )
+
+
+def _add(counts: Dict, key, delta: int) -> None:
+    count = counts.get(key, 0) + delta
+    if count:
+        counts[key] = count
+    else:
+        counts.pop(key, None)
@@ -13,6 +13,7 @@ from queue import (
 from typing import (
     Dict,
     List,
+    Optional,
     Tuple,
     Type,
     Union,
@@ -36,7 +37,18 @@ from galaxy.jobs import (
     JobWrapper,
     TaskWrapper,
 )
+from galaxy.jobs.counts import JobCounts
 from galaxy.jobs.mapper import JobNotReadyException
+from galaxy.jobs.readiness import (
+    count_active_jobs_for_users,
+    ID_CHUNK_SIZE,
+    JobReadinessIndex,
+    READY_CHECK_BULK,
+)
+from galaxy.jobs.wakeup import (
+    WAKE_JOBS,
+    WAKE_STOP,
+)
 from galaxy.managers.jobs import get_jobs_to_check_at_startup
 from galaxy.model.base import (
     check_database_connection,
@@ -82,6 +94,9 @@ class JobHandlerI:
     def shutdown(self):
         pass
 
+    def wake(self, handler=None, queue=WAKE_JOBS):
+        pass
+
 
 class JobHandler(JobHandlerI):
     """
@@ -105,6 +120,16 @@ class JobHandler(JobHandlerI):
         self.job_queue.shutdown()
         self.job_stop_queue.shutdown()
 
+    def wake(self, handler=None, queue=WAKE_JOBS):
+        """Run the next monitor step of the job or stop queue now, if this handler is responsible for ``handler``."""
+        if handler is not None and handler != self.app.config.server_name:
+            if handler not in (getattr(self.app.job_config, "self_handler_tags", None) or ()):
+                return
+        if queue == WAKE_STOP:
+            self.job_stop_queue.sleeper.wake()
+        else:
+            self.job_queue.sleeper.wake()
+
 
 class ItemGrabber:
     grab_model: Union[Type[model.Job], Type[model.WorkflowInvocation]]
@@ -237,6 +262,11 @@ class BaseJobHandlerQueue(Monitors):
         self.parent_pid = os.getpid()
         # This queue is not used if track_jobs_in_database is True.
         self.queue: Queue[Tuple[int, str]] = Queue()
+        # With a wakeup transport configured, polling only acts as a safety net for missed wakeups
+        if self.app.config.job_handler_wakeup:
+            self.monitor_sleep = self.app.config.job_handler_wakeup_monitor_sleep
+        else:
+            self.monitor_sleep = None
 
 
 class JobHandlerQueue(BaseJobHandlerQueue):
@@ -250,11 +280,18 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         # self.queue contains tuples: (job_id, tool_id)
 
         # Initialize structures for handling job limits
+        self.job_counts: Optional[JobCounts] = None
+        if app.config.incremental_job_counts:
+            self.job_counts = JobCounts(app.config.job_counts_reconcile_interval)
         self.__clear_job_count()
         # Contains job ids for jobs that are waiting (only use from monitor thread)
         self.waiting_jobs: List[int] = []
         # Contains wrappers of jobs that are limited or ready (so they aren't created unnecessarily/multiple times)
         self.job_wrappers: Dict[int, JobWrapper] = {}
+        # Tracks the inputs new jobs are waiting on when using the bulk ready check (only use from monitor thread)
+        self.readiness_index = None
+        if self.track_jobs_in_database and self.app.job_config.handler_ready_check == READY_CHECK_BULK:
+            self.readiness_index = JobReadinessIndex()
         name = "JobHandlerQueue.monitor_thread"
         self._init_monitor_thread(name, target=self.__monitor, config=app.config)
         self.job_grabber = None
@@ -379,7 +416,7 @@ class JobHandlerQueue(BaseJobHandlerQueue):
                 # With sqlite backends we can run into locked databases occasionally
                 # To avoid that the monitor step locks again we backoff a little longer.
                 self._monitor_sleep(5)
-            self._monitor_sleep(self.app.config.job_handler_monitor_sleep)
+            self._monitor_sleep(self.monitor_sleep or self.app.config.job_handler_monitor_sleep)
 
     def __monitor_step(self):
         """
@@ -412,68 +449,10 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         if self.track_jobs_in_database:
             # Clear the session so we get fresh states for job and all datasets
             self.sa_session.expunge_all()
-            # Fetch all new jobs
-            hda_not_ready = (
-                self.sa_session.query(model.Job.id)
-                .enable_eagerloads(False)
-                .join(model.JobToInputDatasetAssociation)
-                .join(model.HistoryDatasetAssociation)
-                .join(model.Dataset)
-                .filter(
-                    and_(
-                        model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states)
-                    )
-                )
-                .subquery()
-            )
-            ldda_not_ready = (
-                self.sa_session.query(model.Job.id)
-                .enable_eagerloads(False)
-                .join(model.JobToInputLibraryDatasetAssociation)
-                .join(model.LibraryDatasetDatasetAssociation)
-                .join(model.Dataset)
-                .filter(
-                    and_(
-                        model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states)
-                    )
-                )
-                .subquery()
-            )
-            coalesce_exp = func.coalesce(
-                model.Job.table.c.user_id, model.Job.table.c.session_id
-            )  # accommodate jobs by anonymous users
-            rank = func.rank().over(partition_by=coalesce_exp, order_by=model.Job.table.c.id).label("rank")
-            job_filter_conditions = (
-                (model.Job.state == model.Job.states.NEW),
-                (model.Job.handler == self.app.config.server_name),
-                ~model.Job.table.c.id.in_(select(hda_not_ready)),
-                ~model.Job.table.c.id.in_(select(ldda_not_ready)),
-            )
-            if self.app.config.user_activation_on:
-                job_filter_conditions = job_filter_conditions + (
-                    or_((model.Job.user_id == null()), (model.User.active == true())),
-                )
-            if self.sa_session.bind.name == "sqlite":
-                query_objects = (model.Job,)
+            if self.readiness_index is not None:
+                jobs_to_check = self.__get_ready_jobs_from_index()
             else:
-                query_objects = (model.Job, rank)
-            ready_query = (
-                self.sa_session.query(*query_objects)
-                .enable_eagerloads(False)
-                .outerjoin(model.User)
-                .filter(and_(*job_filter_conditions))
-                .order_by(model.Job.id)
-            )
-            if self.sa_session.bind.name == "sqlite":
-                jobs_to_check = ready_query.all()
-            else:
-                ranked = ready_query.subquery()
-                jobs_to_check = (
-                    self.sa_session.query(model.Job)
-                    .join(ranked, model.Job.id == ranked.c.id)
-                    .filter(ranked.c.rank <= self.app.job_config.handler_ready_window_size)
-                    .all()
-                )
+                jobs_to_check = self.__get_ready_jobs_from_query()
             # Filter jobs with invalid input states
             jobs_to_check = self.__filter_jobs_with_invalid_input_states(jobs_to_check)
             # Fetch all "resubmit" jobs
@@ -507,6 +486,14 @@ class JobHandlerQueue(BaseJobHandlerQueue):
                 pass
         # Ensure that we get new job counts on each iteration
         self.__clear_job_count()
+        if self.job_counts is not None:
+            if self.__has_concurrency_limits():
+                self.__update_job_counts()
+            else:
+                # Nothing to enforce, reconcile with the job table once limits are configured again
+                self.job_counts.reset()
+        elif self.readiness_index is not None:
+            self.__prime_job_counts(jobs_to_check + resubmit_jobs)
         # Check resubmit jobs first so that limits of new jobs will still be enforced
         for job in resubmit_jobs:
             log.debug("(%s) Job was resubmitted and is being dispatched immediately", job.id)
@@ -518,6 +505,8 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         # Iterate over new and waiting jobs and look for any that are
         # ready to run
         new_waiting_jobs = []
+        # With the bulk ready check, ready jobs are dispatched together once all jobs have been checked
+        ready_job_wrappers = []
         for job in jobs_to_check:
             try:
                 # Check the job's dependencies, requeue if they're not done.
@@ -547,8 +536,11 @@ class JobHandlerQueue(BaseJobHandlerQueue):
                 elif job_state == JOB_INPUT_DELETED:
                     log.info("(%d) Job unable to run: one or more inputs deleted" % job.id)
                 elif job_state == JOB_READY:
-                    self.dispatcher.put(self.job_wrappers.pop(job.id))
-                    log.info("(%d) Job dispatched" % job.id)
+                    if self.readiness_index is not None:
+                        ready_job_wrappers.append(self.job_wrappers.pop(job.id))
+                    else:
+                        self.dispatcher.put(self.job_wrappers.pop(job.id))
+                        log.info("(%d) Job dispatched" % job.id)
                 elif job_state == JOB_DELETED:
                     log.info("(%d) Job deleted by user while still queued" % job.id)
                 elif job_state == JOB_ADMIN_DELETED:
@@ -584,6 +576,92 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         # Commit updated state
         with transaction(self.sa_session):
             self.sa_session.commit()
+        for job_wrapper in ready_job_wrappers:
+            try:
+                self.dispatcher.put(job_wrapper)
+                log.info("(%d) Job dispatched" % job_wrapper.job_id)
+            except Exception:
+                log.exception("failure dispatching job %d", job_wrapper.job_id)
+
+    def __get_ready_jobs_from_query(self):
+        """
+        Fetch new jobs assigned to this handler whose inputs are all ready, using a single anti-join query over all
+        new jobs.
+        """
+        # Fetch all new jobs
+        hda_not_ready = (
+            self.sa_session.query(model.Job.id)
+            .enable_eagerloads(False)
+            .join(model.JobToInputDatasetAssociation)
+            .join(model.HistoryDatasetAssociation)
+            .join(model.Dataset)
+            .filter(
+                and_(model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states))
+            )
+            .subquery()
+        )
+        ldda_not_ready = (
+            self.sa_session.query(model.Job.id)
+            .enable_eagerloads(False)
+            .join(model.JobToInputLibraryDatasetAssociation)
+            .join(model.LibraryDatasetDatasetAssociation)
+            .join(model.Dataset)
+            .filter(
+                and_(model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states))
+            )
+            .subquery()
+        )
+        coalesce_exp = func.coalesce(
+            model.Job.table.c.user_id, model.Job.table.c.session_id
+        )  # accommodate jobs by anonymous users
+        rank = func.rank().over(partition_by=coalesce_exp, order_by=model.Job.table.c.id).label("rank")
+        job_filter_conditions = (
+            (model.Job.state == model.Job.states.NEW),
+            (model.Job.handler == self.app.config.server_name),
+            ~model.Job.table.c.id.in_(select(hda_not_ready)),
+            ~model.Job.table.c.id.in_(select(ldda_not_ready)),
+        )
+        if self.app.config.user_activation_on:
+            job_filter_conditions = job_filter_conditions + (
+                or_((model.Job.user_id == null()), (model.User.active == true())),
+            )
+        if self.sa_session.bind.name == "sqlite":
+            query_objects = (model.Job,)
+        else:
+            query_objects = (model.Job, rank)
+        ready_query = (
+            self.sa_session.query(*query_objects)
+            .enable_eagerloads(False)
+            .outerjoin(model.User)
+            .filter(and_(*job_filter_conditions))
+            .order_by(model.Job.id)
+        )
+        if self.sa_session.bind.name == "sqlite":
+            jobs_to_check = ready_query.all()
+        else:
+            ranked = ready_query.subquery()
+            jobs_to_check = (
+                self.sa_session.query(model.Job)
+                .join(ranked, model.Job.id == ranked.c.id)
+                .filter(ranked.c.rank <= self.app.job_config.handler_ready_window_size)
+                .all()
+            )
+        return jobs_to_check
+
+    def __get_ready_jobs_from_index(self):
+        """
+        Fetch new jobs assigned to this handler whose inputs are all ready, using the incrementally maintained
+        readiness index instead of re-checking the inputs of every new job.
+        """
+        self.readiness_index.refresh(self.sa_session, self.app.config.server_name, self.app.config.user_activation_on)
+        ready_job_ids = self.readiness_index.ready_job_ids(self.app.job_config.handler_ready_window_size)
+        jobs_to_check = []
+        for i in range(0, len(ready_job_ids), ID_CHUNK_SIZE):
+            stmt = (
+                select(model.Job).where(model.Job.id.in_(ready_job_ids[i : i + ID_CHUNK_SIZE])).order_by(model.Job.id)
+            )
+            jobs_to_check.extend(self.sa_session.scalars(stmt))
+        return jobs_to_check
 
     def __filter_jobs_with_invalid_input_states(self, jobs):
         """
@@ -819,12 +897,52 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         self.user_job_count = None
         self.user_job_count_per_destination = None
         self.total_job_count_per_destination = None
+        self.job_counts_primed = False
+
+    def __has_concurrency_limits(self):
+        limits = self.app.job_config.limits
+        return bool(
+            limits.registered_user_concurrent_jobs
+            or limits.anonymous_user_concurrent_jobs
+            or limits.destination_user_concurrent_jobs
+            or limits.destination_total_concurrent_jobs
+        )
+
+    def __update_job_counts(self):
+        """
+        Take this iteration's job counts from the incrementally maintained counts, replacing the count queries.
+        """
+        assert self.job_counts is not None
+        self.job_counts.update(self.sa_session)
+        (
+            self.user_job_count,
+            self.user_job_count_per_destination,
+            self.total_job_count_per_destination,
+        ) = self.job_counts.snapshot()
+        self.job_counts_primed = True
+
+    def __prime_job_counts(self, jobs):
+        """
+        Fetch the active job counts of all users owning ``jobs`` with one query, so that checking user concurrency
+        limits does not require a count query per job. Not needed if ``cache_user_job_count`` is set, in which case
+        the counts for all users are cached anyway.
+        """
+        limits = self.app.job_config.limits
+        if self.app.config.cache_user_job_count or not (
+            limits.registered_user_concurrent_jobs or limits.destination_user_concurrent_jobs
+        ):
+            return
+        user_ids = {job.user_id for job in jobs if job.user_id is not None}
+        self.user_job_count, self.user_job_count_per_destination = count_active_jobs_for_users(
+            self.sa_session, user_ids
+        )
+        self.job_counts_primed = True
 
     def get_user_job_count(self, user_id):
         self.__cache_user_job_count()
         # This could have been incremented by a previous job dispatched on this iteration, even if we're not caching
         rval = self.user_job_count.get(user_id, 0)
-        if not self.app.config.cache_user_job_count:
+        if not self.app.config.cache_user_job_count and not self.job_counts_primed:
             result = self.sa_session.execute(
                 select(func.count(model.Job.table.c.id)).where(
                     and_(
@@ -864,7 +982,7 @@ class JobHandlerQueue(BaseJobHandlerQueue):
     def get_user_job_count_per_destination(self, user_id):
         self.__cache_user_job_count_per_destination()
         cached = self.user_job_count_per_destination.get(user_id, {})
-        if self.app.config.cache_user_job_count:
+        if self.app.config.cache_user_job_count or self.job_counts_primed:
             rval = cached
         else:
             # The cached count is still used even when we're not caching, it is
@@ -1084,7 +1202,7 @@ class JobHandlerStopQueue(BaseJobHandlerQueue):
             except Exception:
                 log.exception("Exception in monitor_step")
             # Sleep
-            self._monitor_sleep(1)
+            self._monitor_sleep(self.monitor_sleep or 1)
 
     def __delete(self, job, error_msg, session):
         final_state = job.states.DELETED
@@ -13,6 +13,11 @@ from galaxy.jobs import (
     handler,
     NoopQueue,
 )
+from galaxy.jobs.wakeup import (
+    build_job_handler_wakeup,
+    WAKE_JOBS,
+    WAKE_STOP,
+)
 from galaxy.structured_app import MinimalManagerApp
 from galaxy.web_stack.message import JobHandlerMessage
 
@@ -30,6 +35,7 @@ class JobManager:
         self.app = app
         self.job_lock = False
         self.job_handler = NoopHandler()
+        self.job_handler_wakeup = build_job_handler_wakeup(app)
 
     def _check_jobs_at_startup(self):
         if not self.app.is_job_handler:
@@ -40,6 +46,7 @@ class JobManager:
             log.debug("Initializing job handler")
             self.job_handler = handler.JobHandler(self.app)
             self.job_handler.start()
+            self.job_handler_wakeup.start(self.job_handler)
 
     def _queue_callback(self, job, tool_id):
         self.job_handler.job_queue.put(job.id, tool_id)
@@ -75,7 +82,7 @@ class JobManager:
         queue_callback = partial(self._queue_callback, job, tool_id)
         message_callback = partial(self._message_callback, job)
         try:
-            return self.app.job_config.assign_handler(
+            assigned_handler = self.app.job_config.assign_handler(
                 job,
                 configured=configured_handler,
                 queue_callback=queue_callback,
@@ -84,6 +91,17 @@ class JobManager:
             )
         except HandlerAssignmentError as exc:
             raise ToolExecutionError(exc.args[0], job=exc.obj)
+        if self.app.config.track_jobs_in_database:
+            self.job_handler_wakeup.notify(self.app.model.context, handler=job.handler, queue=WAKE_JOBS)
+        return assigned_handler
+
+    def notify_dependent_jobs(self, job):
+        """Wake the handlers of new jobs waiting on the outputs of ``job``, which has just reached a terminal state."""
+        if not self.job_handler_wakeup.enabled:
+            return
+        dataset_ids = {assoc.dataset.dataset_id for assoc in job.output_datasets if assoc.dataset}
+        dataset_ids.update(assoc.dataset.dataset_id for assoc in job.output_library_datasets if assoc.dataset)
+        self.job_handler_wakeup.notify_dependent_jobs(self.app.model.context, dataset_ids)
 
     def stop(self, job, message=None):
         """Stop a job that is currently executing.
@@ -96,8 +114,14 @@ class JobManager:
         :type message:  str
         """
         self.job_handler.job_stop_queue.put(job.id, error_msg=message)
+        if self.app.config.track_jobs_in_database:
+            self.job_handler_wakeup.notify(self.app.model.context, handler=job.handler, queue=WAKE_STOP)
+
+    def wake(self, handler=None, queue=WAKE_JOBS):
+        self.job_handler.wake(handler=handler, queue=queue)
 
     def shutdown(self):
+        self.job_handler_wakeup.shutdown()
         self.job_handler.shutdown()
 
 
@@ -115,6 +139,12 @@ class NoopManager:
     def stop(self, *args, **kwargs):
         pass
 
+    def notify_dependent_jobs(self, *args, **kwargs):
+        pass
+
+    def wake(self, *args, **kwargs):
+        pass
+
 
 class NoopHandler(handler.JobHandlerI):
     """
@@ -0,0 +1,232 @@
+"""
+Set-based readiness tracking for the job handler queue.
+
+Instead of re-running the "inputs not ready" anti-join over every ``new`` job on
+each monitor step, the :class:`JobReadinessIndex` remembers which input datasets
+each tracked job is still waiting on. Every step only has to
+
+- find the ids of jobs that entered the ``new`` state since the last step,
+- compute the non-ready inputs of those jobs, and
+- check whether any of the datasets still being waited on changed state,
+
+each of which is a single bulk query independent of the number of jobs that are
+already known to the index.
+"""
+
+import logging
+from collections import defaultdict
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Set,
+    Tuple,
+)
+
+from sqlalchemy import (
+    and_,
+    func,
+    not_,
+    null,
+    or_,
+    select,
+    true,
+)
+
+from galaxy import model
+
+log = logging.getLogger(__name__)
+
+# Values of the ``ready_check`` job handling option
+READY_CHECK_QUERY = "query"
+READY_CHECK_BULK = "bulk"
+READY_CHECK_METHODS = (READY_CHECK_QUERY, READY_CHECK_BULK)
+
+# Number of ids passed in a single ``IN`` clause
+ID_CHUNK_SIZE = 1000
+
+# (job id, owner key) - the owner key is the user id or, for anonymous jobs, the session id
+NewJobRow = Tuple[int, Tuple[str, int]]
+
+
+def _chunks(ids: List[int], size: int = ID_CHUNK_SIZE):
+    for i in range(0, len(ids), size):
+        yield ids[i : i + size]
+
+
+class JobReadinessIndex:
+    """In-memory index mapping ``new`` jobs to the input datasets they wait on.
+
+    The index itself is pure bookkeeping, the queries that feed it live in
+    :meth:`refresh`.
+    """
+
+    def __init__(self):
+        # job id -> ids of input datasets that are not yet ready
+        self._waiting_on: Dict[int, Set[int]] = {}
+        # dataset id -> ids of jobs waiting on that dataset
+        self._waiters: Dict[int, Set[int]] = defaultdict(set)
+        # job id -> owner key, used to apply the per-user ready window
+        self._owners: Dict[int, Tuple[str, int]] = {}
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._waiting_on
+
+    def __len__(self) -> int:
+        return len(self._waiting_on)
+
+    def track(self, job_id: int, owner: Tuple[str, int], dataset_ids: Iterable[int] = ()) -> None:
+        waiting_on = set(dataset_ids)
+        self._waiting_on[job_id] = waiting_on
+        self._owners[job_id] = owner
+        for dataset_id in waiting_on:
+            self._waiters[dataset_id].add(job_id)
+
+    def discard(self, job_id: int) -> None:
+        for dataset_id in self._waiting_on.pop(job_id, ()):
+            waiters = self._waiters.get(dataset_id)
+            if waiters is not None:
+                waiters.discard(job_id)
+                if not waiters:
+                    del self._waiters[dataset_id]
+        self._owners.pop(job_id, None)
+
+    def sync(self, job_ids: Iterable[int]) -> Set[int]:
+        """Forget jobs that are no longer ``new`` and return the ids of untracked jobs."""
+        current = set(job_ids)
+        for job_id in set(self._waiting_on) - current:
+            self.discard(job_id)
+        return current - set(self._waiting_on)
+
+    def datasets_ready(self, dataset_ids: Iterable[int]) -> Set[int]:
+        """Record that datasets left the non-ready states, return jobs that became ready."""
+        newly_ready = set()
+        for dataset_id in dataset_ids:
+            for job_id in self._waiters.pop(dataset_id, ()):
+                waiting_on = self._waiting_on.get(job_id)
+                if waiting_on is None:
+                    continue
+                waiting_on.discard(dataset_id)
+                if not waiting_on:
+                    newly_ready.add(job_id)
+        return newly_ready
+
+    def pending_dataset_ids(self) -> List[int]:
+        return list(self._waiters)
+
+    def ready_job_ids(self, window_size=None) -> List[int]:
+        """Return ids of jobs with all inputs ready, ordered by id.
+
+        If ``window_size`` is set at most that many jobs are returned per owner,
+        matching the ``rank()`` window applied by the query based readiness check.
+        """
+        ready = sorted(job_id for job_id, waiting_on in self._waiting_on.items() if not waiting_on)
+        if not window_size:
+            return ready
+        per_owner: Dict[Tuple[str, int], int] = defaultdict(int)
+        windowed = []
+        for job_id in ready:
+            owner = self._owners[job_id]
+            if per_owner[owner] < window_size:
+                per_owner[owner] += 1
+                windowed.append(job_id)
+        return windowed
+
+    def refresh(self, sa_session, handler: str, user_activation_on: bool = False) -> None:
+        """Bring the index up to date with the database using a fixed number of bulk queries."""
+        new_jobs = self._new_job_rows(sa_session, handler, user_activation_on)
+        owners = dict(new_jobs)
+        untracked = sorted(self.sync(owners))
+        if untracked:
+            waiting_on = self._non_ready_inputs(sa_session, untracked)
+            for job_id in untracked:
+                self.track(job_id, owners[job_id], waiting_on.get(job_id, ()))
+        pending = self.pending_dataset_ids()
+        if pending:
+            self.datasets_ready(self._ready_dataset_ids(sa_session, pending))
+
+    def _new_job_rows(self, sa_session, handler: str, user_activation_on: bool) -> List[NewJobRow]:
+        job_table = model.Job.table
+        conditions = [job_table.c.state == model.Job.states.NEW, job_table.c.handler == handler]
+        stmt = select(job_table.c.id, job_table.c.user_id, job_table.c.session_id)
+        if user_activation_on:
+            stmt = stmt.outerjoin(model.User.table, job_table.c.user_id == model.User.table.c.id)
+            conditions.append(or_(job_table.c.user_id == null(), model.User.table.c.active == true()))
+        rows = sa_session.execute(stmt.where(and_(*conditions)))
+        return [
+            (job_id, ("user", user_id) if user_id is not None else ("session", session_id))
+            for job_id, user_id, session_id in rows
+        ]
+
+    def _non_ready_inputs(self, sa_session, job_ids: List[int]) -> Dict[int, Set[int]]:
+        waiting_on: Dict[int, Set[int]] = defaultdict(set)
+        for job_to_input, input_id, input_association in (
+            (
+                model.JobToInputDatasetAssociation,
+                model.JobToInputDatasetAssociation.dataset_id,
+                model.HistoryDatasetAssociation,
+            ),
+            (
+                model.JobToInputLibraryDatasetAssociation,
+                model.JobToInputLibraryDatasetAssociation.ldda_id,
+                model.LibraryDatasetDatasetAssociation,
+            ),
+        ):
+            for chunk in _chunks(job_ids):
+                stmt = (
+                    select(job_to_input.job_id, model.Dataset.id)
+                    .join(input_association, input_id == input_association.id)
+                    .join(model.Dataset, input_association.dataset_id == model.Dataset.id)
+                    .where(
+                        job_to_input.job_id.in_(chunk),
+                        model.Dataset.state.in_(model.Dataset.non_ready_states),
+                    )
+                )
+                for job_id, dataset_id in sa_session.execute(stmt):
+                    waiting_on[job_id].add(dataset_id)
+        return waiting_on
+
+    def _ready_dataset_ids(self, sa_session, dataset_ids: List[int]) -> Set[int]:
+        ready = set()
+        for chunk in _chunks(sorted(dataset_ids)):
+            stmt = select(model.Dataset.id).where(
+                model.Dataset.id.in_(chunk),
+                not_(model.Dataset.state.in_(model.Dataset.non_ready_states)),
+            )
+            ready.update(sa_session.scalars(stmt))
+        return ready
+
+
+def count_active_jobs_for_users(sa_session, user_ids: Iterable[int]):
+    """Return per-user and per-user-per-destination counts of active jobs for ``user_ids``.
+
+    Used to prime the job limit caches of a handler for a whole batch of jobs
+    at once instead of issuing one count query per job.
+    """
+    user_job_count: Dict[int, int] = {}
+    user_job_count_per_destination: Dict[int, Dict[str, int]] = {}
+    job_table = model.Job.table
+    user_ids = sorted(set(user_ids))
+    for chunk in _chunks(user_ids):
+        stmt = (
+            select(
+                job_table.c.user_id,
+                job_table.c.destination_id,
+                job_table.c.state,
+                func.count(job_table.c.id),
+            )
+            .where(
+                job_table.c.state.in_(
+                    (model.Job.states.QUEUED, model.Job.states.RUNNING, model.Job.states.RESUBMITTED)
+                ),
+                job_table.c.user_id.in_(chunk),
+            )
+            .group_by(job_table.c.user_id, job_table.c.destination_id, job_table.c.state)
+        )
+        for user_id, destination_id, state, count in sa_session.execute(stmt):
+            user_job_count[user_id] = user_job_count.get(user_id, 0) + count
+            # resubmitted jobs only count against the overall limit, as in JobHandlerQueue
+            if state != model.Job.states.RESUBMITTED:
+                per_destination = user_job_count_per_destination.setdefault(user_id, {})
+                per_destination[destination_id] = per_destination.get(destination_id, 0) + count
+    return user_job_count, user_job_count_per_destination
@@ -28,6 +28,10 @@ from galaxy.job_execution.output_collect import (
     read_exit_code_from,
 )
 from galaxy.jobs.command_factory import build_command
+from galaxy.jobs.runners.finish_pipeline import (
+    FinishStage,
+    JobFinishPipeline,
+)
 from galaxy.jobs.runners.util import runner_states
 from galaxy.jobs.runners.util.env import env_to_statement
 from galaxy.jobs.runners.util.job_script import (
@@ -96,7 +100,13 @@ class BaseJobRunner:
     runner_name = "BaseJobRunner"
 
     start_methods = ["_init_monitor_thread", "_init_worker_threads"]
-    DEFAULT_SPECS = dict(recheck_missing_job_retries=dict(map=int, valid=lambda x: int(x) >= 0, default=0))
+    DEFAULT_SPECS = dict(
+        recheck_missing_job_retries=dict(map=int, valid=lambda x: int(x) >= 0, default=0),
+        # Staged job finishing, see galaxy.jobs.runners.finish_pipeline (only used by asynchronous runners)
+        finish_workers=dict(map=int, valid=lambda x: int(x) >= 0, default=0),
+        finish_collect_workers=dict(map=int, valid=lambda x: int(x) >= 0, default=0),
+        finish_queue_size=dict(map=int, valid=lambda x: int(x) >= 1, default=100),
+    )
 
     def __init__(self, app: "GalaxyManagerApplication", nworkers: int, **kwargs):
         """Start the job runner"""
@@ -822,6 +832,8 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
     to the correct methods (queue, finish, cleanup) at appropriate times..
     """
 
+    start_methods = BaseJobRunner.start_methods + ["_init_finish_pipeline"]
+
     def __init__(self, app, nworkers, **kwargs):
         super().__init__(app, nworkers, **kwargs)
         # 'watched' and 'queue' are both used to keep track of jobs to watch.
@@ -831,11 +843,43 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
         # to 'watched' and then manage the watched jobs.
         self.watched = []
         self.monitor_queue = Queue()
+        # External states of the watched jobs fetched with get_job_states() at the start of each
+        # check_watched_items() call, keyed by external job id (only use from the monitor thread)
+        self.watched_job_states: typing.Dict[str, typing.Any] = {}
+        self.finish_pipeline: typing.Optional[JobFinishPipeline] = None
 
     def _init_monitor_thread(self):
         name = f"{self.runner_name}.monitor_thread"
         super()._init_monitor_thread(name=name, target=self.monitor, start=True, config=self.app.config)
 
+    def _init_finish_pipeline(self):
+        """Finish jobs in dedicated stages if ``finish_workers`` is set, see :mod:`galaxy.jobs.runners.finish_pipeline`."""
+        if not self.runner_params.finish_workers:
+            return
+        if self.runner_params.finish_collect_workers and type(self).finish_job is AsynchronousJobRunner.finish_job:
+            stages = [
+                ("collect", self._collect_job_output, self.runner_params.finish_collect_workers),
+                ("finish", self._finish_collected_job, self.runner_params.finish_workers),
+            ]
+        else:
+            stages = [("finish", self.finish_job, self.runner_params.finish_workers)]
+        self.finish_pipeline = JobFinishPipeline(
+            [
+                FinishStage(
+                    self.app,
+                    self.runner_name,
+                    name,
+                    method,
+                    workers,
+                    self.runner_params.finish_queue_size,
+                    prepare=self._ensure_db_session,
+                    on_error=self.mark_as_failed,
+                )
+                for name, method, workers in stages
+            ]
+        )
+        self.finish_pipeline.start()
+
     def handle_stop(self):
         # DRMAA and SGE runners should override this and disconnect.
         pass
@@ -882,6 +926,8 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
         self.monitor_queue.put(STOP_SIGNAL)
         # Call the parent's shutdown method to stop workers
         self.shutdown_monitor()
+        if self.finish_pipeline is not None:
+            self.finish_pipeline.shutdown(timeout=self.app.config.monitor_thread_join_timeout or None)
         super().shutdown()
 
     def check_watched_items(self):
@@ -892,6 +938,7 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
         initially) or just override check_watched_item and allow the list processing to
         reuse the logic here.
         """
+        self.watched_job_states = self.get_job_states(self.watched)
         new_watched = []
         for async_job_state in self.watched:
             new_async_job_state = self.check_watched_item(async_job_state)
@@ -903,11 +950,34 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
     def check_watched_item(self, job_state):
         raise NotImplementedError()
 
+    def get_job_states(self, job_states: typing.List[AsynchronousJobState]) -> typing.Dict[str, typing.Any]:
+        """
+        Return the external states of the jobs in ``job_states``, keyed by external job id.
+
+        Runners that can fetch the states of many jobs with a single call to the
+        DRM (e.g. one ``squeue`` or ``qstat`` invocation) should override this,
+        so that each iteration of the monitor thread needs a constant number of
+        calls instead of one per watched job. Jobs missing from the result are
+        expected to be checked individually by ``check_watched_item``. The
+        result of the current iteration is available as ``self.watched_job_states``.
+        """
+        return {}
+
     def finish_job(self, job_state: AsynchronousJobState):
         """
         Get the output/error for a finished job, pass to `job_wrapper.finish`
         and cleanup all the job's temporary files.
         """
+        collected = self._collect_job_output(job_state)
+        if collected is not None:
+            self._finish_collected_job(job_state, *collected)
+
+    def _collect_job_output(self, job_state: AsynchronousJobState) -> typing.Optional[typing.Tuple[str, str]]:
+        """
+        Reclaim ownership of the job's files and read its stdout and stderr.
+
+        Returns ``None`` if the output could not be read, in which case the job has been marked as failed.
+        """
         galaxy_id_tag = job_state.job_wrapper.get_id_tag()
         external_job_id = job_state.job_id
 
@@ -937,12 +1007,20 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
             job_state.fail_message = stderr
             job_state.runner_state = job_state.runner_states.JOB_OUTPUT_NOT_RETURNED_FROM_CLUSTER
             self.mark_as_failed(job_state)
-            return
+            return None
+        return stdout, stderr
 
-        self._finish_or_resubmit_job(job_state, stdout, stderr, job_id=galaxy_id_tag, external_job_id=external_job_id)
+    def _finish_collected_job(self, job_state: AsynchronousJobState, stdout: str, stderr: str):
+        self._finish_or_resubmit_job(
+            job_state, stdout, stderr, job_id=job_state.job_wrapper.get_id_tag(), external_job_id=job_state.job_id
+        )
 
     def mark_as_finished(self, job_state):
-        self.work_queue.put((self.finish_job, job_state))
+        if self.finish_pipeline is not None:
+            # Blocks while the first stage of the pipeline is full
+            self.finish_pipeline.put(job_state)
+        else:
+            self.work_queue.put((self.finish_job, job_state))
 
     def mark_as_failed(self, job_state):
         self.work_queue.put((self.fail_job, job_state))
@@ -159,13 +159,13 @@ class ShellJobRunner(AsynchronousJobRunner):
         """
         new_watched = []
 
-        job_states = self.__get_job_states()
+        self.watched_job_states = self.get_job_states(self.watched)
 
         for ajs in self.watched:
             external_job_id = ajs.job_id
             id_tag = ajs.job_wrapper.get_id_tag()
             old_state = ajs.old_state
-            state = job_states.get(external_job_id, None)
+            state = self.watched_job_states.get(external_job_id, None)
             if state is None:
                 if ajs.job_wrapper.get_state() == model.Job.states.DELETED:
                     continue
@@ -202,7 +202,7 @@ class ShellJobRunner(AsynchronousJobRunner):
                 if external_metadata:
                     self.work_queue.put((self.handle_metadata_externally, ajs))
                 log.debug(f"({id_tag}/{external_job_id}) job execution finished, running job wrapper finish method")
-                self.work_queue.put((self.finish_job, ajs))
+                self.mark_as_finished(ajs)
             else:
                 new_watched.append(ajs)
         # Replace the watch list with the updated version
@@ -223,11 +223,14 @@ class ShellJobRunner(AsynchronousJobRunner):
                 ajs.runner_state = JobState.runner_states.MEMORY_LIMIT_REACHED
                 ajs.fail_message = "Tool failed due to insufficient memory. Try with more memory."
 
-    def __get_job_states(self):
+    def get_job_states(self, job_states):
+        """
+        Fetch the states of all watched jobs with one status command per destination.
+        """
         job_destinations = {}
-        job_states = {}
+        states = {}
         # unique the list of destinations
-        for ajs in self.watched:
+        for ajs in job_states:
             if ajs.job_destination.id not in job_destinations:
                 job_destinations[ajs.job_destination.id] = dict(
                     job_destination=ajs.job_destination, job_ids=[ajs.job_id]
@@ -242,8 +245,9 @@ class ShellJobRunner(AsynchronousJobRunner):
             shell, job_interface = self.get_cli_plugins(shell_params, job_params)
             cmd_out = shell.execute(job_interface.get_status(job_ids))
             assert cmd_out.returncode == 0, cmd_out.stderr
-            job_states.update(job_interface.parse_status(cmd_out.stdout, job_ids))
-        return job_states
+            # Job plugins test each job in the status output for membership in job_ids
+            states.update(job_interface.parse_status(cmd_out.stdout, set(job_ids)))
+        return states
 
     def stop_job(self, job_wrapper):
         """Attempts to delete a dispatched job"""
@@ -256,7 +256,7 @@ class DRMAAJobRunner(AsynchronousJobRunner):
             if external_metadata:
                 self._handle_metadata_externally(ajs.job_wrapper, resolve_requirements=True)
             if job_state != model.Job.states.DELETED:
-                self.work_queue.put((self.finish_job, ajs))
+                self.mark_as_finished(ajs)
 
     def check_watched_item(self, ajs, new_watched):
         """
@@ -283,7 +283,9 @@ class DRMAAJobRunner(AsynchronousJobRunner):
         state = None
         try:
             assert external_job_id not in (None, "None"), f"({galaxy_id_tag}/{external_job_id}) Invalid job id"
-            state = self.ds.job_status(external_job_id)
+            state = self.watched_job_states.get(external_job_id)
+            if state is None:
+                state = self.ds.job_status(external_job_id)
             # Reset exception retries
             for retry_exception in RETRY_EXCEPTIONS_LOWER:
                 setattr(ajs, f"{retry_exception}_retries", 0)
@@ -308,7 +310,7 @@ class DRMAAJobRunner(AsynchronousJobRunner):
                     return None
             if self.runner_params[state_param] == model.Job.states.OK:
                 log.warning("(%s/%s) job will now be finished OK", galaxy_id_tag, external_job_id)
-                self.work_queue.put((self.finish_job, ajs))
+                self.mark_as_finished(ajs)
             elif self.runner_params[state_param] == model.Job.states.ERROR:
                 log.warning("(%s/%s) job will now be errored", galaxy_id_tag, external_job_id)
                 self.work_queue.put((self.fail_job, ajs))
@@ -338,6 +340,11 @@ class DRMAAJobRunner(AsynchronousJobRunner):
         with state changes.
         """
         new_watched = []
+        try:
+            self.watched_job_states = self.get_job_states(self.watched)
+        except Exception:
+            log.exception("Unable to check the state of watched jobs in bulk, checking them individually")
+            self.watched_job_states = {}
         for ajs in self.watched:
             external_job_id = ajs.job_id
             galaxy_id_tag = ajs.job_wrapper.get_id_tag()
@@ -0,0 +1,196 @@
+"""
+Staged, bounded worker pools for finishing jobs of asynchronous job runners.
+
+By default finished jobs are put on the runner's work queue and handled by its
+general worker threads, together with jobs to queue or fail. A job with large
+outputs can then occupy a worker for a long time and hold up everything behind
+it. If the ``finish_workers`` runner parameter is set, finishing jobs goes
+through a :class:`JobFinishPipeline` instead:
+
+- ``collect`` (``finish_collect_workers`` threads) - reclaims ownership of the
+  job's files and waits for and reads the job's outputs, i.e. the file system
+  I/O that may have to wait for a shared file system.
+- ``finish`` (``finish_workers`` threads) - runs ``JobWrapper.finish`` (output
+  discovery, object store and metadata updates, database commits) and cleanup.
+
+Without ``finish_collect_workers``, or for runners that implement their own
+``finish_job``, there is a single ``finish`` stage. Each stage has a queue of at
+most ``finish_queue_size`` jobs. Putting a job on a full queue blocks, so a
+slow stage holds back the previous stage (and, for the first stage, the
+runner's monitor thread) instead of accumulating work. The time jobs wait for
+and spend in each stage is reported through the execution timer factory (and
+so to statsd if configured), counts are available from :meth:`JobFinishPipeline.stats`.
+"""
+
+import threading
+from queue import (
+    Empty,
+    Queue,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from galaxy.util import UNKNOWN
+from galaxy.util.custom_logging import get_logger
+
+log = get_logger(__name__)
+
+STOP_SIGNAL = object()
+
+
+def _id_tag(job_state) -> str:
+    try:
+        return job_state.job_wrapper.get_id_tag()
+    except Exception:
+        return UNKNOWN
+
+
+class FinishStage:
+    """A bounded queue of jobs processed by a pool of worker threads.
+
+    ``method`` is called with the job state and the values returned by the
+    previous stage. If it returns a tuple the job and that tuple are passed to
+    the next stage, if it returns ``None`` the job leaves the pipeline.
+    """
+
+    def __init__(
+        self,
+        app,
+        runner_name: str,
+        name: str,
+        method: Callable,
+        workers: int,
+        queue_size: int,
+        prepare: Callable[[Any], None],
+        on_error: Callable[[Any], None],
+    ):
+        self.app = app
+        self.runner_name = runner_name
+        self.name = name
+        self.method = method
+        self.workers = workers
+        self.prepare = prepare
+        self.on_error = on_error
+        self.next_stage: Optional[FinishStage] = None
+        self.queue: Queue = Queue(maxsize=queue_size)
+        self.threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.busy = 0
+        self.processed = 0
+        self.failed = 0
+        self._timer_id = f"internals.galaxy.jobs.runners.{runner_name.lower()}.finish_pipeline.{name}"
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(name=f"{self.runner_name}.finish_{self.name}_thread-{i}", target=self.run)
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def put(self, job_state, args: Tuple = ()):
+        wait_timer = self.app.execution_timer_factory.get_timer(
+            f"{self._timer_id}.wait", f"job ${{job_id}} waited for finish pipeline stage {self.name}"
+        )
+        if self.queue.full():
+            log.debug(
+                "(%s) %s finish pipeline stage '%s' is full, waiting", _id_tag(job_state), self.runner_name, self.name
+            )
+        self.queue.put((job_state, args, wait_timer))
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is STOP_SIGNAL:
+                return
+            job_state, args, wait_timer = item
+            job_id = _id_tag(job_state)
+            log.trace(wait_timer.to_str(job_id=job_id))
+            with self._lock:
+                self.busy += 1
+            result = None
+            try:
+                with self.app.model.session():
+                    self.prepare(job_state)
+                    timer = self.app.execution_timer_factory.get_timer(
+                        self._timer_id, f"finish pipeline stage {self.name} for job ${{job_id}} executed"
+                    )
+                    result = self.method(job_state, *args)
+                    log.trace(timer.to_str(job_id=job_id))
+            except Exception:
+                log.exception("(%s) Unhandled exception in finish pipeline stage '%s'", job_id, self.name)
+                with self._lock:
+                    self.failed += 1
+                self.on_error(job_state)
+                continue
+            finally:
+                with self._lock:
+                    self.busy -= 1
+            with self._lock:
+                self.processed += 1
+            if result is not None and self.next_stage is not None:
+                self.next_stage.put(job_state, result)
+
+    def stop(self):
+        for _ in self.threads:
+            self.queue.put(STOP_SIGNAL)
+
+    def join(self, timeout: Optional[float] = None):
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(
+                workers=self.workers,
+                queued=self.queue.qsize(),
+                busy=self.busy,
+                processed=self.processed,
+                failed=self.failed,
+            )
+
+
+class JobFinishPipeline:
+    """A chain of :class:`FinishStage` instances, jobs enter at the first stage."""
+
+    def __init__(self, stages: List[FinishStage]):
+        assert stages, "A job finish pipeline needs at least one stage"
+        self.stages = stages
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next_stage = next_stage
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+        log.debug(
+            "Started job finish pipeline with stages: %s",
+            ", ".join(f"{stage.name} ({stage.workers} workers)" for stage in self.stages),
+        )
+
+    def put(self, job_state):
+        """Add a finished job, blocks while the first stage is full."""
+        self.stages[0].put(job_state)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        # Stop stages in order, jobs still queued are recovered on the next startup
+        for stage in self.stages:
+            self._drain(stage)
+            stage.stop()
+        for stage in self.stages:
+            stage.join(timeout)
+
+    def _drain(self, stage: FinishStage):
+        # Make room for the stop signals
+        try:
+            while True:
+                stage.queue.get_nowait()
+        except Empty:
+            pass
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {stage.name: stage.stats() for stage in self.stages}
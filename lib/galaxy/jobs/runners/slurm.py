@@ -4,6 +4,7 @@ SLURM job control via the DRMAA API.
 
 import os
 import time
+from collections import defaultdict
 
 from galaxy import model
 from galaxy.jobs.runners.drmaa import DRMAAJobRunner
@@ -12,6 +13,7 @@ from galaxy.util import (
     unicodify,
 )
 from galaxy.util.custom_logging import get_logger
+from galaxy.util.specs import to_bool
 
 log = get_logger(__name__)
 
@@ -35,11 +37,71 @@ SLURM_MEMORY_LIMIT_EXCEEDED_PARTIAL_WARNINGS = [
 OUT_OF_MEMORY_MSG = "This job was terminated because it used more memory than it was allocated."
 PROBABLY_OUT_OF_MEMORY_MSG = "This job was cancelled probably because it used more memory than it was allocated."
 
+# Maximum number of job ids passed to a single squeue invocation
+SQUEUE_MAX_JOB_IDS = 1000
+
+
+def _split_job_id(external_job_id):
+    """Split the custom slurm-drmaa-with-cluster-support job id syntax into job id and cluster."""
+    if "." in external_job_id:
+        job_id, cluster = external_job_id.split(".", 1)
+        return job_id, cluster
+    return external_job_id, None
+
 
 class SlurmJobRunner(DRMAAJobRunner):
     runner_name = "SlurmRunner"
     restrict_job_name_length = False
 
+    def __init__(self, app, nworkers, **kwargs):
+        runner_param_specs = {"batch_job_status": dict(map=to_bool, default=False)}
+        if "runner_param_specs" not in kwargs:
+            kwargs["runner_param_specs"] = {}
+        kwargs["runner_param_specs"].update(runner_param_specs)
+        super().__init__(app, nworkers, **kwargs)
+
+    def get_job_states(self, job_states):
+        """
+        If the ``batch_job_status`` runner parameter is set, get the states of
+        pending and running jobs with one ``squeue`` call per cluster (and
+        ``SQUEUE_MAX_JOB_IDS`` jobs) instead of one DRMAA call per job. Jobs in
+        any other state, e.g. finished jobs, are left to DRMAA.
+        """
+        if not self.runner_params.batch_job_status:
+            return {}
+        slurm_to_drmaa_states = {
+            "PENDING": self.drmaa_job_states.QUEUED_ACTIVE,
+            "RUNNING": self.drmaa_job_states.RUNNING,
+        }
+        external_job_ids = defaultdict(dict)
+        for ajs in job_states:
+            if ajs.job_id in (None, "None"):
+                continue
+            job_id, cluster = _split_job_id(ajs.job_id)
+            external_job_ids[cluster][job_id] = ajs.job_id
+        states = {}
+        for cluster, cluster_job_ids in external_job_ids.items():
+            job_ids = list(cluster_job_ids)
+            for i in range(0, len(job_ids), SQUEUE_MAX_JOB_IDS):
+                cmd = ["squeue", "--noheader", "--format=%i %T"]
+                if cluster:
+                    cmd.extend(["-M", cluster])
+                cmd.extend(["-j", ",".join(job_ids[i : i + SQUEUE_MAX_JOB_IDS])])
+                try:
+                    stdout = commands.execute(cmd)
+                except commands.CommandLineException as e:
+                    log.warning("Unable to get job states with squeue, checking jobs individually: %s", e)
+                    continue
+                for line in stdout.splitlines():
+                    fields = line.split()
+                    # With -M, squeue also prints a "CLUSTER: <name>" line
+                    if len(fields) != 2 or fields[0] not in cluster_job_ids:
+                        continue
+                    drmaa_state = slurm_to_drmaa_states.get(fields[1])
+                    if drmaa_state is not None:
+                        states[cluster_job_ids[fields[0]]] = drmaa_state
+        return states
+
     def _complete_terminal_job(self, ajs, drmaa_state, **kwargs):
         def _get_slurm_state_with_sacct(job_id, cluster):
             cmd = ["sacct", "-n", "-o", "state%-32"]
@@ -62,13 +124,9 @@ class SlurmJobRunner(DRMAAJobRunner):
 
         def _get_slurm_state():
             cmd = ["scontrol", "-o"]
-            if "." in ajs.job_id:
-                # custom slurm-drmaa-with-cluster-support job id syntax
-                job_id, cluster = ajs.job_id.split(".", 1)
+            job_id, cluster = _split_job_id(ajs.job_id)
+            if cluster:
                 cmd.extend(["-M", cluster])
-            else:
-                job_id = ajs.job_id
-                cluster = None
             cmd.extend(["show", "job", job_id])
             try:
                 stdout = commands.execute(cmd).strip()
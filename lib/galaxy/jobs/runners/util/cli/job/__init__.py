@@ -8,8 +8,8 @@ from abc import (
 )
 from enum import Enum
 from typing import (
+    Collection,
     Dict,
-    List,
 )
 
 from typing_extensions import TypeAlias
@@ -67,9 +67,11 @@ class BaseJobExec(metaclass=ABCMeta):
         """
 
     @abstractmethod
-    def parse_status(self, status: str, job_ids: List[str]) -> Dict[str, job_states]:
+    def parse_status(self, status: str, job_ids: Collection[str]) -> Dict[str, job_states]:
         """
         Parse the statuses of output from get_status command.
+
+        ``job_ids`` may be a set, it is only used for membership tests.
         """
 
     @abstractmethod
@@ -0,0 +1,208 @@
+"""
+Wake job handlers when there is work for them instead of waiting for their next poll.
+
+Job handlers discover new jobs, jobs whose inputs have become ready and jobs that
+should be stopped by polling the database. With a wakeup transport configured
+(``job_handler_wakeup``) processes that create or finish jobs, or request that
+they be stopped, notify the responsible handler(s), which then run their next
+monitor step right away. Polling still happens, but at the (much longer)
+``job_handler_wakeup_monitor_sleep`` interval, as a safety net for lost
+notifications.
+
+Two transports are available:
+
+- ``queue_worker`` sends a ``wake_job_handlers`` control task through the
+  :class:`galaxy.queue_worker.GalaxyQueueWorker` (works with any database and
+  any kombu transport).
+- ``postgres`` uses ``NOTIFY``/``LISTEN`` on the Galaxy database, so it does not
+  depend on the AMQP connection. It requires PostgreSQL with psycopg2, other
+  databases should use ``queue_worker``.
+
+In both cases notifications are only delivered once the transaction that
+created or changed the job commits, so the woken handler sees the change.
+"""
+
+import json
+import logging
+import select
+import threading
+from typing import (
+    Iterable,
+    Optional,
+)
+
+from sqlalchemy import (
+    event,
+    func,
+    select as sa_select,
+)
+
+from galaxy import model
+
+log = logging.getLogger(__name__)
+
+WAKEUP_QUEUE_WORKER = "queue_worker"
+WAKEUP_POSTGRES = "postgres"
+WAKEUP_TRANSPORTS = (WAKEUP_QUEUE_WORKER, WAKEUP_POSTGRES)
+
+# Which of the handler's monitor threads to wake
+WAKE_JOBS = "jobs"
+WAKE_STOP = "stop"
+
+POSTGRES_CHANNEL = "galaxy_job_handler_wakeup"
+PENDING_WAKEUPS_KEY = "galaxy_job_handler_wakeups"
+LISTEN_RECONNECT_SLEEP = 5
+
+
+class JobHandlerWakeup:
+    """Base transport, does nothing - handlers rely on polling alone."""
+
+    enabled = False
+
+    def __init__(self, app):
+        self.app = app
+
+    def start(self, job_handler):
+        """Start delivering wakeups to ``job_handler`` (only called in job handler processes)."""
+
+    def shutdown(self):
+        pass
+
+    def notify(self, sa_session, handler: Optional[str] = None, queue: str = WAKE_JOBS):
+        """Wake ``handler`` (a handler id or tag, ``None`` for all handlers) once ``sa_session`` commits."""
+
+    def notify_dependent_jobs(self, sa_session, dataset_ids: Iterable[int]):
+        """Wake the handlers of ``new`` jobs that use any of ``dataset_ids`` as (history or library) input."""
+        dataset_ids = list(dataset_ids)
+        if not self.enabled or not dataset_ids:
+            return
+        hda_input_handlers = (
+            sa_select(model.Job.handler)
+            .join(model.JobToInputDatasetAssociation, model.JobToInputDatasetAssociation.job_id == model.Job.id)
+            .join(
+                model.HistoryDatasetAssociation,
+                model.JobToInputDatasetAssociation.dataset_id == model.HistoryDatasetAssociation.id,
+            )
+            .where(
+                model.Job.state == model.Job.states.NEW,
+                model.HistoryDatasetAssociation.dataset_id.in_(dataset_ids),
+            )
+        )
+        ldda_input_handlers = (
+            sa_select(model.Job.handler)
+            .join(
+                model.JobToInputLibraryDatasetAssociation,
+                model.JobToInputLibraryDatasetAssociation.job_id == model.Job.id,
+            )
+            .join(
+                model.LibraryDatasetDatasetAssociation,
+                model.JobToInputLibraryDatasetAssociation.ldda_id == model.LibraryDatasetDatasetAssociation.id,
+            )
+            .where(
+                model.Job.state == model.Job.states.NEW,
+                model.LibraryDatasetDatasetAssociation.dataset_id.in_(dataset_ids),
+            )
+        )
+        # UNION (not UNION ALL) returns each handler once
+        stmt = hda_input_handlers.union(ldda_input_handlers)
+        for handler in sa_session.scalars(stmt):
+            if handler is not None:
+                self.notify(sa_session, handler=handler)
+
+
+class QueueWorkerJobHandlerWakeup(JobHandlerWakeup):
+    """Send wakeups as control tasks once the session commits."""
+
+    enabled = True
+
+    def notify(self, sa_session, handler=None, queue=WAKE_JOBS):
+        session = sa_session() if callable(sa_session) else sa_session
+        if not event.contains(session, "after_commit", self._send_pending):
+            # Sessions are long lived (scoped per thread), listen once for all their transactions
+            event.listen(session, "after_commit", self._send_pending)
+            event.listen(session, "after_soft_rollback", self._discard_pending)
+        session.info.setdefault(PENDING_WAKEUPS_KEY, set()).add((handler, queue))
+
+    def _send_pending(self, session):
+        for handler, queue in session.info.pop(PENDING_WAKEUPS_KEY, ()):
+            self.app.queue_worker.send_control_task("wake_job_handlers", kwargs={"handler": handler, "queue": queue})
+
+    def _discard_pending(self, session, previous_transaction):
+        session.info.pop(PENDING_WAKEUPS_KEY, None)
+
+
+class PostgresJobHandlerWakeup(JobHandlerWakeup):
+    """Send wakeups with ``NOTIFY`` and receive them with ``LISTEN`` on a dedicated connection."""
+
+    enabled = True
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._job_handler = None
+        self._listen_thread = None
+        self._running = False
+
+    def notify(self, sa_session, handler=None, queue=WAKE_JOBS):
+        # NOTIFY is transactional, PostgreSQL delivers it on commit
+        payload = json.dumps({"handler": handler, "queue": queue})
+        sa_session.execute(sa_select(func.pg_notify(POSTGRES_CHANNEL, payload)))
+
+    def start(self, job_handler):
+        self._job_handler = job_handler
+        self._running = True
+        self._listen_thread = threading.Thread(name="JobHandlerWakeup.listen_thread", target=self._listen)
+        self._listen_thread.daemon = True
+        self._listen_thread.start()
+
+    def shutdown(self):
+        self._running = False
+
+    def _listen(self):
+        while self._running:
+            connection = None
+            try:
+                connection = self.app.model.engine.raw_connection()
+                dbapi_connection = connection.driver_connection
+                dbapi_connection.autocommit = True
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {POSTGRES_CHANNEL}")
+                log.debug("Listening for job handler wakeups on channel '%s'", POSTGRES_CHANNEL)
+                # Wake once after (re)connecting in case notifications were missed
+                self._job_handler.wake()
+                while self._running:
+                    if select.select([dbapi_connection], [], [], LISTEN_RECONNECT_SLEEP) == ([], [], []):
+                        continue
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        self._handle(dbapi_connection.notifies.pop(0).payload)
+            except Exception:
+                log.exception("Error listening for job handler wakeups, reconnecting")
+                threading.Event().wait(LISTEN_RECONNECT_SLEEP)
+            finally:
+                if connection is not None:
+                    connection.invalidate()
+
+    def _handle(self, payload):
+        try:
+            kwargs = json.loads(payload)
+        except ValueError:
+            log.warning("Ignoring malformed job handler wakeup: %s", payload)
+            return
+        self._job_handler.wake(handler=kwargs.get("handler"), queue=kwargs.get("queue", WAKE_JOBS))
+
+
+def build_job_handler_wakeup(app) -> JobHandlerWakeup:
+    transport = app.config.job_handler_wakeup
+    if not transport:
+        return JobHandlerWakeup(app)
+    assert (
+        transport in WAKEUP_TRANSPORTS
+    ), f"Invalid job_handler_wakeup '{transport}', must be one of: {', '.join(WAKEUP_TRANSPORTS)}"
+    if transport == WAKEUP_POSTGRES:
+        if app.model.engine.name != "postgresql":
+            log.warning(
+                "job_handler_wakeup '%s' requires PostgreSQL, using '%s' instead", transport, WAKEUP_QUEUE_WORKER
+            )
+            return QueueWorkerJobHandlerWakeup(app)
+        return PostgresJobHandlerWakeup(app)
+    return QueueWorkerJobHandlerWakeup(app)
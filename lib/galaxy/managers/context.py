@@ -64,6 +64,7 @@ from galaxy.model.base import (
     transaction,
 )
 from galaxy.model.scoped_session import galaxy_scoped_session
+from galaxy.model.security import DatasetAccessCache
 from galaxy.model.tags import GalaxyTagHandlerSession
 from galaxy.schema.tasks import RequestUser
 from galaxy.security.idencoding import IdEncodingHelper
@@ -206,6 +207,8 @@ class ProvidesUserContext(ProvidesAppContext):
 
     galaxy_session: Optional[GalaxySession] = None
     _tag_handler: Optional[GalaxyTagHandlerSession] = None
+    _dataset_access: Optional[DatasetAccessCache] = None
+    _dataset_access_user: Optional[User] = None
 
     @property
     def tag_handler(self):
@@ -213,6 +216,15 @@ class ProvidesUserContext(ProvidesAppContext):
             self._tag_handler = self.app.tag_handler.create_tag_handler_session(self.galaxy_session)
         return self._tag_handler
 
+    @property
+    def dataset_access(self) -> DatasetAccessCache:
+        """Dataset access checks for the current user, cached for the lifetime of this context."""
+        user = self.user
+        if self._dataset_access is None or self._dataset_access_user is not user:
+            self._dataset_access = DatasetAccessCache(self.app.security_agent, self.get_current_user_roles())
+            self._dataset_access_user = user
+        return self._dataset_access
+
     @property
     def async_request_user(self) -> RequestUser:
         if self.user is None:
@@ -28,6 +28,7 @@ from galaxy.managers import (
     secured,
     users,
 )
+from galaxy.managers.context import ProvidesUserContext
 from galaxy.model import (
     Dataset,
     DatasetHash,
@@ -118,14 +119,16 @@ class DatasetManager(base.ModelManager[Dataset], secured.AccessibleManagerMixin,
         """
         if self.user_manager.is_admin(user, trans=kwargs.get("trans")):
             return True
-        if self.has_access_permission(item, user):
+        if self.has_access_permission(item, user, trans=kwargs.get("trans")):
             return True
         return False
 
-    def has_access_permission(self, dataset, user):
+    def has_access_permission(self, dataset, user, trans=None):
         """
         Return T/F if the user has role-based access to the dataset.
         """
+        if isinstance(trans, ProvidesUserContext) and trans.user is user and dataset.id is not None:
+            return trans.dataset_access.can_access_dataset(dataset.id)
         roles = user.all_roles_exploiting_cache() if user else []
         return self.app.security_agent.can_access_dataset(roles, dataset)
 
@@ -517,7 +520,7 @@ class DatasetAssociationManager(
         self.ensure_can_set_metadata(dataset_assoc)
         assert dataset_assoc.dataset
         path = dataset_assoc.dataset.get_file_name()
-        datatype = sniff.guess_ext(path, self.app.datatypes_registry.sniff_order)
+        datatype = sniff.guess_ext(path, self.app.datatypes_registry.sniffer_index)
         self.app.datatypes_registry.change_datatype(dataset_assoc, datatype)
         with transaction(session):
             session.commit()
@@ -599,6 +602,7 @@ class DatasetAssociationManager(
                 role_ids_dict["LIBRARY_MODIFY"] = modify_roles
 
             self._set_permissions(trans, dataset_assoc, role_ids_dict)
+        trans.dataset_access.forget([dataset.id])
 
     def _set_permissions(self, trans, dataset_assoc, roles_dict):
         raise exceptions.NotImplemented()
@@ -946,7 +946,8 @@ class HistorySerializer(sharable.SharableModelSerializer, deletable.PurgableSeri
     def serialize_contents(self, item, key, trans=None, user=None, **context):
         history = item
         returned = []
-        for content in self.manager.contents_manager._union_of_contents_query(history).all():
+        keys = self.history_contents_serializer.views["summary"]
+        for content in self.manager.contents_manager.contents_rows(history, keys):
             serialized = self.history_contents_serializer.serialize_to_view(
                 content, view="summary", trans=trans, user=user
             )
@@ -8,10 +8,14 @@ import logging
 from typing import (
     Any,
     Dict,
+    Iterable,
     List,
+    Optional,
+    Tuple,
 )
 
 from sqlalchemy import (
+    and_,
     asc,
     cast,
     desc,
@@ -21,6 +25,8 @@ from sqlalchemy import (
     literal,
     nullsfirst,
     nullslast,
+    or_,
+    Row,
     select,
     Select,
     sql,
@@ -31,6 +37,7 @@ from sqlalchemy.orm import (
     joinedload,
     undefer,
 )
+from sqlalchemy.sql import operators
 
 from galaxy import (
     exceptions as glx_exceptions,
@@ -59,6 +66,14 @@ from .base import (
 log = logging.getLogger(__name__)
 
 
+def _order_by_column_name(order_by) -> str:
+    """Return the name of the column an order_by of `parse_order_by` sorts on."""
+    # e.g. nullslast(desc("size")) -> desc("size") -> "size"
+    while not isinstance(order_by, str):
+        order_by = order_by.element
+    return order_by
+
+
 # into its own class to have it's own filters, etc.
 # TODO: but can't inherit from model manager (which assumes only one model)
 class HistoryContentsManager(base.SortableManager):
@@ -105,6 +120,10 @@ class HistoryContentsManager(base.SortableManager):
     def contents(self, container, filters=None, limit=None, offset=None, order_by=None, **kwargs):
         """
         Returns a list of both/all types of contents, filtered and in some order.
+
+        Pass the hid of the last item of a page as `after_hid`, and its
+        `(history_content_type, id)` as `after_item`, to get the next page of
+        contents ordered by hid instead of an `offset`.
         """
         # TODO?: we could branch here based on 'if limit is None and offset is None' - to a simpler (non-union) query
         # for now, I'm just using this (even for non-limited/offset queries) to reduce code paths
@@ -112,6 +131,38 @@ class HistoryContentsManager(base.SortableManager):
             container, filters=filters, limit=limit, offset=offset, order_by=order_by, **kwargs
         )
 
+    def contents_rows(
+        self,
+        container,
+        keys: Iterable[str],
+        filters=None,
+        limit=None,
+        offset=None,
+        order_by=None,
+        **kwargs,
+    ) -> List[Row]:
+        """
+        Returns rows of the given common column `keys` of both/all types of
+        contents, filtered and in some order, without loading any models.
+
+        Only the columns needed for `keys` and the order are selected. Rows can be
+        serialized with `HistoryContentsSerializer`, filters that need the models
+        (of `filter_type` "function") are not supported.
+        """
+        filters = filters or []
+        if any(filter_fn.filter_type == "function" for filter_fn in filters):
+            raise glx_exceptions.RequestParameterInvalidException("Contents rows can only be filtered by columns")
+        columns = {"history_content_type", "id"}
+        columns.update(keys)
+        unknown_columns = columns.difference(self.common_columns)
+        if unknown_columns:
+            raise glx_exceptions.RequestParameterInvalidException(
+                "Unknown contents columns", columns=sorted(unknown_columns), available=self.common_columns
+            )
+        return self._union_of_contents_query(
+            container, filters=filters, limit=limit, offset=offset, order_by=order_by, columns=columns, **kwargs
+        ).all()
+
     def contents_count(self, container, filters=None, limit=None, offset=None, order_by=None, **kwargs):
         """
         Returns a count of both/all types of contents, based on the given filters.
@@ -275,14 +326,38 @@ class HistoryContentsManager(base.SortableManager):
         return True
 
     def _union_of_contents_query(
-        self, container, filters=None, limit=None, offset=None, order_by=None, user_id=None, **kwargs
+        self,
+        container,
+        filters=None,
+        limit=None,
+        offset=None,
+        order_by=None,
+        user_id=None,
+        after_hid: Optional[int] = None,
+        after_item: Optional[Tuple[str, int]] = None,
+        columns: Optional[Iterable[str]] = None,
+        **kwargs,
     ):
         """
         Returns a query for a limited and offset list of both types of contents,
         filtered and in some order.
+
+        With `after_hid` only contents after that hid in the hid order are
+        returned, the query uses an index instead of counting rows to skip like
+        an offset. Several contents can share a hid (e.g. copied datasets), so
+        contents are then ordered by hid, `history_content_type` and id, and
+        `after_item` is the `(history_content_type, id)` of the last item of the
+        previous page. Without it all contents with `after_hid` are skipped.
+        With `columns` only these (and the ordered by) columns are selected.
         """
         order_by = order_by if order_by is not None else self.default_order_by
         order_by = order_by if isinstance(order_by, (tuple, list)) else (order_by,)
+        if after_hid is not None:
+            descending = self._hid_order_descending(order_by)
+            order_by = self._hid_order(descending)
+        elif len(order_by) == 1 and _order_by_column_name(order_by[0]) == "hid":
+            # Several contents can share a hid, order these the same way as pages after a hid
+            order_by = self._hid_order(self._hid_order_descending(order_by))
 
         # TODO: 3 queries and 3 iterations over results - this is undoubtedly better solved in the actual SQL layer
         # via one common table for contents, Some Yonder Resplendent and Fanciful Join, or ORM functionality
@@ -311,6 +386,43 @@ class HistoryContentsManager(base.SortableManager):
                 contained_query = self._apply_orm_filter(contained_query, orm_filter)
                 subcontainer_query = self._apply_orm_filter(subcontainer_query, orm_filter)
 
+        if after_hid is not None:
+            if container is None:
+                raise glx_exceptions.RequestParameterInvalidException("after_hid requires a history")
+            contained_query = contained_query.filter(
+                self._after_condition(
+                    self.contained_class, self.contained_class_type_name, after_hid, after_item, descending
+                )
+            )
+            subcontainer_query = subcontainer_query.filter(
+                self._after_condition(
+                    self.subcontainer_class, self.subcontainer_class_type_name, after_hid, after_item, descending
+                )
+            )
+
+        if columns is not None:
+            # Filters are already applied, only the selected columns are replaced
+            selected = set(columns).union(_order_by_column_name(order) for order in order_by)
+            contained_query = self._select_common_columns(contained_query, selected)
+            subcontainer_query = self._select_common_columns(subcontainer_query, selected)
+
+        if after_hid is not None and limit is not None and offset is None:
+            # A page has at most `limit` items of each class, read these in hid
+            # order (from the index) instead of sorting all following contents.
+            direction = desc if descending else asc
+            contained_table = self.contained_class.table
+            contained_query = contained_query.order_by(
+                direction(contained_table.c.hid), direction(contained_table.c.id)
+            )
+            subcontainer_query = subcontainer_query.order_by(
+                direction(self.subcontainer_class.hid), direction(self.subcontainer_class.id)
+            )
+            # Limited queries can only be combined as subqueries
+            contained_page = contained_query.limit(limit).subquery()
+            subcontainer_page = subcontainer_query.limit(limit).subquery()
+            contained_query = self._session().query(*(column.label(column.name) for column in contained_page.c))
+            subcontainer_query = self._session().query(*(column.label(column.name) for column in subcontainer_page.c))
+
         contents_query = contained_query.union_all(subcontainer_query)
         contents_query = contents_query.order_by(*order_by)
 
@@ -320,6 +432,44 @@ class HistoryContentsManager(base.SortableManager):
             contents_query = contents_query.offset(offset)
         return contents_query
 
+    def _after_condition(self, component_class, type_name, after_hid, after_item, descending):
+        """Condition selecting contents of `component_class` after the cursor in (hid, type, id) order."""
+        after = operators.lt if descending else operators.gt
+        after_or_same = operators.le if descending else operators.ge
+        hid = component_class.hid
+        if after_item is None:
+            return after(hid, after_hid)
+        after_type, after_id = after_item
+        if type_name == after_type:
+            same_hid_after = after(component_class.id, after_id)
+        elif after(type_name, after_type):
+            # All contents of this type with the same hid come after the cursor
+            return after_or_same(hid, after_hid)
+        else:
+            return after(hid, after_hid)
+        # Not written as an OR of both cases, to use the (history_id, hid) index
+        return and_(after_or_same(hid, after_hid), or_(after(hid, after_hid), same_hid_after))
+
+    def _hid_order(self, descending: bool):
+        """Order by hid and, for contents sharing a hid, by type and id."""
+        direction = desc if descending else asc
+        return (direction("hid"), direction("history_content_type"), direction("id"))
+
+    def _hid_order_descending(self, order_by) -> bool:
+        """Return whether contents are ordered by descending hid, raise if not ordered by hid."""
+        first_order = order_by[0]
+        if _order_by_column_name(first_order) == "hid":
+            if isinstance(first_order, str):
+                return False
+            if first_order.modifier in (operators.asc_op, operators.desc_op):
+                return first_order.modifier is operators.desc_op
+        raise glx_exceptions.RequestParameterInvalidException("after_hid requires contents to be ordered by hid")
+
+    def _select_common_columns(self, qry, column_names):
+        """Select only the common columns in `column_names` in the same order for each content class."""
+        columns_by_name = {column["name"]: column["expr"] for column in qry.column_descriptions}
+        return qry.with_entities(*(columns_by_name[name] for name in self.common_columns if name in column_names))
+
     def _apply_orm_filter(self, qry, orm_filter):
         if isinstance(orm_filter.filter, sql.elements.BinaryExpression):
             for match in filter(lambda col: col["name"] == orm_filter.filter.left.name, qry.column_descriptions):
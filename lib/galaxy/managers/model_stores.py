@@ -16,6 +16,7 @@ from galaxy.model.store import (
     DirectoryModelExportStore,
     ImportDiscardedDataType,
     ImportOptions,
+    ImportProgressCallback,
     ObjectImportTracker,
     source_to_import_store,
 )
@@ -263,9 +264,12 @@ class ModelStoreManager:
             export_metadata.result_data = ExportObjectResultMetadata(success=success, error=error)
             self._export_tracker.set_export_association_metadata(export_association_id, export_metadata)
 
-    def import_model_store(self, request: ImportModelStoreTaskRequest):
+    def import_model_store(
+        self, request: ImportModelStoreTaskRequest, progress: Optional[ImportProgressCallback] = None
+    ):
         import_options = ImportOptions(
             allow_library_creation=request.for_library,
+            copy_threads=self._app.config.model_store_import_copy_threads,
         )
         if history_id := request.history_id:
             history = self._sa_session.get(model.History, history_id)
@@ -284,12 +288,13 @@ class ModelStoreManager:
             if not model_import_store.defines_new_history():
                 raise RequestParameterInvalidException("Supplied model store doesn't define new history to import.")
             with model_import_store.target_history(legacy_history_naming=False) as new_history:
-                object_tracker = model_import_store.perform_import(new_history, new_history=True)
+                object_tracker = model_import_store.perform_import(new_history, new_history=True, progress=progress)
                 object_tracker.new_history = new_history
         else:
             object_tracker = model_import_store.perform_import(
                 history=history,
                 new_history=create_new_history,
+                progress=progress,
             )
         return object_tracker
 
@@ -309,6 +314,7 @@ def create_objects_from_store(
     import_options = ImportOptions(
         discarded_data=ImportDiscardedDataType.FORCE,
         allow_library_creation=for_library,
+        copy_threads=app.config.model_store_import_copy_threads,
     )
     user_context = ModelStoreUserContext(app, galaxy_user) if galaxy_user is not None else None
     model_import_store = source_to_import_store(
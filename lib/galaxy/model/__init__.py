@@ -747,6 +747,94 @@ def calculate_disk_usage_per_objectstore(sa_session, user_id: int):
     return sa_session.execute(text(statement), params).all()
 
 
+# The datasets of a user are read in batches of dataset ids, the last id of
+# the next batch is found first and the usage of the datasets up to that id
+# is summed up next.
+USER_DATASETS_BATCH_END = """
+SELECT MAX(dataset_id)
+FROM (
+    SELECT DISTINCT history_dataset_association.dataset_id
+    FROM history_dataset_association
+    JOIN history ON history.id = history_dataset_association.history_id
+    WHERE history.user_id = :id
+        AND NOT history.purged
+        AND NOT history_dataset_association.purged
+        AND history_dataset_association.dataset_id > :after_dataset_id
+    ORDER BY history_dataset_association.dataset_id
+    LIMIT :batch_size
+) AS batch
+"""
+
+USER_DATASETS_BATCH_USAGE_PER_OBJECTSTORE = """
+WITH batch_datasets AS (
+    SELECT DISTINCT history_dataset_association.dataset_id
+    FROM history_dataset_association
+    JOIN history ON history.id = history_dataset_association.history_id
+    WHERE history.user_id = :id
+        AND NOT history.purged
+        AND NOT history_dataset_association.purged
+        AND history_dataset_association.dataset_id > :after_dataset_id
+        AND history_dataset_association.dataset_id <= :last_dataset_id
+)
+SELECT SUM(COALESCE(dataset.total_size, dataset.file_size, 0)) as usage, dataset.object_store_id
+FROM dataset
+LEFT OUTER JOIN library_dataset_dataset_association ON dataset.id = library_dataset_dataset_association.dataset_id
+WHERE dataset.id IN (SELECT dataset_id FROM batch_datasets)
+    AND library_dataset_dataset_association.id IS NULL
+GROUP BY dataset.object_store_id
+"""
+
+DISK_USAGE_BATCH_SIZE = 10000
+
+
+def calculate_disk_usage_per_objectstore_in_batches(
+    sa_session, user_id: int, batch_size: int = DISK_USAGE_BATCH_SIZE
+) -> Dict[Optional[str], int]:
+    """Return the disk usage of a user per object store id like `calculate_disk_usage_per_objectstore`.
+
+    Each statement only reads `batch_size` datasets, so the usage of users
+    with millions of datasets is calculated without a statement running for
+    minutes.
+    """
+    usage: Dict[Optional[str], int] = {}
+    after_dataset_id = 0
+    while True:
+        params = {"id": user_id, "after_dataset_id": after_dataset_id, "batch_size": batch_size}
+        last_dataset_id = sa_session.scalar(text(USER_DATASETS_BATCH_END), params)
+        if last_dataset_id is None:
+            return usage
+        params["last_dataset_id"] = last_dataset_id
+        for row in sa_session.execute(text(USER_DATASETS_BATCH_USAGE_PER_OBJECTSTORE), params):
+            usage[row.object_store_id] = usage.get(row.object_store_id, 0) + int(row.usage or 0)
+        after_dataset_id = last_dataset_id
+
+
+def disk_usage_per_quota_source(
+    usage_per_object_store: Dict[Optional[str], int], quota_source_map
+) -> Tuple[int, Dict[str, int]]:
+    """Return the default disk usage and the usage per quota source label.
+
+    The object store ids are assigned to quota sources like the conditions of
+    `calculate_user_disk_usage_statements` do.
+    """
+    default_quota_enabled = quota_source_map.default_quota_enabled
+    default_exclude_ids = set(quota_source_map.default_usage_excluded_ids())
+    default_usage = 0
+    for object_store_id, usage in usage_per_object_store.items():
+        if not default_exclude_ids:
+            default_usage += usage
+        elif object_store_id is None:
+            if default_quota_enabled:
+                default_usage += usage
+        elif object_store_id not in default_exclude_ids:
+            default_usage += usage
+    usage_per_label = {
+        label: sum(usage_per_object_store.get(object_store_id, 0) for object_store_id in object_store_ids)
+        for label, object_store_ids in quota_source_map.ids_per_quota_source().items()
+    }
+    return default_usage, usage_per_label
+
+
 # move these to galaxy.schema.schema once galaxy-data depends on
 # galaxy-schema.
 class UserQuotaBasicUsage(BaseModel):
@@ -1152,20 +1240,22 @@ ON CONFLICT
         assert object_store is not None
         quota_source_map = object_store.get_quota_source_map()
         sa_session = object_session(self)
-        for_sqlite = "sqlite" in sa_session.bind.dialect.name
-        statements = calculate_user_disk_usage_statements(self.id, quota_source_map, for_sqlite)
-        for sql, args in statements:
-            statement = text(sql)
-            binds = []
-            for key, _ in args.items():
-                expand_binding = key.endswith("s")
-                binds.append(bindparam(key, expanding=expand_binding))
-            statement = statement.bindparams(*binds)
-            sa_session.execute(statement, args)
-            # expire user.disk_usage so sqlalchemy knows to ignore
-            # the existing value - we're setting it in raw SQL for
-            # performance reasons and bypassing object properties.
-            sa_session.expire(self, ["disk_usage"])
+        # The usage is calculated in batches before any row is updated, the
+        # user's usage rows are only locked for the short update at the end.
+        usage_per_object_store = calculate_disk_usage_per_objectstore_in_batches(sa_session, self.id)
+        default_usage, usage_per_label = disk_usage_per_quota_source(usage_per_object_store, quota_source_map)
+        # Usages may have been adjusted on another connection in the meantime
+        sa_session.expire(self, ["disk_usage", "quota_source_usages"])
+        self.disk_usage = default_usage
+        quota_source_usages = {usage.quota_source_label: usage for usage in self.quota_source_usages}
+        for quota_source_label, disk_usage in usage_per_label.items():
+            quota_source_usage = quota_source_usages.pop(quota_source_label, None)
+            if quota_source_usage is None:
+                quota_source_usage = UserQuotaSourceUsage(user=self, quota_source_label=quota_source_label)
+                sa_session.add(quota_source_usage)
+            quota_source_usage.disk_usage = disk_usage
+        for unused_quota_source_usage in quota_source_usages.values():
+            sa_session.delete(unused_quota_source_usage)
         with transaction(sa_session):
             sa_session.commit()
 
@@ -6867,6 +6957,7 @@ class HistoryDatasetCollectionAssociation(
     """Associates a DatasetCollection with a History."""
 
     __tablename__ = "history_dataset_collection_association"
+    __table_args__ = (Index("ix_history_dataset_collection_association_history_id_hid", "history_id", "hid"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     collection_id: Mapped[Optional[int]] = mapped_column(ForeignKey("dataset_collection.id"), index=True)
@@ -8530,6 +8621,8 @@ class WorkflowInvocation(Base, UsesCreateAndUpdateTime, Dictifiable, Serializabl
     handler: Mapped[Optional[str]] = mapped_column(TrimmedString(255), index=True)
     uuid: Mapped[Optional[Union[UUID, str]]] = mapped_column(UUIDType())
     history_id: Mapped[Optional[int]] = mapped_column(ForeignKey("history.id"), index=True)
+    # Maps ids of steps blocked on a delayed step to the id of that step, see WorkflowProgress.
+    scheduling_frontier: Mapped[Optional[Dict[str, int]]] = mapped_column(MutableJSONType)
 
     history = relationship("History", back_populates="workflow_invocations")
     input_parameters = relationship(
@@ -8745,7 +8838,7 @@ class WorkflowInvocation(Base, UsesCreateAndUpdateTime, Dictifiable, Serializabl
         return list(sa_session.scalars(stmt))
 
     @staticmethod
-    def poll_active_workflow_ids(engine, scheduler=None, handler=None):
+    def _active_workflow_conditions(scheduler=None, handler=None):
         and_conditions = [
             or_(
                 WorkflowInvocation.state == WorkflowInvocation.states.NEW,
@@ -8757,12 +8850,19 @@ class WorkflowInvocation(Base, UsesCreateAndUpdateTime, Dictifiable, Serializabl
             and_conditions.append(WorkflowInvocation.scheduler == scheduler)
         if handler is not None:
             and_conditions.append(WorkflowInvocation.handler == handler)
+        return and_(*and_conditions)
 
-        stmt = select(WorkflowInvocation.id).filter(and_(*and_conditions)).order_by(WorkflowInvocation.id.asc())
-        # Immediately just load all ids into memory so time slicing logic
-        # is relatively intutitive.
+    @staticmethod
+    def poll_active_workflow_invocations(engine, scheduler=None, handler=None):
+        """Return ``(id, history_id, user_id)`` rows of active invocations, ordered by id."""
+        stmt = (
+            select(WorkflowInvocation.id, WorkflowInvocation.history_id, History.user_id)
+            .outerjoin(History, WorkflowInvocation.history_id == History.id)
+            .filter(WorkflowInvocation._active_workflow_conditions(scheduler, handler))
+            .order_by(WorkflowInvocation.id.asc())
+        )
         with engine.connect() as conn:
-            return conn.scalars(stmt).all()
+            return [tuple(row) for row in conn.execute(stmt)]
 
     def add_output(self, workflow_output, step, output_object):
         if not hasattr(output_object, "history_content_type"):
@@ -11372,6 +11472,7 @@ HistoryDatasetAssociation.table = Table(
     Column(
         "hidden_beneath_collection_instance_id", ForeignKey("history_dataset_collection_association.id"), nullable=True
     ),
+    Index("ix_history_dataset_association_history_id_hid", "history_id", "hid"),
 )
 
 LibraryDatasetDatasetAssociation.table = Table(
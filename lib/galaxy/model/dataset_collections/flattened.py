@@ -0,0 +1,158 @@
+"""Flattened views of nested dataset collections loaded with a single query."""
+
+from collections import defaultdict
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from sqlalchemy import (
+    and_,
+    literal,
+    select,
+)
+from sqlalchemy.orm import object_session
+
+from galaxy.model import (
+    Dataset,
+    DatasetCollection,
+    DatasetCollectionElement,
+    HistoryDatasetAssociation,
+)
+
+
+class FlattenedCollection:
+    """The elements of a nested dataset collection down to ``depth`` in flat lists.
+
+    Elements are listed depth first in ``element_index`` order, so the
+    elements of a ``list:paired`` collection are the first pair followed by
+    its forward and reverse elements, the second pair and so on. The lists
+    are parallel, the element at ``position`` has ``depths[position]``,
+    ``element_identifiers[position]`` etc.. ``states`` holds the state of the
+    dataset of dataset elements and the populated state of subcollections.
+    """
+
+    def __init__(self, collection_id: int, depth: int):
+        self.collection_id = collection_id
+        self.depth = depth
+        self.depths: List[int] = []
+        self.parents: List[Optional[int]] = []
+        self.element_ids: List[int] = []
+        self.element_identifiers: List[str] = []
+        self.child_collection_ids: List[Optional[int]] = []
+        self.hda_ids: List[Optional[int]] = []
+        self.ldda_ids: List[Optional[int]] = []
+        self.states: List[Optional[str]] = []
+        # Only loaded for the elements at ``depth``
+        self.elements: List[Optional[DatasetCollectionElement]] = []
+        self._children: Dict[Optional[int], List[int]] = defaultdict(list)
+
+    def __len__(self):
+        return len(self.element_ids)
+
+    @staticmethod
+    def for_collection(
+        collection: DatasetCollection, depth: Optional[int] = None, with_elements: bool = False
+    ) -> Optional["FlattenedCollection"]:
+        """Load the elements of ``collection`` down to ``depth`` (all levels by default).
+
+        With ``with_elements`` the ``DatasetCollectionElement`` objects at
+        ``depth`` are loaded by the same query. Returns ``None`` if the
+        collection's elements cannot be queried, e.g. the collection is not
+        flushed or has elements that are not flushed yet.
+        """
+        if not isinstance(collection, DatasetCollection):
+            return None
+        session = object_session(collection)
+        if session is None or collection.id is None:
+            return None
+        if any(isinstance(obj, (DatasetCollection, DatasetCollectionElement)) for obj in session.new):
+            return None
+        if depth is None:
+            depth = len(collection.collection_type.split(":"))
+
+        dce = DatasetCollectionElement.__table__
+        columns = (
+            dce.c.id,
+            dce.c.dataset_collection_id,
+            dce.c.element_index,
+            dce.c.element_identifier,
+            dce.c.child_collection_id,
+            dce.c.hda_id,
+            dce.c.ldda_id,
+        )
+        elements_cte = (
+            select(*columns, literal(1).label("depth"))
+            .where(dce.c.dataset_collection_id == collection.id)
+            .cte("flattened_elements", recursive=True)
+        )
+        child_dce = dce.alias()
+        elements_cte = elements_cte.union_all(
+            select(*(child_dce.c[column.name] for column in columns), (elements_cte.c.depth + 1).label("depth")).where(
+                and_(
+                    child_dce.c.dataset_collection_id == elements_cte.c.child_collection_id,
+                    elements_cte.c.depth < depth,
+                )
+            )
+        )
+        child_collection = DatasetCollection.__table__.alias()
+        stmt = (
+            select(elements_cte, Dataset.state, child_collection.c.populated_state)
+            .outerjoin(HistoryDatasetAssociation, HistoryDatasetAssociation.id == elements_cte.c.hda_id)
+            .outerjoin(Dataset, Dataset.id == HistoryDatasetAssociation.dataset_id)
+            .outerjoin(child_collection, child_collection.c.id == elements_cte.c.child_collection_id)
+        )
+        if with_elements:
+            stmt = stmt.add_columns(DatasetCollectionElement).outerjoin(
+                DatasetCollectionElement,
+                and_(DatasetCollectionElement.id == elements_cte.c.id, elements_cte.c.depth == depth),
+            )
+
+        # A subcollection shared by several elements is listed once per element
+        rows_by_collection_id: Dict[int, Dict[int, Any]] = defaultdict(dict)
+        for row in session.execute(stmt):
+            rows_by_collection_id[row.dataset_collection_id][row.id] = row
+        flattened = FlattenedCollection(collection.id, depth)
+        flattened._add_rows(rows_by_collection_id, collection.id, None)
+        return flattened
+
+    def _add_rows(self, rows_by_collection_id, collection_id: int, parent: Optional[int]) -> None:
+        rows = rows_by_collection_id.get(collection_id, {}).values()
+        for row in sorted(rows, key=lambda row: row.element_index):
+            position = len(self.element_ids)
+            self.depths.append(row.depth)
+            self.parents.append(parent)
+            self.element_ids.append(row.id)
+            self.element_identifiers.append(row.element_identifier)
+            self.child_collection_ids.append(row.child_collection_id)
+            self.hda_ids.append(row.hda_id)
+            self.ldda_ids.append(row.ldda_id)
+            self.states.append(row.state if row.child_collection_id is None else row.populated_state)
+            self.elements.append(getattr(row, "DatasetCollectionElement", None))
+            self._children[parent].append(position)
+            if row.child_collection_id is not None and row.depth < self.depth:
+                self._add_rows(rows_by_collection_id, row.child_collection_id, position)
+
+    def children(self, position: Optional[int] = None) -> List[int]:
+        """Return the positions of the elements of the subcollection at ``position``, top-level elements by default."""
+        return self._children.get(position, [])
+
+    def positions_at_depth(self, depth: Optional[int] = None) -> List[int]:
+        depth = depth or self.depth
+        return [position for position, element_depth in enumerate(self.depths) if element_depth == depth]
+
+    def elements_at_depth(self) -> List[Optional[DatasetCollectionElement]]:
+        """Return the elements at ``depth``, these are only loaded ``with_elements``."""
+        return [self.elements[position] for position in self.positions_at_depth()]
+
+    def identifier_path(self, position: int) -> Tuple[str, ...]:
+        """Return the element identifiers of the element at ``position`` and its parents, outermost first."""
+        path = []
+        current: Optional[int] = position
+        while current is not None:
+            path.append(self.element_identifiers[current])
+            current = self.parents[current]
+        return tuple(reversed(path))
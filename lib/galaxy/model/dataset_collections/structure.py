@@ -3,6 +3,8 @@
 
 import logging
 
+from .flattened import FlattenedCollection
+
 log = logging.getLogger(__name__)
 
 
@@ -71,6 +73,11 @@ class Tree(BaseTree):
 
     @staticmethod
     def for_dataset_collection(dataset_collection, collection_type_description):
+        flattened = FlattenedCollection.for_collection(
+            dataset_collection, depth=len(collection_type_description.collection_type.split(":"))
+        )
+        if flattened is not None:
+            return Tree.for_flattened_collection(flattened, collection_type_description)
         children = []
         for element in dataset_collection.elements:
             if collection_type_description.has_subcollections():
@@ -86,8 +93,46 @@ class Tree(BaseTree):
                 children.append((element.element_identifier, leaf))
         return Tree(children, collection_type_description)
 
+    @staticmethod
+    def for_flattened_collection(flattened, collection_type_description, position=None):
+        children = []
+        for child_position in flattened.children(position):
+            element_identifier = flattened.element_identifiers[child_position]
+            if collection_type_description.has_subcollections():
+                subcollection_type_description = collection_type_description.subcollection_type_description()
+                tree = Tree.for_flattened_collection(flattened, subcollection_type_description, child_position)
+                children.append((element_identifier, tree))
+            else:
+                children.append((element_identifier, leaf))
+        return Tree(children, collection_type_description)
+
     def walk_collections(self, hdca_dict):
-        return self._walk_collections(dict_map(lambda hdca: hdca.collection, hdca_dict))
+        collection_dict = dict_map(lambda hdca: hdca.collection, hdca_dict)
+        depth = len(self.collection_type_description.collection_type.split(":"))
+        flattened_dict = dict_map(
+            lambda collection: FlattenedCollection.for_collection(collection, depth=depth, with_elements=True),
+            collection_dict,
+        )
+        if all(flattened is not None for flattened in flattened_dict.values()):
+            return self._walk_flattened_collections(dict_map(lambda f: f.elements_at_depth(), flattened_dict))
+        return self._walk_collections(collection_dict)
+
+    def _walk_flattened_collections(self, elements_dict):
+        # The elements below each top-level element are consecutive in the flattened elements
+        start = 0
+        for index, (_identifier, substructure) in enumerate(self.children):
+            when_value = self._when_value(index)
+            end = start + len(substructure)
+            for position in range(start, end):
+                yield dict_map(lambda elements: elements[position], elements_dict), when_value  # noqa: B023
+            start = end
+
+    def _when_value(self, index):
+        if self.when_values:
+            if len(self.when_values) == 1:
+                return self.when_values[0]
+            return self.when_values[index]
+        return None
 
     def _walk_collections(self, collection_dict):
         for index, (_identifier, substructure) in enumerate(self.children):
@@ -95,12 +140,7 @@ class Tree(BaseTree):
             def get_element(collection):
                 return collection[index]  # noqa: B023
 
-            when_value = None
-            if self.when_values:
-                if len(self.when_values) == 1:
-                    when_value = self.when_values[0]
-                else:
-                    when_value = self.when_values[index]
+            when_value = self._when_value(index)
 
             if substructure.is_leaf:
                 yield dict_map(get_element, collection_dict), when_value
@@ -1,4 +1,5 @@
 from galaxy import exceptions
+from .flattened import FlattenedCollection
 
 
 def split_dataset_collection_instance(dataset_collection_instance, collection_type):
@@ -11,6 +12,13 @@ def _split_dataset_collection(dataset_collection, collection_type):
     if not this_collection_type.endswith(collection_type) or this_collection_type == collection_type:
         raise exceptions.MessageException("Cannot split collection in desired fashion.")
 
+    depth = len(this_collection_type.split(":")) - len(collection_type.split(":"))
+    flattened = FlattenedCollection.for_collection(dataset_collection, depth=depth, with_elements=True)
+    if flattened is not None:
+        if None in flattened.child_collection_ids:
+            raise exceptions.MessageException("Cannot split collection in desired fashion.")
+        return flattened.elements_at_depth()
+
     split_elements = []
     for element in dataset_collection.elements:
         child_collection = element.child_collection
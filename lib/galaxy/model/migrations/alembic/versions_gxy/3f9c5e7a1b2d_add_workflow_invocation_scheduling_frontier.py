@@ -0,0 +1,33 @@
+"""add workflow_invocation.scheduling_frontier column
+
+Revision ID: 3f9c5e7a1b2d
+Revises: eee9229a9765
+Create Date: 2026-10-18 10:12:41.533092
+
+"""
+
+from sqlalchemy import Column
+
+from galaxy.model.custom_types import MutableJSONType
+from galaxy.model.migrations.util import (
+    add_column,
+    drop_column,
+)
+
+# revision identifiers, used by Alembic.
+revision = "3f9c5e7a1b2d"
+down_revision = "eee9229a9765"
+branch_labels = None
+depends_on = None
+
+# database object names used in this revision
+table_name = "workflow_invocation"
+column_name = "scheduling_frontier"
+
+
+def upgrade():
+    add_column(table_name, Column(column_name, MutableJSONType))
+
+
+def downgrade():
+    drop_column(table_name, column_name)
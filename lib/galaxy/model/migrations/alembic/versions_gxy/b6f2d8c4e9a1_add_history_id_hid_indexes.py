@@ -0,0 +1,36 @@
+"""Add indexes on history_id and hid of history items
+
+Revision ID: b6f2d8c4e9a1
+Revises: 3f9c5e7a1b2d
+Create Date: 2026-10-18 14:02:17.215338
+
+"""
+
+from galaxy.model.database_object_names import build_index_name
+from galaxy.model.migrations.util import (
+    create_index,
+    drop_index,
+)
+
+# revision identifiers, used by Alembic.
+revision = "b6f2d8c4e9a1"
+down_revision = "3f9c5e7a1b2d"
+branch_labels = None
+depends_on = None
+
+
+hda_table_name = "history_dataset_association"
+hdca_table_name = "history_dataset_collection_association"
+columns = ["history_id", "hid"]
+hda_index_name = build_index_name(hda_table_name, columns)
+hdca_index_name = build_index_name(hdca_table_name, columns)
+
+
+def upgrade():
+    create_index(hda_index_name, hda_table_name, columns)
+    create_index(hdca_index_name, hdca_table_name, columns)
+
+
+def downgrade():
+    drop_index(hdca_index_name, hdca_table_name)
+    drop_index(hda_index_name, hda_table_name)
@@ -4,12 +4,18 @@ from datetime import (
     datetime,
     timedelta,
 )
-from typing import List
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Set,
+)
 
 from sqlalchemy import (
     and_,
     false,
     func,
+    insert,
     not_,
     or_,
     select,
@@ -508,7 +514,7 @@ class GalaxyRBACAgent(RBACAgent):
         return retval
 
     def can_access_datasets(self, user_roles, action_tuples):
-        user_role_ids = [galaxy.model.cached_id(r) for r in user_roles]
+        user_role_ids = {galaxy.model.cached_id(r) for r in user_roles}
 
         # For DATASET_ACCESS, user must have ALL associated roles
         for action, user_role_id in action_tuples:
@@ -518,6 +524,33 @@ class GalaxyRBACAgent(RBACAgent):
 
         return True
 
+    def get_dataset_access_role_ids(self, dataset_ids: Iterable[int]) -> Dict[int, Set[int]]:
+        """
+        Return a mapping of the ids of the given datasets that are not public
+        to the ids of the roles a user must have all of to access them. The
+        permissions of all datasets are read with a single query.
+        """
+        stmt = select(DatasetPermissions.dataset_id, DatasetPermissions.role_id).where(
+            and_(
+                DatasetPermissions.dataset_id.in_(dataset_ids),
+                DatasetPermissions.action == self.permitted_actions.DATASET_ACCESS.action,
+            )
+        )
+        access_role_ids: Dict[int, Set[int]] = {}
+        for dataset_id, role_id in self.sa_session.execute(stmt):
+            access_role_ids.setdefault(dataset_id, set()).add(role_id)
+        return access_role_ids
+
+    def can_access_dataset_ids(self, user_roles, dataset_ids: Iterable[int]) -> Dict[int, bool]:
+        """
+        Bulk version of `can_access_dataset`, return a mapping of the given
+        dataset ids to whether a user with `user_roles` can access them.
+        """
+        dataset_ids = set(dataset_ids)
+        user_role_ids = {galaxy.model.cached_id(role) for role in user_roles}
+        access_role_ids = self.get_dataset_access_role_ids(dataset_ids)
+        return {dataset_id: access_role_ids.get(dataset_id, set()) <= user_role_ids for dataset_id in dataset_ids}
+
     def can_access_collection(self, user_roles: List[galaxy.model.Role], collection: galaxy.model.DatasetCollection):
         action_tuples = collection.dataset_action_tuples
         if not self.can_access_datasets(user_roles, action_tuples):
@@ -948,6 +981,38 @@ WHERE history.user_id != :user_id and history_dataset_association.dataset_id = :
                 self.sa_session.commit()
         return ""
 
+    def set_new_datasets_permissions(self, datasets, permissions):
+        """
+        Set the same full permissions on many new datasets with a single batched insert.
+        The datasets must have been flushed and must not have any permissions yet.
+        Permission looks like: { Action : [ Role, Role ] }
+        """
+        # Make sure that DATASET_MANAGE_PERMISSIONS is associated with at least 1 role
+        has_dataset_manage_permissions = False
+        permissions = permissions or {}
+        for _ in _walk_action_roles(permissions, self.permitted_actions.DATASET_MANAGE_PERMISSIONS):
+            has_dataset_manage_permissions = True
+            break
+        if not has_dataset_manage_permissions:
+            return "At least 1 role must be associated with manage permissions on this dataset."
+        role_actions = []
+        for action, roles in permissions.items():
+            if isinstance(action, Action):
+                action = action.action
+            for role in roles:
+                role_actions.append((action, role.id if hasattr(role, "id") else role))
+        rows = [
+            {"action": action, "dataset_id": dataset.id, "role_id": role_id}
+            for dataset in datasets
+            for action, role_id in role_actions
+        ]
+        if rows:
+            self.sa_session.execute(insert(DatasetPermissions.table), rows)
+            for dataset in datasets:
+                # Don't keep a (possibly loaded) empty collection around
+                self.sa_session.expire(dataset, ["actions"])
+        return ""
+
     def set_dataset_permission(self, dataset, permission=None):
         """
         Set a specific permission on a dataset, leaving all other current permissions on the dataset alone.
@@ -1571,6 +1636,51 @@ WHERE history.user_id != :user_id and history_dataset_association.dataset_id = :
         return False, hidden_folder_ids
 
 
+class DatasetAccessCache:
+    """
+    Answer whether a user can access datasets, reading the permissions of all
+    datasets not checked before with a single query.
+
+    The role ids of the user and the access role ids of every dataset checked
+    are kept, so a cache should not outlive the request it was created for.
+    """
+
+    def __init__(self, security_agent: GalaxyRBACAgent, user_roles: List[Role]):
+        self.security_agent = security_agent
+        self.user_role_ids = {galaxy.model.cached_id(role) for role in user_roles}
+        self.public_dataset_ids: Set[int] = set()
+        self.access_role_ids: Dict[int, Set[int]] = {}
+
+    def prefetch(self, dataset_ids: Iterable[int]) -> None:
+        """Read the permissions of the given datasets that are not cached yet."""
+        missing = {
+            dataset_id
+            for dataset_id in dataset_ids
+            if dataset_id not in self.public_dataset_ids and dataset_id not in self.access_role_ids
+        }
+        if missing:
+            access_role_ids = self.security_agent.get_dataset_access_role_ids(missing)
+            self.access_role_ids.update(access_role_ids)
+            self.public_dataset_ids.update(missing.difference(access_role_ids))
+
+    def forget(self, dataset_ids: Iterable[int]) -> None:
+        """Drop the cached permissions of datasets, e.g. after changing them."""
+        for dataset_id in dataset_ids:
+            self.public_dataset_ids.discard(dataset_id)
+            self.access_role_ids.pop(dataset_id, None)
+
+    def can_access_datasets(self, dataset_ids: Iterable[int]) -> Dict[int, bool]:
+        dataset_ids = set(dataset_ids)
+        self.prefetch(dataset_ids)
+        return {
+            dataset_id: dataset_id in self.public_dataset_ids or self.access_role_ids[dataset_id] <= self.user_role_ids
+            for dataset_id in dataset_ids
+        }
+
+    def can_access_dataset(self, dataset_id: int) -> bool:
+        return self.can_access_datasets((dataset_id,))[dataset_id]
+
+
 class HostAgent(RBACAgent):
     """
     A simple security agent which allows access to datasets based on host.
@@ -7,6 +7,10 @@ import shutil
 import tarfile
 import tempfile
 from collections import defaultdict
+from concurrent.futures import (
+    as_completed,
+    ThreadPoolExecutor,
+)
 from dataclasses import dataclass
 from enum import Enum
 from json import (
@@ -136,6 +140,8 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 ObjectKeyType = Union[str, int]
+# Called with the number of dataset files imported so far and the number of dataset files to import
+ImportProgressCallback = Callable[[int, int], None]
 
 ATTRS_FILENAME_HISTORY = "history_attrs.txt"
 ATTRS_FILENAME_DATASETS = "datasets_attrs.txt"
@@ -197,6 +203,7 @@ class DatasetAttributeImportModel(BaseModel):
 
 
 DEFAULT_DISCARDED_DATA_TYPE = ImportDiscardedDataType.FORBID
+DEFAULT_IMPORT_COPY_THREADS = 4
 
 
 class ImportOptions:
@@ -204,6 +211,7 @@ class ImportOptions:
     allow_library_creation: bool
     allow_dataset_object_edit: bool
     discarded_data: ImportDiscardedDataType
+    copy_threads: int
 
     def __init__(
         self,
@@ -211,6 +219,7 @@ class ImportOptions:
         allow_library_creation: bool = False,
         allow_dataset_object_edit: Optional[bool] = None,
         discarded_data: ImportDiscardedDataType = DEFAULT_DISCARDED_DATA_TYPE,
+        copy_threads: int = DEFAULT_IMPORT_COPY_THREADS,
     ) -> None:
         self.allow_edit = allow_edit
         self.allow_library_creation = allow_library_creation
@@ -219,6 +228,7 @@ class ImportOptions:
         else:
             self.allow_dataset_object_edit = allow_dataset_object_edit
         self.discarded_data = discarded_data
+        self.copy_threads = copy_threads
 
 
 class SessionlessContext:
@@ -400,14 +410,23 @@ class ModelImportStore(metaclass=abc.ABCMeta):
             self._flush()
 
     def perform_import(
-        self, history: Optional[model.History] = None, new_history: bool = False, job: Optional[model.Job] = None
+        self,
+        history: Optional[model.History] = None,
+        new_history: bool = False,
+        job: Optional[model.Job] = None,
+        progress: Optional[ImportProgressCallback] = None,
     ) -> "ObjectImportTracker":
+        """Import the objects of this store.
+
+        ``progress`` is called with the number of dataset files copied into the
+        object store so far and the total number of dataset files to copy.
+        """
         object_import_tracker = ObjectImportTracker()
 
         datasets_attrs = self.datasets_properties()
         collections_attrs = self.collections_properties()
 
-        self._import_datasets(object_import_tracker, datasets_attrs, history, new_history, job)
+        self._import_datasets(object_import_tracker, datasets_attrs, history, new_history, job, progress)
         self._import_dataset_copied_associations(object_import_tracker, datasets_attrs)
         self._import_libraries(object_import_tracker)
         self._import_collection_instances(object_import_tracker, collections_attrs, history, new_history)
@@ -460,8 +479,11 @@ class ModelImportStore(metaclass=abc.ABCMeta):
         history: Optional[model.History],
         new_history: bool,
         job: Optional[model.Job],
+        progress: Optional[ImportProgressCallback] = None,
     ) -> None:
         object_key = self.object_key
+        dataset_files: List[Tuple[model.DatasetInstance, str, Optional[str]]] = []
+        new_dataset_instances: List[model.DatasetInstance] = []
 
         def handle_dataset_object_edit(dataset_instance, dataset_attrs):
             if "dataset" in dataset_attrs:
@@ -658,19 +680,13 @@ class ModelImportStore(metaclass=abc.ABCMeta):
                         if not self.object_store:
                             raise Exception(f"self.object_store is missing from {self}.")
                         if not dataset_instance.dataset.purged:
-                            self.object_store.update_from_file(
-                                dataset_instance.dataset, file_name=temp_dataset_file_name, create=True
-                            )
-
                             # Import additional files if present. Histories exported previously might not have this attribute set.
                             dataset_extra_files_path = dataset_attrs.get("extra_files_path", None)
                             if dataset_extra_files_path:
                                 assert file_source_root
                                 dataset_extra_files_path = os.path.join(file_source_root, dataset_extra_files_path)
-                                persist_extra_files(self.object_store, dataset_extra_files_path, dataset_instance)
-                            # Only trust file size if the dataset is purged. If we keep the data we should check the file size.
-                            dataset_instance.dataset.file_size = None
-                            dataset_instance.dataset.set_total_size()  # update the filesize record in the database
+                            # Files are copied into the object store once all datasets have been created
+                            dataset_files.append((dataset_instance, temp_dataset_file_name, dataset_extra_files_path))
 
                     if dataset_instance.deleted:
                         dataset_instance.dataset.deleted = True
@@ -689,38 +705,7 @@ class ModelImportStore(metaclass=abc.ABCMeta):
                             user=self.user, item=dataset_instance, new_tags_list=tag_list, flush=False
                         )
 
-                if self.app:
-                    # If dataset instance is discarded or deferred, don't attempt to regenerate
-                    # metadata for it.
-                    if dataset_instance.state == dataset_instance.states.OK:
-                        regenerate_kwds: Dict[str, Any] = {}
-                        if job:
-                            regenerate_kwds["user"] = job.user
-                            regenerate_kwds["session_id"] = job.session_id
-                        elif history:
-                            user = history.user
-                            regenerate_kwds["user"] = user
-                            if user is None:
-                                regenerate_kwds["session_id"] = history.galaxy_sessions[0].galaxy_session.id
-                            else:
-                                regenerate_kwds["session_id"] = None
-                        else:
-                            # Need a user to run library jobs to generate metadata...
-                            pass
-                        if not self.import_options.allow_edit:
-                            # external import, metadata files need to be regenerated (as opposed to extended metadata dataset import)
-                            if self.app.datatypes_registry.set_external_metadata_tool:
-                                self.app.datatypes_registry.set_external_metadata_tool.regenerate_imported_metadata_if_needed(
-                                    dataset_instance, history, **regenerate_kwds
-                                )
-                            else:
-                                # Try to set metadata directly. @mvdbeek thinks we should only record the datasets
-                                try:
-                                    if dataset_instance.has_metadata_files:
-                                        dataset_instance.datatype.set_meta(dataset_instance)  # type:ignore[arg-type]
-                                except Exception:
-                                    log.debug(f"Metadata setting failed on {dataset_instance}", exc_info=True)
-                                    dataset_instance.state = dataset_instance.dataset.states.FAILED_METADATA
+                new_dataset_instances.append(dataset_instance)
 
                 if model_class == "HistoryDatasetAssociation":
                     if not isinstance(dataset_instance, model.HistoryDatasetAssociation):
@@ -745,6 +730,102 @@ class ModelImportStore(metaclass=abc.ABCMeta):
                         assert "id" in dataset_attrs
                         object_import_tracker.lddas_by_key[dataset_attrs["id"]] = dataset_instance
 
+        self._import_dataset_files(dataset_files, progress)
+
+        if self.app:
+            for dataset_instance in new_dataset_instances:
+                # If dataset instance is discarded or deferred, don't attempt to regenerate
+                # metadata for it.
+                if dataset_instance.state == dataset_instance.states.OK:
+                    regenerate_kwds: Dict[str, Any] = {}
+                    if job:
+                        regenerate_kwds["user"] = job.user
+                        regenerate_kwds["session_id"] = job.session_id
+                    elif history:
+                        user = history.user
+                        regenerate_kwds["user"] = user
+                        if user is None:
+                            regenerate_kwds["session_id"] = history.galaxy_sessions[0].galaxy_session.id
+                        else:
+                            regenerate_kwds["session_id"] = None
+                    else:
+                        # Need a user to run library jobs to generate metadata...
+                        pass
+                    if not self.import_options.allow_edit:
+                        # external import, metadata files need to be regenerated (as opposed to extended metadata dataset import)
+                        if self.app.datatypes_registry.set_external_metadata_tool:
+                            self.app.datatypes_registry.set_external_metadata_tool.regenerate_imported_metadata_if_needed(
+                                dataset_instance, history, **regenerate_kwds
+                            )
+                        else:
+                            # Try to set metadata directly. @mvdbeek thinks we should only record the datasets
+                            try:
+                                if dataset_instance.has_metadata_files:
+                                    dataset_instance.datatype.set_meta(dataset_instance)  # type:ignore[arg-type]
+                            except Exception:
+                                log.debug(f"Metadata setting failed on {dataset_instance}", exc_info=True)
+                                dataset_instance.state = dataset_instance.dataset.states.FAILED_METADATA
+
+    def _import_dataset_files(
+        self,
+        dataset_files: List[Tuple[model.DatasetInstance, str, Optional[str]]],
+        progress: Optional[ImportProgressCallback] = None,
+    ) -> None:
+        """Copy the files of newly created datasets into the object store.
+
+        The datasets are flushed together first, so that an object store storing
+        by id doesn't commit the session for every dataset, then the files are
+        copied by a pool of ``import_options.copy_threads`` threads.
+        """
+        if not dataset_files:
+            return
+        object_store = self.object_store
+        if not object_store:
+            raise Exception(f"self.object_store is missing from {self}.")
+        self.sa_session.flush()
+
+        def import_files(dataset_instance, file_name, extra_files_path):
+            dataset = dataset_instance.dataset
+            object_store.update_from_file(dataset, file_name=file_name, create=True)
+            if extra_files_path:
+                persist_extra_files(object_store, extra_files_path, dataset_instance)
+            # Only trust file size if the dataset is purged. If we keep the data we should check the file size.
+            dataset.file_size = None
+            dataset.set_total_size()  # update the filesize record in the database
+
+        def import_group(group):
+            for files in group:
+                import_files(*files)
+            return len(group)
+
+        # Datasets sharing a uuid are stored at the same path when storing by uuid,
+        # copy their files one after another in the same thread.
+        groups: Dict[Any, List[Tuple[model.DatasetInstance, str, Optional[str]]]] = {}
+        for files in dataset_files:
+            dataset = files[0].dataset
+            groups.setdefault(str(dataset.uuid) if dataset.uuid else id(dataset), []).append(files)
+
+        total = len(dataset_files)
+        report_every = max(1, total // 100)
+        completed = 0
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, self.import_options.copy_threads), thread_name_prefix="model_store_import"
+        )
+        futures = []
+        try:
+            futures = [executor.submit(import_group, group) for group in groups.values()]
+            for future in as_completed(futures):
+                previously_completed = completed
+                completed += future.result()
+                if progress and (
+                    completed // report_every > previously_completed // report_every or completed == total
+                ):
+                    progress(completed, total)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
     def _import_libraries(self, object_import_tracker: "ObjectImportTracker") -> None:
         object_key = self.object_key
 
@@ -1936,23 +2017,9 @@ class DirectoryModelExportStore(ModelExportStore):
     def serialize_files(self, dataset: model.DatasetInstance, as_dict: JsonDictT) -> None:
         if self.export_files is None:
             return None
-
-        add: Callable[[str, str], None]
-        if self.export_files == "symlink":
-            add = os.symlink
-        elif self.export_files == "copy":
-
-            def add(src, dest):
-                if os.path.isdir(src):
-                    shutil.copytree(src, dest)
-                else:
-                    shutil.copyfile(src, dest)
-
-        else:
+        if self.export_files not in ("symlink", "copy"):
             raise Exception(f"Unknown export_files parameter type encountered {self.export_files}")
 
-        export_directory = self.export_directory
-
         _, include_files = self.included_datasets[dataset]
         if not include_files:
             return
@@ -1971,7 +2038,6 @@ class DirectoryModelExportStore(ModelExportStore):
             pass
 
         dir_name = "datasets"
-        dir_path = os.path.join(export_directory, dir_name)
 
         if dataset.dataset.id in self.dataset_id_to_path:
             file_name, extra_files_path = self.dataset_id_to_path[dataset.dataset.id]
@@ -1982,9 +2048,6 @@ class DirectoryModelExportStore(ModelExportStore):
             return
 
         if file_name:
-            if not os.path.exists(dir_path):
-                os.makedirs(dir_path)
-
             conversion = self.dataset_implicit_conversions.get(dataset)
             conversion_key = (
                 self.serialization_options.get_identifier(self.security, conversion) if conversion else None
@@ -1993,9 +2056,7 @@ class DirectoryModelExportStore(ModelExportStore):
                 as_dict["name"], as_dict["extension"], as_dict["encoded_id"], conversion_key=conversion_key
             )
             arcname = os.path.join(dir_name, target_filename)
-            src = file_name
-            dest = os.path.join(export_directory, arcname)
-            add(src, dest)
+            self._export_file(file_name, arcname)
             as_dict["file_name"] = arcname
 
         if extra_files_path:
@@ -2009,13 +2070,24 @@ class DirectoryModelExportStore(ModelExportStore):
                     as_dict["encoded_id"], conversion_key=conversion_key
                 )
                 arcname = os.path.join(dir_name, extra_files_target_filename)
-                add(extra_files_path, os.path.join(export_directory, arcname))
+                self._export_file(extra_files_path, arcname)
                 as_dict["extra_files_path"] = arcname
             else:
                 as_dict["extra_files_path"] = ""
 
         self.dataset_id_to_path[dataset.dataset.id] = (as_dict.get("file_name"), as_dict.get("extra_files_path"))
 
+    def _export_file(self, src: str, arcname: str) -> None:
+        """Add the file or directory ``src`` to the export as ``arcname``."""
+        dest = os.path.join(self.export_directory, arcname)
+        safe_makedirs(os.path.dirname(dest))
+        if self.export_files == "symlink":
+            os.symlink(src, dest)
+        elif os.path.isdir(src):
+            shutil.copytree(src, dest)
+        else:
+            shutil.copyfile(src, dest)
+
     def exported_key(
         self,
         obj: model.RepresentById,
@@ -2153,8 +2225,7 @@ class DirectoryModelExportStore(ModelExportStore):
             jobs_attrs.append(job_attrs)
 
         jobs_attrs_filename = os.path.join(self.export_directory, ATTRS_FILENAME_JOBS)
-        with open(jobs_attrs_filename, "w") as jobs_attrs_out:
-            jobs_attrs_out.write(json_encoder.encode(jobs_attrs))
+        write_attrs(jobs_attrs_filename, jobs_attrs)
         return jobs_attrs
 
     def export_history(
@@ -2327,31 +2398,25 @@ class DirectoryModelExportStore(ModelExportStore):
             else:
                 provenance_attrs.append(dataset)
 
-        def to_json(attributes):
-            return json_encoder.encode([a.serialize(self.security, self.serialization_options) for a in attributes])
+        def serialize(attributes):
+            for a in attributes:
+                yield a.serialize(self.security, self.serialization_options)
 
         datasets_attrs_filename = os.path.join(export_directory, ATTRS_FILENAME_DATASETS)
-        with open(datasets_attrs_filename, "w") as datasets_attrs_out:
-            datasets_attrs_out.write(to_json(datasets_attrs))
-
-        with open(f"{datasets_attrs_filename}.provenance", "w") as provenance_attrs_out:
-            provenance_attrs_out.write(to_json(provenance_attrs))
+        write_attrs(datasets_attrs_filename, serialize(datasets_attrs))
+        write_attrs(f"{datasets_attrs_filename}.provenance", serialize(provenance_attrs))
 
         libraries_attrs_filename = os.path.join(export_directory, ATTRS_FILENAME_LIBRARIES)
-        with open(libraries_attrs_filename, "w") as libraries_attrs_out:
-            libraries_attrs_out.write(to_json(self.included_libraries))
+        write_attrs(libraries_attrs_filename, serialize(self.included_libraries))
 
         library_folders_attrs_filename = os.path.join(export_directory, ATTRS_FILENAME_LIBRARY_FOLDERS)
-        with open(library_folders_attrs_filename, "w") as library_folder_attrs_out:
-            library_folder_attrs_out.write(to_json(self.included_library_folders))
+        write_attrs(library_folders_attrs_filename, serialize(self.included_library_folders))
 
         collections_attrs_filename = os.path.join(export_directory, ATTRS_FILENAME_COLLECTIONS)
-        with open(collections_attrs_filename, "w") as collections_attrs_out:
-            collections_attrs_out.write(to_json(self.collections_attrs))
+        write_attrs(collections_attrs_filename, serialize(self.collections_attrs))
 
         conversions_attrs_filename = os.path.join(export_directory, ATTRS_FILENAME_CONVERSIONS)
-        with open(conversions_attrs_filename, "w") as conversions_attrs_out:
-            conversions_attrs_out.write(to_json(self.dataset_implicit_conversions.values()))
+        write_attrs(conversions_attrs_filename, serialize(self.dataset_implicit_conversions.values()))
 
         jobs_attrs = []
         for job_id, job_output_dataset_associations in self.job_output_dataset_associations.items():
@@ -2421,14 +2486,8 @@ class DirectoryModelExportStore(ModelExportStore):
 
             # Get jobs' attributes.
 
-            icjs_attrs = []
-            for icj in implicit_collection_jobs_dict.values():
-                icj_attrs = icj.serialize(self.security, self.serialization_options)
-                icjs_attrs.append(icj_attrs)
-
             icjs_attrs_filename = os.path.join(export_directory, ATTRS_FILENAME_IMPLICIT_COLLECTION_JOBS)
-            with open(icjs_attrs_filename, "w") as icjs_attrs_out:
-                icjs_attrs_out.write(json_encoder.encode(icjs_attrs))
+            write_attrs(icjs_attrs_filename, serialize(implicit_collection_jobs_dict.values()))
 
         invocations_attrs = []
 
@@ -2869,10 +2928,21 @@ class TarModelExportStore(DirectoryModelExportStore):
             self.file_source_uri = None
             export_directory = temp_output_dir
         super().__init__(export_directory, **kwds)
+        tarfile_mode = "w"
+        if gzip:
+            tarfile_mode += ":gz"
+        # Dataset files are written to the archive as they are serialized
+        # instead of being copied (or linked) to the export directory first.
+        self._archive = tarfile.open(self.out_file, tarfile_mode, dereference=True)
+
+    def _export_file(self, src: str, arcname: str) -> None:
+        self._archive.add(src, arcname=arcname)
 
     def _finalize(self) -> None:
         super()._finalize()
-        tar_export_directory(self.export_directory, self.out_file, self.gzip)
+        with self._archive:
+            for export_path in os.listdir(self.export_directory):
+                self._archive.add(os.path.join(self.export_directory, export_path), arcname=export_path)
         if self.file_source_uri:
             if not self.file_sources:
                 raise Exception(f"Need self.file_sources but {type(self)} is missing it: {self.file_sources}.")
@@ -2882,6 +2952,14 @@ class TarModelExportStore(DirectoryModelExportStore):
             file_source.write_from(file_source_path.path, self.out_file, user_context=self.user_context)
         shutil.rmtree(self.temp_output_dir)
 
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
+    ) -> bool:
+        try:
+            return super().__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._archive.close()
+
 
 class BagDirectoryModelExportStore(DirectoryModelExportStore):
     def __init__(self, out_directory: str, **kwds) -> None:
@@ -2977,6 +3055,21 @@ def tar_export_directory(export_directory: StrPath, out_file: StrPath, gzip: boo
             store_archive.add(os.path.join(export_directory, export_path), arcname=export_path)
 
 
+def write_attrs(path: StrPath, attrs: Iterable[Any]) -> None:
+    """Write ``attrs`` to ``path`` as a JSON array, encoding one item at a time.
+
+    Unlike encoding the whole list at once, memory use doesn't grow with the
+    number of items in the export.
+    """
+    with open(path, "w") as attrs_out:
+        attrs_out.write("[")
+        for i, item in enumerate(attrs):
+            if i:
+                attrs_out.write(", ")
+            attrs_out.write(json_encoder.encode(item))
+        attrs_out.write("]")
+
+
 def get_export_dataset_filename(name: str, ext: str, encoded_id: str, conversion_key: Optional[str]) -> str:
     """
     Builds a filename for a dataset using its name an extension.
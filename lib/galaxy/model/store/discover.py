@@ -7,8 +7,10 @@ corresponding to files in other contexts.
 """
 
 import abc
+import copy
 import logging
 import os
+from contextlib import nullcontext
 from typing import (
     Any,
     Callable,
@@ -20,6 +22,13 @@ from typing import (
     Union,
 )
 
+from sqlalchemy import (
+    bindparam,
+    insert,
+    inspect,
+    update,
+)
+from sqlalchemy.orm import make_transient_to_detached
 from sqlalchemy.orm.scoping import ScopedSession
 
 import galaxy.model
@@ -96,6 +105,7 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
         output_name=None,
         storage_callbacks=None,
         purged=False,
+        set_default_permissions=True,
     ):
         tag_list = tag_list or []
         sources = sources or []
@@ -135,7 +145,7 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
                 if init_from:
                     self.permission_provider.copy_dataset_permissions(init_from, primary_data)
                     primary_data.state = init_from.state
-                else:
+                elif set_default_permissions:
                     self.permission_provider.set_default_hda_permissions(primary_data)
             else:
                 ld = galaxy.model.LibraryDataset(folder=library_folder, name=name)
@@ -304,30 +314,33 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
             name = "unnamed output"
         if change_datatype_actions is None:
             change_datatype_actions = {}
-        if self.flush_per_n_datasets and self.flush_per_n_datasets > 0:
-            for chunk in chunk_iterable(discovered_files, size=self.flush_per_n_datasets):
+        # New datasets must not be flushed through the session before being inserted in bulk
+        sa_session = self.sa_session
+        with sa_session.no_autoflush if self.bulk_insert and sa_session is not None else nullcontext():
+            if self.flush_per_n_datasets and self.flush_per_n_datasets > 0:
+                for chunk in chunk_iterable(discovered_files, size=self.flush_per_n_datasets):
+                    self._populate_elements(
+                        chunk=chunk,
+                        name=name,
+                        root_collection_builder=root_collection_builder,
+                        metadata_source_name=metadata_source_name,
+                        final_job_state=final_job_state,
+                        change_datatype_actions=change_datatype_actions,
+                    )
+                    if len(chunk) == self.flush_per_n_datasets:
+                        # In most cases we don't need to flush, that happens in the caller.
+                        # Only flush here for saving memory.
+                        root_collection_builder.populate_partial()
+                        self.flush()
+            else:
                 self._populate_elements(
-                    chunk=chunk,
+                    chunk=discovered_files,
                     name=name,
                     root_collection_builder=root_collection_builder,
                     metadata_source_name=metadata_source_name,
                     final_job_state=final_job_state,
                     change_datatype_actions=change_datatype_actions,
                 )
-                if len(chunk) == self.flush_per_n_datasets:
-                    # In most cases we don't need to flush, that happens in the caller.
-                    # Only flush here for saving memory.
-                    root_collection_builder.populate_partial()
-                    self.flush()
-        else:
-            self._populate_elements(
-                chunk=discovered_files,
-                name=name,
-                root_collection_builder=root_collection_builder,
-                metadata_source_name=metadata_source_name,
-                final_job_state=final_job_state,
-                change_datatype_actions=change_datatype_actions,
-            )
 
     def _populate_elements(
         self, chunk, name, root_collection_builder, metadata_source_name, final_job_state, change_datatype_actions
@@ -340,6 +353,8 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
             "extra_files": [],
         }
         ext_override = change_datatype_actions.get(name)
+        bulk_insert = self.bulk_insert
+        output_dataset_associations = []
         for discovered_file in chunk:
             filename = discovered_file.path
             create_dataset_timer = ExecutionTimer()
@@ -379,6 +394,7 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
                 hashes=hashes,
                 created_from_basename=created_from_basename,
                 final_job_state=final_job_state,
+                set_default_permissions=not bulk_insert,
             )
             log.debug(
                 "(%s) Created dynamic collection dataset for path [%s] with element identifier [%s] for output [%s] %s",
@@ -394,7 +410,8 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
             element_datasets["tag_lists"].append(discovered_file.match.tag_list)
             element_datasets["paths"].append(filename)
 
-        self.add_tags_to_datasets(datasets=element_datasets["datasets"], tag_lists=element_datasets["tag_lists"])
+        if not bulk_insert:
+            self.add_tags_to_datasets(datasets=element_datasets["datasets"], tag_lists=element_datasets["tag_lists"])
         for element_identifiers, dataset in zip(element_datasets["element_identifiers"], element_datasets["datasets"]):
             current_builder = root_collection_builder
             for element_identifier in element_identifiers[:-1]:
@@ -404,10 +421,26 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
             # Associate new dataset with job
             element_identifier_str = ":".join(element_identifiers)
             association_name = f"__new_primary_file_{name}|{element_identifier_str}__"
-            self.add_output_dataset_association(association_name, dataset)
+            if bulk_insert:
+                output_dataset_associations.append((association_name, dataset))
+            else:
+                self.add_output_dataset_association(association_name, dataset)
 
         add_datasets_timer = ExecutionTimer()
         self.add_datasets_to_history(element_datasets["datasets"])
+        if bulk_insert:
+            self._bulk_insert_datasets(
+                element_datasets=element_datasets,
+                output_dataset_associations=output_dataset_associations,
+                output_name=name,
+            )
+            log.debug(
+                "(%s) Inserted dynamic collection datasets for output [%s] %s",
+                self.job_id(),
+                name,
+                add_datasets_timer,
+            )
+            return
         self.update_object_store_with_datasets(
             datasets=element_datasets["datasets"],
             paths=element_datasets["paths"],
@@ -422,6 +455,40 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
         )
         self.set_datasets_metadata(datasets=element_datasets["datasets"])
 
+    def _bulk_insert_datasets(self, element_datasets, output_dataset_associations, output_name):
+        """Persist new datasets with batched inserts instead of the unit of work.
+
+        Flushing thousands of new datasets through the session inserts them one row at a time,
+        and populating the object store would first commit and then reload each of them. Instead
+        the datasets are taken out of the session and inserted with one statement per table:
+        datasets once their ids are needed for the object store (and updated with their sizes
+        afterwards), HDAs once their metadata is set. Then they are added back to the session
+        as persistent objects with nothing left to flush.
+        """
+        sa_session = self.sa_session
+        assert sa_session is not None
+        hdas = element_datasets["datasets"]
+        datasets = [hda.dataset for hda in hdas]
+        for hda, dataset in zip(hdas, datasets):
+            sa_session.expunge(hda)
+            sa_session.expunge(dataset)
+        dataset_rows = bulk_insert_objects(sa_session, datasets, unique_key="uuid")
+        self.update_object_store_with_datasets(
+            datasets=hdas,
+            paths=element_datasets["paths"],
+            extra_files=element_datasets["extra_files"],
+            output_name=output_name,
+        )
+        self.set_datasets_metadata(datasets=hdas)
+        bulk_update_objects(sa_session, datasets, dataset_rows)
+        for hda, dataset in zip(hdas, datasets):
+            hda.dataset_id = dataset.id
+        bulk_insert_objects(sa_session, hdas, unique_key="dataset_id")
+        add_inserted_objects(sa_session, datasets + hdas)
+        self.permission_provider.set_new_hdas_default_permissions(hdas)
+        self.add_output_dataset_associations(output_dataset_associations)
+        self.add_tags_to_datasets(datasets=hdas, tag_lists=element_datasets["tag_lists"])
+
     def add_tags_to_datasets(self, datasets, tag_lists):
         if any(tag_lists):
             for dataset, tags in zip(datasets, tag_lists):
@@ -508,6 +575,11 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
     def input_dbkey(self) -> str:
         return "?"
 
+    @property
+    def bulk_insert(self) -> bool:
+        """Create discovered collection elements with batched inserts, requires a database session."""
+        return False
+
     @abc.abstractmethod
     def add_library_dataset_to_folder(self, library_folder, ld):
         """Add library dataset to persisted library folder."""
@@ -520,6 +592,11 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
     def add_output_dataset_association(self, name, dataset):
         """If discovering outputs for a job, persist output dataset association."""
 
+    def add_output_dataset_associations(self, associations):
+        """Persist output dataset associations for a list of (name, dataset) tuples."""
+        for name, dataset in associations:
+            self.add_output_dataset_association(name, dataset)
+
     @abc.abstractmethod
     def add_datasets_to_history(self, datasets, for_output_dataset=None):
         """Add datasets to the history this context points at."""
@@ -556,6 +633,11 @@ class PermissionProvider(metaclass=abc.ABCMeta):
     def set_default_hda_permissions(self, primary_data):
         return
 
+    def set_new_hdas_default_permissions(self, datasets):
+        """Set default permissions on many flushed datasets that have no permissions yet."""
+        for primary_data in datasets:
+            self.set_default_hda_permissions(primary_data)
+
     @abc.abstractmethod
     def copy_dataset_permissions(self, init_from, primary_data):
         """Copy dataset permissions from supplied input dataset."""
@@ -695,6 +777,84 @@ class SessionlessModelPersistenceContext(ModelPersistenceContext):
         """No-op, no job context."""
 
 
+def _mapped_columns(obj):
+    mapper = inspect(obj).mapper
+    table = mapper.local_table
+    return table, [(column, mapper.get_property_by_column(column).key) for column in table.columns]
+
+
+def bulk_insert_objects(sa_session, objects, unique_key: str) -> List[Dict[str, Any]]:
+    """Insert new model objects of one class with batched INSERT statements.
+
+    The objects must not be in the session and stay transient, only their ids are set.
+    Column defaults are applied to unset columns first. Foreign keys are not synchronized
+    from relationships, these columns must be set on the objects. The ids are matched
+    to the objects by the ``unique_key`` column, as not all databases return the ids of
+    a batch in insertion order, databases that don't return rows of such a batch at all
+    (e.g. MySQL) get one INSERT per object. Returns a copy of the inserted rows.
+    """
+    if not objects:
+        return []
+    table, columns = _mapped_columns(objects[0])
+    columns = [(column, key) for column, key in columns if not column.primary_key]
+    rows = []
+    for obj in objects:
+        state_dict = inspect(obj).dict
+        row = {}
+        for column, key in columns:
+            value = state_dict.get(key)
+            default = column.default
+            if value is None and default is not None and (default.is_callable or default.is_scalar):
+                value = default.arg(None) if default.is_callable else default.arg
+            if key not in state_dict or value is not state_dict[key]:
+                # Nothing is expired once the objects are added to the session
+                setattr(obj, key, value)
+            # Mutable values (e.g. JSON) can be changed in place before bulk_update_objects
+            row[column.key] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        rows.append(row)
+    if sa_session.get_bind().dialect.insert_executemany_returning:
+        key_column = table.c[unique_key]
+        ids = dict(sa_session.execute(insert(table).returning(key_column, table.c.id), rows).all())
+        for obj, row in zip(objects, rows):
+            obj.id = row["id"] = ids[row[unique_key]]
+    else:
+        for obj, row in zip(objects, rows):
+            obj.id = row["id"] = sa_session.execute(insert(table), row).inserted_primary_key[0]
+    return rows
+
+
+def bulk_update_objects(sa_session, objects, rows: List[Dict[str, Any]]) -> None:
+    """Update the columns of objects inserted by :func:`bulk_insert_objects` that changed since, in one batch."""
+    if not objects:
+        return
+    table, columns = _mapped_columns(objects[0])
+    changed = set()
+    for obj, row in zip(objects, rows):
+        state_dict = inspect(obj).dict
+        changed.update(column for column, key in columns if state_dict.get(key) != row[column.key])
+    if not changed:
+        return
+    update_rows = []
+    for obj in objects:
+        state_dict = inspect(obj).dict
+        update_row = {f"_{column.key}": state_dict.get(key) for column, key in columns if column in changed}
+        update_row["_id"] = obj.id
+        update_rows.append(update_row)
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .values({column.key: bindparam(f"_{column.key}") for column in changed})
+    )
+    sa_session.execute(statement, update_rows, execution_options={"synchronize_session": False})
+
+
+def add_inserted_objects(sa_session, objects) -> None:
+    """Add objects inserted by :func:`bulk_insert_objects` to the session as persistent objects."""
+    for obj in objects:
+        make_transient_to_detached(obj)
+    sa_session.add_all(objects)
+
+
 def persist_target_to_export_store(target_dict, export_store, object_store, work_directory):
     replace_request_syntax_sugar(target_dict)
     model_persistence_context = SessionlessModelPersistenceContext(object_store, export_store, work_directory)
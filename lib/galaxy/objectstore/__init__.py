@@ -259,6 +259,35 @@ class ObjectStore(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def get_bytes(
+        self,
+        obj,
+        start=0,
+        count=-1,
+        base_dir=None,
+        extra_dir=None,
+        extra_dir_at_root=False,
+        alt_name=None,
+        obj_dir: bool = False,
+    ) -> bytes:
+        """
+        Fetch `count` bytes of the object offset by `start` bytes, as bytes.
+
+        Unlike `get_data`, which reads the object as text, this reads raw
+        bytes. Caching object stores read slices of objects that are not in
+        the cache with ranged requests instead of pulling the whole object
+        into the cache. If the object does not exist raises `ObjectNotFound`.
+
+        :type start: int
+        :param start: Set the position to start reading the object
+
+        :type count: int
+        :param count: Read at most `count` bytes from the object, all
+                      remaining bytes if negative
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def get_filename(
         self,
@@ -611,6 +640,29 @@ class BaseObjectStore(ObjectStore):
             obj_dir=obj_dir,
         )
 
+    def get_bytes(
+        self,
+        obj,
+        start=0,
+        count=-1,
+        base_dir=None,
+        extra_dir=None,
+        extra_dir_at_root=False,
+        alt_name=None,
+        obj_dir: bool = False,
+    ) -> bytes:
+        return self._invoke(
+            "get_bytes",
+            obj,
+            start=start,
+            count=count,
+            base_dir=base_dir,
+            extra_dir=extra_dir,
+            extra_dir_at_root=extra_dir_at_root,
+            alt_name=alt_name,
+            obj_dir=obj_dir,
+        )
+
     def get_filename(
         self,
         obj,
@@ -1096,6 +1148,12 @@ class DiskObjectStore(ConcreteObjectStore):
         data_file.close()
         return content
 
+    def _get_bytes(self, obj, start=0, count=-1, **kwargs) -> bytes:
+        """Override `ObjectStore`'s stub; retrieve bytes directly from disk."""
+        with open(self._get_filename(obj, **kwargs), "rb") as data_file:
+            data_file.seek(start)
+            return data_file.read(count)
+
     def _get_filename(self, obj, sync_cache: bool = True, **kwargs) -> str:
         """
         Override `ObjectStore`'s stub.
@@ -1205,6 +1263,10 @@ class NestedObjectStore(BaseObjectStore):
         """For the first backend that has this `obj`, get data from it."""
         return self._call_method("_get_data", obj, ObjectNotFound, True, **kwargs)
 
+    def _get_bytes(self, obj, **kwargs) -> bytes:
+        """For the first backend that has this `obj`, get bytes from it."""
+        return self._call_method("_get_bytes", obj, ObjectNotFound, True, **kwargs)
+
     def _get_filename(self, obj, **kwargs) -> str:
         """For the first backend that has this `obj`, get its filename."""
         return self._call_method("_get_filename", obj, ObjectNotFound, True, **kwargs)
@@ -20,8 +20,12 @@ from galaxy.util import (
 from galaxy.util.path import safe_relpath
 from ._util import fix_permissions
 from .caching import (
+    BlockCache,
+    CacheIndex,
     CacheTarget,
+    get_cache_index,
     InProcessCacheMonitor,
+    ONE_MEGA_BYTE,
 )
 
 log = logging.getLogger(__name__)
@@ -36,6 +40,8 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
     cache_size: int
     cache_monitor: Optional[InProcessCacheMonitor] = None
     cache_monitor_interval: int
+    _cache_index: Optional[CacheIndex] = None
+    _block_cache: Optional[BlockCache] = None
 
     def _ensure_staging_path_writable(self):
         staging_path = self.staging_path
@@ -106,6 +112,32 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
     def _get_cache_path(self, rel_path: str) -> str:
         return os.path.abspath(os.path.join(self.staging_path, rel_path))
 
+    @property
+    def cache_index(self) -> CacheIndex:
+        if self._cache_index is None:
+            self._cache_index = get_cache_index(self.staging_path)
+        return self._cache_index
+
+    @property
+    def block_cache(self) -> Optional[BlockCache]:
+        if self._block_cache is None:
+            block_cache_size = getattr(self.config, "object_store_block_cache_size", 0) or 0
+            if block_cache_size > 0:
+                self._block_cache = BlockCache(block_cache_size * ONE_MEGA_BYTE)
+        return self._block_cache
+
+    def _invalidate_blocks(self, rel_path: str, entire_dir: bool = False) -> None:
+        if self._block_cache is not None:
+            self._block_cache.invalidate(rel_path, directory=entire_dir)
+
+    def _remove_from_cache(self, rel_path: str, entire_dir: bool = False) -> None:
+        if entire_dir:
+            shutil.rmtree(self._get_cache_path(rel_path), ignore_errors=True)
+        else:
+            unlink(self._get_cache_path(rel_path), ignore_errors=True)
+        self.cache_index.remove(rel_path, directory=entire_dir)
+        self._invalidate_blocks(rel_path, entire_dir=entire_dir)
+
     def _in_cache(self, rel_path: str) -> bool:
         """Check if the given dataset is in the local cache and return True if so."""
         cache_path = self._get_cache_path(rel_path)
@@ -120,15 +152,37 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
         file_ok = self._download(rel_path)
         if file_ok:
             fix_permissions(self.config, self._get_cache_path(rel_path_dir))
+            self.cache_index.record(rel_path)
         else:
             unlink(self._get_cache_path(rel_path), ignore_errors=True)
         return file_ok
 
+    def _get_remote_data(self, rel_path: str, start: int, count: int) -> Optional[bytes]:
+        """Read a slice of a remote object without pulling it into the cache.
+
+        Returns ``None`` if the object store does not support ranged reads or
+        the read failed.
+        """
+        block_cache = self.block_cache
+        if block_cache is not None:
+            version = self._get_remote_version(rel_path)
+            if version is not None:
+                return block_cache.read(
+                    rel_path,
+                    version,
+                    start,
+                    count,
+                    lambda start, count: self._get_remote_range(rel_path, start, count),
+                )
+        return self._get_remote_range(rel_path, start, count)
+
     def _get_data(self, obj, start=0, count=-1, **kwargs):
         rel_path = self._construct_path(obj, **kwargs)
         # Check cache first and get file if not there
         if not self._in_cache(rel_path):
             self._pull_into_cache(rel_path, **kwargs)
+        else:
+            self.cache_index.touch(rel_path)
         # Read the file content from cache
         data_file = open(self._get_cache_path(rel_path))
         data_file.seek(start)
@@ -136,6 +190,22 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
         data_file.close()
         return content
 
+    def _get_bytes(self, obj, start=0, count=-1, **kwargs) -> bytes:
+        rel_path = self._construct_path(obj, **kwargs)
+        if not self._in_cache(rel_path):
+            if count >= 0:
+                # Only a slice is needed, try to avoid pulling the whole object into the cache
+                content = self._get_remote_data(rel_path, start, count)
+                if content is not None:
+                    return content
+            if not self._pull_into_cache(rel_path, **kwargs):
+                raise ObjectNotFound(f"objectstore.get_bytes, failed to fetch object: {rel_path}")
+        else:
+            self.cache_index.touch(rel_path)
+        with open(self._get_cache_path(rel_path), "rb") as data_file:
+            data_file.seek(start)
+            return data_file.read(count)
+
     def _exists(self, obj, **kwargs) -> bool:
         in_cache = exists_remotely = False
         rel_path = self._construct_path(obj, **kwargs)
@@ -194,6 +264,8 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
             if not dir_only:
                 rel_path = os.path.join(rel_path, alt_name if alt_name else f"dataset_{self._get_object_id(obj)}.dat")
                 open(os.path.join(self.staging_path, rel_path), "w").close()
+                self.cache_index.record(rel_path, 0)
+                self._invalidate_blocks(rel_path)
                 self._push_to_storage(rel_path, from_string="")
         return self
 
@@ -288,12 +360,14 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
         # always resync the cache. Gotta make sure we're being judicious in out data.extra_files_path
         # calls I think.
         if not dir_only and self._in_cache(rel_path) and os.path.getsize(self._get_cache_path(rel_path)) > 0:
+            self.cache_index.touch(rel_path)
             return cache_path
 
         # Check if the file exists in persistent storage and, if it does, pull it into cache
         elif self._exists(obj, **kwargs):
             if dir_only:
                 self._download_directory_into_cache(rel_path, cache_path)
+                self.cache_index.record_directory(rel_path)
                 return cache_path
             else:
                 if self._pull_into_cache(rel_path, **kwargs):
@@ -328,11 +402,11 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
             # with all the files in it. This is easy for the local file system,
             # but requires iterating through each individual key in S3 and deleing it.
             if entire_dir and extra_dir:
-                shutil.rmtree(self._get_cache_path(rel_path), ignore_errors=True)
+                self._remove_from_cache(rel_path, entire_dir=True)
                 return self._delete_remote_all(rel_path)
             else:
                 # Delete from cache first
-                unlink(self._get_cache_path(rel_path), ignore_errors=True)
+                self._remove_from_cache(rel_path)
                 # Delete from S3 as well
                 if self._exists_remotely(rel_path):
                     return self._delete_existing_remote(rel_path)
@@ -362,6 +436,9 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
                     log.exception("Trouble copying source file '%s' to cache '%s'", source_file, cache_file)
             else:
                 source_file = self._get_cache_path(rel_path)
+            if os.path.exists(self._get_cache_path(rel_path)):
+                self.cache_index.record(rel_path)
+            self._invalidate_blocks(rel_path)
 
             self._push_to_storage(rel_path, source_file)
 
@@ -394,6 +471,21 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
     def _download(self, rel_path: str) -> bool:
         raise NotImplementedError()
 
+    # Override to read slices of objects not in the cache with ranged requests
+    def _get_remote_range(self, rel_path: str, start: int, count: int) -> Optional[bytes]:
+        return None
+
+    # Blocks of remote objects are cached per version, so that other processes
+    # updating an object don't leave stale blocks behind. Override to use e.g.
+    # an ETag instead of the size of the object.
+    def _get_remote_version(self, rel_path: str) -> Optional[str]:
+        try:
+            size = self._get_remote_size(rel_path)
+        except Exception:
+            log.exception("Could not get size of '%s' to read it through the block cache", rel_path)
+            return None
+        return str(size) if size >= 0 else None
+
     # Do not need to override these if instead replacing _delete
     def _delete_existing_remote(self, rel_path) -> bool:
         raise NotImplementedError()
@@ -251,6 +251,20 @@ class AzureBlobObjectStore(CachingConcreteObjectStore):
             log.exception("Problem downloading '%s' from Azure", rel_path)
         return False
 
+    def _get_remote_range(self, rel_path, start, count):
+        try:
+            return self._blob_client(rel_path).download_blob(offset=start, length=count).readall()
+        except AzureHttpError:
+            log.exception("Problem reading range of '%s' from Azure", rel_path)
+        return None
+
+    def _get_remote_version(self, rel_path):
+        try:
+            return self._blob_client(rel_path).get_blob_properties().etag
+        except AzureHttpError:
+            log.exception("Could not get ETag of blob '%s' from Azure", rel_path)
+        return None
+
     def _download_to_file(self, rel_path, local_destination):
         kwd = {}
         max_concurrency = self.transfer_dict.get("download_max_concurrency") or self.transfer_dict.get(
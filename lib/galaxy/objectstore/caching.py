@@ -1,12 +1,31 @@
-"""
+"""Size accounting and cleaning of the local caches of caching object stores.
+
+Files in a cache are tracked by a :class:`CacheIndex`, a SQLite database in the
+cache directory that the object store updates whenever it adds, accesses or
+removes a file. The cache monitor then gets the cache size and the least
+recently used files from the index instead of walking and stat-ing the whole
+cache directory. Caches without an index (e.g. created by an older Galaxy) are
+indexed once by walking the cache directory, ``scripts/objectstore/rebuild_cache_index.py``
+does the same on demand.
+
+Files added to or removed from a cache directory other than through the object
+store are not noticed right away: an unknown file is added to the index when
+it's accessed, a file that is gone is dropped when it's due for cleaning, and
+the cache monitor re-indexes the cache directory once a day to pick up the rest.
 """
 
 import logging
 import os
+import sqlite3
 import threading
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from math import inf
 from typing import (
+    Callable,
+    Dict,
+    Iterator,
     List,
     Optional,
     Tuple,
@@ -23,10 +42,33 @@ from galaxy.util.sleeper import Sleeper
 log = logging.getLogger(__name__)
 
 
-ONE_GIGA_BYTE = 1024 * 1024 * 1024
-
-
-FileListT = List[Tuple[time.struct_time, str, int]]
+ONE_MEGA_BYTE = 1024 * 1024
+ONE_GIGA_BYTE = 1024 * ONE_MEGA_BYTE
+
+CACHE_INDEX_FILENAME = ".galaxy_cache_index.sqlite"
+CACHE_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_file (path TEXT PRIMARY KEY, size INTEGER NOT NULL, atime REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS ix_cache_file_atime ON cache_file (atime);
+CREATE TABLE IF NOT EXISTS cache_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO cache_meta (key, value) VALUES ('total_size', 0);
+CREATE TRIGGER IF NOT EXISTS cache_file_insert AFTER INSERT ON cache_file BEGIN
+    UPDATE cache_meta SET value = value + new.size WHERE key = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS cache_file_delete AFTER DELETE ON cache_file BEGIN
+    UPDATE cache_meta SET value = value - old.size WHERE key = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS cache_file_update AFTER UPDATE OF size ON cache_file BEGIN
+    UPDATE cache_meta SET value = value - old.size + new.size WHERE key = 'total_size';
+END;
+"""
+CLEAN_BATCH_SIZE = 1000
+# Accesses to a file are recorded at most this often (in seconds)
+CACHE_INDEX_TOUCH_INTERVAL = 600
+# Forget when accesses were recorded once this many files were accessed
+CACHE_INDEX_TOUCHED_MAX = 100000
+# The cache monitor re-indexes the cache directory this often (in seconds)
+CACHE_INDEX_REBUILD_INTERVAL = 24 * 60 * 60
+BLOCK_CACHE_BLOCK_SIZE = ONE_MEGA_BYTE
 
 
 class CacheTarget(NamedTuple):
@@ -54,11 +96,276 @@ def check_caches(targets: List[CacheTarget]):
         check_cache(target)
 
 
+class CacheIndex:
+    """Index of the files in a cache directory, their sizes and last access times.
+
+    Paths are stored relative to the cache directory. Each process keeps one
+    connection to the index, shared between its threads, the index itself can
+    be shared between processes using the same cache. Accesses to a file are
+    recorded at most every ``CACHE_INDEX_TOUCH_INTERVAL`` seconds, which is
+    precise enough to find the least recently used files. Errors updating the
+    index are logged but never fail the object store operation that triggered
+    the update.
+    """
+
+    def __init__(self, cache_path: str):
+        self.cache_path = os.path.abspath(cache_path)
+        self.db_path = os.path.join(self.cache_path, CACHE_INDEX_FILENAME)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.RLock()
+        self._touched: Dict[str, float] = {}
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            if self._conn is None or self._conn_pid != os.getpid():
+                # Never use a connection inherited from the parent process
+                conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+                if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+                    conn.executescript(f"{CACHE_INDEX_SCHEMA}PRAGMA user_version = 1;")
+                self._conn, self._conn_pid = conn, os.getpid()
+            yield self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def _rel_path(self, path: str) -> str:
+        if os.path.isabs(path):
+            path = os.path.relpath(path, self.cache_path)
+        return os.path.normpath(path)
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the index covers all files of the cache directory."""
+        return self.built_time is not None
+
+    @property
+    def built_time(self) -> Optional[float]:
+        """When the cache directory was last indexed, ``None`` if it never was."""
+        if not os.path.exists(self.db_path):
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM cache_meta WHERE key = 'built'").fetchone()
+        return row and row[0]
+
+    def record(self, rel_path: str, size: Optional[int] = None) -> None:
+        """Record a file that was added to the cache (or replaced)."""
+        try:
+            if size is None:
+                size = os.path.getsize(os.path.join(self.cache_path, rel_path))
+            with self._connect() as conn, conn:
+                conn.execute(
+                    "INSERT INTO cache_file (path, size, atime) VALUES (?, ?, ?) "
+                    "ON CONFLICT (path) DO UPDATE SET size = excluded.size, atime = excluded.atime",
+                    (self._rel_path(rel_path), size, time.time()),
+                )
+        except (OSError, sqlite3.Error) as e:
+            log.warning("Failed to record '%s' in cache index '%s': %s", rel_path, self.db_path, e)
+
+    def record_directory(self, rel_path: str) -> None:
+        """Record all files below a directory that was added to the cache."""
+        for dirpath, _, filenames in os.walk(os.path.join(self.cache_path, rel_path)):
+            for filename in filenames:
+                self.record(os.path.join(dirpath, filename))
+
+    def touch(self, rel_path: str) -> None:
+        """Record an access to a cached file, at most every ``CACHE_INDEX_TOUCH_INTERVAL`` seconds."""
+        path = self._rel_path(rel_path)
+        now = time.time()
+        if now - self._touched.get(path, 0) < CACHE_INDEX_TOUCH_INTERVAL:
+            return
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT atime FROM cache_file WHERE path = ?", (path,)).fetchone()
+                atime = now
+                if row is not None:
+                    if now - row[0] >= CACHE_INDEX_TOUCH_INTERVAL:
+                        with conn:
+                            conn.execute("UPDATE cache_file SET atime = ? WHERE path = ?", (now, path))
+                    else:
+                        # Recently recorded by another process
+                        atime = row[0]
+        except sqlite3.Error as e:
+            log.warning("Failed to update '%s' in cache index '%s': %s", rel_path, self.db_path, e)
+            return
+        if row is None:
+            # File made it into the cache some other way
+            self.record(rel_path)
+        if len(self._touched) >= CACHE_INDEX_TOUCHED_MAX:
+            self._touched.clear()
+        self._touched[path] = atime
+
+    def remove(self, rel_path: str, directory: bool = False) -> None:
+        """Remove a file, or with ``directory`` all files below a directory, from the index."""
+        path = self._rel_path(rel_path)
+        try:
+            with self._connect() as conn, conn:
+                if directory:
+                    # '0' is the character following '/'
+                    conn.execute(
+                        "DELETE FROM cache_file WHERE path = ? OR (path >= ? AND path < ?)",
+                        (path, f"{path}/", f"{path}0"),
+                    )
+                else:
+                    conn.execute("DELETE FROM cache_file WHERE path = ?", (path,))
+        except sqlite3.Error as e:
+            log.warning("Failed to remove '%s' from cache index '%s': %s", rel_path, self.db_path, e)
+
+    def remove_all(self, rel_paths: List[str]) -> None:
+        with self._connect() as conn, conn:
+            conn.executemany("DELETE FROM cache_file WHERE path = ?", [(path,) for path in rel_paths])
+
+    def total_size(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT value FROM cache_meta WHERE key = 'total_size'").fetchone()[0]
+
+    def least_recently_used(self, limit: int = CLEAN_BATCH_SIZE) -> List[Tuple[str, int]]:
+        with self._connect() as conn:
+            return conn.execute("SELECT path, size FROM cache_file ORDER BY atime, path LIMIT ?", (limit,)).fetchall()
+
+    def rebuild(self) -> Tuple[int, int]:
+        """Re-create the index by walking the cache directory, return number and total size of files.
+
+        Access times already in the index are kept if more recent than the
+        access times of the files.
+        """
+        os.makedirs(self.cache_path, exist_ok=True)
+        with self._connect() as conn:
+            atimes = dict(conn.execute("SELECT path, atime FROM cache_file").fetchall())
+        rows = []
+        for file_path, size, atime in _walk_cache(self.cache_path):
+            rel_path = self._rel_path(file_path)
+            rows.append((rel_path, size, max(atime, atimes.get(rel_path, atime))))
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM cache_file")
+            conn.executemany("INSERT OR REPLACE INTO cache_file (path, size, atime) VALUES (?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('built', ?)", (int(time.time()),))
+        total_size = self.total_size()
+        log.info("Indexed %d files (%s) in cache '%s'", len(rows), nice_size(total_size), self.cache_path)
+        return len(rows), total_size
+
+
+class BlockCache:
+    """In-memory LRU cache of fixed size blocks of remote objects.
+
+    Serves repeated ranged reads of objects that are not in the local cache
+    (e.g. paging through a large dataset) without fetching the same bytes from
+    the remote store again. Only the blocks a read needs are fetched, runs of
+    consecutive missing blocks with a single ranged request.
+
+    Blocks are keyed by path and version (e.g. size or ETag) of the object, so
+    blocks of an object that was replaced by another process are not served.
+    The last block of an object is only cached if it is complete, since it
+    would change if the object grew.
+    """
+
+    def __init__(self, max_size: int, block_size: int = BLOCK_CACHE_BLOCK_SIZE):
+        self.max_size = max_size
+        self.block_size = block_size
+        self._blocks: OrderedDict[Tuple[str, str, int], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def read(
+        self, rel_path: str, version: str, start: int, count: int, fetch: Callable[[int, int], Optional[bytes]]
+    ) -> Optional[bytes]:
+        """Read ``count`` bytes at ``start`` of ``rel_path``, ``fetch(start, count)`` reads missing blocks.
+
+        Returns ``None`` if fetching a missing block fails.
+        """
+        if count <= 0:
+            return b""
+        block_size = self.block_size
+        first_block = start // block_size
+        last_block = (start + count - 1) // block_size
+        blocks: Dict[int, bytes] = {}
+        missing: List[int] = []
+        with self._lock:
+            for block in range(first_block, last_block + 1):
+                key = (rel_path, version, block)
+                data = self._blocks.get(key)
+                if data is None:
+                    missing.append(block)
+                else:
+                    self._blocks.move_to_end(key)
+                    blocks[block] = data
+        for run in _consecutive_runs(missing):
+            data = fetch(run[0] * block_size, len(run) * block_size)
+            if data is None:
+                return None
+            for i, block in enumerate(run):
+                blocks[block] = data[i * block_size : (i + 1) * block_size]
+            self._put(rel_path, version, {block: blocks[block] for block in run if len(blocks[block]) == block_size})
+        content = b"".join(blocks[block] for block in range(first_block, last_block + 1))
+        offset = start - first_block * block_size
+        return content[offset : offset + count]
+
+    def invalidate(self, rel_path: str, directory: bool = False) -> None:
+        """Drop all cached blocks of ``rel_path`` (or of all objects below it), e.g. after an update."""
+        prefix = f"{rel_path.rstrip('/')}/"
+        with self._lock:
+            for key in [key for key in self._blocks if key[0] == rel_path or (directory and key[0].startswith(prefix))]:
+                self._size -= len(self._blocks.pop(key))
+
+    def _put(self, rel_path: str, version: str, blocks: Dict[int, bytes]) -> None:
+        with self._lock:
+            for block, data in blocks.items():
+                key = (rel_path, version, block)
+                previous = self._blocks.pop(key, None)
+                if previous is not None:
+                    self._size -= len(previous)
+                self._blocks[key] = data
+                self._size += len(data)
+            while self._size > self.max_size and self._blocks:
+                _, data = self._blocks.popitem(last=False)
+                self._size -= len(data)
+
+
+def _consecutive_runs(blocks: List[int]) -> Iterator[List[int]]:
+    run: List[int] = []
+    for block in blocks:
+        if run and block != run[-1] + 1:
+            yield run
+            run = []
+        run.append(block)
+    if run:
+        yield run
+
+
+_cache_indexes: Dict[str, CacheIndex] = {}
+_cache_indexes_lock = threading.Lock()
+
+
+def get_cache_index(cache_path: str) -> CacheIndex:
+    """Get the index of a cache directory, shared by all users of the cache in this process."""
+    cache_path = os.path.abspath(cache_path)
+    with _cache_indexes_lock:
+        index = _cache_indexes.get(cache_path)
+        if index is None:
+            index = _cache_indexes[cache_path] = CacheIndex(cache_path)
+    return index
+
+
+def _cache_index(cache_target: CacheTarget) -> CacheIndex:
+    index = get_cache_index(cache_target.path)
+    built_time = index.built_time
+    if built_time is None or time.time() - built_time > CACHE_INDEX_REBUILD_INTERVAL:
+        index.rebuild()
+    return index
+
+
 def check_cache(cache_target: CacheTarget):
     """Run a step of the cache monitor."""
-    total_size, file_list = _get_cache_size_files(cache_target.path)
-    # Sort the file list (based on access time)
-    file_list.sort()
+    index = _cache_index(cache_target)
+    total_size = index.total_size()
     # Initiate cleaning once we reach cache_monitor_cache_limit percentage of the defined cache size?
     # Convert GBs to bytes for comparison
     cache_size_in_gb = cache_target.size * ONE_GIGA_BYTE
@@ -74,57 +381,57 @@ def check_cache(cache_target: CacheTarget):
         # the limit - maybe delete additional #%?
         # For now, delete enough to leave at least 10% of the total cache free
         delete_this_much = total_size - cache_limit
-        _clean_cache(file_list, delete_this_much)
+        _clean_cache(index, delete_this_much)
 
 
 def reset_cache(cache_target: CacheTarget):
-    _, file_list = _get_cache_size_files(cache_target.path)
-    _clean_cache(file_list, inf)
-
-
-def _clean_cache(file_list: FileListT, delete_this_much: float) -> None:
-    """Keep deleting files from the file_list until the size of the deleted
-    files is greater than the value in delete_this_much parameter.
-    :param file_list: List of candidate files that can be deleted. This method
-        will start deleting files from the beginning of the list so the list
-        should be sorted accordingly. The list must contains 3-element tuples,
-        positioned as follows: position 0 holds file last accessed timestamp
-        (as time.struct_time), position 1 holds file path, and position 2 has
-        file size (e.g., (<access time>, /mnt/data/dataset_1.dat), 472394)
-    :param delete_this_much: Total size of files, in bytes, that should be deleted.
-    """
-    # Keep deleting datasets from file_list until deleted_amount does not
-    # exceed delete_this_much; start deleting from the front of the file list,
-    # which assumes the oldest files come first on the list.
-    deleted_amount = 0
-    for entry in file_list:
-        if deleted_amount < delete_this_much:
-            deleted_amount += entry[2]
-            os.remove(entry[1])
-        else:
-            log.debug("Cache cleaning done. Total space freed: %s", nice_size(deleted_amount))
-            return
+    index = CacheIndex(cache_target.path)
+    index.rebuild()
+    _clean_cache(index, inf)
 
 
-def _get_cache_size_files(cache_path) -> Tuple[int, FileListT]:
-    """Returns cache size and cache files.
+def rebuild_cache_index(cache_target: CacheTarget) -> Tuple[int, int]:
+    return CacheIndex(cache_target.path).rebuild()
 
-    For each file, we get last access time, file path, and file size.
-    """
-    cache_size = 0
-    file_list = []
 
+def _clean_cache(index: CacheIndex, delete_this_much: float) -> None:
+    """Keep deleting the least recently used files of the cache until the size
+    of the deleted files is greater than the value in delete_this_much parameter.
+    :param index: Index of the cache to clean.
+    :param delete_this_much: Total size of files, in bytes, that should be deleted.
+    """
+    deleted_amount = 0
+    while deleted_amount < delete_this_much:
+        entries = index.least_recently_used()
+        if not entries:
+            break
+        removed = []
+        for rel_path, size in entries:
+            if deleted_amount >= delete_this_much:
+                break
+            try:
+                os.remove(os.path.join(index.cache_path, rel_path))
+                deleted_amount += size
+            except FileNotFoundError:
+                # Removed without updating the index, just drop it from the index
+                pass
+            removed.append(rel_path)
+        index.remove_all(removed)
+    log.debug("Cache cleaning done. Total space freed: %s", nice_size(deleted_amount))
+
+
+def _walk_cache(cache_path) -> Iterator[Tuple[str, int, float]]:
+    """Yield path, size and last access time of each file in the cache."""
     for dirpath, _, filenames in os.walk(cache_path):
         for filename in filenames:
+            if dirpath == cache_path and filename.startswith(CACHE_INDEX_FILENAME):
+                continue
             file_path = os.path.join(dirpath, filename)
-            file_size = os.path.getsize(file_path)
-            cache_size += file_size
-            # Get the time given file was last accessed
-            last_access_time = time.localtime(os.stat(file_path)[7])
-            # Compose a tuple of the access time and the file path
-            file_tuple = last_access_time, file_path, file_size
-            file_list.append(file_tuple)
-    return cache_size, file_list
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            yield file_path, stat.st_size, stat.st_atime
 
 
 def parse_caching_config_dict_from_xml(config_xml):
@@ -23,7 +23,6 @@ except ImportError:
 from galaxy.util import (
     ExecutionTimer,
     string_as_bool,
-    unlink,
 )
 from ._caching_base import CachingConcreteObjectStore
 
@@ -371,6 +370,26 @@ class IRODSObjectStore(CachingConcreteObjectStore):
         finally:
             log.debug("irods_pt _download: %s", ipt_timer)
 
+    def _get_remote_range(self, rel_path, start, count):
+        ipt_timer = ExecutionTimer()
+        p = Path(rel_path)
+        data_object_name = p.stem + p.suffix
+        subcollection_name = p.parent
+
+        collection_path = f"{self.home}/{subcollection_name}"
+        data_object_path = f"{collection_path}/{data_object_name}"
+        options = {kw.DEST_RESC_NAME_KW: self.resource}
+
+        try:
+            with self.session.data_objects.open(data_object_path, "r", **options) as data_obj:
+                data_obj.seek(start)
+                return data_obj.read(count)
+        except (DataObjectDoesNotExist, CollectionDoesNotExist):
+            log.warning("Collection or data object (%s) does not exist", data_object_path)
+            return None
+        finally:
+            log.debug("irods_pt _get_remote_range: %s", ipt_timer)
+
     def _push_to_storage(self, rel_path, source_file=None, from_string=None):
         """
         Push the file pointed to by ``rel_path`` to the iRODS. Extract folder name
@@ -471,7 +490,7 @@ class IRODSObjectStore(CachingConcreteObjectStore):
             # with all the files in it. This is easy for the local file system,
             # but requires iterating through each individual key in irods and deleing it.
             if entire_dir and extra_dir:
-                shutil.rmtree(self._get_cache_path(rel_path), ignore_errors=True)
+                self._remove_from_cache(rel_path, entire_dir=True)
 
                 col_path = f"{self.home}/{rel_path}"
                 col = None
@@ -495,7 +514,7 @@ class IRODSObjectStore(CachingConcreteObjectStore):
 
             else:
                 # Delete from cache first
-                unlink(self._get_cache_path(rel_path), ignore_errors=True)
+                self._remove_from_cache(rel_path)
                 # Delete from irods as well
                 p = Path(rel_path)
                 data_object_name = p.stem + p.suffix
@@ -46,6 +46,11 @@ class PulsarObjectStore(BaseObjectStore):
     def _get_data(self, obj, **kwds):
         return self.pulsar_client.get_data(**self.__build_kwds(obj, **kwds))
 
+    def _get_bytes(self, obj, start=0, count=-1, **kwds) -> bytes:
+        with open(self._get_filename(obj, **kwds), "rb") as data_file:
+            data_file.seek(start)
+            return data_file.read(count)
+
     def _get_filename(self, obj, **kwds) -> str:
         return self.pulsar_client.get_filename(**self.__build_kwds(obj, **kwds))
 
@@ -30,7 +30,6 @@ from galaxy.util import (
     directory_hash_id,
     string_as_bool,
     umask_fix_perms,
-    unlink,
 )
 from ._caching_base import CachingConcreteObjectStore
 from .caching import (
@@ -318,6 +317,8 @@ class RucioObjectStore(CachingConcreteObjectStore):
         auth_token = self._get_token(**kwargs)
         file_ok = self.rucio_broker.download(rel_path, dest, auth_token)
         self._fix_permissions(self._get_cache_path(rel_path_dir))
+        if file_ok:
+            self.cache_index.record(rel_path)
         return file_ok
 
     def _fix_file_permissions(self, path):
@@ -425,10 +426,7 @@ class RucioObjectStore(CachingConcreteObjectStore):
                 return True
 
             # Delete from cache first
-            if entire_dir and extra_dir:
-                shutil.rmtree(self._get_cache_path(rel_path), ignore_errors=True)
-            else:
-                unlink(self._get_cache_path(rel_path), ignore_errors=True)
+            self._remove_from_cache(rel_path, entire_dir=bool(entire_dir and extra_dir))
 
             # Delete from rucio as well
             if self.rucio_broker.data_object_exists(rel_path):
@@ -486,6 +484,7 @@ class RucioObjectStore(CachingConcreteObjectStore):
             size_in_rdb = self.rucio_broker.get_size(rel_path)
             # same size as in  rucio, or empty file in rucio - do not pull
             if size_in_cache == size_in_rdb or size_in_rdb == 0:
+                self.cache_index.touch(rel_path)
                 return cache_path
 
         # Check if the file exists in persistent storage and, if it does, pull it into cache
@@ -543,6 +542,8 @@ class RucioObjectStore(CachingConcreteObjectStore):
                 log.exception("Trouble copying source file '%s' to cache '%s'", source_file, cache_file)
         else:
             source_file = self._get_cache_path(rel_path)
+        if os.path.exists(self._get_cache_path(rel_path)):
+            self.cache_index.record(rel_path)
 
         # Update the file on rucio
         self.rucio_broker.upload(rel_path, source_file)
@@ -326,6 +326,18 @@ class S3ObjectStore(CachingConcreteObjectStore, CloudConfigMixin, UsesAxel):
             log.exception("Problem downloading key '%s' from S3 bucket '%s'", rel_path, self._bucket.name)
         return False
 
+    def _get_remote_range(self, rel_path, start, count):
+        try:
+            key = self._bucket.get_key(rel_path)
+            if key is None:
+                return None
+            if start >= key.size:
+                return b""
+            return key.get_contents_as_string(headers={"Range": f"bytes={start}-{start + count - 1}"})
+        except S3ResponseError:
+            log.exception("Problem reading range of key '%s' from S3 bucket '%s'", rel_path, self._bucket.name)
+        return None
+
     def _push_to_storage(self, rel_path, source_file=None, from_string=None):
         """
         Push the file pointed to by ``rel_path`` to the object store naming the key
@@ -7,6 +7,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Optional,
     TYPE_CHECKING,
 )
 
@@ -327,6 +328,26 @@ class S3ObjectStore(CachingConcreteObjectStore):
             log.exception("Failed to download file from S3")
         return False
 
+    def _get_remote_range(self, rel_path: str, start: int, count: int) -> Optional[bytes]:
+        try:
+            response = self._client.get_object(
+                Bucket=self.bucket, Key=rel_path, Range=f"bytes={start}-{start + count - 1}"
+            )
+            return response["Body"].read()
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "InvalidRange":
+                # start is beyond the end of the object
+                return b""
+            log.exception("Failed to read range of file from S3")
+        return None
+
+    def _get_remote_version(self, rel_path: str) -> Optional[str]:
+        try:
+            return self._client.head_object(Bucket=self.bucket, Key=rel_path)["ETag"]
+        except ClientError:
+            log.exception("Could not get ETag of key '%s' from S3", rel_path)
+        return None
+
     def _push_string_to_path(self, rel_path: str, from_string: str) -> bool:
         try:
             self._client.put_object(Body=from_string.encode("utf-8"), Bucket=self.bucket, Key=rel_path)
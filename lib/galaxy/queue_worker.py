@@ -57,7 +57,7 @@ def send_control_task(app, task, noop_self=False, get_response=False, routing_ke
     """
     if kwargs is None:
         kwargs = {}
-    log.info(f"Sending {task} control task.")
+    log.debug(f"Sending {task} control task.")
     payload = {"task": task, "kwargs": kwargs}
     if noop_self:
         payload["noop"] = app.config.server_name
@@ -291,6 +291,10 @@ def job_rule_modules(app):
     return rules_module_list
 
 
+def wake_job_handlers(app, **kwargs):
+    app.job_manager.wake(handler=kwargs.get("handler"), queue=kwargs.get("queue", "jobs"))
+
+
 def admin_job_lock(app, **kwargs):
     job_lock = kwargs.get("job_lock", False)
     # job_queue is exposed in the root app, but this will be 'fixed' at some
@@ -308,6 +312,7 @@ control_message_to_task = {
     "reload_tool_data_tables": reload_tool_data_tables,
     "reload_job_rules": reload_job_rules,
     "admin_job_lock": admin_job_lock,
+    "wake_job_handlers": wake_job_handlers,
     "reload_sanitize_allowlist": reload_sanitize_allowlist,
     "recalculate_user_disk_usage": recalculate_user_disk_usage,
     "rebuild_toolbox_search_index": rebuild_toolbox_search_index,
@@ -114,6 +114,9 @@ class RBACAgent:
     def set_all_dataset_permissions(self, dataset, permissions, new=False):
         raise Exception("Unimplemented Method")
 
+    def set_new_datasets_permissions(self, datasets, permissions):
+        raise Exception("Unimplemented Method")
+
     def set_dataset_permission(self, dataset, permission):
         raise Exception("Unimplemented Method")
 
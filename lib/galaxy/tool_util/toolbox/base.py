@@ -388,6 +388,10 @@ class AbstractToolBox(ManagesIntegratedToolPanelMixin):
         panel_view_rendered = self._tool_panel_view_rendered[panel_view_id]
         return panel_view_rendered.has_item_recursive(tool)
 
+    def panel_view_items(self, panel_view_id):
+        """Iterate through the items of a panel view, including the elements of its sections."""
+        return self._tool_panel_view_rendered[panel_view_id].items_recursive()
+
     def load_dynamic_tool(self, dynamic_tool):
         if not dynamic_tool.active:
             return None
@@ -294,6 +294,13 @@ class ToolPanelElements(odict, HasPanelItems):
         the_copy.update(self)
         return the_copy
 
+    def items_recursive(self):
+        """Iterate through panel items and the elements of sections."""
+        for value in self.values():
+            yield value
+            if isinstance(value, ToolSection):
+                yield from value.elems.values()
+
     def has_item_recursive(self, item):
         """Check panel and section elements for supplied item."""
         for value in self.values():
@@ -10,10 +10,13 @@ import os
 import re
 import tarfile
 import tempfile
+import threading
 from collections.abc import MutableMapping
+from functools import partial
 from pathlib import Path
 from typing import (
     Any,
+    Callable,
     cast,
     Dict,
     List,
@@ -365,6 +368,24 @@ def get_safe_version(tool: "Tool", requested_tool_version: str) -> Optional[str]
     return None
 
 
+# Attributes of lazily loaded tools that are only parsed once the tool is requested
+LAZY_TOOL_ATTRIBUTES = (
+    "inputs",
+    "inputs_by_page",
+    "display_by_page",
+    "display",
+    "npages",
+    "last_page",
+    "enctype",
+    "template_macro_params",
+    "input_params",
+    "input_required",
+    "outputs",
+    "output_collections",
+    "_Tool__tests",
+)
+
+
 class ToolNotFoundException(Exception):
     pass
 
@@ -560,6 +581,13 @@ class ToolBox(AbstractToolBox):
             return self.cache_regions[tool_cache_data_dir]
 
     def create_tool(self, config_file, tool_cache_data_dir=None, **kwds):
+        tool_source = self.get_cached_tool_source(config_file, tool_cache_data_dir)
+        if getattr(self.app.config, "lazy_load_tools", False):
+            # Lazily loaded tools reload their document once they are requested
+            kwds["tool_source_loader"] = partial(self.get_cached_tool_source, config_file, tool_cache_data_dir)
+        return self._create_tool_from_source(tool_source, config_file=config_file, **kwds)
+
+    def get_cached_tool_source(self, config_file, tool_cache_data_dir=None):
         cache = self.get_cache_region(tool_cache_data_dir)
         if config_file.endswith(".xml") and cache and not cache.disabled:
             tool_document = cache.get(config_file)
@@ -574,7 +602,15 @@ class ToolBox(AbstractToolBox):
                 cache.set(config_file, tool_source)
         else:
             tool_source = self.get_expanded_tool_source(config_file)
-        return self._create_tool_from_source(tool_source, config_file=config_file, **kwds)
+        return tool_source
+
+    def get_tool(self, tool_id, tool_version=None, get_all_versions=False, exact=False, tool_uuid=None):
+        tool = super().get_tool(
+            tool_id, tool_version=tool_version, get_all_versions=get_all_versions, exact=exact, tool_uuid=tool_uuid
+        )
+        if isinstance(tool, Tool) and tool.lazy:
+            self.app.tool_cache.touch_materialized_tool(tool)
+        return tool
 
     def get_expanded_tool_source(self, config_file, **kwargs):
         try:
@@ -783,6 +819,7 @@ class Tool(UsesDictVisibleKeys):
         allow_code_files=True,
         dynamic=False,
         tool_dir=None,
+        tool_source_loader: Optional[Callable[[], ToolSource]] = None,
     ):
         """Load a tool from the config named by `config_file`"""
         # Determine the full path of the directory where the tool config is
@@ -845,19 +882,79 @@ class Tool(UsesDictVisibleKeys):
         self._is_workflow_compatible = None
         self.__help = None
         self.__tests: Optional[str] = None
+        # Only plain tools loaded from a config file are loaded lazily, special
+        # tool types may depend on their inputs and outputs while loading.
+        self.lazy = (
+            getattr(app.config, "lazy_load_tools", False)
+            and type(self) is Tool
+            and not dynamic
+            and config_file is not None
+        )
+        self._tool_source_loader = tool_source_loader
+        self._parse_deferred = False
+        self._materialize_lock = threading.RLock()
         try:
             self.parse(tool_source, guid=guid, dynamic=dynamic)
         except Exception as e:
             global_tool_errors.add_error(config_file, "Tool Loading", e)
             raise e
-        mem_optimize = getattr(self.tool_source, "mem_optimize", None)
-        if mem_optimize is not None:
-            mem_optimize()
+        if self.lazy:
+            self.defer_parsing()
+        if not self.lazy or self._tool_source_loader:
+            self._mem_optimize_tool_source()
         # The job search is only relevant in a galaxy context, and breaks
         # loading tools into the toolshed for validation.
         if self.app.name == "galaxy":
             self.job_search = self.app.job_search
 
+    if not TYPE_CHECKING:
+
+        def __getattr__(self, name):
+            # Only called if the attribute is not set, parse the inputs,
+            # outputs and tests of lazily loaded tools on first access.
+            if name in LAZY_TOOL_ATTRIBUTES and self.__dict__.get("_parse_deferred"):
+                self.materialize()
+                return getattr(self, name)
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def _mem_optimize_tool_source(self):
+        mem_optimize = getattr(self.tool_source, "mem_optimize", None)
+        if mem_optimize is not None:
+            mem_optimize()
+
+    def materialize(self):
+        """Parse the inputs, outputs and tests of a lazily loaded tool if they are not parsed yet."""
+        if not self.lazy:
+            return
+        with self._materialize_lock:
+            if self._parse_deferred:
+                if self._tool_source_loader:
+                    self.tool_source = self._tool_source_loader()
+                self.inputs_by_page = []
+                self.display_by_page = []
+                self.input_params = []
+                self.input_required = False
+                self.__tests = None
+                self.parse_inputs(self.tool_source)
+                self.parse_outputs(self.tool_source)
+                if self.app.is_webapp:
+                    self.parse_tests()
+                if self._tool_source_loader:
+                    self._mem_optimize_tool_source()
+                self._parse_deferred = False
+        # Discard the parsed inputs, outputs and tests of the least recently
+        # requested tools, outside of the lock to not hold two tool locks at once.
+        if tool_cache := getattr(self.app, "tool_cache", None):
+            for tool in tool_cache.add_materialized_tool(self):
+                tool.defer_parsing()
+
+    def defer_parsing(self):
+        """Discard the inputs, outputs and tests of a lazily loaded tool, they are parsed again on first access."""
+        with self._materialize_lock:
+            for name in LAZY_TOOL_ATTRIBUTES:
+                self.__dict__.pop(name, None)
+            self._parse_deferred = True
+
     def remove_from_cache(self):
         if source_path := self.tool_source.source_path:
             for region in self.app.toolbox.cache_regions.values():
@@ -1166,13 +1263,22 @@ class Tool(UsesDictVisibleKeys):
         self.hidden = tool_source.parse_hidden()
         self.license = tool_source.parse_license()
         self.creator = tool_source.parse_creator()
-        self.parse_inputs(self.tool_source)
-        self.parse_outputs(self.tool_source)
+        if self.lazy:
+            # Inputs, outputs and tests are parsed once the tool is requested,
+            # only parse what the tool panel needs to know about the inputs.
+            pages = tool_source.parse_input_pages()
+            if pages.inputs_defined:
+                self.parse_input_form(pages)
+            self.has_multiple_pages = pages.inputs_defined and len(pages.page_sources) > 1
+        else:
+            self.parse_inputs(self.tool_source)
+            self.parse_outputs(self.tool_source)
         self.raw_help = None
 
         if self.app.is_webapp:
             self.raw_help = self.__get_help_with_images(tool_source.parse_help())
-            self.parse_tests()
+            if not self.lazy:
+                self.parse_tests()
         self.__parse_legacy_features(tool_source)
 
         # Load any tool specific options (optional)
@@ -1426,31 +1532,9 @@ class Tool(UsesDictVisibleKeys):
         pages = tool_source.parse_input_pages()
         enctypes: Set[str] = set()
         if pages.inputs_defined:
-            if hasattr(pages, "input_elem"):
-                input_elem = pages.input_elem
-                # Handle properties of the input form
-                self.check_values = string_as_bool(input_elem.get("check_values", self.check_values))
-                self.nginx_upload = string_as_bool(input_elem.get("nginx_upload", self.nginx_upload))
-                self.action = input_elem.get("action", self.action)
-                # If we have an nginx upload, save the action as a tuple instead of
-                # a string. The actual action needs to get url_for run to add any
-                # prefixes, and we want to avoid adding the prefix to the
-                # nginx_upload_path.
-                if self.nginx_upload and self.app.config.nginx_upload_path and not isinstance(self.action, tuple):
-                    if "?" in unquote_plus(self.action):
-                        raise Exception(
-                            "URL parameters in a non-default tool action can not be used "
-                            "in conjunction with nginx upload.  Please convert them to "
-                            "hidden POST parameters"
-                        )
-                    self.action = (
-                        f"{self.app.config.nginx_upload_path}?nginx_redir=",
-                        unquote_plus(self.action),
-                    )
-                self.target = input_elem.get("target", self.target)
-                self.method = input_elem.get("method", self.method)
-                # Parse the actual parameters
-                # Handle multiple page case
+            self.parse_input_form(pages)
+            # Parse the actual parameters
+            # Handle multiple page case
             for page_source in pages.page_sources:
                 inputs = self.parse_input_elem(page_source, enctypes)
                 display = page_source.parse_display()
@@ -1484,6 +1568,34 @@ class Tool(UsesDictVisibleKeys):
                 self.input_required = True
                 break
 
+    def parse_input_form(self, pages):
+        """
+        Parse the properties of the input form, e.g. the "action" and
+        "target" attributes of the "<inputs>" element.
+        """
+        if hasattr(pages, "input_elem"):
+            input_elem = pages.input_elem
+            self.check_values = string_as_bool(input_elem.get("check_values", self.check_values))
+            self.nginx_upload = string_as_bool(input_elem.get("nginx_upload", self.nginx_upload))
+            self.action = input_elem.get("action", self.action)
+            # If we have an nginx upload, save the action as a tuple instead of
+            # a string. The actual action needs to get url_for run to add any
+            # prefixes, and we want to avoid adding the prefix to the
+            # nginx_upload_path.
+            if self.nginx_upload and self.app.config.nginx_upload_path and not isinstance(self.action, tuple):
+                if "?" in unquote_plus(self.action):
+                    raise Exception(
+                        "URL parameters in a non-default tool action can not be used "
+                        "in conjunction with nginx upload.  Please convert them to "
+                        "hidden POST parameters"
+                    )
+                self.action = (
+                    f"{self.app.config.nginx_upload_path}?nginx_redir=",
+                    unquote_plus(self.action),
+                )
+            self.target = input_elem.get("target", self.target)
+            self.method = input_elem.get("method", self.method)
+
     def parse_outputs(self, tool_source):
         """
         Parse <outputs> elements and fill in self.outputs (keyed by name)
@@ -2385,6 +2497,7 @@ class Tool(UsesDictVisibleKeys):
             object_store=tool.app.object_store,
             final_job_state=final_job_state,
             flush_per_n_datasets=tool.app.config.flush_per_n_datasets,
+            bulk_insert=tool.app.config.bulk_insert_discovered_datasets,
             max_discovered_files=tool.app.config.max_discovered_files,
         )
         collected = output_collect.collect_primary_datasets(
@@ -5,9 +5,12 @@ import shutil
 import sqlite3
 import tempfile
 import zlib
+from collections import OrderedDict
 from threading import Lock
 from typing import (
+    Any,
     Dict,
+    List,
     Optional,
 )
 
@@ -63,8 +66,9 @@ class ToolDocumentCache:
         return os.access(self.cache_file, os.W_OK)
 
     def reopen_ro(self):
-        self._get_cache(flag="r")
+        # The writeable copy has been renamed to the cache file by now
         self.writeable_cache_file = None
+        self._get_cache(flag="r")
 
     def get(self, config_file):
         try:
@@ -136,8 +140,11 @@ class ToolCache:
     toolbox.
     """
 
-    def __init__(self):
+    def __init__(self, max_materialized_tools: int = 0):
         self._lock = Lock()
+        self.max_materialized_tools = max_materialized_tools
+        # Lazily loaded tools whose inputs, outputs and tests are parsed, least recently used first
+        self._materialized_tools: OrderedDict[int, Any] = OrderedDict()
         self._hash_by_tool_paths: Dict[str, ToolHash] = {}
         self._tools_by_path = {}
         self._tool_paths_by_id = {}
@@ -175,6 +182,7 @@ class ToolCache:
                         # We record it here, so that we can recover it
                         self._removed_tools_by_path[config_filename] = self._tools_by_path[config_filename]
                     del self._tools_by_path[config_filename]
+                    self._materialized_tools.pop(id(tool), None)
                     tool_ids = tool.all_ids
                     for tool_id in tool_ids:
                         if tool_id in self._tool_paths_by_id:
@@ -231,7 +239,8 @@ class ToolCache:
                 config_filename = self._tool_paths_by_id[tool_id]
                 del self._hash_by_tool_paths[config_filename]
                 del self._tool_paths_by_id[tool_id]
-                del self._tools_by_path[config_filename]
+                tool = self._tools_by_path.pop(config_filename)
+                self._materialized_tools.pop(id(tool), None)
                 if tool_id in self._new_tool_ids:
                     self._new_tool_ids.remove(tool_id)
 
@@ -252,6 +261,28 @@ class ToolCache:
                 else:
                     self._macro_paths_by_id[tool_id].add(macro_path)
 
+    def add_materialized_tool(self, tool) -> List:
+        """
+        Keep track of a lazily loaded tool whose inputs, outputs and tests are parsed.
+
+        Returns the least recently used tools exceeding ``max_materialized_tools``,
+        the parsed inputs, outputs and tests of these tools should be discarded.
+        """
+        evicted_tools = []
+        with self._lock:
+            self._materialized_tools[id(tool)] = tool
+            self._materialized_tools.move_to_end(id(tool))
+            if self.max_materialized_tools > 0:
+                while len(self._materialized_tools) > self.max_materialized_tools:
+                    evicted_tools.append(self._materialized_tools.popitem(last=False)[1])
+        return evicted_tools
+
+    def touch_materialized_tool(self, tool):
+        """Mark a lazily loaded tool as recently used if its inputs, outputs and tests are parsed."""
+        with self._lock:
+            if id(tool) in self._materialized_tools:
+                self._materialized_tools.move_to_end(id(tool))
+
     def reset_status(self):
         """
         Reset tracking of new and newly disabled tools.
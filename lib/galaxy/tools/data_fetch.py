@@ -5,12 +5,15 @@ import os
 import shutil
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
 from typing import (
     Any,
     Dict,
     List,
     Optional,
+    Set,
     Tuple,
 )
 
@@ -34,7 +37,7 @@ from galaxy.util.bunch import Bunch
 from galaxy.util.compression_utils import CompressedFile
 from galaxy.util.hash_util import (
     HASH_NAMES,
-    memory_bound_hexdigest,
+    memory_bound_hexdigests,
 )
 
 DESCRIPTION = """Data Import Script"""
@@ -46,7 +49,12 @@ def main(argv=None):
     args = _arg_parser().parse_args(argv)
     registry = Registry()
     registry.load_datatypes(root_dir=args.galaxy_root, config=args.datatypes_registry)
-    do_fetch(args.request, working_directory=args.working_directory or os.getcwd(), registry=registry)
+    do_fetch(
+        args.request,
+        working_directory=args.working_directory or os.getcwd(),
+        registry=registry,
+        workers=args.workers,
+    )
 
 
 def do_fetch(
@@ -54,6 +62,7 @@ def do_fetch(
     working_directory: str,
     registry: Registry,
     file_sources_dict: Optional[Dict] = None,
+    workers: int = 1,
 ):
     assert os.path.exists(request_path)
     with open(request_path) as f:
@@ -66,6 +75,7 @@ def do_fetch(
         working_directory,
         allow_failed_collections,
         file_sources_dict,
+        workers,
     )
     galaxy_json = _request_to_galaxy_json(upload_config, request)
     galaxy_json_path = os.path.join(working_directory, "galaxy.json")
@@ -127,7 +137,7 @@ def _fetch_target(upload_config: "UploadConfig", target):
     fetched_target["destination"] = destination
     destination_type = destination["type"]
     is_collection = destination_type == "hdca"
-    failed_elements = []
+    failed_element_ids: Set[int] = set()
 
     if "collection_type" in target:
         fetched_target["collection_type"] = target["collection_type"]
@@ -250,14 +260,15 @@ def _fetch_target(upload_config: "UploadConfig", target):
         if url:
             sources.append(source_dict)
         hashes = item.get("hashes", [])
-        for hash_dict in hashes:
-            hash_function = hash_dict.get("hash_function")
-            hash_value = hash_dict.get("hash_value")
-            try:
-                _handle_hash_validation(upload_config, hash_function, hash_value, path)
-            except Exception as e:
-                error_message = str(e)
-                item["error_message"] = error_message
+        try:
+            _handle_hash_validation(
+                upload_config,
+                [(hash_dict.get("hash_function"), hash_dict.get("hash_value")) for hash_dict in hashes],
+                path,
+            )
+        except Exception as e:
+            error_message = str(e)
+            item["error_message"] = error_message
 
         dbkey = item.get("dbkey", "?")
         link_data_only = upload_config.link_data_only
@@ -392,11 +403,13 @@ def _fetch_target(upload_config: "UploadConfig", target):
         except Exception as e:
             rval = {"error_message": str(e)}
             rval = _copy_and_validate_simple_attributes(item, rval)
-            failed_elements.append(rval)
+            failed_element_ids.add(id(rval))
             return rval
 
     if expansion_error is None:
-        elements = elements_tree_map(_resolve_item_capture_error, items)
+        elements = elements_tree_map(_resolve_item_capture_error, items, workers=upload_config.workers)
+        # Collect failures in request order, elements may be resolved concurrently.
+        failed_elements = [element for element in _elements_tree_leaves(elements) if id(element) in failed_element_ids]
         if is_collection and not upload_config.allow_failed_collections and len(failed_elements) > 0:
             element_error = "Failed to fetch collection element(s):\n"
             for failed_element in failed_elements:
@@ -431,15 +444,38 @@ def _decompress_target(upload_config: "UploadConfig", target):
     return result if fuzzy_root else temp_directory
 
 
-def elements_tree_map(f, items):
+def elements_tree_map(f, items, workers=1):
+    """Apply ``f`` to the leaves of the ``items`` tree, preserving the structure and order of the tree.
+
+    If ``workers`` is greater than one, leaves are processed concurrently by a
+    pool of that many threads.
+    """
+    leaves = list(_elements_tree_leaves(items))
+    if workers > 1 and len(leaves) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(leaves)), thread_name_prefix="data_fetch") as pool:
+            results = list(pool.map(f, leaves))
+    else:
+        results = [f(leaf) for leaf in leaves]
+    return _elements_tree_replace_leaves(items, iter(results))
+
+
+def _elements_tree_leaves(items):
+    for item in items:
+        if "elements" in item:
+            yield from _elements_tree_leaves(item["elements"])
+        else:
+            yield item
+
+
+def _elements_tree_replace_leaves(items, new_leaves):
     new_items = []
     for item in items:
         if "elements" in item:
             new_item = item.copy()
-            new_item["elements"] = elements_tree_map(f, item["elements"])
+            new_item["elements"] = _elements_tree_replace_leaves(item["elements"], new_leaves)
             new_items.append(new_item)
         else:
-            new_items.append(f(item))
+            new_items.append(next(new_leaves))
     return new_items
 
 
@@ -491,10 +527,11 @@ def _has_src_to_path(upload_config, item, is_dataset=False) -> Tuple[str, str]:
         if not is_dataset:
             # Actual target dataset will validate and put results in dict
             # that gets passed back to Galaxy.
-            for hash_function in HASH_NAMES:
-                hash_value = item.get(hash_function)
-                if hash_value:
-                    _handle_hash_validation(upload_config, hash_function, hash_value, path)
+            _handle_hash_validation(
+                upload_config,
+                [(hash_function, item[hash_function]) for hash_function in HASH_NAMES if item.get(hash_function)],
+                path,
+            )
         if name is None:
             name = url.split("/")[-1]
     elif src == "pasted":
@@ -509,13 +546,16 @@ def _has_src_to_path(upload_config, item, is_dataset=False) -> Tuple[str, str]:
     return name, path
 
 
-def _handle_hash_validation(upload_config, hash_function, hash_value, path):
-    if upload_config.validate_hashes:
-        calculated_hash_value = memory_bound_hexdigest(hash_func_name=hash_function, path=path)
-        if calculated_hash_value != hash_value:
-            raise Exception(
-                f"Failed to validate upload with [{hash_function}] - expected [{hash_value}] got [{calculated_hash_value}]"
-            )
+def _handle_hash_validation(upload_config, hashes, path):
+    """Validate ``path`` against a list of ``(hash_function, hash_value)`` pairs, reading the file once."""
+    if upload_config.validate_hashes and hashes:
+        calculated_hash_values = memory_bound_hexdigests([hash_function for hash_function, _ in hashes], path)
+        for hash_function, hash_value in hashes:
+            calculated_hash_value = calculated_hash_values[hash_function]
+            if calculated_hash_value != hash_value:
+                raise Exception(
+                    f"Failed to validate upload with [{hash_function}] - expected [{hash_value}] got [{calculated_hash_value}]"
+                )
 
 
 def _arg_parser():
@@ -525,6 +565,7 @@ def _arg_parser():
     parser.add_argument("--request-version")
     parser.add_argument("--request")
     parser.add_argument("--working-directory")
+    parser.add_argument("--workers", type=int, default=1, help="number of files to download and process concurrently")
     return parser
 
 
@@ -553,6 +594,7 @@ class UploadConfig:
         working_directory,
         allow_failed_collections,
         file_sources_dict=None,
+        workers=1,
     ):
         self.registry = registry
         self.working_directory = working_directory
@@ -566,14 +608,19 @@ class UploadConfig:
         self.link_data_only = _link_data_only(request)
         self.file_sources_dict = file_sources_dict
         self._file_sources = None
+        self.workers = max(workers, 1)
 
         self.__workdir = os.path.abspath(working_directory)
         self.__upload_count = 0
+        self.__lock = threading.Lock()
 
     @property
     def file_sources(self):
-        if self._file_sources is None:
-            self._file_sources = get_file_sources(self.working_directory, file_sources_as_dict=self.file_sources_dict)
+        with self.__lock:
+            if self._file_sources is None:
+                self._file_sources = get_file_sources(
+                    self.working_directory, file_sources_as_dict=self.file_sources_dict
+                )
         return self._file_sources
 
     def get_option(self, item, key):
@@ -588,8 +635,9 @@ class UploadConfig:
             return getattr(self, key)
 
     def __new_dataset_path(self):
-        path = os.path.join(self.working_directory, f"gxupload_{self.__upload_count}")
-        self.__upload_count += 1
+        with self.__lock:
+            path = os.path.join(self.working_directory, f"gxupload_{self.__upload_count}")
+            self.__upload_count += 1
         return path
 
     def ensure_in_working_directory(self, path, purge_source, in_place):
@@ -72,6 +72,7 @@ class JobImportHistoryArchiveWrapper:
                 app=self.app,
                 user=user,
                 tag_handler=self.app.tag_handler.create_tag_handler_session(jiha.job.galaxy_session),
+                import_options=store.ImportOptions(copy_threads=self.app.config.model_store_import_copy_threads),
             )
             job = jiha.job
             with model_store.target_history(default_history=job.history) as new_history:
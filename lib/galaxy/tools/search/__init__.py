@@ -25,13 +25,18 @@ Filters - various filters are available for processing content as the index is
 
 """
 
+import json
 import logging
 import os
 import re
 import shutil
+import threading
+from collections import OrderedDict
 from typing import (
     Dict,
     List,
+    Optional,
+    Tuple,
     Union,
 )
 
@@ -50,6 +55,7 @@ from whoosh.qparser import (
     MultifieldParser,
     OrGroup,
 )
+from whoosh.query import Term
 from whoosh.scoring import (
     BM25F,
     Frequency,
@@ -62,12 +68,30 @@ from galaxy.util import (
     ExecutionTimer,
     unicodify,
 )
+from galaxy.util.hash_util import md5_hash_str
 
 log = logging.getLogger(__name__)
 
 CanConvertToFloat = Union[str, int, float]
 CanConvertToInt = Union[str, int, float]
 
+# Fields searched by the query parser
+SEARCH_FIELDS = [
+    "id",
+    "id_exact",
+    "name",
+    "name_exact",
+    "description",
+    "section",
+    "edam_operations",
+    "edam_topics",
+    "repository",
+    "owner",
+    "help",
+    "labels",
+    "stub",
+]
+
 
 def get_or_create_index(index_dir, schema):
     """Get or create a reference to the index."""
@@ -84,194 +108,231 @@ def get_or_create_index(index_dir, schema):
     return index.create_in(index_dir, schema=schema)
 
 
-class ToolBoxSearch:
-    """Support searching across all fixed panel views in a toolbox.
+def tool_search_schema(config: GalaxyAppConfiguration) -> Schema:
+    """Build the schema of the tool search index."""
+    schema_conf = {
+        # The stored ID field is not searchable
+        "id": ID(stored=True, unique=True),
+        # This exact field is searchable by exact matches only
+        "id_exact": NGRAMWORDS(
+            minsize=config.tool_ngram_minsize,
+            maxsize=config.tool_ngram_maxsize,
+            field_boost=(config.tool_id_boost * config.tool_name_exact_multiplier),
+        ),
+        # The primary name field is searchable by exact match only, and is
+        # eligible for massive score boosting. A secondary ngram or text
+        # field for name is added below
+        "name_exact": TEXT(
+            field_boost=(config.tool_name_boost * config.tool_name_exact_multiplier),
+            analyzer=analysis.IDTokenizer() | analysis.LowercaseFilter(),
+        ),
+        # The owner/repo/tool_id parsed from the GUID
+        "stub": KEYWORD(field_boost=float(config.tool_stub_boost)),
+        # The section where the tool is listed in the tool panel
+        "section": TEXT(field_boost=float(config.tool_section_boost)),
+        # The edam operations section where the tool is listed in the tool panel
+        "edam_operations": TEXT(field_boost=float(config.tool_section_boost)),
+        # The edam topics section where the tool is listed in the tool panel
+        "edam_topics": TEXT(field_boost=float(config.tool_section_boost)),
+        # The name of the repository the tool belongs to
+        "repository": TEXT(field_boost=float(config.tool_section_boost)),
+        # The owner id of the repository the tool belongs to
+        "owner": TEXT(field_boost=float(config.tool_section_boost)),
+        # Short description defined in the tool XML
+        "description": TEXT(
+            field_boost=config.tool_description_boost,
+            analyzer=analysis.StemmingAnalyzer(),
+        ),
+        # Help text parsed from the tool XML
+        "help": TEXT(field_boost=config.tool_help_boost, analyzer=analysis.StemmingAnalyzer()),
+        "labels": KEYWORD(field_boost=float(config.tool_label_boost)),
+        # The panel views listing the tool, only used to filter search results
+        "panel_views": KEYWORD(commas=True, scorable=False),
+        # Hash of the other fields, used to update only modified documents
+        "fingerprint": ID(stored=True),
+    }
+
+    if config.tool_enable_ngram_search:
+        schema_conf.update(
+            {
+                "name": NGRAMWORDS(
+                    minsize=config.tool_ngram_minsize,
+                    maxsize=config.tool_ngram_maxsize,
+                    field_boost=(float(config.tool_name_boost) * config.tool_ngram_factor),
+                ),
+            }
+        )
+    else:
+        schema_conf.update(
+            {
+                "name": TEXT(
+                    field_boost=float(config.tool_name_boost),
+                ),
+            }
+        )
+    return Schema(**schema_conf)
 
-    Search is delegated off to ToolPanelViewSearch for each panel object.
-    """
 
-    def __init__(self, toolbox, index_dir: str, index_help: bool = True):
-        panel_searches = {}
-        for panel_view in toolbox.panel_views():
-            panel_view_id = panel_view.id
-            panel_index_dir = os.path.join(index_dir, panel_view_id)
-            panel_searches[panel_view_id] = ToolPanelViewSearch(
-                panel_view_id,
-                panel_index_dir,
-                index_help=index_help,
-                config=toolbox.app.config,
-            )
-        self.panel_searches = panel_searches
-        # We keep track of how many times the tool index has been rebuilt.
-        # We start at -1, so that after the first index the count is at 0,
-        # which is the same as the toolbox reload count. This way we can skip
-        # reindexing if the index count is equal to the toolbox reload count.
-        self.index_count = -1
+class ToolSearchResultCache:
+    """Bounded LRU cache of the search results of one index generation.
 
-    def build_index(self, tool_cache, toolbox, index_help: bool = True) -> None:
-        self.index_count += 1
-        for panel_search in self.panel_searches.values():
-            panel_search.build_index(tool_cache, toolbox, index_help=index_help)
+    The cache is cleared as soon as a search runs against a newer generation
+    of the index, this includes generations written by other processes
+    sharing the index directory.
+    """
 
-    def search(self, *args, **kwd) -> List[str]:
-        panel_view = kwd.pop("panel_view")
-        if panel_view not in self.panel_searches:
-            raise KeyError(f"Unknown panel_view specified {panel_view}")
-        panel_search = self.panel_searches[panel_view]
-        return panel_search.search(*args, **kwd)
+    def __init__(self, size: int):
+        self.size = size
+        self.generation: Optional[int] = None
+        self.hits = 0
+        self._results: OrderedDict[Tuple, Tuple[str, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, generation: int, key: Tuple) -> Optional[List[str]]:
+        with self._lock:
+            if generation != self.generation:
+                self._results.clear()
+                self.generation = generation
+                return None
+            results = self._results.get(key)
+            if results is None:
+                return None
+            self.hits += 1
+            self._results.move_to_end(key)
+            return list(results)
+
+    def put(self, generation: int, key: Tuple, results: List[str]) -> None:
+        if self.size <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                # The index was updated while searching
+                return
+            self._results[key] = tuple(results)
+            self._results.move_to_end(key)
+            while len(self._results) > self.size:
+                self._results.popitem(last=False)
 
 
-class ToolPanelViewSearch:
-    """
-    Support searching tools in a toolbox. This implementation uses
-    the Whoosh search library.
-    """
+class ToolBoxSearch:
+    """Support searching across all fixed panel views in a toolbox.
 
-    def __init__(
-        self,
-        panel_view_id: str,
-        index_dir: str,
-        config: GalaxyAppConfiguration,
-        index_help: bool = True,
-    ):
-        """Build the schema and validate against the index."""
-        schema_conf = {
-            # The stored ID field is not searchable
-            "id": ID(stored=True, unique=True),
-            # This exact field is searchable by exact matches only
-            "id_exact": NGRAMWORDS(
-                minsize=config.tool_ngram_minsize,
-                maxsize=config.tool_ngram_maxsize,
-                field_boost=(config.tool_id_boost * config.tool_name_exact_multiplier),
-            ),
-            # The primary name field is searchable by exact match only, and is
-            # eligible for massive score boosting. A secondary ngram or text
-            # field for name is added below
-            "name_exact": TEXT(
-                field_boost=(config.tool_name_boost * config.tool_name_exact_multiplier),
-                analyzer=analysis.IDTokenizer() | analysis.LowercaseFilter(),
-            ),
-            # The owner/repo/tool_id parsed from the GUID
-            "stub": KEYWORD(field_boost=float(config.tool_stub_boost)),
-            # The section where the tool is listed in the tool panel
-            "section": TEXT(field_boost=float(config.tool_section_boost)),
-            # The edam operations section where the tool is listed in the tool panel
-            "edam_operations": TEXT(field_boost=float(config.tool_section_boost)),
-            # The edam topics section where the tool is listed in the tool panel
-            "edam_topics": TEXT(field_boost=float(config.tool_section_boost)),
-            # The name of the repository the tool belongs to
-            "repository": TEXT(field_boost=float(config.tool_section_boost)),
-            # The owner id of the repository the tool belongs to
-            "owner": TEXT(field_boost=float(config.tool_section_boost)),
-            # Short description defined in the tool XML
-            "description": TEXT(
-                field_boost=config.tool_description_boost,
-                analyzer=analysis.StemmingAnalyzer(),
-            ),
-            # Help text parsed from the tool XML
-            "help": TEXT(field_boost=config.tool_help_boost, analyzer=analysis.StemmingAnalyzer()),
-            "labels": KEYWORD(field_boost=float(config.tool_label_boost)),
-        }
+    The tools of all panel views are kept in a single index, each document
+    records the panel views listing the tool. Search is delegated off to
+    ToolPanelViewSearch for each panel view, which filters on these.
 
-        if config.tool_enable_ngram_search:
-            schema_conf.update(
-                {
-                    "name": NGRAMWORDS(
-                        minsize=config.tool_ngram_minsize,
-                        maxsize=config.tool_ngram_maxsize,
-                        field_boost=(float(config.tool_name_boost) * config.tool_ngram_factor),
-                    ),
-                }
-            )
-        else:
-            schema_conf.update(
-                {
-                    "name": TEXT(
-                        field_boost=float(config.tool_name_boost),
-                    ),
-                }
-            )
+    Results are kept in a bounded LRU cache of ``cache_size`` queries, which
+    is cleared whenever the index changes.
+    """
 
-        self.schema = Schema(**schema_conf)
+    def __init__(self, toolbox, index_dir: str, index_help: bool = True, cache_size: int = 0):
+        self.schema = tool_search_schema(toolbox.app.config)
         self.rex = analysis.RegexTokenizer()
+        self.parser = MultifieldParser(SEARCH_FIELDS, schema=self.schema, group=OrGroup)
+        self.result_cache = ToolSearchResultCache(cache_size)
+        self.execution_timer_factory = toolbox.app.execution_timer_factory
         self.index_dir = index_dir
-        self.panel_view_id = panel_view_id
         self.index = self._index_setup()
+        self.panel_searches = {
+            panel_view.id: ToolPanelViewSearch(panel_view.id, self) for panel_view in toolbox.panel_views()
+        }
+        # We keep track of how many times the tool index has been rebuilt.
+        # We start at -1, so that after the first index the count is at 0,
+        # which is the same as the toolbox reload count. This way we can skip
+        # reindexing if the index count is equal to the toolbox reload count.
+        self.index_count = -1
 
     def _index_setup(self) -> index.Index:
         """Get or create a reference to the index."""
+        # Indexes of earlier releases were split into a directory per panel
+        # view, these are replaced with a new index by get_or_create_index.
         return get_or_create_index(self.index_dir, self.schema)
 
     def build_index(self, tool_cache, toolbox, index_help: bool = True) -> None:
         """Prepare search index for tools loaded in toolbox.
 
-        Use `tool_cache` to determine which tools need indexing and which
-        should be removed.
+        Documents are created for all tools listed in any panel view and
+        compared to the indexed documents, only added, modified and removed
+        tools are written. The documents are created before the writer is
+        acquired, searches are never blocked by building the index.
         """
-        log.debug(f"Starting to build toolbox index of panel {self.panel_view_id}.")
+        self.index_count += 1
+        log.debug("Starting to build toolbox index.")
         execution_timer = ExecutionTimer()
 
         with self.index.reader() as reader:
             # Index ocasionally contains empty stored fields
-            self.indexed_tool_ids = {f["id"] for f in reader.all_stored_fields() if f}
-
-        tool_ids_to_remove = self._get_tools_to_remove(tool_cache)
-        tools_to_index = self._get_tool_list(
-            toolbox,
-            tool_cache,
-        )
-
-        with AsyncWriter(self.index) as writer:
-            for tool_id in tool_ids_to_remove:
-                writer.delete_by_term("id", tool_id)
-            for tool in tools_to_index:
-                add_doc_kwds = self._create_doc(
-                    tool=tool,
-                    index_help=index_help,
-                )
-                # Add tool document to index (or overwrite if existing)
-                writer.update_document(**add_doc_kwds)
-
-        log.debug("Toolbox index of panel %s finished %s", self.panel_view_id, execution_timer)
-
-    def _get_tools_to_remove(self, tool_cache) -> list:
-        """Return list of tool IDs to be removed from index."""
-        tool_ids_to_remove = (self.indexed_tool_ids - set(tool_cache._tool_paths_by_id.keys())).union(
-            tool_cache._removed_tool_ids
+            indexed_fingerprints = {f["id"]: f.get("fingerprint") for f in reader.all_stored_fields() if f}
+
+        documents = self._get_documents(tool_cache, toolbox, index_help)
+        tool_ids_to_remove = indexed_fingerprints.keys() - documents.keys()
+        documents_to_index = [
+            document
+            for tool_id, document in documents.items()
+            if indexed_fingerprints.get(tool_id) != document["fingerprint"]
+        ]
+        if tool_ids_to_remove or documents_to_index:
+            with AsyncWriter(self.index) as writer:
+                for tool_id in tool_ids_to_remove:
+                    writer.delete_by_term("id", tool_id)
+                for document in documents_to_index:
+                    # Add tool document to index (or overwrite if existing)
+                    writer.update_document(**document)
+
+        log.debug(
+            "Toolbox index finished, %d tools updated and %d removed %s",
+            len(documents_to_index),
+            len(tool_ids_to_remove),
+            execution_timer,
         )
 
-        for indexed_tool_id in self.indexed_tool_ids:
-            indexed_tool = tool_cache.get_tool_by_id(indexed_tool_id)
-            if indexed_tool:
-                if indexed_tool.is_latest_version:
-                    continue
-                latest_version = indexed_tool.latest_version
-                if latest_version and latest_version.hidden:
-                    continue
-            tool_ids_to_remove.add(indexed_tool_id)
-
-        return list(tool_ids_to_remove)
-
-    def _get_tool_list(self, toolbox, tool_cache) -> list:
-        """Return list of tools to add and remove from index."""
-        tools_to_index = []
-
-        for tool_id in tool_cache._new_tool_ids - self.indexed_tool_ids:
+    def _get_documents(self, tool_cache, toolbox, index_help: bool = True) -> Dict[str, Dict[str, str]]:
+        """Return the documents of all tools to index, keyed by tool id."""
+        documents = {}
+        # Identities of the items of each panel view, like toolbox.panel_has_tool
+        # but without walking the panel for each tool.
+        panel_view_items = {
+            panel_view_id: {id(item) for item in toolbox.panel_view_items(panel_view_id)}
+            for panel_view_id in self.panel_searches
+        }
+        for tool_id in list(tool_cache._tool_paths_by_id):
             tool = toolbox.get_tool(tool_id)
-            if tool and tool.is_latest_version and toolbox.panel_has_tool(tool, self.panel_view_id):
-                if tool.hidden:
-                    # Check if there is an older tool we can return
-                    if tool.lineage:
-                        tool_versions = reversed(tool.lineage.get_versions())
-                        for tool_version in tool_versions:
-                            tool = tool_cache.get_tool_by_id(tool_version.id)
-                            if tool and not tool.hidden:
-                                break
-                    else:
+            if not tool or not tool.is_latest_version:
+                continue
+            panel_view_ids = [
+                panel_view_id for panel_view_id, item_ids in panel_view_items.items() if id(tool) in item_ids
+            ]
+            if not panel_view_ids:
+                continue
+            if tool.hidden:
+                # Check if there is an older tool we can return
+                if tool.lineage:
+                    tool_versions = reversed(tool.lineage.get_versions())
+                    for tool_version in tool_versions:
+                        tool = tool_cache.get_tool_by_id(tool_version.id)
+                        if tool and not tool.hidden:
+                            break
+                    if not tool:
                         continue
-                tools_to_index.append(tool)
+                else:
+                    continue
+            document = self._create_doc(tool=tool, index_help=index_help)
+            if not document:
+                continue
+            document["panel_views"] = ",".join(panel_view_ids)
+            document["fingerprint"] = md5_hash_str(json.dumps(document, sort_keys=True))
+            documents[document["id"]] = document
+        return documents
 
-        return tools_to_index
+    def search(self, *args, **kwd) -> List[str]:
+        panel_view = kwd.pop("panel_view")
+        if panel_view not in self.panel_searches:
+            raise KeyError(f"Unknown panel_view specified {panel_view}")
+        panel_search = self.panel_searches[panel_view]
+        return panel_search.search(*args, **kwd)
 
     def _create_doc(
         self,
@@ -322,45 +383,52 @@ class ToolPanelViewSearch:
 
         return add_doc_kwds
 
+
+class ToolPanelViewSearch:
+    """
+    Support searching tools of a panel view in the index of a toolbox.
+    This implementation uses the Whoosh search library.
+    """
+
+    def __init__(self, panel_view_id: str, toolbox_search: ToolBoxSearch):
+        self.panel_view_id = panel_view_id
+        self.toolbox_search = toolbox_search
+
     def search(
         self,
         q: str,
         config: GalaxyAppConfiguration,
     ) -> List[str]:
-        """Perform search on the in-memory index."""
-        # Change field boosts for searcher
-        self.searcher = self.index.searcher(
-            weighting=MultiWeighting(
-                Frequency(),
-                help=BM25F(K1=config.tool_help_bm25f_k1),
-            )
+        """Perform search on the index, or return the cached results of the query."""
+        timer = self.toolbox_search.execution_timer_factory.get_timer(
+            "internals.galaxy.tools.search",
+            "Searched tools in panel view ${panel_view} (result cache ${cache})",
         )
-        fields = [
-            "id",
-            "id_exact",
-            "name",
-            "name_exact",
-            "description",
-            "section",
-            "edam_operations",
-            "edam_topics",
-            "repository",
-            "owner",
-            "help",
-            "labels",
-            "stub",
-        ]
-        self.parser = MultifieldParser(
-            fields,
-            schema=self.schema,
-            group=OrGroup,
-        )
-        parsed_query = self.parser.parse(q)
-        hits = self.searcher.search(
-            parsed_query,
-            limit=None,
-            sortedby="",
-            terms=True,
+        index = self.toolbox_search.index
+        result_cache = self.toolbox_search.result_cache
+        generation = index.latest_generation()
+        # Whitespace does not change the parsed query
+        cache_key = (self.panel_view_id, " ".join(q.split()), config.tool_help_bm25f_k1)
+        results = result_cache.get(generation, cache_key)
+        if results is not None:
+            log.debug(timer.to_str(panel_view=self.panel_view_id, cache="hit"))
+            return results
+
+        parsed_query = self.toolbox_search.parser.parse(q)
+        # Change field boosts for searcher
+        weighting = MultiWeighting(
+            Frequency(),
+            help=BM25F(K1=config.tool_help_bm25f_k1),
         )
-
-        return [hit["id"] for hit in hits]
+        with index.searcher(weighting=weighting) as searcher:
+            hits = searcher.search(
+                parsed_query,
+                filter=Term("panel_views", self.panel_view_id),
+                limit=None,
+                sortedby="",
+                terms=True,
+            )
+            results = [hit["id"] for hit in hits]
+        result_cache.put(generation, cache_key, results)
+        log.debug(timer.to_str(panel_view=self.panel_view_id, cache="miss"))
+        return results
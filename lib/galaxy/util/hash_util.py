@@ -82,6 +82,19 @@ def memory_bound_hexdigest(
         file.close()
 
 
+def memory_bound_hexdigests(
+    hash_func_names: List[HashFunctionNameEnum],
+    path: str,
+) -> Dict[HashFunctionNameEnum, str]:
+    """Calculate the digests of ``path`` for all of ``hash_func_names`` reading the file only once."""
+    hashers = {hash_func_name: HASH_NAME_MAP[hash_func_name]() for hash_func_name in hash_func_names}
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(BLOCK_SIZE), b""):
+            for hasher in hashers.values():
+                hasher.update(block)
+    return {hash_func_name: hasher.hexdigest() for hash_func_name, hasher in hashers.items()}
+
+
 def md5_hash_file(path: Union[str, os.PathLike]) -> Optional[str]:
     """
     Return a md5 hashdigest for a file or None if path could not be read.
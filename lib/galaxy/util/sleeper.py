@@ -5,19 +5,22 @@ class Sleeper:
     """
     Provides a 'sleep' method that sleeps for a number of seconds *unless*
     the notify method is called (from a different thread).
+
+    A wake that arrives while no thread is sleeping is remembered, the next
+    call to sleep then returns immediately.
     """
 
     def __init__(self):
         self.condition = threading.Condition()
+        self.woken = False
 
     def sleep(self, seconds):
-        # Should this be in a try/finally block? -John
-        self.condition.acquire()
-        self.condition.wait(seconds)
-        self.condition.release()
+        with self.condition:
+            if not self.woken:
+                self.condition.wait(seconds)
+            self.woken = False
 
     def wake(self):
-        # Should this be in a try/finally block? -John
-        self.condition.acquire()
-        self.condition.notify()
-        self.condition.release()
+        with self.condition:
+            self.woken = True
+            self.condition.notify()
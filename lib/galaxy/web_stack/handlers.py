@@ -87,6 +87,9 @@ class ConfiguresHandlers:
             ready_window_size_str = config_element.attrib.get("ready_window_size", None)
             if ready_window_size_str:
                 handling_config_dict["ready_window_size"] = int(ready_window_size_str)
+            ready_check = config_element.attrib.get("ready_check", None)
+            if ready_check:
+                handling_config_dict["ready_check"] = ready_check
 
         return handling_config_dict
 
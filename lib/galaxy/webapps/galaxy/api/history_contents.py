@@ -178,18 +178,45 @@ def get_index_query_params(
         ),
         deprecated=True,  # TODO: remove 'dataset_details' when the UI doesn't need it
     ),
+    after_hid: Optional[int] = Query(
+        default=None,
+        title="After HID",
+        description=(
+            "Only return contents after this `hid`, in ascending or descending `hid` order. "
+            "Pass the `hid` of the last item of the previous page to get the next page without an `offset`."
+        ),
+    ),
+    after_type: Optional[HistoryContentType] = Query(
+        default=None,
+        title="After Type",
+        description=(
+            "The `history_content_type` of the last item of the previous page. Several contents can share "
+            "a `hid`, set this and `after_id` to continue with the contents sharing `after_hid`."
+        ),
+    ),
+    after_id: Optional[str] = Query(
+        default=None,
+        title="After ID",
+        description="The encoded ID of the last item of the previous page, see `after_type`.",
+    ),
 ) -> HistoryContentsIndexParams:
     """This function is meant to be used as a dependency to render the OpenAPI documentation
     correctly"""
     return parse_index_query_params(
         v=v,
         dataset_details=dataset_details,
+        after_hid=after_hid,
+        after_type=after_type,
+        after_id=after_id,
     )
 
 
 def parse_index_query_params(
     v: Optional[str] = None,
     dataset_details: Optional[str] = None,
+    after_hid: Optional[int] = None,
+    after_type: Optional[str] = None,
+    after_id: Optional[str] = None,
     **_,  # Additional params are ignored
 ) -> HistoryContentsIndexParams:
     """Parses query parameters for the history contents `index` operation
@@ -198,6 +225,9 @@ def parse_index_query_params(
         return HistoryContentsIndexParams(
             v=v,
             dataset_details=parse_dataset_details(dataset_details),
+            after_hid=after_hid,
+            after_type=after_type,
+            after_id=after_id,
         )
     except ValidationError as e:
         raise validation_error_to_message_exception(e)
@@ -72,12 +72,12 @@ class DatasetInterface(BaseUIController, UsesAnnotations, UsesItemRatings, UsesE
         super().__init__(app)
 
     def _can_access_dataset(self, trans, dataset_association, allow_admin=True, additional_roles=None):
-        roles = trans.get_current_user_roles()
-        if additional_roles:
-            roles = roles + additional_roles
-        return (allow_admin and trans.user_is_admin) or trans.app.security_agent.can_access_dataset(
-            roles, dataset_association.dataset
-        )
+        if allow_admin and trans.user_is_admin:
+            return True
+        if not additional_roles:
+            return trans.dataset_access.can_access_dataset(dataset_association.dataset_id)
+        roles = trans.get_current_user_roles() + additional_roles
+        return trans.app.security_agent.can_access_dataset(roles, dataset_association.dataset)
 
     @web.expose
     def default(self, trans, dataset_id=None, **kwd):
@@ -383,7 +383,7 @@ class DatasetInterface(BaseUIController, UsesAnnotations, UsesItemRatings, UsesE
                     )
                 else:
                     path = data.dataset.get_file_name()
-                    datatype = guess_ext(path, trans.app.datatypes_registry.sniff_order)
+                    datatype = guess_ext(path, trans.app.datatypes_registry.sniffer_index)
                     trans.app.datatypes_registry.change_datatype(data, datatype)
                     with transaction(trans.sa_session):
                         trans.sa_session.commit()
@@ -264,6 +264,9 @@ class DatasetCollectionsService(ServiceBase, UsesLibraryMixinItems):
 
         # retrieve contents
         contents = self.collection_manager.get_collection_contents(trans, parent_id, limit=limit, offset=offset)
+        if not trans.user_is_admin:
+            # Read the permissions of all datasets at once instead of once per element
+            trans.dataset_access.prefetch(element.hda.dataset_id for element in contents if element.hda)
 
         # dictify and tack on a collection_url for drilling down into nested collections
         def serialize_element(dsc_element) -> DCESummary:
@@ -276,7 +279,9 @@ class DatasetCollectionsService(ServiceBase, UsesLibraryMixinItems):
                     parent_id=self.encode_id(result["object"]["id"]),
                 )
             elif result["element_type"] == DCEType.hda:
-                result["object"]["accessible"] = self.hda_manager.is_accessible(dsc_element.element_object, trans.user)
+                result["object"]["accessible"] = self.hda_manager.is_accessible(
+                    dsc_element.element_object, trans.user, trans=trans
+                )
             return result
 
         rval = [serialize_element(el) for el in contents]
@@ -617,7 +617,7 @@ class DatasetsService(ServiceBase, UsesVisualizationMixin):
         rval: Any = ""
         try:
             dataset_manager = self.dataset_manager_by_type[hda_ldda]
-            dataset_instance = dataset_manager.get_accessible(dataset_id, trans.user)
+            dataset_instance = dataset_manager.get_accessible(dataset_id, trans.user, trans=trans)
             dataset_manager.ensure_dataset_on_disk(trans, dataset_instance)
             if raw:
                 if filename and filename != "index":
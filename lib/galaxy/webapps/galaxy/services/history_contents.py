@@ -141,6 +141,21 @@ class HistoryContentsIndexParams(Model):
 
     v: Optional[Literal["dev"]]
     dataset_details: Optional[DatasetDetailsType]
+    after_hid: Optional[int] = Field(
+        default=None,
+        title="After HID",
+        description="Only return contents after this `hid` in the `hid` order, to page through contents.",
+    )
+    after_type: Optional[HistoryContentType] = Field(
+        default=None,
+        title="After Type",
+        description="The type of the last item of the previous page, for contents sharing `after_hid`.",
+    )
+    after_id: Optional[DecodedDatabaseIdField] = Field(
+        default=None,
+        title="After ID",
+        description="The ID of the last item of the previous page, for contents sharing `after_hid`.",
+    )
 
 
 class LegacyHistoryContentsIndexParams(Model):
@@ -954,7 +969,8 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
             object_store_ids = self.object_store.object_store_ids(private=not shareable)
             if object_store_ids:
                 legacy_params_dict["object_store_ids"] = object_store_ids
-        contents = history.contents_iter(**legacy_params_dict)
+        contents = list(history.contents_iter(**legacy_params_dict))
+        self._prefetch_dataset_access(trans, contents)
         items = [
             self._serialize_legacy_content_item(trans, content, legacy_params_dict.get("dataset_details"))
             for content in contents
@@ -988,14 +1004,24 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         serialization_params = self._handle_extra_serialization_for_media_type(serialization_params, accept)
         filter_query_params.order = filter_query_params.order or "hid-asc"
         order_by = self.build_order_by(self.history_contents_manager, filter_query_params.order)
+        after_item = None
+        if params.after_type is not None or params.after_id is not None:
+            if params.after_type is None or params.after_id is None or params.after_hid is None:
+                raise exceptions.RequestParameterInvalidException(
+                    "after_type and after_id must be given together with after_hid"
+                )
+            after_item = (params.after_type, params.after_id)
         contents = self.history_contents_manager.contents(
             history,
             filters=filters,
             limit=filter_query_params.limit,
             offset=filter_query_params.offset,
             order_by=order_by,
+            after_hid=params.after_hid,
+            after_item=after_item,
             serialization_params=serialization_params,
         )
+        self._prefetch_dataset_access(trans, contents)
         items = [
             self._serialize_content_item(
                 trans,
@@ -1025,6 +1051,13 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
             serialization_params.keys.append("elements_datatypes")
         return serialization_params
 
+    def _prefetch_dataset_access(self, trans, contents) -> None:
+        """Read the permissions of the datasets of all contents at once instead of once per dataset."""
+        if not trans.user_is_admin:
+            trans.dataset_access.prefetch(
+                content.dataset_id for content in contents if isinstance(content, HistoryDatasetAssociation)
+            )
+
     def _serialize_legacy_content_item(
         self,
         trans,
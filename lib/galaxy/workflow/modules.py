@@ -2497,8 +2497,10 @@ def load_module_sections(trans):
 
 
 class DelayedWorkflowEvaluation(Exception):
-    def __init__(self, why=None):
+    def __init__(self, why=None, waiting_on_step_id=None):
         self.why = why
+        # Set if the evaluation is delayed because outputs of this step are delayed
+        self.waiting_on_step_id = waiting_on_step_id
 
 
 class CancelWorkflowEvaluation(Exception):
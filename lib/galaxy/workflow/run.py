@@ -1,4 +1,5 @@
 import logging
+import time
 import uuid
 from typing import (
     Any,
@@ -18,6 +19,7 @@ from galaxy.exceptions import MessageException
 from galaxy.model import (
     WorkflowInvocation,
     WorkflowInvocationStep,
+    WorkflowRequestStepState,
 )
 from galaxy.model.base import (
     ensure_object_added_to_session,
@@ -217,17 +219,39 @@ class WorkflowInvoker:
                 )
             )
 
+        maximum_iteration_duration = getattr(config, "maximum_workflow_scheduling_iteration_duration", -1)
+        deadline = None
+        if maximum_iteration_duration > 0:
+            deadline = time.monotonic() + maximum_iteration_duration
+
         remaining_steps = self.progress.remaining_steps()
         delayed_steps = False
         max_jobs_per_iteration_reached = False
+        max_duration_per_iteration_reached = False
+        steps_invoked = 0
         for step, workflow_invocation_step in remaining_steps:
             max_jobs_to_schedule = self.progress.maximum_jobs_to_schedule_or_none
             if max_jobs_to_schedule is not None and max_jobs_to_schedule <= 0:
                 max_jobs_per_iteration_reached = True
                 break
+            if self.progress.is_blocked(step):
+                # Still waiting on the same delayed step as in the previous iteration,
+                # re-evaluating the step would just delay it again.
+                delayed_steps = True
+                self.progress.mark_step_outputs_delayed(step)
+                continue
+            if deadline is not None and steps_invoked and time.monotonic() > deadline:
+                # Yield to other invocations, remaining steps are scheduled in the next iteration.
+                log.debug(
+                    f"Workflow invocation [{workflow_invocation.id}] exceeded maximum scheduling iteration duration [{maximum_iteration_duration}], resuming in next iteration."
+                )
+                max_duration_per_iteration_reached = True
+                break
+            steps_invoked += 1
             step_delayed = False
             step_timer = ExecutionTimer()
             try:
+                self.progress.compute_runtime_state(step)
                 self.__check_implicitly_dependent_steps(step)
 
                 if not workflow_invocation_step:
@@ -248,9 +272,11 @@ class WorkflowInvoker:
                     self.progress.mark_step_outputs_delayed(step, why="Not all jobs scheduled for state.")
                 else:
                     workflow_invocation_step.state = "scheduled"
+                self.progress.mark_step_unblocked(step)
             except modules.DelayedWorkflowEvaluation as de:
                 step_delayed = delayed_steps = True
                 self.progress.mark_step_outputs_delayed(step, why=de.why)
+                self.progress.mark_step_blocked(step, de.waiting_on_step_id)
             except Exception as e:
                 log_function = log.exception
                 if isinstance(e, modules.FailWorkflowEvaluation) and e.why.reason in FAILURE_REASONS_EXPECTED:
@@ -274,11 +300,12 @@ class WorkflowInvoker:
             if not step_delayed:
                 log.debug(f"Workflow step {step.id} of invocation {workflow_invocation.id} invoked {step_timer}")
 
-        if delayed_steps or max_jobs_per_iteration_reached:
+        if delayed_steps or max_jobs_per_iteration_reached or max_duration_per_iteration_reached:
             state = model.WorkflowInvocation.states.READY
         else:
             state = model.WorkflowInvocation.states.SCHEDULED
         workflow_invocation.set_state(state)
+        self.progress.persist_frontier()
 
         # All jobs ran successfully, so we can save now
         self.trans.sa_session.add(workflow_invocation)
@@ -369,6 +396,7 @@ class WorkflowProgress:
         when_values=None,
     ) -> None:
         self.outputs: Dict[int, Any] = {}
+        self._step_states: Dict[int, WorkflowRequestStepState] = {}
         self.module_injector = module_injector
         self.workflow_invocation = workflow_invocation
         self.inputs_by_step_id = inputs_by_step_id
@@ -382,6 +410,13 @@ class WorkflowProgress:
         self.subworkflow_collection_info = subworkflow_collection_info
         self.subworkflow_structure = subworkflow_collection_info.structure if subworkflow_collection_info else None
         self.when_values = when_values
+        # Steps that were delayed because outputs of an upstream step were delayed, mapped to that
+        # upstream step. Persisted with the invocation so that later scheduling iterations only
+        # re-evaluate these steps once the upstream step's outputs become available.
+        self.blocked_steps: Dict[int, int] = {
+            int(step_id): waiting_on_step_id
+            for step_id, waiting_on_step_id in (workflow_invocation.scheduling_frontier or {}).items()
+        }
 
     @property
     def maximum_jobs_to_schedule_or_none(self) -> Optional[int]:
@@ -407,24 +442,49 @@ class WorkflowProgress:
         self.module_injector.inject_all(self.workflow_invocation.workflow, param_map=self.param_map)
         for step in steps:
             step_id = step.id
-            step_args = self.param_map.get(step_id, {})
-            self.module_injector.compute_runtime_state(step, step_args=step_args)
             if step_id not in step_states:
                 # Can this ever happen?
                 public_message = f"Workflow invocation has no step state for step {step.order_index + 1}"
                 log.error(f"{public_message}. State is known for these step ids: {list(step_states.keys())}.")
                 raise MessageException(public_message)
-            runtime_state = step_states[step_id].value
-            assert step.module
-            step.state = step.module.decode_runtime_state(step, runtime_state)
 
             invocation_step = step_invocations_by_id.get(step_id, None)
             if invocation_step and invocation_step.state == "scheduled":
                 self._recover_mapping(invocation_step)
             else:
                 remaining_steps.append((step, invocation_step))
+        self._step_states = step_states
         return remaining_steps
 
+    def compute_runtime_state(self, step: "WorkflowStep") -> None:
+        """Compute the runtime state of a remaining step, only needed right before invoking it."""
+        step_args = self.param_map.get(step.id, {})
+        self.module_injector.compute_runtime_state(step, step_args=step_args)
+        runtime_state = self._step_states[step.id].value
+        assert step.module
+        step.state = step.module.decode_runtime_state(step, runtime_state)
+
+    def is_blocked(self, step: "WorkflowStep") -> bool:
+        """Whether the step is still waiting on the delayed step that blocked it previously."""
+        waiting_on_step_id = self.blocked_steps.get(step.id)
+        if waiting_on_step_id is None:
+            return False
+        return self.outputs.get(waiting_on_step_id) is STEP_OUTPUT_DELAYED
+
+    def mark_step_blocked(self, step: "WorkflowStep", waiting_on_step_id: Optional[int]) -> None:
+        if waiting_on_step_id is not None and self.outputs.get(waiting_on_step_id) is STEP_OUTPUT_DELAYED:
+            self.blocked_steps[step.id] = waiting_on_step_id
+        else:
+            self.mark_step_unblocked(step)
+
+    def mark_step_unblocked(self, step: "WorkflowStep") -> None:
+        self.blocked_steps.pop(step.id, None)
+
+    def persist_frontier(self) -> None:
+        frontier = {str(step_id): waiting_on_step_id for step_id, waiting_on_step_id in self.blocked_steps.items()}
+        if frontier != (self.workflow_invocation.scheduling_frontier or {}):
+            self.workflow_invocation.scheduling_frontier = frontier or None
+
     def replacement_for_input(self, trans, step: "WorkflowStep", input_dict: Dict[str, Any]):
         replacement: Union[
             modules.NoReplacement,
@@ -477,7 +537,7 @@ class WorkflowProgress:
         step_outputs = self.outputs[output_step_id]
         if step_outputs is STEP_OUTPUT_DELAYED:
             delayed_why = f"dependent step [{output_step_id}] delayed, so this step must be delayed"
-            raise modules.DelayedWorkflowEvaluation(why=delayed_why)
+            raise modules.DelayedWorkflowEvaluation(why=delayed_why, waiting_on_step_id=output_step_id)
         try:
             replacement = step_outputs[output_name]
         except KeyError:
@@ -551,7 +611,7 @@ class WorkflowProgress:
         step_outputs = self.outputs[step.id]
         if step_outputs is STEP_OUTPUT_DELAYED:
             delayed_why = f"depends on workflow output [{output_name}] but that output has not been created yet"
-            raise modules.DelayedWorkflowEvaluation(why=delayed_why)
+            raise modules.DelayedWorkflowEvaluation(why=delayed_why, waiting_on_step_id=step.id)
         else:
             return step_outputs[output_name]
 
@@ -1,5 +1,17 @@
 import os
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    wait,
+)
 from functools import partial
+from itertools import zip_longest
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 import galaxy.workflow.schedulers
 from galaxy import model
@@ -29,6 +41,28 @@ EXCEPTION_MESSAGE_DUPLICATE_SCHEDULERS = (
 EXCEPTION_MESSAGE_SERIALIZE = "Parallelization is not desired but handler assignment methods are non-deterministic. Set DB_PREASSIGN in workflow_schedulers_conf.xml."
 
 
+def fair_invocation_batches(invocations: Iterable[Tuple[int, Optional[int], Optional[int]]]) -> List[List[int]]:
+    """Group active ``(invocation_id, history_id, user_id)`` rows for scheduling.
+
+    Invocations of the same history are kept together, in the order they were
+    created, so that they are never scheduled concurrently and datasets keep
+    appearing in histories in a predictable order, invocations without a
+    history are kept together too. The per-history batches are interleaved
+    across users, so that a user with many active invocations doesn't delay
+    the invocations of everybody else.
+    """
+    histories: Dict[Optional[int], Tuple[Optional[int], List[int]]] = {}
+    for invocation_id, history_id, user_id in invocations:
+        histories.setdefault(history_id, (user_id, []))[1].append(invocation_id)
+    batches_by_user: Dict[Optional[int], List[List[int]]] = {}
+    for user_id, invocation_ids in histories.values():
+        batches_by_user.setdefault(user_id, []).append(invocation_ids)
+    batches = []
+    for batches_round in zip_longest(*batches_by_user.values()):
+        batches.extend(batch for batch in batches_round if batch is not None)
+    return batches
+
+
 class WorkflowSchedulingManager(ConfiguresHandlers):
     """A workflow scheduling manager based loosely on pattern established by
     ``galaxy.manager.JobManager``. Only schedules workflows on handler
@@ -282,6 +316,12 @@ class WorkflowRequestMonitor(Monitors):
         self._init_monitor_thread(
             name="WorkflowRequestMonitor.monitor_thread", target=self.__monitor, config=app.config
         )
+        self.scheduling_pool = None
+        workers = getattr(app.config, "workflow_scheduling_workers", 0) or 0
+        if workers > 0:
+            self.scheduling_pool = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="WorkflowRequestMonitor.scheduling_thread"
+            )
         self.invocation_grabber = None
         self_handler_tags = set(self.app.job_config.self_handler_tags)
         self_handler_tags.add(self.workflow_scheduling_manager.default_handler_id)
@@ -319,12 +359,30 @@ class WorkflowRequestMonitor(Monitors):
             self._monitor_sleep(self.app.config.workflow_monitor_sleep)
 
     def __schedule(self, workflow_scheduler_id, workflow_scheduler):
-        invocation_ids = self.__active_invocation_ids(workflow_scheduler_id)
+        invocations = self.__active_invocations(workflow_scheduler_id)
+        if self.scheduling_pool is None:
+            self.__schedule_batch([invocation_id for invocation_id, _, _ in invocations], workflow_scheduler)
+            return
+
+        # Invocations of different histories are independent, schedule them
+        # concurrently - each worker thread uses its own scoped session.
+        batches = fair_invocation_batches(invocations)
+        futures = [
+            self.scheduling_pool.submit(self.__schedule_batch, invocation_ids, workflow_scheduler)
+            for invocation_ids in batches
+        ]
+        wait(futures)
+        for future in futures:
+            exception = future.exception()
+            if exception is not None:
+                log.error("Exception raised while scheduling workflow invocations", exc_info=exception)
+
+    def __schedule_batch(self, invocation_ids, workflow_scheduler):
         for invocation_id in invocation_ids:
-            log.debug("Attempting to schedule workflow invocation [%s]", invocation_id)
-            self.__attempt_schedule(invocation_id, workflow_scheduler)
             if not self.monitor_running:
                 return
+            log.debug("Attempting to schedule workflow invocation [%s]", invocation_id)
+            self.__attempt_schedule(invocation_id, workflow_scheduler)
 
     def __attempt_schedule(self, invocation_id, workflow_scheduler):
         with self.app.model.context() as session:
@@ -357,9 +415,9 @@ class WorkflowRequestMonitor(Monitors):
         # A workflow was obtained and scheduled...
         return True
 
-    def __active_invocation_ids(self, scheduler_id):
+    def __active_invocations(self, scheduler_id):
         handler = self.app.config.server_name
-        return model.WorkflowInvocation.poll_active_workflow_ids(
+        return model.WorkflowInvocation.poll_active_workflow_invocations(
             self.app.model.engine,
             scheduler=scheduler_id,
             handler=handler,
@@ -370,3 +428,5 @@ class WorkflowRequestMonitor(Monitors):
 
     def shutdown(self):
         self.shutdown_monitor()
+        if self.scheduling_pool is not None:
+            self.scheduling_pool.shutdown(wait=False)
@@ -897,6 +897,34 @@ class TestHistoryContentsApi(ApiTestCase):
         ).json()
         assert len(contents_response) == 0
 
+    def test_index_after_hid(self, history_id):
+        for _ in range(3):
+            self.dataset_populator.new_dataset(history_id)
+        self.dataset_collection_populator.create_list_in_history(history_id=history_id, wait=True)
+        contents = self._get(f"histories/{history_id}/contents?v=dev&keys=hid,history_content_type,id").json()
+        expected = [(item["hid"], item["history_content_type"], item["id"]) for item in contents]
+        assert expected == sorted(expected, key=lambda item: item[0])
+
+        paged: List[Any] = []
+        query = ""
+        while True:
+            page = self._get(
+                f"histories/{history_id}/contents?v=dev&keys=hid,history_content_type,id&limit=2{query}"
+            ).json()
+            if not page:
+                break
+            paged.extend((item["hid"], item["history_content_type"], item["id"]) for item in page)
+            last = page[-1]
+            query = f"&after_hid={last['hid']}&after_type={last['history_content_type']}&after_id={last['id']}"
+        assert paged == expected
+
+        last_hid = expected[-1][0]
+        page = self._get(f"histories/{history_id}/contents?v=dev&order=hid-dsc&after_hid={last_hid}").json()
+        assert [item["hid"] for item in page] == [item[0] for item in reversed(expected) if item[0] < last_hid]
+
+        response = self._get(f"histories/{history_id}/contents?v=dev&after_type=dataset&after_id={expected[0][2]}")
+        self._assert_status_code_is(response, 400)
+
     @skip_without_tool("cat_data_and_sleep")
     def test_index_filter_by_related_items(self, history_id):
         # initialise history with 2 datasets
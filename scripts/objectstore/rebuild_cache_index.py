@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Rebuild the index of files in the local caches of caching object stores.
+
+Caching object stores keep track of the files in their cache directory, their
+sizes and last access times in an index stored in the cache directory. The
+index of a cache without one is built the first time the cache monitor
+checks it, use this script to (re)build indexes of existing caches ahead of
+time or after the contents of a cache directory were modified by hand.
+
+% python scripts/objectstore/rebuild_cache_index.py -c config/galaxy.yml
+% python scripts/objectstore/rebuild_cache_index.py --cache-path /mnt/cache/s3 /mnt/cache/irods
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "lib")))
+
+import galaxy.config
+from galaxy.objectstore import build_object_store_from_config
+from galaxy.objectstore.caching import (
+    CacheTarget,
+    rebuild_cache_index,
+)
+from galaxy.util import nice_size
+from galaxy.util.script import (
+    app_properties_from_args,
+    populate_config_args,
+)
+
+DESCRIPTION = "Rebuild the index of files in the caches of caching object stores."
+
+
+def cache_targets_from_config(args):
+    app_properties = app_properties_from_args(args)
+    config = galaxy.config.Configuration(**app_properties)
+    object_store = build_object_store_from_config(config)
+    try:
+        return object_store.cache_targets()
+    finally:
+        object_store.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    populate_config_args(parser)
+    parser.add_argument(
+        "--cache-path",
+        nargs="+",
+        help="Rebuild the index of these cache directories instead of the caches of the configured object store",
+    )
+    args = parser.parse_args(argv)
+    if args.cache_path:
+        cache_targets = [CacheTarget(path, -1, 0.9) for path in args.cache_path]
+    else:
+        cache_targets = cache_targets_from_config(args)
+    for cache_target in cache_targets:
+        files, total_size = rebuild_cache_index(cache_target)
+        print(f"Indexed {files} files ({nice_size(total_size)}) in cache '{cache_target.path}'")
+
+
+if __name__ == "__main__":
+    main()
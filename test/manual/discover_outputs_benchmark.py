@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""Measure how long discovering many job outputs into a list collection takes.
+
+For each number of elements a job working directory with that many small files
+is created and the files are discovered into a new list collection of a job's
+history, the way ``JobWrapper.finish`` collects dynamic outputs. The time
+needed to populate the collection and commit it is reported with and without
+the ``bulk_insert_discovered_datasets`` mode, together with the number of SQL
+statements executed.
+
+% python test/manual/discover_outputs_benchmark.py --elements 10000 50000
+
+By default an in-memory SQLite database is used, set ``--database_connection``
+to benchmark against e.g. an empty PostgreSQL database. Statements are nearly
+free with in-memory SQLite, against a database server each statement also
+costs a round trip.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from sqlalchemy import event
+
+from galaxy import model
+from galaxy.job_execution.output_collect import (
+    dataset_collector,
+    JobContext,
+    MetadataSourceProvider,
+    PermissionProvider,
+)
+from galaxy.model.base import transaction
+from galaxy.model.dataset_collections import builder
+from galaxy.model.unittest_utils import GalaxyDataTestApp
+from galaxy.model.unittest_utils.data_app import GALAXY_TEST_IN_MEMORY_DB_CONNECTION
+from galaxy.tool_util.parser.output_collection_def import FilePatternDatasetCollectionDescription
+from galaxy.tool_util.provided_metadata import NullToolProvidedMetadata
+from galaxy.util.bunch import Bunch
+
+DESCRIPTION = "Benchmark discovering job outputs into a list collection with and without bulk inserts."
+
+
+def discover(app, job_working_directory, bulk_insert, flush_per_n_datasets):
+    sa_session = app.model.context
+    user = model.User(email=f"discover_{time.time()}@example.org", password="password")
+    history = model.History(name="Discover benchmark", user=user)
+    role = model.Role(name=f"discover_{time.time()}", type=model.Role.types.PRIVATE)
+    job = model.Job()
+    job.history = history
+    job.user = user
+    collection = model.DatasetCollection(collection_type="list", populated=False)
+    hdca = model.HistoryDatasetCollectionAssociation(collection=collection, history=history, name="discovered")
+    sa_session.add_all([role, job, hdca])
+    with transaction(sa_session):
+        sa_session.commit()
+
+    permitted_actions = app.security_agent.permitted_actions
+    permission_provider = PermissionProvider({}, app.security_agent, job)
+    permission_provider._permissions = {
+        permitted_actions.DATASET_MANAGE_PERMISSIONS: [role],
+        permitted_actions.DATASET_ACCESS: [role],
+    }
+    tool = Bunch(app=app, sa_session=sa_session)
+    job_context = JobContext(
+        tool,
+        NullToolProvidedMetadata(),
+        job,
+        job_working_directory,
+        permission_provider,
+        MetadataSourceProvider({}),
+        "?",
+        app.object_store,
+        "ok",
+        max_discovered_files=None,
+        flush_per_n_datasets=flush_per_n_datasets,
+        bulk_insert=bulk_insert,
+    )
+    collection_description = FilePatternDatasetCollectionDescription(pattern="__name__")
+    discovered_files = job_context.find_files("output", collection, [dataset_collector(collection_description)])
+
+    statements = []
+
+    def count_statement(*args):
+        statements.append(args[2])
+
+    event.listen(app.model.engine, "before_cursor_execute", count_statement)
+    start = time.perf_counter()
+    collection_builder = builder.BoundCollectionBuilder(collection)
+    job_context.populate_collection_elements(
+        collection, collection_builder, discovered_files, name="output", final_job_state="ok"
+    )
+    collection_builder.populate()
+    job_context.flush()
+    elapsed = time.perf_counter() - start
+    event.remove(app.model.engine, "before_cursor_execute", count_statement)
+    assert collection.element_count == len(discovered_files)
+    sa_session.expunge_all()
+    return elapsed, len(statements)
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--elements", type=int, nargs="+", default=[10000, 50000])
+    arg_parser.add_argument("--flush_per_n_datasets", type=int, default=1000)
+    arg_parser.add_argument("--database_connection", default=GALAXY_TEST_IN_MEMORY_DB_CONNECTION)
+    args = arg_parser.parse_args(argv)
+
+    app = GalaxyDataTestApp(database_connection=args.database_connection)
+    print(f"{'elements':>8} {'default (s)':>12} {'statements':>11} {'bulk (s)':>9} {'statements':>11} {'speedup':>8}")
+    for nelements in args.elements:
+        job_working_directory = tempfile.mkdtemp()
+        try:
+            for i in range(nelements):
+                with open(os.path.join(job_working_directory, f"element_{i}.txt"), "w") as f:
+                    f.write(f"{i}\n")
+            default, default_statements = discover(app, job_working_directory, False, args.flush_per_n_datasets)
+            bulk, bulk_statements = discover(app, job_working_directory, True, args.flush_per_n_datasets)
+        finally:
+            shutil.rmtree(job_working_directory)
+        print(
+            f"{nelements:>8} {default:>12.2f} {default_statements:>11} {bulk:>9.2f} {bulk_statements:>11} {default / bulk:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
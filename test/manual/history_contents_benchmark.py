@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""Measure how long fetching a page of history contents takes deep into a large history.
+
+A history with 200000 items (by default, one in 100 of them a collection) is
+created with bulk inserts, then pages of contents are fetched at increasing
+depths the way the history panel scrolls through them: with a limit and an
+offset loading models, with an ``after_hid`` cursor loading models, and with
+an ``after_hid`` cursor selecting only the rows serialized by the summary
+view of ``HistoryContentsSerializer``. The benchmark fails if the cursor
+returns different items than the offset.
+
+% python test/manual/history_contents_benchmark.py
+% python test/manual/history_contents_benchmark.py --items 50000 --limit 500
+
+By default an in-memory SQLite database is used, set ``--database_connection``
+to benchmark against e.g. an empty PostgreSQL database.
+"""
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from sqlalchemy import insert
+
+from galaxy import model
+from galaxy.app_unittest_utils.galaxy_mock import MockApp
+from galaxy.managers.history_contents import (
+    HistoryContentsManager,
+    HistoryContentsSerializer,
+)
+from galaxy.model.base import transaction
+from galaxy.model.unittest_utils.data_app import GALAXY_TEST_IN_MEMORY_DB_CONNECTION
+
+DESCRIPTION = "Benchmark fetching pages of history contents with offsets, hid cursors and column projection."
+
+
+def create_history(app, n_items, collection_every, chunk_size=10000):
+    sa_session = app.model.context
+    user = model.User(email=f"contents_{time.time()}@example.org", password="password")
+    history = model.History(name="Contents benchmark", user=user)
+    sa_session.add(history)
+    with transaction(sa_session):
+        sa_session.commit()
+    for start in range(1, n_items + 1, chunk_size):
+        hids = range(start, min(start + chunk_size, n_items + 1))
+        dataset_hids = [hid for hid in hids if hid % collection_every]
+        collection_hids = [hid for hid in hids if not hid % collection_every]
+        dataset_ids = sa_session.scalars(
+            insert(model.Dataset.table).returning(model.Dataset.table.c.id),
+            [{"state": "ok", "file_size": hid} for hid in dataset_hids],
+        ).all()
+        sa_session.execute(
+            insert(model.HistoryDatasetAssociation.table),
+            [
+                {
+                    "history_id": history.id,
+                    "dataset_id": dataset_id,
+                    "hid": hid,
+                    "name": f"dataset {hid}",
+                    "extension": "txt",
+                    "visible": True,
+                    "deleted": False,
+                    "purged": False,
+                }
+                for hid, dataset_id in zip(dataset_hids, dataset_ids)
+            ],
+        )
+        if collection_hids:
+            collection_ids = sa_session.scalars(
+                insert(model.DatasetCollection.__table__).returning(model.DatasetCollection.__table__.c.id),
+                [{"collection_type": "list", "populated_state": "ok"} for _ in collection_hids],
+            ).all()
+            sa_session.execute(
+                insert(model.HistoryDatasetCollectionAssociation.__table__),
+                [
+                    {
+                        "history_id": history.id,
+                        "collection_id": collection_id,
+                        "hid": hid,
+                        "name": f"collection {hid}",
+                        "visible": True,
+                        "deleted": False,
+                    }
+                    for hid, collection_id in zip(collection_hids, collection_ids)
+                ],
+            )
+        with transaction(sa_session):
+            sa_session.commit()
+    return history
+
+
+def fetch_hids(app, fetch, history_id, **kwd):
+    history = app.model.context.get(model.History, history_id)
+    start = time.perf_counter()
+    hids = [item.hid for item in fetch(history, **kwd)]
+    elapsed = time.perf_counter() - start
+    app.model.context.expunge_all()
+    return elapsed, hids
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--items", type=int, default=200000, help="number of items in the history")
+    arg_parser.add_argument("--collection_every", type=int, default=100, help="make every n-th item a collection")
+    arg_parser.add_argument("--limit", type=int, default=100, help="number of items per page")
+    arg_parser.add_argument("--database_connection", default=GALAXY_TEST_IN_MEMORY_DB_CONNECTION)
+    args = arg_parser.parse_args(argv)
+
+    app = MockApp(database_connection=args.database_connection)
+    contents_manager = app[HistoryContentsManager]
+    summary_keys = app[HistoryContentsSerializer].views["summary"]
+    history_id = create_history(app, args.items, args.collection_every).id
+
+    print(f"{'offset':>8} {'offset (ms)':>12} {'after_hid (ms)':>15} {'rows (ms)':>10} {'speedup':>8}")
+    mismatches = []
+    for fraction in (0, 0.1, 0.5, 0.9, 0.99):
+        offset = int(args.items * fraction)
+        # hids are contiguous, the item before the page has hid == offset
+        offset_time, by_offset = fetch_hids(app, contents_manager.contents, history_id, limit=args.limit, offset=offset)
+        cursor_time, by_cursor = fetch_hids(
+            app, contents_manager.contents, history_id, limit=args.limit, after_hid=offset
+        )
+        rows_time, by_rows = fetch_hids(
+            app, contents_manager.contents_rows, history_id, keys=summary_keys, limit=args.limit, after_hid=offset
+        )
+        if not by_offset == by_cursor == by_rows:
+            mismatches.append(offset)
+        print(
+            f"{offset:>8} {offset_time * 1000:>12.1f} {cursor_time * 1000:>15.1f} {rows_time * 1000:>10.1f} {offset_time / rows_time:>7.1f}x"
+        )
+    for offset in mismatches:
+        print(f"Page at offset {offset}: different items with the hid cursor")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""Measure how long importing a history archive with many datasets takes.
+
+A synthetic history archive with 100000 small datasets (by default) is
+written to a temporary directory, then imported into a new history once with
+dataset files copied into the object store one after another and once with
+``--threads`` copy threads. ``--latency`` adds a delay to every file written
+to the object store, to approximate object stores backed by e.g. S3. The
+benchmark fails if any imported dataset doesn't have the content of its
+archived file.
+
+% python test/manual/model_store_import_benchmark.py
+% python test/manual/model_store_import_benchmark.py --datasets 10000 --threads 8 --latency 5
+% python test/manual/model_store_import_benchmark.py --store_by id
+
+By default an in-memory SQLite database is used, set ``--database_connection``
+to benchmark against e.g. an empty PostgreSQL database.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy import model
+from galaxy.model import store
+from galaxy.model.unittest_utils.data_app import (
+    GALAXY_TEST_IN_MEMORY_DB_CONNECTION,
+    GalaxyDataTestApp,
+    GalaxyDataTestConfig,
+)
+
+DESCRIPTION = "Benchmark importing a synthetic history archive with serial and parallel dataset file copies."
+HISTORY_ENCODED_ID = "synthetic_history"
+
+
+def write_archive(archive_dir, n_datasets):
+    datasets_dir = os.path.join(archive_dir, "datasets")
+    os.makedirs(datasets_dir)
+
+    def datasets_attrs():
+        for hid in range(1, n_datasets + 1):
+            file_name = os.path.join("datasets", f"dataset_{hid}.txt")
+            with open(os.path.join(archive_dir, file_name), "w") as f:
+                f.write(f"line {hid}\n")
+            yield {
+                "model_class": "HistoryDatasetAssociation",
+                "encoded_id": f"dataset_{hid}",
+                "history_encoded_id": HISTORY_ENCODED_ID,
+                "hid": hid,
+                "name": f"dataset {hid}",
+                "extension": "txt",
+                "info": None,
+                "blurb": "1 line",
+                "peek": f"line {hid}",
+                "designation": None,
+                "visible": True,
+                "deleted": False,
+                "metadata": {"dbkey": "?"},
+                "annotation": None,
+                "tags": [],
+                "state": "ok",
+                "file_name": file_name,
+            }
+
+    store.write_attrs(os.path.join(archive_dir, store.ATTRS_FILENAME_DATASETS), datasets_attrs())
+    for attrs_file_name in (store.ATTRS_FILENAME_COLLECTIONS, store.ATTRS_FILENAME_JOBS):
+        store.write_attrs(os.path.join(archive_dir, attrs_file_name), [])
+    with open(os.path.join(archive_dir, store.ATTRS_FILENAME_HISTORY), "w") as f:
+        json.dump({"name": "Import benchmark", "encoded_id": HISTORY_ENCODED_ID, "hid_counter": n_datasets + 1}, f)
+    with open(os.path.join(archive_dir, store.ATTRS_FILENAME_EXPORT), "w") as f:
+        json.dump({"galaxy_export_version": store.GALAXY_EXPORT_VERSION}, f)
+
+
+def import_archive(archive_dir, copy_threads, latency, database_connection, store_by):
+    config = GalaxyDataTestConfig(database_connection=database_connection)
+    config.object_store_store_by = store_by
+    app = GalaxyDataTestApp(config=config)
+    if latency:
+        update_from_file = app.object_store.update_from_file
+
+        def slow_update_from_file(obj, **kwargs):
+            time.sleep(latency / 1000)
+            return update_from_file(obj, **kwargs)
+
+        app.object_store.update_from_file = slow_update_from_file  # type: ignore[method-assign]
+
+    sa_session = app.model.session
+    user = model.User(email="import@example.org", password="password")
+    sa_session.add(user)
+    sa_session.commit()
+    model_store = store.get_import_model_store_for_directory(
+        archive_dir, app=app, user=user, import_options=store.ImportOptions(copy_threads=copy_threads)
+    )
+    start = time.perf_counter()
+    with model_store.target_history(legacy_history_naming=False) as history:
+        model_store.perform_import(history, new_history=True)
+    elapsed = time.perf_counter() - start
+
+    mismatches = []
+    for hda in history.datasets:
+        with open(hda.get_file_name()) as f:
+            if f.read() != f"line {hda.hid}\n":
+                mismatches.append(hda.hid)
+    return elapsed, len(history.datasets), mismatches
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--datasets", type=int, default=100000, help="number of datasets in the archive")
+    arg_parser.add_argument("--threads", type=int, default=store.DEFAULT_IMPORT_COPY_THREADS)
+    arg_parser.add_argument("--latency", type=float, default=0, help="milliseconds added to every file written")
+    arg_parser.add_argument("--store_by", choices=["uuid", "id"], default="uuid")
+    arg_parser.add_argument("--database_connection", default=GALAXY_TEST_IN_MEMORY_DB_CONNECTION)
+    args = arg_parser.parse_args(argv)
+
+    archive_dir = tempfile.mkdtemp()
+    try:
+        write_archive(archive_dir, args.datasets)
+        print(f"{'threads':>8} {'datasets':>9} {'import (s)':>11} {'datasets/s':>11}")
+        failed = False
+        for copy_threads in (1, args.threads):
+            elapsed, n_imported, mismatches = import_archive(
+                archive_dir, copy_threads, args.latency, args.database_connection, args.store_by
+            )
+            print(f"{copy_threads:>8} {n_imported:>9} {elapsed:>11.1f} {n_imported / elapsed:>11.1f}")
+            for hid in mismatches:
+                print(f"Dataset {hid}: imported with different content")
+            failed = failed or bool(mismatches) or n_imported != args.datasets
+    finally:
+        shutil.rmtree(archive_dir)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
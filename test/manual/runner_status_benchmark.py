@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Measure how long one state check of the CLI job runner takes for many watched jobs.
+
+A fake ``squeue`` script reporting every watched job as running is put on the
+``PATH``, then the time needed to get the state of all watched jobs is measured
+
+- with one status command per job (how runners without a batch status
+  implementation behave, extrapolated from ``--per_job_sample`` jobs),
+- with a single status command, matching job ids against a list, and
+- with ``ShellJobRunner.get_job_states()``, a single status command matching job ids
+  against a set.
+
+% python test/manual/runner_status_benchmark.py --jobs 100 1000 10000
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.jobs import JobDestination
+from galaxy.jobs.runners.cli import ShellJobRunner
+from galaxy.util.bunch import Bunch
+
+DESCRIPTION = "Benchmark batched job state checks of the CLI job runner against a fake scheduler."
+
+FAKE_SQUEUE = """#!/bin/sh
+echo "JOBID ST"
+case "$*" in
+    *-j*) for job_id; do :; done; echo "$job_id R" ;;
+    *) cat "$FAKE_SQUEUE_STATES" ;;
+esac
+"""
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--jobs", type=int, nargs="+", default=[100, 1000, 10000])
+    arg_parser.add_argument("--per_job_sample", type=int, default=200)
+    args = arg_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        squeue = os.path.join(temp_directory, "squeue")
+        with open(squeue, "w") as f:
+            f.write(FAKE_SQUEUE)
+        os.chmod(squeue, os.stat(squeue).st_mode | stat.S_IEXEC)
+        states_path = os.path.join(temp_directory, "states")
+        os.environ["PATH"] = f"{temp_directory}{os.pathsep}{os.environ['PATH']}"
+        os.environ["FAKE_SQUEUE_STATES"] = states_path
+
+        app = Bunch(config=Bunch(redact_email_in_job_name=False), model=Bunch(context=None))
+        runner = ShellJobRunner(app, 1)
+        destination = JobDestination(id="slurm", runner="cli", params={"job_plugin": "Slurm"})
+        shell, job_interface = runner.get_cli_plugins(*runner.parse_destination_params(destination.params))
+
+        print(f"{'jobs':>8} {'per job (s)':>12} {'batch, list (s)':>16} {'batch, set (s)':>15}")
+        for njobs in args.jobs:
+            job_ids = [str(i) for i in range(1, njobs + 1)]
+            with open(states_path, "w") as f:
+                f.writelines(f"{job_id} R\n" for job_id in job_ids)
+            watched = [Bunch(job_id=job_id, job_destination=destination) for job_id in job_ids]
+
+            sample = job_ids[: args.per_job_sample]
+            start = time.perf_counter()
+            for job_id in sample:
+                cmd_out = shell.execute(job_interface.get_single_status(job_id))
+                job_interface.parse_single_status(cmd_out.stdout, job_id)
+            per_job = (time.perf_counter() - start) * njobs / len(sample)
+
+            start = time.perf_counter()
+            cmd_out = shell.execute(job_interface.get_status(job_ids))
+            list_states = job_interface.parse_status(cmd_out.stdout, job_ids)
+            batch_list = time.perf_counter() - start
+
+            start = time.perf_counter()
+            set_states = runner.get_job_states(watched)
+            batch_set = time.perf_counter() - start
+
+            assert len(list_states) == len(set_states) == njobs
+            print(f"{njobs:>8} {per_job:>12.3f} {batch_list:>16.3f} {batch_set:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Measure sniffing throughput with the complete sniff order and with the sniffer index.
+
+Every file in ``lib/galaxy/datatypes/test`` (or the given directories) is
+sniffed the way uploads are sniffed, first by running through the complete
+sniff order of the sample datatypes registry and then by dispatching through
+the registry's ``sniffer_index``. The benchmark fails if any file is sniffed
+differently and reports the number of files sniffed per second for both.
+
+% python test/manual/sniff_benchmark.py --repeat 3
+% python test/manual/sniff_benchmark.py /data/uploads/batch1
+"""
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.datatypes import sniff
+from galaxy.datatypes.registry import example_datatype_registry_for_sample
+
+DESCRIPTION = "Benchmark sniffing files with the complete sniff order and with the sniffer index."
+DEFAULT_TEST_DIRECTORY = os.path.join(galaxy_root, "lib", "galaxy", "datatypes", "test")
+
+
+def sniff_all(files, sniff_order):
+    start = time.perf_counter()
+    exts = [sniff.guess_ext(path, sniff_order) for path in files]
+    return time.perf_counter() - start, exts
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("directories", nargs="*", default=[DEFAULT_TEST_DIRECTORY])
+    arg_parser.add_argument("--repeat", type=int, default=1, help="sniff all files this many times")
+    arg_parser.add_argument(
+        "--exclude", nargs="*", default=["mongodb_fake.tar.bz2"], help="skip these files, e.g. very slow ones"
+    )
+    args = arg_parser.parse_args(argv)
+
+    files = []
+    for directory in args.directories:
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path) and name not in args.exclude:
+                files.append(path)
+    files = files * args.repeat
+    datatypes_registry = example_datatype_registry_for_sample()
+    # Warm up, sniffers import some modules the first time they run
+    sniff_all(files[: len(files) // args.repeat], datatypes_registry.sniff_order)
+
+    sniff_order_time, sniff_order_exts = sniff_all(files, datatypes_registry.sniff_order)
+    index_time, index_exts = sniff_all(files, datatypes_registry.sniffer_index)
+    mismatches = [
+        (path, expected, ext) for path, expected, ext in zip(files, sniff_order_exts, index_exts) if expected != ext
+    ]
+    for path, expected, ext in mismatches:
+        print(f"{path}: sniffed as '{ext}' with the sniffer index but as '{expected}' with the sniff order")
+
+    print(f"{'files':>6} {'sniff order (files/s)':>22} {'sniffer index (files/s)':>24} {'speedup':>8}")
+    print(
+        f"{len(files):>6} {len(files) / sniff_order_time:>22.1f} {len(files) / index_time:>24.1f} {sniff_order_time / index_time:>7.1f}x"
+    )
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
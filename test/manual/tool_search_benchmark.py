@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""Measure tool search latency with and without the search result cache.
+
+An index of synthetic tools (10000 by default) is built with the schema and
+default boosts of Galaxy's tool search, then a query log is replayed against
+it, first with the result cache disabled and then with a cache of
+``--cache-size`` queries. Without a query log, one is generated the way the
+tool panel searches: a search for every keystroke while typing a tool name,
+with corrections and the most popular tools searched most often. The
+benchmark fails if any query returns different results with the cache.
+
+% python test/manual/tool_search_benchmark.py
+% python test/manual/tool_search_benchmark.py --tools 20000 --cache-size 100
+% python test/manual/tool_search_benchmark.py --query-log queries.txt
+"""
+
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.config import (
+    GALAXY_APP_NAME,
+    GALAXY_CONFIG_SCHEMA_PATH,
+)
+from galaxy.config.schema import AppSchema
+from galaxy.tools.search import (
+    get_or_create_index,
+    tool_search_schema,
+    ToolBoxSearch,
+)
+from galaxy.util import StructuredExecutionTimer
+from galaxy.util.bunch import Bunch
+
+DESCRIPTION = "Benchmark replaying tool searches with and without the search result cache."
+WORDS = (
+    "align annotate assemble bam bed blast call cluster convert count coverage cut deseq extract fasta fastq "
+    "filter genome group join kraken map merge motif peak plot quality rna sam sort split summarize table trim "
+    "variant vcf"
+).split()
+
+
+def tool_documents(n_tools, rng):
+    for i in range(n_tools):
+        name = " ".join(rng.sample(WORDS, 3))
+        yield {
+            "id": f"tool_{i}",
+            "id_exact": f"tool_{i}",
+            "name": name,
+            "name_exact": name,
+            "description": " ".join(rng.sample(WORDS, 6)),
+            "section": rng.choice(WORDS),
+            "help": " ".join(rng.choices(WORDS, k=50)),
+            "panel_views": "default",
+            "fingerprint": str(i),
+        }
+
+
+def generate_query_log(names, n_searches, rng):
+    queries = []
+    # Popular tools are searched for much more often
+    weights = [1 / (rank + 1) for rank in range(len(names))]
+    for name in rng.choices(names, weights=weights, k=n_searches):
+        typed = name[: rng.randint(3, len(name))]
+        queries.extend(typed[:length] for length in range(1, len(typed) + 1))
+        if rng.random() < 0.3:
+            # Correct the last few characters
+            queries.extend(typed[:length] for length in range(len(typed) - 1, len(typed) - 4, -1) if length > 0)
+    return queries
+
+
+def replay(toolbox_search, queries, config):
+    latencies = []
+    results = []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(toolbox_search.search(q=q, panel_view="default", config=config))
+        latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--tools", type=int, default=10000, help="number of tools to index")
+    arg_parser.add_argument("--searches", type=int, default=50, help="number of tool names typed")
+    arg_parser.add_argument("--cache-size", type=int, default=1000, help="number of cached queries")
+    arg_parser.add_argument("--query-log", help="replay the queries in this file, one query per line")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    args = arg_parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    config = Bunch(**AppSchema(GALAXY_CONFIG_SCHEMA_PATH, GALAXY_APP_NAME).defaults)
+    toolbox = Bunch(
+        app=Bunch(config=config, execution_timer_factory=Bunch(get_timer=StructuredExecutionTimer)),
+        panel_views=lambda: [Bunch(id="default")],
+    )
+    temp_directory = tempfile.mkdtemp()
+    index_dir = os.path.join(temp_directory, "tool_search_index")
+    try:
+        tool_index = get_or_create_index(index_dir, tool_search_schema(config))
+        names = []
+        with tool_index.writer() as writer:
+            for document in tool_documents(args.tools, rng):
+                names.append(document["name"])
+                writer.add_document(**document)
+        if args.query_log:
+            with open(args.query_log) as f:
+                queries = [line.strip() for line in f if line.strip()]
+        else:
+            queries = generate_query_log(names, args.searches, rng)
+
+        print(f"{'cache size':>10} {'queries':>8} {'queries/s':>10} {'mean (ms)':>10} {'p95 (ms)':>9} {'hit rate':>9}")
+        all_results = []
+        for cache_size in (0, args.cache_size):
+            toolbox_search = ToolBoxSearch(toolbox, index_dir=index_dir, cache_size=cache_size)
+            latencies, results = replay(toolbox_search, queries, config)
+            all_results.append(results)
+            total = sum(latencies)
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            hit_rate = toolbox_search.result_cache.hits / len(queries)
+            print(
+                f"{cache_size:>10} {len(queries):>8} {len(queries) / total:>10.1f} {total / len(queries) * 1000:>10.2f} {p95 * 1000:>9.2f} {hit_rate:>8.1%}"
+            )
+    finally:
+        shutil.rmtree(temp_directory)
+
+    mismatches = [q for q, expected, cached in zip(queries, *all_results) if expected != cached]
+    for q in mismatches:
+        print(f"'{q}': different results with the result cache")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import contextlib
+import threading
+
+from galaxy.jobs.runners import AsynchronousJobRunner
+from galaxy.jobs.runners.finish_pipeline import (
+    FinishStage,
+    JobFinishPipeline,
+)
+from galaxy.util.bunch import Bunch
+
+TIMEOUT = 10
+
+
+class MockTimerFactory:
+    def get_timer(self, *args):
+        return Bunch(to_str=lambda **kwd: "")
+
+
+def _app():
+    return Bunch(
+        config=Bunch(redact_email_in_job_name=False, monitor_thread_join_timeout=0),
+        model=Bunch(context=None, session=contextlib.nullcontext),
+        execution_timer_factory=MockTimerFactory(),
+    )
+
+
+def _job_state(job_id):
+    return Bunch(job_id=job_id, job_wrapper=Bunch(get_id_tag=lambda: job_id))
+
+
+def _stage(name, method, workers=1, queue_size=10, on_error=None):
+    return FinishStage(
+        _app(),
+        "TestRunner",
+        name,
+        method,
+        workers,
+        queue_size,
+        prepare=lambda job_state: None,
+        on_error=on_error or (lambda job_state: None),
+    )
+
+
+def test_pipeline_passes_results_between_stages():
+    finished = {}
+    done = threading.Event()
+
+    def collect(job_state):
+        return (f"stdout {job_state.job_id}", f"stderr {job_state.job_id}")
+
+    def finish(job_state, stdout, stderr):
+        finished[job_state.job_id] = (stdout, stderr)
+        if len(finished) == 3:
+            done.set()
+
+    pipeline = JobFinishPipeline([_stage("collect", collect), _stage("finish", finish)])
+    pipeline.start()
+    for job_id in ("1", "2", "3"):
+        pipeline.put(_job_state(job_id))
+    assert done.wait(TIMEOUT)
+    assert finished["2"] == ("stdout 2", "stderr 2")
+    pipeline.shutdown(TIMEOUT)
+    stats = pipeline.stats()
+    assert stats["collect"]["processed"] == 3
+    assert stats["finish"]["processed"] == 3
+
+
+def test_pipeline_slow_job_does_not_block_others():
+    release = threading.Event()
+    finished = []
+    done = threading.Event()
+
+    def finish(job_state):
+        if job_state.job_id == "slow":
+            release.wait(TIMEOUT)
+        finished.append(job_state.job_id)
+        if finished == ["fast1", "fast2"]:
+            done.set()
+
+    pipeline = JobFinishPipeline([_stage("finish", finish, workers=2)])
+    pipeline.start()
+    for job_id in ("slow", "fast1", "fast2"):
+        pipeline.put(_job_state(job_id))
+    assert done.wait(TIMEOUT)
+    release.set()
+    pipeline.shutdown(TIMEOUT)
+    assert finished == ["fast1", "fast2", "slow"]
+
+
+def test_pipeline_backpressure():
+    release = threading.Event()
+    started = threading.Event()
+
+    def finish(job_state):
+        started.set()
+        release.wait(TIMEOUT)
+
+    stage = _stage("finish", finish, queue_size=1)
+    pipeline = JobFinishPipeline([stage])
+    pipeline.start()
+    pipeline.put(_job_state("1"))
+    assert started.wait(TIMEOUT)
+    # One job is being finished and one is queued, adding another one blocks
+    pipeline.put(_job_state("2"))
+    blocked = threading.Thread(target=pipeline.put, args=(_job_state("3"),))
+    blocked.start()
+    blocked.join(0.5)
+    assert blocked.is_alive()
+    release.set()
+    blocked.join(TIMEOUT)
+    assert not blocked.is_alive()
+    pipeline.shutdown(TIMEOUT)
+
+
+def test_pipeline_stage_error():
+    failed = []
+    finished = []
+    done = threading.Event()
+
+    def collect(job_state):
+        if job_state.job_id == "broken":
+            raise Exception("Cannot read outputs")
+        return ()
+
+    def finish(job_state):
+        finished.append(job_state.job_id)
+        done.set()
+
+    def on_error(job_state):
+        failed.append(job_state.job_id)
+
+    pipeline = JobFinishPipeline([_stage("collect", collect, on_error=on_error), _stage("finish", finish)])
+    pipeline.start()
+    pipeline.put(_job_state("broken"))
+    pipeline.put(_job_state("ok"))
+    assert done.wait(TIMEOUT)
+    pipeline.shutdown(TIMEOUT)
+    assert failed == ["broken"]
+    assert finished == ["ok"]
+    assert pipeline.stats()["collect"]["failed"] == 1
+
+
+class MockAsynchronousJobRunner(AsynchronousJobRunner):
+    runner_name = "MockRunner"
+
+    def __init__(self, app, nworkers, **kwargs):
+        super().__init__(app, nworkers, **kwargs)
+        self.finished = []
+        self.done = threading.Event()
+
+    def _ensure_db_session(self, arg):
+        pass
+
+    def _collect_job_output(self, job_state):
+        return ("stdout", "stderr")
+
+    def _finish_or_resubmit_job(self, job_state, job_stdout, job_stderr, job_id=None, external_job_id=None):
+        self.finished.append((job_id, job_stdout, job_stderr))
+        self.done.set()
+
+
+def test_runner_finish_pipeline():
+    runner = MockAsynchronousJobRunner(_app(), 1, finish_workers="2", finish_collect_workers="1")
+    runner._init_finish_pipeline()
+    assert runner.finish_pipeline is not None
+    assert [stage.name for stage in runner.finish_pipeline.stages] == ["collect", "finish"]
+    runner.mark_as_finished(_job_state("1"))
+    assert runner.done.wait(TIMEOUT)
+    assert runner.finished == [("1", "stdout", "stderr")]
+    runner.finish_pipeline.shutdown(TIMEOUT)
+
+
+def test_runner_finish_pipeline_disabled():
+    runner = MockAsynchronousJobRunner(_app(), 1)
+    runner._init_finish_pipeline()
+    assert runner.finish_pipeline is None
@@ -0,0 +1,188 @@
+from typing import List
+
+import pytest
+
+from galaxy import model
+from galaxy.jobs import JobDestination
+from galaxy.jobs.handler import JobHandlerQueue
+from galaxy.jobs.readiness import (
+    READY_CHECK_BULK,
+    READY_CHECK_QUERY,
+)
+from galaxy.model.unittest_utils import GalaxyDataTestApp
+from galaxy.util.bunch import Bunch
+
+HANDLER = "handler0"
+
+
+class MockJobWrapper:
+    def __init__(self, job):
+        self.job_id = job.id
+        self.tool = object()
+        self.job_destination = JobDestination(id="local", runner="local")
+
+    def fail(self, message, exception=False):
+        raise AssertionError(f"Job {self.job_id} unexpectedly failed: {message}")
+
+
+class MockDispatcher:
+    def __init__(self, sa_session):
+        self.sa_session = sa_session
+        self.dispatched: List[int] = []
+
+    def put(self, job_wrapper):
+        # Mimic JobWrapper.enqueue() so the job counts against the limits in the next iteration
+        job = self.sa_session.get(model.Job, job_wrapper.job_id)
+        job.set_state(model.Job.states.QUEUED)
+        job.destination_id = job_wrapper.job_destination.id
+        self.sa_session.commit()
+        self.dispatched.append(job_wrapper.job_id)
+
+
+class MockTimerFactory:
+    def get_timer(self, *args):
+        return Bunch(to_str=lambda: "")
+
+
+class MockJobHandlerQueue(JobHandlerQueue):
+    def job_wrapper(self, job, use_persisted_destination=False):
+        return MockJobWrapper(job)
+
+
+def _mock_app(data_app, ready_check, cache_user_job_count=False, incremental_job_counts=False):
+    limits = Bunch(
+        registered_user_concurrent_jobs=2,
+        anonymous_user_concurrent_jobs=None,
+        destination_user_concurrent_jobs={"local": 2},
+        destination_total_concurrent_jobs={},
+        total_walltime={},
+    )
+    return Bunch(
+        model=data_app.model,
+        config=Bunch(
+            track_jobs_in_database=True,
+            server_name=HANDLER,
+            user_activation_on=False,
+            cache_user_job_count=cache_user_job_count,
+            incremental_job_counts=incremental_job_counts,
+            job_counts_reconcile_interval=300,
+            monitor_thread_join_timeout=0,
+            job_handler_wakeup=None,
+        ),
+        job_config=Bunch(
+            handler_assignment_methods=None,
+            handler_ready_check=ready_check,
+            handler_ready_window_size=100,
+            limits=limits,
+        ),
+        quota_agent=Bunch(is_over_quota=lambda *args: False),
+        execution_timer_factory=MockTimerFactory(),
+    )
+
+
+def _job(session, user, state, input_hdas=()):
+    job = model.Job()
+    job.user = user
+    job.tool_id = "cat1"
+    job.state = state
+    job.handler = HANDLER
+    job.destination_id = "local"
+    for i, hda in enumerate(input_hdas):
+        job.add_input_dataset(f"input{i}", hda)
+    session.add(job)
+    return job
+
+
+def _hda(session, history, state):
+    hda = model.HistoryDatasetAssociation(history=history, create_dataset=True, sa_session=session)
+    hda.dataset.state = state
+    session.add(hda)
+    return hda
+
+
+def _monitor_step(queue):
+    queue._JobHandlerQueue__monitor_step()
+
+
+@pytest.mark.parametrize(
+    "cache_user_job_count,incremental_job_counts",
+    [(False, False), (True, False), (False, True)],
+)
+def test_bulk_ready_check_matches_query_ready_check(cache_user_job_count, incremental_job_counts):
+    dispatched_by_mode = {}
+    for ready_check in (READY_CHECK_QUERY, READY_CHECK_BULK):
+        data_app = GalaxyDataTestApp()
+        session = data_app.model.session
+        user = model.User(email="limits@example.com", password="password")
+        other_user = model.User(email="other@example.com", password="password")
+        history = model.History(user=user)
+        ok_hda = _hda(session, history, model.Dataset.states.OK)
+        queued_hda = _hda(session, history, model.Dataset.states.QUEUED)
+        running_job = _job(session, user, model.Job.states.RUNNING)
+        new_jobs = [_job(session, user, model.Job.states.NEW, [ok_hda]) for _ in range(3)]
+        waiting_job = _job(session, other_user, model.Job.states.NEW, [queued_hda])
+        other_job = _job(session, other_user, model.Job.states.NEW, [ok_hda])
+        session.commit()
+        running_job_id = running_job.id
+        new_job_ids = [job.id for job in new_jobs]
+        waiting_job_id = waiting_job.id
+        other_job_id = other_job.id
+        queued_dataset_id = queued_hda.dataset.id
+
+        app = _mock_app(
+            data_app,
+            ready_check,
+            cache_user_job_count=cache_user_job_count,
+            incremental_job_counts=incremental_job_counts,
+        )
+        dispatcher = MockDispatcher(session)
+        queue = MockJobHandlerQueue(app, dispatcher)
+        assert (queue.readiness_index is not None) == (ready_check == READY_CHECK_BULK)
+        assert (queue.job_counts is not None) == incremental_job_counts
+
+        # The user has one running job and a limit of two, only one more job may be dispatched.
+        _monitor_step(queue)
+        assert dispatcher.dispatched == [new_job_ids[0], other_job_id]
+
+        # Nothing changed, so nothing more is dispatched.
+        _monitor_step(queue)
+        assert dispatcher.dispatched == [new_job_ids[0], other_job_id]
+
+        # Once the running job finishes and the input is ready the remaining jobs can run.
+        session.get(model.Job, running_job_id).set_state(model.Job.states.OK)
+        session.get(model.Dataset, queued_dataset_id).state = model.Dataset.states.OK
+        session.commit()
+        _monitor_step(queue)
+        assert dispatcher.dispatched == [new_job_ids[0], other_job_id, new_job_ids[1], waiting_job_id]
+        dispatched_by_mode[ready_check] = dispatcher.dispatched
+    assert dispatched_by_mode[READY_CHECK_QUERY] == dispatched_by_mode[READY_CHECK_BULK]
+
+
+def test_job_counts_only_updated_with_limits(mocker):
+    data_app = GalaxyDataTestApp()
+    session = data_app.model.session
+    user = model.User(email="limits@example.com", password="password")
+    history = model.History(user=user)
+    ok_hda = _hda(session, history, model.Dataset.states.OK)
+    new_job = _job(session, user, model.Job.states.NEW, [ok_hda])
+    session.commit()
+    new_job_id = new_job.id
+    user_id = user.id
+
+    app = _mock_app(data_app, READY_CHECK_BULK, incremental_job_counts=True)
+    limits = app.job_config.limits
+    limits.registered_user_concurrent_jobs = None
+    limits.destination_user_concurrent_jobs = {}
+    dispatcher = MockDispatcher(session)
+    queue = MockJobHandlerQueue(app, dispatcher)
+    assert queue.job_counts is not None
+    update = mocker.spy(queue.job_counts, "update")
+    _monitor_step(queue)
+    assert dispatcher.dispatched == [new_job_id]
+    assert update.call_count == 0
+
+    # Counts are recomputed from the job table once limits are configured
+    limits.registered_user_concurrent_jobs = 2
+    _monitor_step(queue)
+    assert update.call_count == 1
+    assert queue.job_counts.user_job_count == {user_id: 1}
@@ -33,6 +33,32 @@ CONDITIONAL_RUNNER_JOB_CONF = os.path.join(os.path.dirname(__file__), "condition
 HANDLER_TEMPLATE_JOB_CONF = os.path.join(os.path.dirname(__file__), "handler_template_job_conf.xml")
 
 
+HANDLER_READY_CHECK_JOB_CONF_XML = """<?xml version="1.0"?>
+<job_conf>
+    <plugins>
+        <plugin id="local" type="runner" load="galaxy.jobs.runners.local:LocalJobRunner" workers="4"/>
+    </plugins>
+    <handlers ready_check="{ready_check}"/>
+    <destinations>
+        <destination id="local" runner="local"/>
+    </destinations>
+</job_conf>
+"""
+
+HANDLER_READY_CHECK_JOB_CONF_YAML = """
+runners:
+  local:
+    load: galaxy.jobs.runners.local:LocalJobRunner
+handling:
+  ready_check: {ready_check}
+execution:
+  default: local
+  environments:
+    local:
+      runner: local
+"""
+
+
 class TestApplicationStack(ApplicationStack):
     def get_preferred_handler_assignment_method(self):
         return HANDLER_ASSIGNMENT_METHODS.DB_SKIP_LOCKED
@@ -203,6 +229,19 @@ class TestSimpleJobConfXmlParser(BaseJobConfXmlParserTestCase):
         assert self.job_config.default_handler_id is None
         assert self.job_config.handlers == {}
 
+    def test_default_ready_check(self):
+        assert self.job_config.handler_ready_check == "query"
+
+    def test_bulk_ready_check(self):
+        self._write_config(HANDLER_READY_CHECK_JOB_CONF_XML.format(ready_check="bulk"))
+        assert self.job_config.handler_ready_check == "bulk"
+
+    def test_invalid_ready_check(self):
+        self._write_config(HANDLER_READY_CHECK_JOB_CONF_XML.format(ready_check="sometimes"))
+        with self.assertRaises(Exception) as context:
+            _ = self.job_config
+        assert "Invalid job handler ready check 'sometimes'" in str(context.value)
+
     def test_load_simple_destination(self):
         local_dest = self.job_config.destinations["local"][0]
         assert local_dest.id == "local"
@@ -364,6 +403,24 @@ class TestAdvancedJobConfYamlParser(TestAdvancedJobConfXmlParser):
     extension = "yml"
 
 
+class TestHandlingJobConfYamlParser(BaseJobConfXmlParserTestCase):
+    extension = "yml"
+
+    def test_bulk_ready_check(self):
+        self._write_config(HANDLER_READY_CHECK_JOB_CONF_YAML.format(ready_check="bulk"))
+        assert self.job_config.handler_ready_check == "bulk"
+
+    def test_ready_check_case_insensitive(self):
+        self._write_config(HANDLER_READY_CHECK_JOB_CONF_YAML.format(ready_check="Query"))
+        assert self.job_config.handler_ready_check == "query"
+
+    def test_invalid_ready_check(self):
+        self._write_config(HANDLER_READY_CHECK_JOB_CONF_YAML.format(ready_check="sometimes"))
+        with self.assertRaises(Exception) as context:
+            _ = self.job_config
+        assert "Invalid job handler ready check 'sometimes'" in str(context.value)
+
+
 def test_yaml_advanced_validation():
     schema = GALAXY_SCHEMAS_PATH / "job_config_schema.yml"
     integration_tests_dir = os.path.join(galaxy_directory(), "test", "integration")
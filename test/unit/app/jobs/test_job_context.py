@@ -1,13 +1,26 @@
 import os
 import tempfile
+from unittest import mock
+
+import pytest
+from sqlalchemy import (
+    func,
+    select,
+)
 
 from galaxy import model
+from galaxy.job_execution import output_collect
 from galaxy.job_execution.output_collect import (
     dataset_collector,
     JobContext,
 )
 from galaxy.model.base import transaction
 from galaxy.model.dataset_collections import builder
+from galaxy.model.store.discover import (
+    add_inserted_objects,
+    bulk_insert_objects,
+    bulk_update_objects,
+)
 from galaxy.tool_util.parser.output_collection_def import FilePatternDatasetCollectionDescription
 from galaxy.tool_util.provided_metadata import NullToolProvidedMetadata
 from ..tools.test_history_imp_exp import _mock_app
@@ -98,3 +111,105 @@ def test_job_context_discover_outputs_flushes_once(mocker):
         sa_session.commit()
     assert len(collection.dataset_instances) == 10
     assert collection.dataset_instances[0].dataset.file_size == 1
+
+
+@pytest.mark.parametrize("flush_per_n_datasets", [None, 4])
+def test_job_context_discover_outputs_bulk_insert(mocker, flush_per_n_datasets):
+    app = _mock_app()
+    sa_session = app.model.context
+
+    u = model.User(email="collection@example.com", password="password")
+    h = model.History(name="Test History", user=u)
+    role = model.Role(name="private", type=model.Role.types.PRIVATE)
+    sa_session.add(role)
+
+    tool = Tool(app)
+    job = model.Job()
+    job.history = h
+    job.user = u
+    sa_session.add(job)
+    with transaction(sa_session):
+        sa_session.commit()
+    job_working_directory = tempfile.mkdtemp()
+    setup_data(job_working_directory)
+    permitted_actions = app.security_agent.permitted_actions
+    permission_provider = output_collect.PermissionProvider({}, app.security_agent, job)
+    permission_provider._permissions = {
+        permitted_actions.DATASET_MANAGE_PERMISSIONS: [role],
+        permitted_actions.DATASET_ACCESS: [role],
+    }
+    collection = model.DatasetCollection(collection_type="list", populated=False)
+    sa_session.add(collection)
+    job_context = JobContext(
+        tool,
+        NullToolProvidedMetadata(),
+        job,
+        job_working_directory,
+        permission_provider,
+        MetadataSourceProvider(),
+        "?",
+        app.object_store,
+        "ok",
+        max_discovered_files=100,
+        flush_per_n_datasets=flush_per_n_datasets,
+        bulk_insert=True,
+    )
+    collection_builder = builder.BoundCollectionBuilder(collection)
+    collection_description = FilePatternDatasetCollectionDescription(pattern="__name__")
+    filenames = job_context.find_files("output", collection, [dataset_collector(collection_description)])
+    spy = mocker.spy(sa_session, "commit")
+    job_context.populate_collection_elements(
+        collection,
+        collection_builder,
+        filenames,
+        name="output",
+        metadata_source_name="",
+        final_job_state=job_context.final_job_state,
+    )
+    collection_builder.populate()
+    assert spy.call_count == (2 if flush_per_n_datasets else 0)
+    with transaction(sa_session):
+        sa_session.commit()
+    sa_session.expire_all()
+    # HDAs are inserted with their metadata, not updated afterwards
+    assert sa_session.scalar(select(func.count(model.HistoryDatasetAssociationHistory.id))) == 0
+
+    hdas = collection.dataset_instances
+    assert len(hdas) == 10
+    assert sorted(hda.hid for hda in hdas) == list(range(1, 11))
+    assert all(hda.dataset.file_size == 1 for hda in hdas)
+    assert all(hda.state == "ok" for hda in hdas)
+    for hda in hdas:
+        assert sorted(action.action for action in hda.dataset.actions) == sorted(
+            [permitted_actions.DATASET_MANAGE_PERMISSIONS.action, permitted_actions.DATASET_ACCESS.action]
+        )
+        assert all(action.role == role for action in hda.dataset.actions)
+    output_datasets = {assoc.name: assoc.dataset for assoc in job.output_datasets}
+    assert len(output_datasets) == 10
+    assert output_datasets["__new_primary_file_output|datasets_3.txt__"].name == "datasets_3.txt"
+
+
+@pytest.mark.parametrize("executemany_returning", [True, False])
+def test_bulk_insert_and_update_objects(executemany_returning):
+    app = _mock_app()
+    sa_session = app.model.context
+    jobs = [model.Job() for _ in range(3)]
+    for i, job in enumerate(jobs):
+        job.tool_id = f"tool_{i}"
+        job.destination_params = {"value": i}
+    dialect = sa_session.get_bind().dialect
+    with mock.patch.object(dialect, "insert_executemany_returning", executemany_returning):
+        rows = bulk_insert_objects(sa_session, jobs, unique_key="tool_id")
+    assert all(job.id for job in jobs)
+    # Changed in place, detected against a copy of the inserted values
+    jobs[1].destination_params["value"] = 10
+    bulk_update_objects(sa_session, jobs, rows)
+    add_inserted_objects(sa_session, jobs)
+    with transaction(sa_session):
+        sa_session.commit()
+    sa_session.expire_all()
+    job_ids = [job.id for job in jobs]
+    params = {
+        job.tool_id: job.destination_params for job in sa_session.query(model.Job).filter(model.Job.id.in_(job_ids))
+    }
+    assert params == {"tool_0": {"value": 0}, "tool_1": {"value": 10}, "tool_2": {"value": 2}}
@@ -0,0 +1,88 @@
+from galaxy import model
+from galaxy.jobs import counts as job_counts
+from galaxy.jobs.counts import JobCounts
+from galaxy.model.unittest_utils import GalaxyDataTestApp
+
+
+def test_job_counts():
+    app = GalaxyDataTestApp()
+    session = app.model.session
+    user = model.User(email="counts@example.com", password="password")
+    other_user = model.User(email="other@example.com", password="password")
+    queued = _job(session, user, model.Job.states.QUEUED, "local")
+    running = _job(session, user, model.Job.states.RUNNING, "cluster")
+    _job(session, user, model.Job.states.RESUBMITTED, "cluster")
+    _job(session, user, model.Job.states.OK, "cluster")
+    _job(session, other_user, model.Job.states.RUNNING, "local")
+    anonymous = _job(session, None, model.Job.states.RUNNING, "local")
+    new = _job(session, other_user, model.Job.states.NEW, None)
+    session.commit()
+
+    counts = JobCounts(reconcile_interval=300)
+    counts.update(session)
+    assert counts.user_job_count == {user.id: 3, other_user.id: 1}
+    assert counts.user_job_count_per_destination == {
+        user.id: {"local": 1, "cluster": 1},
+        other_user.id: {"local": 1},
+    }
+    assert counts.total_job_count_per_destination == {"local": 3, "cluster": 1}
+
+    # State changes are applied from the job state history
+    queued.set_state(model.Job.states.RUNNING)
+    running.set_state(model.Job.states.OK)
+    anonymous.set_state(model.Job.states.ERROR)
+    new.set_state(model.Job.states.QUEUED)
+    new.destination_id = "cluster"
+    session.commit()
+    counts.update(session)
+    assert counts.user_job_count == {user.id: 2, other_user.id: 2}
+    assert counts.user_job_count_per_destination == {
+        user.id: {"local": 1},
+        other_user.id: {"local": 1, "cluster": 1},
+    }
+    assert counts.total_job_count_per_destination == {"local": 2, "cluster": 1}
+
+    # Applying the same changes again does not change the counts
+    counts.update(session)
+    assert counts.user_job_count == {user.id: 2, other_user.id: 2}
+
+    # Snapshots can be modified without affecting the counts
+    user_job_count, user_job_count_per_destination, _ = counts.snapshot()
+    user_job_count[user.id] += 1
+    user_job_count_per_destination[user.id]["local"] += 1
+    assert counts.user_job_count[user.id] == 2
+    assert counts.user_job_count_per_destination[user.id]["local"] == 1
+
+
+def test_job_counts_reconcile(monkeypatch):
+    # Only look at new job state history rows
+    monkeypatch.setattr(job_counts, "HISTORY_LOOKBACK", 0)
+    app = GalaxyDataTestApp()
+    session = app.model.session
+    user = model.User(email="reconcile@example.com", password="password")
+    job = _job(session, user, model.Job.states.QUEUED, "local")
+    session.commit()
+
+    counts = JobCounts(reconcile_interval=300)
+    counts.update(session)
+    assert counts.user_job_count == {user.id: 1}
+
+    # Changing the state without set_state() is not recorded in the job state history
+    job.state = model.Job.states.OK
+    session.commit()
+    counts.update(session)
+    assert counts.user_job_count == {user.id: 1}
+    counts.reconcile(session)
+    assert counts.user_job_count == {}
+    assert counts.user_job_count_per_destination == {}
+    assert counts.total_job_count_per_destination == {}
+
+
+def _job(session, user, state, destination_id):
+    job = model.Job()
+    job.user = user
+    job.tool_id = "cat1"
+    job.state = state
+    job.destination_id = destination_id
+    session.add(job)
+    return job
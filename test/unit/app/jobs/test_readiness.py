@@ -0,0 +1,106 @@
+from galaxy import model
+from galaxy.jobs.readiness import (
+    count_active_jobs_for_users,
+    JobReadinessIndex,
+)
+from galaxy.model.unittest_utils import GalaxyDataTestApp
+
+HANDLER = "handler0"
+
+
+def test_index_tracks_waiting_datasets():
+    index = JobReadinessIndex()
+    index.track(1, ("user", 1), [10, 11])
+    index.track(2, ("user", 1), [11])
+    index.track(3, ("user", 2))
+    assert index.ready_job_ids() == [3]
+    assert sorted(index.pending_dataset_ids()) == [10, 11]
+    assert index.datasets_ready([11]) == {2}
+    assert index.ready_job_ids() == [2, 3]
+    assert index.datasets_ready([10]) == {1}
+    assert index.ready_job_ids() == [1, 2, 3]
+    assert index.pending_dataset_ids() == []
+
+
+def test_index_sync_discards_jobs_no_longer_new():
+    index = JobReadinessIndex()
+    index.track(1, ("user", 1), [10])
+    index.track(2, ("user", 1), [10])
+    assert index.sync([2, 3]) == {3}
+    assert 1 not in index
+    assert 2 in index
+    assert index.datasets_ready([10]) == {2}
+
+
+def test_index_ready_window():
+    index = JobReadinessIndex()
+    for job_id in range(1, 6):
+        index.track(job_id, ("user", 1))
+    index.track(6, ("session", 1))
+    assert index.ready_job_ids(window_size=2) == [1, 2, 6]
+    assert index.ready_job_ids() == [1, 2, 3, 4, 5, 6]
+
+
+def test_index_refresh():
+    app = GalaxyDataTestApp()
+    session = app.model.session
+    user = model.User(email="readiness@example.com", password="password")
+    history = model.History(user=user)
+    ok_hda = _hda(session, history, model.Dataset.states.OK)
+    queued_hda = _hda(session, history, model.Dataset.states.QUEUED)
+    ready_job = _new_job(user, [ok_hda])
+    waiting_job = _new_job(user, [ok_hda, queued_hda])
+    other_handler_job = _new_job(user, [ok_hda], handler="handler1")
+    session.add_all([ready_job, waiting_job, other_handler_job])
+    session.commit()
+
+    index = JobReadinessIndex()
+    index.refresh(session, HANDLER)
+    assert index.ready_job_ids() == [ready_job.id]
+    assert index.pending_dataset_ids() == [queued_hda.dataset.id]
+
+    queued_hda.dataset.state = model.Dataset.states.OK
+    ready_job.state = model.Job.states.QUEUED
+    session.commit()
+    index.refresh(session, HANDLER)
+    assert index.ready_job_ids() == [waiting_job.id]
+    assert ready_job.id not in index
+
+
+def test_count_active_jobs_for_users():
+    app = GalaxyDataTestApp()
+    session = app.model.session
+    user = model.User(email="counts@example.com", password="password")
+    for state, destination_id in [
+        (model.Job.states.QUEUED, "local"),
+        (model.Job.states.RUNNING, "local"),
+        (model.Job.states.RUNNING, "cluster"),
+        (model.Job.states.RESUBMITTED, "cluster"),
+        (model.Job.states.OK, "cluster"),
+    ]:
+        job = _new_job(user, [])
+        job.state = state
+        job.destination_id = destination_id
+        session.add(job)
+    session.commit()
+    user_job_count, user_job_count_per_destination = count_active_jobs_for_users(session, [user.id])
+    assert user_job_count == {user.id: 4}
+    assert user_job_count_per_destination == {user.id: {"local": 2, "cluster": 1}}
+
+
+def _hda(session, history, state):
+    hda = model.HistoryDatasetAssociation(history=history, create_dataset=True, sa_session=session)
+    hda.dataset.state = state
+    session.add(hda)
+    return hda
+
+
+def _new_job(user, input_hdas, handler=HANDLER):
+    job = model.Job()
+    job.user = user
+    job.tool_id = "cat1"
+    job.state = model.Job.states.NEW
+    job.handler = handler
+    for i, hda in enumerate(input_hdas):
+        job.add_input_dataset(f"input{i}", hda)
+    return job
@@ -0,0 +1,92 @@
+import os
+import stat
+import tempfile
+
+from galaxy import model
+from galaxy.jobs import JobDestination
+from galaxy.jobs.runners.cli import ShellJobRunner
+from galaxy.jobs.runners.slurm import SlurmJobRunner
+from galaxy.jobs.runners.util.cli.job.slurm import Slurm
+from galaxy.util.bunch import Bunch
+from galaxy.util.unittest import TestCase
+
+# Fake squeue, prints the states listed in $FAKE_SQUEUE_STATES and logs each call to $FAKE_SQUEUE_LOG
+FAKE_SQUEUE = """#!/bin/sh
+echo "$@" >> "$FAKE_SQUEUE_LOG"
+case "$*" in
+    *--noheader*) ;;
+    *) echo "JOBID ST" ;;
+esac
+cat "$FAKE_SQUEUE_STATES"
+"""
+
+
+class TestBatchJobStates(TestCase):
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+        squeue = os.path.join(self.temp_directory, "squeue")
+        with open(squeue, "w") as f:
+            f.write(FAKE_SQUEUE)
+        os.chmod(squeue, os.stat(squeue).st_mode | stat.S_IEXEC)
+        self.states_path = os.path.join(self.temp_directory, "states")
+        self.log_path = os.path.join(self.temp_directory, "log")
+        self._environ = os.environ.copy()
+        os.environ["PATH"] = f"{self.temp_directory}{os.pathsep}{os.environ['PATH']}"
+        os.environ["FAKE_SQUEUE_STATES"] = self.states_path
+        os.environ["FAKE_SQUEUE_LOG"] = self.log_path
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self._environ)
+
+    def test_cli_job_states(self):
+        self._write_states("1 R\n2 PD\n3 R\n")
+        app = Bunch(config=Bunch(redact_email_in_job_name=False), model=Bunch(context=None))
+        runner = ShellJobRunner(app, 1)
+        first = JobDestination(id="first", runner="cli", params={"job_plugin": "Slurm"})
+        second = JobDestination(id="second", runner="cli", params={"job_plugin": "Slurm"})
+        job_states = [
+            self._job_state("1", first),
+            self._job_state("2", first),
+            self._job_state("3", second),
+            self._job_state("4", second),
+        ]
+        assert runner.get_job_states(job_states) == {
+            "1": model.Job.states.RUNNING,
+            "2": model.Job.states.QUEUED,
+            "3": model.Job.states.RUNNING,
+        }
+        # One status command per destination, not per job
+        assert self._calls() == 2
+
+    def test_slurm_parse_status_with_set(self):
+        job_ids = {str(i) for i in range(10000)}
+        status = "JOBID ST\n" + "".join(f"{i} R\n" for i in range(0, 20000, 2))
+        states = Slurm().parse_status(status, job_ids)
+        assert len(states) == 5000
+        assert states["9998"] == model.Job.states.RUNNING
+
+    def test_slurm_drmaa_job_states(self):
+        self._write_states("1 RUNNING\n2 PENDING\n3 COMPLETING\n")
+        runner = Bunch(
+            runner_params=Bunch(batch_job_status=True),
+            drmaa_job_states=Bunch(QUEUED_ACTIVE="queued_active", RUNNING="running"),
+        )
+        job_states = [self._job_state(job_id) for job_id in ("1", "2", "3", "4")]
+        # Jobs in other states or not known to squeue are left to DRMAA
+        assert SlurmJobRunner.get_job_states(runner, job_states) == {"1": "running", "2": "queued_active"}
+        assert self._calls() == 1
+        runner.runner_params.batch_job_status = False
+        assert SlurmJobRunner.get_job_states(runner, job_states) == {}
+        assert self._calls() == 1
+
+    def _write_states(self, states):
+        with open(self.states_path, "w") as f:
+            f.write(states)
+
+    def _calls(self):
+        with open(self.log_path) as f:
+            return len(f.readlines())
+
+    def _job_state(self, job_id, job_destination=None):
+        return Bunch(job_id=job_id, job_destination=job_destination or JobDestination())
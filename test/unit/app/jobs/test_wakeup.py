@@ -0,0 +1,140 @@
+import threading
+import time
+
+from galaxy import model
+from galaxy.jobs.handler import JobHandler
+from galaxy.jobs.wakeup import (
+    build_job_handler_wakeup,
+    JobHandlerWakeup,
+    QueueWorkerJobHandlerWakeup,
+    WAKE_JOBS,
+    WAKE_STOP,
+)
+from galaxy.model.unittest_utils import GalaxyDataTestApp
+from galaxy.util.bunch import Bunch
+from galaxy.util.sleeper import Sleeper
+
+
+class MockQueueWorker:
+    def __init__(self):
+        self.sent = []
+
+    def send_control_task(self, task, kwargs=None, **_):
+        self.sent.append((task, kwargs))
+
+
+def _app(job_handler_wakeup):
+    data_app = GalaxyDataTestApp()
+    return Bunch(
+        model=data_app.model,
+        config=Bunch(job_handler_wakeup=job_handler_wakeup, server_name="handler0"),
+        queue_worker=MockQueueWorker(),
+    )
+
+
+def test_sleeper_remembers_wake():
+    sleeper = Sleeper()
+    sleeper.wake()
+    start = time.time()
+    sleeper.sleep(10)
+    assert time.time() - start < 5
+    # the wake is consumed
+    start = time.time()
+    sleeper.sleep(0.1)
+    assert time.time() - start >= 0.1
+
+
+def test_sleeper_wake_from_other_thread():
+    sleeper = Sleeper()
+    timer = threading.Timer(0.1, sleeper.wake)
+    timer.start()
+    start = time.time()
+    sleeper.sleep(10)
+    assert time.time() - start < 5
+    timer.join()
+
+
+def test_build_job_handler_wakeup():
+    assert not build_job_handler_wakeup(_app(None)).enabled
+    assert isinstance(build_job_handler_wakeup(_app("queue_worker")), QueueWorkerJobHandlerWakeup)
+    # falls back to the queue worker if the database is not PostgreSQL
+    assert isinstance(build_job_handler_wakeup(_app("postgres")), QueueWorkerJobHandlerWakeup)
+
+
+def test_queue_worker_wakeup_sent_on_commit():
+    app = _app("queue_worker")
+    wakeup = QueueWorkerJobHandlerWakeup(app)
+    session = app.model.session
+    wakeup.notify(session, handler="handler0")
+    wakeup.notify(session, handler="handler0")
+    wakeup.notify(session, handler="handler1", queue=WAKE_STOP)
+    assert app.queue_worker.sent == []
+    session.commit()
+    assert sorted(app.queue_worker.sent, key=lambda t: t[1]["handler"]) == [
+        ("wake_job_handlers", {"handler": "handler0", "queue": WAKE_JOBS}),
+        ("wake_job_handlers", {"handler": "handler1", "queue": WAKE_STOP}),
+    ]
+    session.commit()
+    assert len(app.queue_worker.sent) == 2
+
+    # Wakeups are sent for later transactions of the same session, but not after a rollback
+    job = model.Job()
+    job.tool_id = "cat1"
+    job.handler = "handler2"
+    session.add(job)
+    session.flush()
+    wakeup.notify(session, handler=job.handler)
+    session.rollback()
+    session.commit()
+    assert len(app.queue_worker.sent) == 2
+    wakeup.notify(session, handler="handler2")
+    session.commit()
+    assert app.queue_worker.sent[2:] == [("wake_job_handlers", {"handler": "handler2", "queue": WAKE_JOBS})]
+
+
+def test_notify_dependent_jobs():
+    app = _app("queue_worker")
+    wakeup = QueueWorkerJobHandlerWakeup(app)
+    session = app.model.session
+    history = model.History()
+    hda = model.HistoryDatasetAssociation(history=history, create_dataset=True, sa_session=session)
+    for handler, state in [("handler0", model.Job.states.NEW), ("handler1", model.Job.states.OK)]:
+        job = model.Job()
+        job.tool_id = "cat1"
+        job.state = state
+        job.handler = handler
+        job.add_input_dataset("input1", hda)
+        session.add(job)
+    session.commit()
+    wakeup.notify_dependent_jobs(session, [hda.dataset.id])
+    session.commit()
+    assert app.queue_worker.sent == [("wake_job_handlers", {"handler": "handler0", "queue": WAKE_JOBS})]
+    # disabled transport never queries
+    JobHandlerWakeup(app).notify_dependent_jobs(None, [hda.dataset.id])
+
+    # library dataset inputs wake their handlers too
+    ldda = model.LibraryDatasetDatasetAssociation(dataset=hda.dataset, sa_session=session)
+    job = model.Job()
+    job.tool_id = "cat1"
+    job.state = model.Job.states.NEW
+    job.handler = "handler2"
+    job.add_input_library_dataset("input1", ldda)
+    session.add(job)
+    session.commit()
+    app.queue_worker.sent = []
+    wakeup.notify_dependent_jobs(session, [hda.dataset.id])
+    session.commit()
+    assert sorted(kwargs["handler"] for _, kwargs in app.queue_worker.sent) == ["handler0", "handler2"]
+
+
+def test_job_handler_wake_filters_on_handler():
+    job_handler = JobHandler.__new__(JobHandler)
+    job_handler.app = Bunch(config=Bunch(server_name="handler0"), job_config=Bunch(self_handler_tags=["special"]))
+    job_handler.job_queue = Bunch(sleeper=Sleeper())
+    job_handler.job_stop_queue = Bunch(sleeper=Sleeper())
+    job_handler.wake(handler="handler1")
+    assert not job_handler.job_queue.sleeper.woken
+    job_handler.wake(handler="special")
+    assert job_handler.job_queue.sleeper.woken
+    job_handler.wake(handler="handler0", queue=WAKE_STOP)
+    assert job_handler.job_stop_queue.sleeper.woken
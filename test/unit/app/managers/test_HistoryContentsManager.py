@@ -4,6 +4,7 @@
 import datetime
 import random
 
+import pytest
 from sqlalchemy import (
     column,
     desc,
@@ -11,6 +12,7 @@ from sqlalchemy import (
     true,
 )
 
+from galaxy import exceptions
 from galaxy.managers import (
     base,
     collections,
@@ -106,6 +108,90 @@ class TestHistoryAsContainer(HistoryAsContainerBaseTestCase):
         assert self.contents_manager.contents(history, limit=0) == []
         assert self.contents_manager.contents(history, offset=len(contents)) == []
 
+    def test_after_hid(self):
+        user2 = self.user_manager.create(**user2_data)
+        self.trans.set_user(user2)
+        history = self.history_manager.create(name="history", user=user2)
+        contents = []
+        contents.extend([self.add_hda_to_history(history, name=("hda-" + str(x))) for x in range(3)])
+        contents.append(self.add_list_collection_to_history(history, contents[:3]))
+        contents.extend([self.add_hda_to_history(history, name=("hda-" + str(x))) for x in range(4, 6)])
+
+        self.log("should be able to page through contents by hid")
+        first_page = self.contents_manager.contents(history, limit=4)
+        assert first_page == contents[:4]
+        second_page = self.contents_manager.contents(history, limit=4, after_hid=first_page[-1].hid)
+        assert second_page == contents[4:]
+        assert self.contents_manager.contents(history, limit=4, after_hid=second_page[-1].hid) == []
+
+        self.log("should page in descending hid order")
+        first_page = self.contents_manager.contents(history, limit=4, order_by=desc("hid"))
+        assert first_page == contents[::-1][:4]
+        second_page = self.contents_manager.contents(
+            history, limit=4, order_by=desc("hid"), after_hid=first_page[-1].hid
+        )
+        assert second_page == contents[::-1][4:]
+
+        self.log("should combine with filters")
+        assert (
+            self.contents_manager.contents(
+                history, filters=[parsed_filter("orm", column("history_content_type") == "dataset")], after_hid=3
+            )
+            == contents[4:]
+        )
+
+        self.log("should only page by hid")
+        with pytest.raises(exceptions.RequestParameterInvalidException):
+            self.contents_manager.contents(history, order_by=desc("create_time"), after_hid=1)
+
+        self.log("should page through contents sharing a hid")
+        for item, hid in zip(contents, [1, 1, 2, 2, 2, 3]):
+            item.hid = hid
+        self.trans.sa_session.commit()
+        for order_by, reverse in ((None, False), (desc("hid"), True)):
+            expected = sorted(contents, key=lambda c: (c.hid, c.history_content_type, c.id), reverse=reverse)
+            paged: list = []
+            after: dict = {}
+            while True:
+                page = self.contents_manager.contents(history, limit=2, order_by=order_by, **after)
+                if not page:
+                    break
+                paged.extend(page)
+                last = page[-1]
+                after = dict(after_hid=last.hid, after_item=(last.history_content_type, last.id))
+            assert paged == expected
+
+    def test_contents_rows(self):
+        user2 = self.user_manager.create(**user2_data)
+        self.trans.set_user(user2)
+        history = self.history_manager.create(name="history", user=user2)
+        contents = []
+        contents.extend([self.add_hda_to_history(history, name=("hda-" + str(x))) for x in range(3)])
+        contents.append(self.add_list_collection_to_history(history, contents[:3]))
+
+        self.log("should return rows of the requested columns without loading models")
+        rows = self.contents_manager.contents_rows(history, ["hid", "name"], order_by=desc("create_time"))
+        assert set(rows[0]._fields) == {"history_content_type", "id", "hid", "name", "create_time"}
+        newest_first = sorted(rows, key=lambda row: row.create_time, reverse=True)
+        assert rows == newest_first
+        rows = self.contents_manager.contents_rows(history, ["hid", "name", "state"], limit=2, after_hid=2)
+        assert [(row.hid, row.name) for row in rows] == [(3, "hda-2"), (4, "test collection")]
+        assert [row.history_content_type for row in rows] == ["dataset", "dataset_collection"]
+
+        self.log("should serialize rows with the contents serializer")
+        serializer = self.app[history_contents.HistoryContentsSerializer]
+        rows = self.contents_manager.contents_rows(history, serializer.views["summary"])
+        serialized = serializer.serialize_to_view(rows[3], view="summary")
+        assert serialized["id"] == self.app.security.encode_id(contents[3].id)
+        assert serialized["history_content_type"] == "dataset_collection"
+        assert serialized["state"] == contents[3].collection.populated_state
+
+        self.log("should raise on unknown columns and model filters")
+        with pytest.raises(exceptions.RequestParameterInvalidException):
+            self.contents_manager.contents_rows(history, ["file_name"])
+        with pytest.raises(exceptions.RequestParameterInvalidException):
+            self.contents_manager.contents_rows(history, ["hid"], filters=[parsed_filter("function", bool)])
+
     def test_orm_filtering(self):
         parse_filter = self.history_contents_filters.parse_filter
         user2 = self.user_manager.create(**user2_data)
@@ -239,6 +239,78 @@ def test_hdca_failed_expansion():
         assert "Expected bagit.txt does not exist" in output["error_message"]
 
 
+def test_concurrent_list_path_get():
+    with _execute_context() as execute_context:
+        job_directory = execute_context.job_directory
+        elements = []
+        for i in range(8):
+            example_path = os.path.join(job_directory, f"example_file_{i}")
+            with open(example_path, "w") as f:
+                f.write(f"chr1\t{i}\t{i + 1}\n")
+            elements.append({"src": "path", "path": example_path, "name": f"element_{i}", "ext": "bed"})
+        elements.append({"name": "nested", "elements": [{"src": "pasted", "paste_content": "a\n", "name": "pasted"}]})
+        elements.append({"src": "path", "path": os.path.join(job_directory, "missing"), "name": "missing"})
+        request = {
+            "allow_failed_collections": True,
+            "targets": [
+                {
+                    "destination": {
+                        "type": "hdca",
+                    },
+                    "elements": elements,
+                }
+            ],
+        }
+        execute_context.execute_request(request, workers=4)
+        output = _unnamed_output(execute_context)
+        elements = output["elements"]
+        assert [element["name"] for element in elements[:8]] == [f"element_{i}" for i in range(8)]
+        filenames = set()
+        for i, element in enumerate(elements[:8]):
+            with open(element["filename"]) as f:
+                assert f.read() == f"chr1\t{i}\t{i + 1}\n"
+            filenames.add(element["filename"])
+        assert len(filenames) == 8
+        assert elements[8]["name"] == "nested"
+        assert elements[8]["elements"][0]["name"] == "pasted"
+        assert "error_message" in elements[9]
+
+
+def test_validate_multiple_hashes():
+    with _execute_context() as execute_context:
+        job_directory = execute_context.job_directory
+        example_path = os.path.join(job_directory, "example_file")
+        with open(example_path, "w") as f:
+            f.write("sample data\nhello world")
+        request = {
+            "validate_hashes": True,
+            "targets": [
+                {
+                    "destination": {
+                        "type": "hdas",
+                    },
+                    "elements": [
+                        {
+                            "src": "path",
+                            "path": example_path,
+                            "hashes": [
+                                {"hash_function": "MD5", "hash_value": "471ddd37fc297fba09b893b88739ece9"},
+                                {
+                                    "hash_function": "SHA-1",
+                                    "hash_value": "not-the-sha1",
+                                },
+                            ],
+                        }
+                    ],
+                }
+            ],
+        }
+        execute_context.execute_request(request)
+        output = _unnamed_output(execute_context)
+        error = output["elements"][0]["error_message"]
+        assert "Failed to validate upload with [SHA-1] - expected [not-the-sha1]" in error
+
+
 @contextmanager
 def _execute_context():
     job_directory = mkdtemp()
@@ -268,11 +340,11 @@ class ExecuteContext:
         self.job_directory = directory
         self.galaxy_json_path = os.path.join(directory, "galaxy.json")
 
-    def execute_request(self, request):
+    def execute_request(self, request, workers=1):
         request_path = os.path.join(self.job_directory, "request.json")
         with open(request_path, "w") as f:
             json.dump(request, f)
-        self._execute(["--request", request_path])
+        self._execute(["--request", request_path, "--workers", str(workers)])
 
     def _execute(self, args):
         args.extend(["--working-directory", self.job_directory])
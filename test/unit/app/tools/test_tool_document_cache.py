@@ -0,0 +1,57 @@
+import os
+
+from galaxy.tool_util.parser import get_tool_source
+from galaxy.tools.cache import ToolDocumentCache
+
+TOOL_XML = """<tool id="cached_tool" name="Cached Tool" version="1.0">
+    <command>echo $param1 > $out1</command>
+    <inputs>
+        <param type="text" name="param1" value="" />
+    </inputs>
+    <outputs>
+        <data name="out1" format="txt" />
+    </outputs>
+</tool>
+"""
+
+
+def _write_tool(tmp_path, name="tool.xml"):
+    tool_path = str(tmp_path / name)
+    with open(tool_path, "w") as out:
+        out.write(TOOL_XML)
+    return tool_path
+
+
+def test_cache_readable_after_persist(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    tool_path = _write_tool(tmp_path)
+    cache = ToolDocumentCache(cache_dir)
+    cache.set(tool_path, get_tool_source(tool_path))
+    cache.persist()
+    assert not cache.disabled
+    assert cache.writeable_cache_file is None
+    assert 'id="cached_tool"' in cache.get(tool_path)["document"]
+
+    other_cache = ToolDocumentCache(cache_dir)
+    assert other_cache.get(tool_path) == cache.get(tool_path)
+    assert other_cache.get(str(tmp_path / "other.xml")) is None
+    # Modified tools are not served from the cache
+    os.utime(tool_path, (0, 0))
+    assert other_cache.get(tool_path) is None
+
+
+def test_cache_updated_after_persist(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    tool_path = _write_tool(tmp_path)
+    cache = ToolDocumentCache(cache_dir)
+    cache.set(tool_path, get_tool_source(tool_path))
+    cache.persist()
+
+    # e.g. after reloading the toolbox
+    other_tool_path = _write_tool(tmp_path, "other.xml")
+    cache.set(other_tool_path, get_tool_source(other_tool_path))
+    cache.persist()
+    assert not cache.disabled
+    assert cache.get(tool_path)
+    assert cache.get(other_tool_path)
+    assert not [name for name in os.listdir(cache_dir) if name.endswith(".tmp")]
@@ -0,0 +1,102 @@
+import os
+
+from galaxy.app_unittest_utils.toolbox_support import BaseToolBoxTestCase
+from galaxy.tools.search import ToolBoxSearch
+from galaxy.util.bunch import Bunch
+
+SEARCH_CONFIG = {
+    "tool_ngram_minsize": 3,
+    "tool_ngram_maxsize": 4,
+    "tool_id_boost": 20.0,
+    "tool_name_exact_multiplier": 10.0,
+    "tool_name_boost": 20.0,
+    "tool_stub_boost": 2.0,
+    "tool_section_boost": 3.0,
+    "tool_description_boost": 8.0,
+    "tool_help_boost": 1.0,
+    "tool_label_boost": 1.0,
+    "tool_enable_ngram_search": True,
+    "tool_ngram_factor": 0.2,
+    "tool_help_bm25f_k1": 0.5,
+}
+
+CUSTOM_VIEW = {
+    "id": "custom",
+    "name": "Custom",
+    "type": "generic",
+    "items": [{"type": "tool", "id": "tool2"}],
+}
+
+
+class TestToolSearch(BaseToolBoxTestCase):
+    def setUp(self):
+        super().setUp()
+        for key, value in SEARCH_CONFIG.items():
+            setattr(self.app.config, key, value)
+        self.app.config.panel_views = [CUSTOM_VIEW]
+        # Tools get EDAM operations and topics with a metadata source
+        self.app.biotools_metadata_source = Bunch(get_biotools_metadata=lambda ref: None)
+        self._init_tool(filename="tool1.xml", tool_id="tool1")
+        self._init_tool(filename="tool2.xml", tool_id="tool2")
+        self._add_config("""<toolbox><tool file="tool1.xml" /><tool file="tool2.xml" /></toolbox>""")
+        self.index_dir = os.path.join(self.test_directory, "tool_search_index")
+        self.toolbox_search = ToolBoxSearch(self.toolbox, index_dir=self.index_dir, cache_size=2)
+
+    def _search(self, q, panel_view="default"):
+        return sorted(self.toolbox_search.search(q=q, panel_view=panel_view, config=self.app.config))
+
+    def _indexed_fingerprints(self):
+        with self.toolbox_search.index.reader() as reader:
+            return {f["id"]: f["fingerprint"] for f in reader.all_stored_fields() if f}
+
+    def test_filter_on_panel_view(self):
+        self.toolbox_search.build_index(self.app.tool_cache, self.toolbox)
+        assert self._search("Test Tool") == ["tool1", "tool2"]
+        assert self._search("Test Tool", panel_view="custom") == ["tool2"]
+        # A single index is shared by all panel views
+        assert os.listdir(self.index_dir)
+        assert not os.path.exists(os.path.join(self.index_dir, "default"))
+
+    def test_incremental_build(self):
+        self.toolbox_search.build_index(self.app.tool_cache, self.toolbox)
+        fingerprints = self._indexed_fingerprints()
+        assert set(fingerprints) == {"tool1", "tool2"}
+        with self.toolbox_search.index.reader() as reader:
+            generation = reader.generation()
+
+        # Nothing changed, nothing is written
+        self.toolbox_search.build_index(self.app.tool_cache, self.toolbox)
+        with self.toolbox_search.index.reader() as reader:
+            assert reader.generation() == generation
+
+        tool = self.toolbox.get_tool("tool1")
+        tool.description = "modified description"
+        self.toolbox_search.build_index(self.app.tool_cache, self.toolbox)
+        new_fingerprints = self._indexed_fingerprints()
+        assert new_fingerprints["tool1"] != fingerprints["tool1"]
+        assert new_fingerprints["tool2"] == fingerprints["tool2"]
+        assert self._search("modified") == ["tool1"]
+
+        self.app.tool_cache.expire_tool("tool1")
+        self.toolbox_search.build_index(self.app.tool_cache, self.toolbox)
+        assert set(self._indexed_fingerprints()) == {"tool2"}
+
+    def test_result_cache(self):
+        self.toolbox_search.build_index(self.app.tool_cache, self.toolbox)
+        result_cache = self.toolbox_search.result_cache
+        assert self._search("Test Tool") == ["tool1", "tool2"]
+        assert self._search(" Test  Tool") == ["tool1", "tool2"]
+        assert self._search("Test Tool", panel_view="custom") == ["tool2"]
+        assert len(result_cache) == 2
+        # Least recently used queries are evicted
+        self._search("tool1")
+        assert len(result_cache) == 2
+        assert ("default", "Test Tool", 0.5) not in result_cache._results
+
+        # Updating the index invalidates cached results
+        tool = self.toolbox.get_tool("tool1")
+        tool.description = "modified description"
+        assert self._search("modified") == []
+        self.toolbox_search.build_index(self.app.tool_cache, self.toolbox)
+        assert self._search("modified") == ["tool1"]
+        assert len(result_cache) == 1
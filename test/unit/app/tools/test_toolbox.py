@@ -275,6 +275,32 @@ class TestToolBox(BaseToolBoxTestCase):
             != "github.com/galaxyproject/example/test_tool/0.3"
         )
 
+    def test_lazy_load_tools(self):
+        self._init_tool(filename="tool1.xml", tool_id="tool1")
+        self._init_tool(filename="tool2.xml", tool_id="tool2")
+        self._add_config("""<toolbox><tool file="tool1.xml" /><tool file="tool2.xml" /></toolbox>""")
+        self.app.config.lazy_load_tools = True
+        self.app.tool_cache.max_materialized_tools = 1
+
+        tool1 = self.toolbox.get_tool("tool1")
+        tool2 = self.toolbox.get_tool("tool2")
+        assert tool1.lazy
+        assert "inputs" not in vars(tool1)
+        assert "outputs" not in vars(tool2)
+        assert tool1.name == "Test Tool"
+        assert tool1.is_workflow_compatible
+        assert tool1.to_dict(mock_trans(), link_details=True)["target"] == "galaxy_main"
+
+        assert list(tool1.inputs) == ["param1"]
+        assert list(tool1.outputs) == ["out1"]
+        assert tool1.npages == 1
+        assert "inputs" in vars(tool1)
+        assert list(tool2.outputs) == ["out1"]
+        # Only the most recently requested tool stays materialized
+        assert "inputs" not in vars(tool1)
+        assert "inputs" in vars(tool2)
+        assert tool1.inputs["param1"].tool is tool1
+
     def test_tool_dir(self):
         self._init_tool()
         self._add_config(f"""<toolbox><tool_dir dir="{self.test_directory}" /></toolbox>""")
@@ -0,0 +1,61 @@
+"""
+Unit tests for reading datasets through their object store.
+.. seealso:: galaxy.datatypes.dataproviders.dataset
+"""
+
+import gzip
+import os
+
+from galaxy.datatypes.dataproviders import (
+    chunk,
+    dataset,
+)
+from galaxy.util.bunch import Bunch
+
+
+class BytesObjectStore:
+    def __init__(self, content):
+        self.content = content
+        self.reads = []
+
+    def get_bytes(self, obj, start=0, count=-1):
+        self.reads.append((start, count))
+        return self.content[start:] if count < 0 else self.content[start : start + count]
+
+    def size(self, obj):
+        return len(self.content)
+
+
+def _dataset(object_store, file_name):
+    model_dataset = Bunch(object_store=object_store, external_filename=None)
+    return Bunch(dataset=model_dataset, get_file_name=lambda: file_name)
+
+
+def test_dataset_bytes_reader():
+    object_store = BytesObjectStore(b"0123456789")
+    reader = dataset.DatasetBytesReader(object_store, None)
+    reader.seek(2)
+    assert reader.read(3) == b"234"
+    assert reader.tell() == 5
+    reader.seek(-2, os.SEEK_END)
+    assert reader.read() == b"89"
+    assert object_store.reads == [(2, 3), (8, -1)]
+
+
+def test_chunk_dataprovider_reads_through_object_store():
+    object_store = BytesObjectStore(bytes(range(256)))
+    source = dataset.open_dataset_bytes(_dataset(object_store, "/nonexistent"))
+    provider = chunk.ChunkDataProvider(source, chunk_index=2, chunk_size=16)
+    assert list(provider) == [bytes(range(32, 48))]
+    assert object_store.reads[-1] == (32, 16)
+
+
+def test_open_dataset_bytes_decompresses(tmp_path):
+    path = tmp_path / "dataset_1.dat"
+    content = gzip.compress(b"Hello World!")
+    path.write_bytes(content)
+    object_store = BytesObjectStore(content)
+    with dataset.open_dataset_bytes(_dataset(object_store, str(path))) as fh:
+        assert fh.read() == b"Hello World!"
+    with dataset.open_dataset_bytes(_dataset(object_store, str(path)), decompress=False) as fh:
+        assert fh.read() == content
@@ -114,3 +114,31 @@ def test_sniff_compressed_dynamic_datatypes_default_off():
     assert "fastq" not in sniff.guess_ext(fname, sniff_order)
     fname = sniff.get_test_fname("1.fastqsanger.bz2")
     assert "fastq" not in sniff.guess_ext(fname, sniff_order)
+
+
+def test_sniffer_index():
+    datatypes_registry = example_datatype_registry_for_sample()
+    sniffer_index = datatypes_registry.sniffer_index
+    assert list(sniffer_index) == datatypes_registry.sniff_order
+    for test_file in [
+        "1.fastqsanger.gz",
+        "1.fastqsanger.bz2",
+        "1.bam",
+        "1.tiff",
+        "1.mtx",
+        "brukerbaf.d.tar",
+        "some.wiff.tar",
+        "test.fast5.tar",
+        "test.fast5.tar.xz",
+        "postgresql_fake.tar.bz2",
+        "megablast_xml_parser_test1.blastxml",
+        "empty.txt",
+    ]:
+        fname = sniff.get_test_fname(test_file)
+        assert sniff.guess_ext(fname, sniffer_index) == sniff.guess_ext(fname, datatypes_registry.sniff_order)
+    # Sniffers only matching tar archives are not candidates for text files
+    file_prefix = sniff.FilePrefix(sniff.get_test_fname("1.mtx"))
+    candidates = sniffer_index.candidates(file_prefix)
+    assert not any(datatype.is_binary is True for datatype in candidates)
+    assert sniff.run_sniffers_raw(file_prefix, sniffer_index) == "mtx"
+    assert not file_prefix.tar
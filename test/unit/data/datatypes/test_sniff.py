@@ -1,3 +1,6 @@
+import gzip
+import hashlib
+import io
 import tempfile
 
 import pytest
@@ -7,7 +10,12 @@ from galaxy.datatypes.sniff import (
     convert_newlines,
     convert_newlines_sep2tabs,
     convert_sep2tabs,
+    convert_stream,
+    FilePrefix,
+    get_headers,
     get_test_fname,
+    handle_uploaded_dataset_file_internal,
+    NEWLINES_SEP2TABS_REGEXP,
 )
 
 
@@ -100,6 +108,45 @@ def test_convert_sep2tabs_only():
     assert_converts_to_1234_convert_sep2tabs_only(b"1    2\n3    4", b"1\t2\n3\t4")
 
 
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 1024])
+def test_convert_stream_block_size(block_size):
+    # Whitespace runs and \r\n pairs split across blocks are converted like any other
+    content = b"chr1   100\r\nchr2 \t 200  \r\n\r\nchr3\t300"
+    expected = b"chr1\t100\nchr2\t200\t\n\nchr3\t300\n"
+    fp = io.BytesIO()
+    result = convert_stream(
+        io.BytesIO(content),
+        fp,
+        regexp=NEWLINES_SEP2TABS_REGEXP,
+        block_size=block_size,
+        hash_functions=["MD5", "SHA-1"],
+    )
+    assert fp.getvalue() == expected
+    assert result.line_count == 4
+    assert result.converted_newlines
+    assert result.converted_regex
+    assert result.hashes == {"MD5": hashlib.md5(expected).hexdigest(), "SHA-1": hashlib.sha1(expected).hexdigest()}
+
+
+def test_convert_while_uncompressing(tmp_path):
+    path = tmp_path / "sample.txt.gz"
+    with gzip.open(path, "wb") as f:
+        f.write(b"1 2\r\n3 4\r\n" * 1000)
+    response = handle_uploaded_dataset_file_internal(
+        FilePrefix(str(path)),
+        example_datatype_registry_for_sample(),
+        tmp_dir=str(tmp_path),
+        convert_to_posix_lines=True,
+        convert_spaces_to_tabs=True,
+    )
+    assert response.ext == "tabular"
+    assert response.compressed_type == "gzip"
+    assert response.converted_newlines
+    assert response.converted_spaces
+    with open(response.converted_path, "rb") as f:
+        assert f.read() == b"1\t2\n3\t4\n" * 1000
+
+
 def test_infer_from_filename():
     datatypes_registry = example_datatype_registry_for_sample()
     assert datatypes_registry.get_datatype_from_filename("mycool.fa").file_ext == "fasta"
@@ -109,3 +156,57 @@ def test_infer_from_filename():
     assert datatypes_registry.get_datatype_from_filename("mycool.fq").file_ext == "fastqsanger"
     assert datatypes_registry.get_datatype_from_filename("mycool.fq.gz").file_ext == "fastqsanger.gz"
     assert datatypes_registry.get_datatype_from_filename("mycool.fastq").file_ext == "fastqsanger"
+
+
+def _readline_lines(text, truncated):
+    # How FilePrefix.line_iterator() used to split the prefix
+    s = io.StringIO(text)
+    s_len = len(text)
+    for line in iter(s.readline, ""):
+        if line.endswith("\n") or line.endswith("\r"):
+            yield line
+        elif s.tell() == s_len and not truncated:
+            yield line
+
+
+def test_file_prefix_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr("galaxy.datatypes.sniff.SNIFF_PREFIX_BYTES", 24)
+    for contents in [
+        "a\tb\nc\td\n",
+        "a\tb\nc\td",
+        "a\r\nb\rc\n\nlast line",
+        "a\tb\nc\td\ne\tf\ng\th\ni\tj\nk\tl\n",
+        "a\tb\nc\td\ne\tf\ng\th\ni\tj\nk\tl\r",
+        "",
+    ]:
+        path = tmp_path / "prefix.txt"
+        path.write_bytes(contents.encode("utf-8"))
+        file_prefix = FilePrefix(str(path))
+        expected = list(_readline_lines(contents[:24], file_prefix.truncated))
+        assert list(file_prefix.line_iterator()) == expected
+        # Lines are split once and shared
+        assert list(file_prefix.line_iterator()) == expected
+        rows = [line.rstrip("\r\n").split("\t") for line in expected]
+        assert get_headers(file_prefix, "\t", count=-1) == rows
+        assert [row for _, row in file_prefix.rows("\t")] == [tuple(row) for row in rows]
+
+
+def test_file_prefix_rows_are_not_shared():
+    file_prefix = FilePrefix(get_test_fname("complete.bed"))
+    headers = get_headers(file_prefix, "\t", count=1)
+    headers[0].pop()
+    assert get_headers(file_prefix, "\t", count=1)[0][-1] == "0,10713,13126,"
+    assert get_headers(file_prefix, "\t", count=1, comment_designator="chr") == []
+
+
+def test_file_prefix_non_utf8(tmp_path):
+    path = tmp_path / "latin1.txt"
+    path.write_bytes("café\n".encode("latin-1"))
+    file_prefix = FilePrefix(str(path))
+    assert file_prefix.contents_header is None
+    assert isinstance(file_prefix.non_utf8_error, UnicodeDecodeError)
+    lines = file_prefix.line_iterator()
+    with pytest.raises(UnicodeDecodeError):
+        next(lines)
+    assert file_prefix.encoding == "iso-8859-1"
+    assert file_prefix.mime_type == "text/plain"
@@ -4,6 +4,7 @@ import json
 import os
 import pathlib
 import shutil
+import tarfile
 from tempfile import (
     mkdtemp,
     NamedTemporaryFile,
@@ -14,6 +15,7 @@ from typing import (
     NamedTuple,
     Optional,
 )
+from uuid import uuid4
 
 import pytest
 from rocrate.rocrate import ROCrate
@@ -59,6 +61,87 @@ def test_import_export_history():
     _assert_simple_cat_job_imported(imported_history)
 
 
+def test_export_history_streams_files_to_tar():
+    app = _mock_app()
+
+    u, h, d1, d2, j = _setup_simple_cat_job(app)
+
+    dest_export = os.path.join(mkdtemp(), "moo.tgz")
+    with store.TarModelExportStore(dest_export, app=app, export_files="copy") as export_store:
+        export_store.export_history(h)
+        temp_output_dir = export_store.temp_output_dir
+        # dataset files go straight into the archive, only attrs are written to the export directory
+        assert "datasets" not in os.listdir(export_store.export_directory)
+    assert not os.path.exists(temp_output_dir)
+
+    with tarfile.open(dest_export) as archive:
+        names = archive.getnames()
+        datasets_attrs = json.load(archive.extractfile(store.ATTRS_FILENAME_DATASETS))
+    assert len(datasets_attrs) == 2
+    for dataset_attrs in datasets_attrs:
+        assert names.count(dataset_attrs["file_name"]) == 1
+
+
+def test_import_history_copies_files_in_parallel():
+    app = _mock_app()
+
+    u, h, d1, d2, j = _setup_simple_cat_job(app)
+    dest_export = os.path.join(mkdtemp(), "moo.tgz")
+    with store.TarModelExportStore(dest_export, app=app, export_files="copy") as export_store:
+        export_store.export_history(h)
+
+    dest_parent = mkdtemp()
+    dest_dir = CompressedFile(dest_export).extract(dest_parent)
+    model_store = store.get_import_model_store_for_directory(
+        dest_dir, app=app, user=u, import_options=store.ImportOptions(copy_threads=2)
+    )
+    progress = []
+    with model_store.target_history(default_history=None) as imported_history:
+        model_store.perform_import(
+            imported_history, progress=lambda completed, total: progress.append((completed, total))
+        )
+    shutil.rmtree(dest_parent)
+
+    assert progress == [(1, 2), (2, 2)]
+    _assert_simple_cat_job_imported(imported_history)
+    for dataset in imported_history.datasets:
+        assert dataset.get_size() == dataset.dataset.total_size > 0
+
+
+def test_import_history_copies_files_of_shared_datasets_in_one_thread():
+    app = _mock_app()
+
+    u, h, d1, d2, j = _setup_simple_cat_job(app)
+    dest_export = os.path.join(mkdtemp(), "moo.tgz")
+    with store.TarModelExportStore(dest_export, app=app, export_files="copy") as export_store:
+        export_store.export_history(h)
+
+    dest_parent = mkdtemp()
+    dest_dir = CompressedFile(dest_export).extract(dest_parent)
+    datasets_attrs_path = os.path.join(dest_dir, store.ATTRS_FILENAME_DATASETS)
+    with open(datasets_attrs_path) as f:
+        datasets_attrs = json.load(f)
+    shared_uuid = str(uuid4())
+    for dataset_attrs in datasets_attrs:
+        dataset_attrs["uuid"] = dataset_attrs["dataset_uuid"] = shared_uuid
+    with open(datasets_attrs_path, "w") as f:
+        json.dump(datasets_attrs, f)
+
+    model_store = store.get_import_model_store_for_directory(
+        dest_dir, app=app, user=u, import_options=store.ImportOptions(copy_threads=2)
+    )
+    progress = []
+    with model_store.target_history(default_history=None) as imported_history:
+        model_store.perform_import(
+            imported_history, progress=lambda completed, total: progress.append((completed, total))
+        )
+    shutil.rmtree(dest_parent)
+
+    # both files target the same path, they are copied by a single task
+    assert progress == [(2, 2)]
+    assert len(imported_history.datasets) == 2
+
+
 def test_import_export_history_failed_job():
     """Test a simple job import/export, make sure state is maintained correctly."""
     app = _mock_app()
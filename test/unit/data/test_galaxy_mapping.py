@@ -16,13 +16,21 @@ import galaxy.model.mapping as mapping
 from galaxy import model
 from galaxy.model.base import transaction
 from galaxy.model.database_utils import create_database
+from galaxy.model.dataset_collections.flattened import FlattenedCollection
+from galaxy.model.dataset_collections.structure import Tree
+from galaxy.model.dataset_collections.subcollections import split_dataset_collection_instance
+from galaxy.model.dataset_collections.type_description import COLLECTION_TYPE_DESCRIPTION_FACTORY
 from galaxy.model.metadata import MetadataTempFile
 from galaxy.model.orm.util import (
     add_object_to_object_session,
     get_object_session,
 )
-from galaxy.model.security import GalaxyRBACAgent
+from galaxy.model.security import (
+    DatasetAccessCache,
+    GalaxyRBACAgent,
+)
 from galaxy.objectstore import QuotaSourceMap
+from galaxy.util.bunch import Bunch
 from galaxy.util.unittest import TestCase
 
 datatypes_registry = galaxy.datatypes.registry.Registry()
@@ -124,6 +132,67 @@ class TestMappings(BaseModelTestCase):
         assert all(d.name == f"forward_{i}" for i, d in enumerate(forward_hdas))
         assert all(d.name == f"reverse_{i}" for i, d in enumerate(reverse_hdas))
 
+    def test_flattened_collection(self):
+        u = model.User(email="flattened@example.com", password="password")
+        h1 = model.History(name="History 1", user=u)
+        list_pair = model.DatasetCollection(collection_type="list:paired")
+        to_persist = [u, h1, list_pair]
+        hdas = []
+        # elements are created out of order, they are flattened in element_index order
+        for i in reversed(range(3)):
+            pair = model.DatasetCollection(collection_type="paired")
+            for j, identifier in reversed(list(enumerate(("forward", "reverse")))):
+                hda = model.HistoryDatasetAssociation(
+                    extension="txt",
+                    history=h1,
+                    name=f"{identifier}_{i}",
+                    create_dataset=True,
+                    sa_session=self.model.session,
+                )
+                dce = model.DatasetCollectionElement(
+                    collection=pair, element=hda, element_identifier=identifier, element_index=j
+                )
+                hdas.append(hda)
+                to_persist.extend([hda, dce])
+            outer_dce = model.DatasetCollectionElement(
+                collection=list_pair, element=pair, element_identifier=f"pair_{i}", element_index=i
+            )
+            to_persist.extend([pair, outer_dce])
+        self.persist(*to_persist)
+
+        flattened = FlattenedCollection.for_collection(list_pair)
+        assert flattened is not None
+        assert len(flattened) == 9
+        assert flattened.depths == [1, 2, 2] * 3
+        assert [flattened.identifier_path(p) for p in flattened.positions_at_depth()] == [
+            (f"pair_{i}", identifier) for i in range(3) for identifier in ("forward", "reverse")
+        ]
+        hda_ids = {hda.name: hda.id for hda in hdas}
+        assert [flattened.hda_ids[p] for p in flattened.positions_at_depth()] == [
+            hda_ids[f"{identifier}_{i}"] for i in range(3) for identifier in ("forward", "reverse")
+        ]
+        assert flattened.states == ["ok", "new", "new"] * 3
+        assert flattened.children() == [0, 3, 6]
+        assert flattened.children(3) == [4, 5]
+
+        # Only the outer elements when mapping over the pairs
+        outer_flattened = FlattenedCollection.for_collection(list_pair, depth=1, with_elements=True)
+        assert outer_flattened is not None
+        assert outer_flattened.element_identifiers == ["pair_0", "pair_1", "pair_2"]
+        assert outer_flattened.elements_at_depth() == list_pair.elements
+        assert (
+            split_dataset_collection_instance(model.HistoryDatasetCollectionAssociation(collection=list_pair), "paired")
+            == list_pair.elements
+        )
+
+        collection_type_description = COLLECTION_TYPE_DESCRIPTION_FACTORY.for_collection_type("list:paired")
+        tree = Tree.for_dataset_collection(list_pair, collection_type_description)
+        assert [identifier for identifier, _ in tree.children] == ["pair_0", "pair_1", "pair_2"]
+        assert [identifier for identifier, _ in tree.children[0][1].children] == ["forward", "reverse"]
+        assert len(tree) == 6
+        walked = [elements["input"] for elements, _ in tree.walk_collections({"input": Bunch(collection=list_pair)})]
+        assert walked == list_pair.dataset_elements
+
     def test_nested_collection_attributes(self):
         u = model.User(email="mary2@example.com", password="password")
         h1 = model.History(name="History 1", user=u)
@@ -454,6 +523,16 @@ class TestMappings(BaseModelTestCase):
         assert counts.root["new"] == 2
         assert counts.root["scheduled"] == 1
 
+        # Invocations without a history are still polled
+        workflow_invocation_2 = _invocation_for_workflow(user, loaded_workflow)
+        workflow_invocation_2.history = None
+        self.model.session.add(workflow_invocation_2)
+        self.model.session.commit()
+        active = model.WorkflowInvocation.poll_active_workflow_invocations(self.model.engine)
+        assert (workflow_invocation_0.id, workflow_invocation_0.history.id, user.id) in active
+        assert (workflow_invocation_2.id, None, None) in active
+        assert workflow_invocation_1.id not in [invocation_id for invocation_id, _, _ in active]
+
     def test_role_creation(self):
         security_agent = GalaxyRBACAgent(self.model)
 
@@ -502,6 +581,40 @@ class TestMappings(BaseModelTestCase):
         assert security_agent.can_access_dataset(u_to.all_roles(), d1.dataset)
         assert not security_agent.can_access_dataset(u_other.all_roles(), d1.dataset)
 
+    def test_dataset_access_in_bulk(self):
+        security_agent = GalaxyRBACAgent(self.model)
+        u_from, u_to, u_other = self._three_users("dataset_access_in_bulk")
+
+        h = model.History(name="History for Annotation", user=u_from)
+        d1 = model.HistoryDatasetAssociation(
+            extension="txt", history=h, create_dataset=True, sa_session=self.model.session
+        )
+        d2 = model.HistoryDatasetAssociation(
+            extension="txt", history=h, create_dataset=True, sa_session=self.model.session
+        )
+        self.persist(h, d1, d2)
+        security_agent.privately_share_dataset(d1.dataset, [u_to])
+        dataset_ids = [d1.dataset.id, d2.dataset.id]
+
+        assert security_agent.can_access_dataset_ids(u_to.all_roles(), dataset_ids) == {
+            d1.dataset.id: True,
+            d2.dataset.id: True,
+        }
+        assert security_agent.can_access_dataset_ids(u_other.all_roles(), dataset_ids) == {
+            d1.dataset.id: False,
+            d2.dataset.id: True,
+        }
+
+        dataset_access = DatasetAccessCache(security_agent, u_other.all_roles())
+        dataset_access.prefetch(dataset_ids)
+        assert dataset_access.public_dataset_ids == {d2.dataset.id}
+        assert not dataset_access.can_access_dataset(d1.dataset.id)
+        security_agent.make_dataset_public(d1.dataset)
+        # permissions are cached until they are forgotten
+        assert not dataset_access.can_access_dataset(d1.dataset.id)
+        dataset_access.forget([d1.dataset.id])
+        assert dataset_access.can_access_dataset(d1.dataset.id)
+
     def test_make_dataset_public(self):
         security_agent = GalaxyRBACAgent(self.model)
         u_from, u_to, u_other = self._three_users("make_dataset_public")
@@ -156,6 +156,22 @@ class TestCalculateUsage(BaseModelTestCase):
         assert int(usage_dict["not_tracked"]) == 10
         assert int(usage_dict["tracked"]) == 15
 
+    def test_calculate_objectstore_usage_in_batches(self):
+        u = self.u
+
+        d1 = self._add_dataset(10, "not_tracked")
+        self._add_dataset(15, "tracked")
+        self._add_dataset(20)
+        # copies of a dataset are only counted once
+        d2 = d1.copy()
+        self.h.add_dataset(d2)
+        self.persist(d2)
+
+        expected = {"not_tracked": 10, "tracked": 15, None: 20}
+        for batch_size in (1, 2, 10):
+            usage = model.calculate_disk_usage_per_objectstore_in_batches(self.model.session, u.id, batch_size)
+            assert usage == expected
+
     def test_calculate_usage_disabled_quota(self):
         u = self.u
 
@@ -14,8 +14,11 @@ from requests import get
 
 from galaxy.exceptions import ObjectInvalid
 from galaxy.objectstore import persist_extra_files_for_dataset
+from galaxy.objectstore._caching_base import CachingConcreteObjectStore
 from galaxy.objectstore.azure_blob import AzureBlobObjectStore
 from galaxy.objectstore.caching import (
+    BlockCache,
+    CacheIndex,
     CacheTarget,
     check_cache,
     InProcessCacheMonitor,
@@ -35,6 +38,7 @@ from galaxy.util import (
     directory_hash_id,
     unlink,
 )
+from galaxy.util.bunch import Bunch
 from galaxy.util.unittest_utils import skip_unless_environ
 
 
@@ -118,6 +122,10 @@ def test_disk_store():
             data = object_store.get_data(hello_world_dataset, start=1, count=6)
             assert data == "ello W"
 
+            # Test get_bytes
+            assert object_store.get_bytes(hello_world_dataset) == b"Hello World!"
+            assert object_store.get_bytes(hello_world_dataset, start=1, count=6) == b"ello W"
+
             # Test Size
 
             # Test absent and empty datasets yield size of 0.
@@ -966,6 +974,184 @@ def test_check_cache_sanity(tmp_path):
     assert not path.exists()
 
 
+def test_cache_index(tmp_path):
+    cache_dir = tmp_path
+    (cache_dir / "000").mkdir()
+    (cache_dir / "000" / "dataset_1.dat").write_bytes(b"a" * 100)
+    (cache_dir / "000" / "dataset_2.dat").write_bytes(b"b" * 200)
+    an_hour_ago = time.time() - 3600
+    for path in ("dataset_1.dat", "dataset_2.dat"):
+        os.utime(cache_dir / "000" / path, (an_hour_ago, an_hour_ago))
+    index = CacheIndex(cache_dir)
+    assert not index.is_built
+    assert index.rebuild() == (2, 300)
+    assert index.is_built
+
+    # Files added, accessed and removed by the object store update the index
+    (cache_dir / "000" / "dataset_3.dat").write_bytes(b"c" * 300)
+    index.record("000/dataset_3.dat")
+    extra_files = cache_dir / "000" / "dataset_3_files"
+    extra_files.mkdir()
+    (extra_files / "extra.txt").write_bytes(b"d" * 50)
+    index.record_directory("000/dataset_3_files")
+    assert index.total_size() == 650
+    index.touch("000/dataset_1.dat")
+    assert [path for path, _ in index.least_recently_used()] == [
+        "000/dataset_2.dat",
+        "000/dataset_3.dat",
+        "000/dataset_3_files/extra.txt",
+        "000/dataset_1.dat",
+    ]
+    index.remove("000/dataset_3_files/", directory=True)
+    assert index.total_size() == 600
+
+    # Accesses are recorded at most every CACHE_INDEX_TOUCH_INTERVAL seconds
+    def atime(rel_path):
+        with index._connect() as conn:
+            return conn.execute("SELECT atime FROM cache_file WHERE path = ?", (rel_path,)).fetchone()[0]
+
+    touched = atime("000/dataset_1.dat")
+    index.touch("000/dataset_1.dat")
+    index.touch("000/dataset_3.dat")
+    assert atime("000/dataset_1.dat") == touched
+
+    # The monitor removes least recently used files until the cache is small enough
+    one_kb_limit = 1000 / (1024 * 1024 * 1024)
+    check_cache(CacheTarget(cache_dir, 1, one_kb_limit))
+    assert (cache_dir / "000" / "dataset_1.dat").exists()
+    check_cache(CacheTarget(cache_dir, 1, one_kb_limit / 2))
+    assert not (cache_dir / "000" / "dataset_2.dat").exists()
+    assert (cache_dir / "000" / "dataset_3.dat").exists()
+    assert (cache_dir / "000" / "dataset_1.dat").exists()
+    assert index.total_size() == 400
+
+    # Files removed behind the index's back are just dropped from the index
+    os.remove(cache_dir / "000" / "dataset_3.dat")
+    check_cache(CacheTarget(cache_dir, 1, one_kb_limit / 10))
+    assert index.total_size() == 0
+    assert not (cache_dir / "000" / "dataset_1.dat").exists()
+    # Not in the index anymore, but resetting the cache indexes all files again
+    assert (cache_dir / "000" / "dataset_3_files" / "extra.txt").exists()
+    reset_cache(CacheTarget(cache_dir, 1, 0.2))
+    assert not (cache_dir / "000" / "dataset_3_files" / "extra.txt").exists()
+
+
+def test_cache_index_rebuilt_by_monitor(tmp_path):
+    cache_dir = tmp_path
+    (cache_dir / "000").mkdir()
+    (cache_dir / "000" / "dataset_1.dat").write_bytes(b"a" * 100)
+    an_hour_ago = time.time() - 3600
+    os.utime(cache_dir / "000" / "dataset_1.dat", (an_hour_ago, an_hour_ago))
+    cache_target = CacheTarget(cache_dir, 1, 0.2)
+    check_cache(cache_target)
+    index = CacheIndex(cache_dir)
+    assert index.total_size() == 100
+    index.touch("000/dataset_1.dat")
+
+    # Files added behind the index's back are indexed once the index is old enough
+    (cache_dir / "000" / "dataset_2.dat").write_bytes(b"b" * 200)
+    os.utime(cache_dir / "000" / "dataset_2.dat", (an_hour_ago, an_hour_ago))
+    check_cache(cache_target)
+    assert index.total_size() == 100
+    with index._connect() as conn, conn:
+        conn.execute("UPDATE cache_meta SET value = ? WHERE key = 'built'", (an_hour_ago - 24 * 3600,))
+    check_cache(cache_target)
+    assert index.total_size() == 300
+    # Re-indexing keeps access times of the index that are more recent than those of the files
+    assert [path for path, _ in index.least_recently_used()] == ["000/dataset_2.dat", "000/dataset_1.dat"]
+
+
+def test_block_cache():
+    data = bytes(range(256)) * 4
+    fetches = []
+
+    def fetch(start, count):
+        fetches.append((start, count))
+        return data[start : start + count]
+
+    block_cache = BlockCache(max_size=64, block_size=16)
+    assert block_cache.read("a", "1024", 10, 30, fetch) == data[10:40]
+    # Missing consecutive blocks are fetched with a single request
+    assert fetches == [(0, 48)]
+    assert block_cache.read("a", "1024", 20, 10, fetch) == data[20:30]
+    assert len(fetches) == 1
+    assert block_cache.read("a", "1024", 40, 20, fetch) == data[40:60]
+    assert fetches[1:] == [(48, 16)]
+    assert block_cache.size == 64
+    # Blocks of another version of the object are not served
+    assert block_cache.read("a", "2048", 20, 10, fetch) == data[20:30]
+    assert fetches[2:] == [(16, 16)]
+    # Reading past the end of the object returns what is there
+    assert block_cache.read("a", "1024", 1020, 10, fetch) == data[1020:]
+    assert block_cache.size <= 64
+    block_cache.invalidate("a")
+    assert block_cache.size == 0
+    assert block_cache.read("b", "1", 0, 10, lambda start, count: None) is None
+
+    # An incomplete last block is not cached, the object might grow
+    fetches.clear()
+    assert block_cache.read("c", "10", 0, 10, lambda start, count: fetch(start, 10)) == data[:10]
+    assert block_cache.size == 0
+    assert block_cache.read("c", "10", 0, 10, lambda start, count: fetch(start, 10)) == data[:10]
+    assert len(fetches) == 2
+
+
+class RangeReadObjectStore(CachingConcreteObjectStore):
+    def __init__(self, staging_path, data, block_cache_size=0):
+        self.staging_path = staging_path
+        self.config = Bunch(umask=0o077, gid=os.getgid(), object_store_block_cache_size=block_cache_size)
+        self.data = data
+        self.range_reads = []
+        self.downloads = []
+
+    def _construct_path(self, obj, **kwargs):
+        return "000/dataset_1.dat"
+
+    def _get_remote_size(self, rel_path):
+        return len(self.data)
+
+    def _get_remote_range(self, rel_path, start, count):
+        self.range_reads.append((start, count))
+        return self.data[start : start + count]
+
+    def _download(self, rel_path):
+        self.downloads.append(rel_path)
+        with open(self._get_cache_path(rel_path), "wb") as f:
+            f.write(self.data)
+        return True
+
+
+def test_get_bytes_range_read(tmp_path):
+    object_store = RangeReadObjectStore(str(tmp_path), b"0123456789" * 10)
+    assert object_store._get_bytes(None, start=5, count=10) == b"5678901234"
+    assert object_store.range_reads == [(5, 10)]
+    assert not object_store.downloads
+
+    # Reading the whole object still pulls it into the cache
+    assert object_store._get_bytes(None) == b"0123456789" * 10
+    assert object_store.downloads == ["000/dataset_1.dat"]
+    assert object_store._get_bytes(None, start=5, count=10) == b"5678901234"
+    assert len(object_store.range_reads) == 1
+
+    block_cache_store = RangeReadObjectStore(str(tmp_path / "block_cache"), b"0123456789" * 10, block_cache_size=1)
+    block_cache_store._block_cache = BlockCache(1024, block_size=16)
+    assert block_cache_store._get_bytes(None, start=5, count=10) == b"5678901234"
+    assert block_cache_store._get_bytes(None, start=0, count=3) == b"012"
+    assert block_cache_store.range_reads == [(0, 16)]
+    # Blocks are cached for the current size of the object only
+    block_cache_store.data = b"abcdefghij" * 11
+    assert block_cache_store._get_bytes(None, start=0, count=3) == b"abc"
+    assert block_cache_store.range_reads[1:] == [(0, 16)]
+
+
+def test_get_data_reads_text(tmp_path):
+    # Slices of text are read from the cached file in text mode, characters are never split
+    object_store = RangeReadObjectStore(str(tmp_path), "αβγδε".encode())
+    assert object_store._get_data(None, start=0, count=3) == "αβγ"
+    assert object_store.downloads == ["000/dataset_1.dat"]
+    assert not object_store.range_reads
+
+
 def test_fits_in_cache_check(tmp_path):
     cache_dir = tmp_path
     big_cache_target = CacheTarget(cache_dir, 1, 0.2)
@@ -0,0 +1,89 @@
+import threading
+
+from galaxy.util.bunch import Bunch
+from galaxy.workflow.scheduling_manager import (
+    fair_invocation_batches,
+    WorkflowRequestMonitor,
+)
+
+TIMEOUT = 10
+
+
+def test_fair_invocation_batches():
+    # (invocation_id, history_id, user_id)
+    invocations = [
+        (1, 10, 100),
+        (2, 11, 100),
+        (3, 10, 100),
+        (4, 12, 100),
+        (5, 20, 200),
+        (6, 30, None),
+        (7, 21, 200),
+        (8, None, None),
+        (9, None, None),
+    ]
+    assert fair_invocation_batches(invocations) == [[1, 3], [5], [6], [2], [7], [8, 9], [4]]
+    assert fair_invocation_batches([]) == []
+
+
+def _monitor(workers):
+    app = Bunch(
+        config=Bunch(monitor_thread_join_timeout=0, workflow_scheduling_workers=workers, server_name="main"),
+        job_config=Bunch(self_handler_tags=[]),
+    )
+    manager = Bunch(default_handler_id="main", handler_assignment_methods=None, handler_max_grab=None)
+    return WorkflowRequestMonitor(app, manager)
+
+
+def _schedule(monitor, invocations, attempt_schedule):
+    monitor._WorkflowRequestMonitor__active_invocations = lambda scheduler_id: invocations
+    monitor._WorkflowRequestMonitor__attempt_schedule = attempt_schedule
+    monitor._WorkflowRequestMonitor__schedule("default", None)
+
+
+def test_serial_scheduling():
+    monitor = _monitor(0)
+    assert monitor.scheduling_pool is None
+    scheduled = []
+    _schedule(monitor, [(1, 10, 100), (2, 11, 100), (3, 20, 200)], lambda i, s: scheduled.append(i))
+    # Without worker threads invocations are scheduled in the order they were created
+    assert scheduled == [1, 2, 3]
+
+
+def test_concurrent_scheduling():
+    monitor = _monitor(2)
+    scheduled = []
+    release = threading.Event()
+
+    def attempt_schedule(invocation_id, workflow_scheduler):
+        if invocation_id == 1:
+            # Other histories are scheduled while this invocation is busy
+            assert release.wait(TIMEOUT)
+        elif invocation_id == 4:
+            release.set()
+        scheduled.append(invocation_id)
+
+    try:
+        _schedule(monitor, [(1, 10, 100), (2, 10, 100), (3, 20, 200), (4, 30, 300)], attempt_schedule)
+    finally:
+        monitor.shutdown()
+    assert scheduled.index(4) < scheduled.index(1)
+    # Invocations of the same history are scheduled in order
+    assert scheduled.index(1) < scheduled.index(2)
+    assert sorted(scheduled) == [1, 2, 3, 4]
+
+
+def test_concurrent_scheduling_exception():
+    monitor = _monitor(2)
+    scheduled = []
+
+    def attempt_schedule(invocation_id, workflow_scheduler):
+        if invocation_id == 1:
+            raise Exception("Cannot schedule")
+        scheduled.append(invocation_id)
+
+    try:
+        _schedule(monitor, [(1, 10, 100), (2, 10, 100), (3, 20, 200)], attempt_schedule)
+    finally:
+        monitor.shutdown()
+    assert scheduled == [3]
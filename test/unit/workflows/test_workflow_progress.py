@@ -1,8 +1,11 @@
 from typing import cast
 
+import pytest
+
 from galaxy import model
 from galaxy.model.base import transaction
 from galaxy.util.unittest import TestCase
+from galaxy.workflow import modules
 from galaxy.workflow.run import (
     ModuleInjector,
     WorkflowProgress,
@@ -179,6 +182,47 @@ class TestWorkflowProgress(TestCase):
         replacement = progress.replacement_for_input(None, self._step(4), step_dict)
         assert replacement is hda3
 
+    def test_blocked_step_frontier(self):
+        self._setup_workflow(TEST_WORKFLOW_YAML)
+        self._set_previous_progress(
+            [
+                (100, {"output": model.HistoryDatasetAssociation()}),
+                (101, {"output": model.HistoryDatasetAssociation()}),
+                (102, UNSCHEDULED_STEP),
+                (103, {"out_file1": model.HistoryDatasetAssociation()}),
+                (104, UNSCHEDULED_STEP),
+            ]
+        )
+        progress = self._new_workflow_progress()
+        steps = progress.remaining_steps()
+        assert [step.id for step, _ in steps] == [102, 104]
+        progress.mark_step_outputs_delayed(self._step(2))
+        conn = model.WorkflowStepConnection()
+        conn.output_name = "out_file1"
+        conn.output_step = self._step(2)
+        with pytest.raises(modules.DelayedWorkflowEvaluation) as exc_info:
+            progress.replacement_for_connection(conn)
+        assert exc_info.value.waiting_on_step_id == 102
+        progress.mark_step_blocked(self._step(4), exc_info.value.waiting_on_step_id)
+        assert progress.is_blocked(self._step(4))
+        progress.persist_frontier()
+        assert self.invocation.scheduling_frontier == {"104": 102}
+
+        # Step 4 is skipped while step 2 is still delayed ...
+        progress = self._new_workflow_progress()
+        progress.remaining_steps()
+        progress.mark_step_outputs_delayed(self._step(2))
+        assert progress.is_blocked(self._step(4))
+
+        # ... and re-evaluated once step 2 has been scheduled.
+        progress = self._new_workflow_progress()
+        progress.remaining_steps()
+        progress.set_step_outputs(self._invocation_step(2), {"out_file1": model.HistoryDatasetAssociation()})
+        assert not progress.is_blocked(self._step(4))
+        progress.mark_step_unblocked(self._step(4))
+        progress.persist_frontier()
+        assert self.invocation.scheduling_frontier is None
+
     # TODO: Replace multiple true HDA with HDCA
     # TODO: Test explicit delay
     # TODO: Test cancel on collection invalid